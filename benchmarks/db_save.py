@@ -0,0 +1,63 @@
+"""Rows per second of saving ResultDB records.
+
+Compares the previous behaviour of DB.save, which opened, committed and closed
+a connection for every record, with DB.save on the persistent connection of the
+thread and DB.save_many, which inserts all the records in one transaction.
+
+Usage:
+    python benchmarks/db_save.py [--rows 1000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from aiomql.core.config import Config
+from aiomql.core.db import DB
+from aiomql.lib.result_db import ResultDB
+
+
+def records(rows: int, start: int) -> list[ResultDB]:
+    return [ResultDB(deal=order, order=order, name="benchmark", symbol="EURUSD", time=time.time(), volume=0.1,
+                     price=1.1, type=0, parameters={"fast": 8, "slow": 21}) for order in range(start, start + rows)]
+
+
+def connect_per_record(batch: list[ResultDB]):
+    for record in batch:
+        record.save(conn=ResultDB.get_connection())
+
+
+def persistent_connection(batch: list[ResultDB]):
+    for record in batch:
+        record.save()
+
+
+def save_many(batch: list[ResultDB]):
+    ResultDB.save_many(batch)
+
+
+SCENARIOS = {
+    "save, connection per record (previous)": connect_per_record,
+    "save, persistent connection": persistent_connection,
+    "save_many": save_many,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        Config().db_name = str(Path(tmp) / "benchmark.sqlite3")
+        print(f"{'scenario':<42}{'rows/sec':>12}")
+        for index, (name, scenario) in enumerate(SCENARIOS.items()):
+            batch = records(args.rows, index * args.rows)
+            start = time.perf_counter()
+            scenario(batch)
+            print(f"{name:<42}{args.rows / (time.perf_counter() - start):>12.0f}")
+        DB.close_connections()
+
+
+if __name__ == "__main__":
+    main()
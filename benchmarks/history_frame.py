@@ -0,0 +1,60 @@
+"""Seconds taken to turn history deals into a DataFrame.
+
+Compares building a TradeDeal per deal and a DataFrame from their dicts, which
+History required before, with History.deals_frame, which copies the tuples
+returned by the terminal into a typed structured array in one pass.
+
+Usage:
+    python benchmarks/history_frame.py [--deals 200000]
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from aiomql.core.models import TradeDeal
+from aiomql.lib.history import DEAL_COLUMNS, History
+
+RawDeal = namedtuple("RawDeal", list(DEAL_COLUMNS))
+
+
+def raw_deals(count: int) -> tuple:
+    start = 1704067200
+    return tuple(RawDeal(ticket, ticket, start + ticket, (start + ticket) * 1000, ticket % 2, ticket % 2, 7,
+                         ticket // 2, 3, 0.1, 1.1, -0.5, 0.0, 1.5, 0.0, 0.0, 0.0, f"SYMBOL{ticket % 20}", "", "")
+                 for ticket in range(count))
+
+
+def objects(deals: tuple) -> pd.DataFrame:
+    return pd.DataFrame([TradeDeal(**deal._asdict()).dict for deal in deals])
+
+
+def frame(deals: tuple) -> pd.DataFrame:
+    history = History(date_from=0, date_to=1)
+    history.set_raw(deals=deals, orders=())
+    return history.deals_frame()
+
+
+SCENARIOS = {
+    "TradeDeal objects then DataFrame (previous)": objects,
+    "History.deals_frame": frame,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deals", type=int, default=200000)
+    args = parser.parse_args()
+    deals = raw_deals(args.deals)
+    print(f"{'scenario':<46}{'seconds':>12}{'MB':>8}")
+    for name, scenario in SCENARIOS.items():
+        start = time.perf_counter()
+        result = scenario(deals)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<46}{elapsed:>12.3f}{result.memory_usage(deep=True).sum() / 2 ** 20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Cold-start import time of aiomql.
+
+Every scenario runs in a fresh interpreter, so the numbers are the cost a new
+worker process of Bot.process_pool pays. The 'eager' scenario imports the
+indicators and mplfinance up front, which is what `import aiomql` used to do.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import aiomql": "import aiomql",
+    "import aiomql + first indicator": (
+        "import aiomql, pandas as pd\n"
+        "pd.DataFrame({'close': [float(i) for i in range(20)]}).ta.sma(5)"
+    ),
+    "import aiomql (eager, previous behaviour)": (
+        "import aiomql, mplfinance\n"
+        "import aiomql.ta_libs.pandas_ta_classic.core"
+    ),
+}
+
+TIMER = "import time; _start = time.perf_counter()\n{code}\nprint(time.perf_counter() - _start)"
+
+
+def measure(code: str, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], capture_output=True, text=True,
+                             check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'scenario':<45}{'median ms':>12}{'min ms':>10}")
+    for name, code in SCENARIOS.items():
+        timings = measure(code, args.runs)
+        print(f"{name:<45}{statistics.median(timings):>12.1f}{min(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Objects per second built from the namedtuples returned by the terminal.
+
+Compares constructing a model from the dict of a namedtuple, ``Model(**obj._asdict())``,
+with the constructor compiled once per class by ``Model.from_mt5``, for the models built
+on every cycle of a strategy.
+
+Usage:
+    python benchmarks/model_construction.py [--objects 100000]
+"""
+
+import argparse
+import enum
+import time
+from collections import namedtuple
+
+from aiomql.core.models import SymbolInfo, TradeDeal, TradePosition
+from aiomql.lib.ticks import Tick
+
+SAMPLES = {int: 7, float: 1.2345, str: "EURUSD", bool: True}
+TICK_FIELDS = ("time", "bid", "ask", "last", "volume", "time_msc", "flags", "volume_real")
+
+
+def value(annot):
+    if isinstance(annot, type) and issubclass(annot, enum.Enum):
+        return next(iter(annot)).value
+    return SAMPLES.get(annot, 0)
+
+
+def raw_objects(model, count: int) -> tuple:
+    """Namedtuples shaped like those of the MetaTrader5 package for a model."""
+    if model is Tick:
+        Raw = namedtuple("Tick", TICK_FIELDS)
+        return tuple(Raw(1704067200 + n, 1.1, 1.2, 0.0, 0, (1704067200 + n) * 1000, 6, 0.0) for n in range(count))
+    types = {name: annot for name, annot in model.field_types().items() if name not in model.exclude}
+    Raw = namedtuple(model.__name__, types)
+    raw = Raw(*(value(annot) for annot in types.values()))
+    return tuple(raw._replace(**{next(iter(types)): n}) for n in range(count))
+
+
+def from_dict(model, objs):
+    return [model(**obj._asdict()) for obj in objs]
+
+
+def from_mt5(model, objs):
+    return [model.from_mt5(obj) for obj in objs]
+
+
+SCENARIOS = {"Model(**obj._asdict())": from_dict, "Model.from_mt5(obj)": from_mt5}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args()
+    print(f"{'model':<16}{'scenario':<26}{'objects/sec':>14}")
+    for model in (TradeDeal, TradePosition, SymbolInfo, Tick):
+        objs = raw_objects(model, args.objects)
+        for name, scenario in SCENARIOS.items():
+            start = time.perf_counter()
+            scenario(model, objs)
+            elapsed = time.perf_counter() - start
+            print(f"{model.__name__:<16}{name:<26}{args.objects / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Seconds taken to report on ResultDB records.
+
+Compares loading every record with ResultDB.filter and computing the figures
+in Python, which decodes the parameters of every row, with the SQL aggregates
+of ResultReport.summary and the single pass of ResultReport.drawdown.
+
+Usage:
+    python benchmarks/result_report.py [--rows 100000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from aiomql.core.config import Config
+from aiomql.core.db import DB
+from aiomql.lib.result_db import ResultDB
+from aiomql.lib.result_report import ResultReport
+
+
+def records(rows: int) -> list[ResultDB]:
+    start = time.time() * 1000
+    return [ResultDB(deal=order, order=order, name=f"strategy{order % 10}", symbol=f"SYMBOL{order % 20}",
+                     time=start + order * 60000, time_close=start + order * 60000 + 30000, volume=0.1, price=1.1,
+                     type=0, closed=True, profit=random.uniform(-10, 11), parameters={"fast": 8, "slow": 21})
+            for order in range(rows)]
+
+
+def load_and_compute():
+    curves = {}
+    for record in sorted(ResultDB.filter(closed=1), key=lambda record: (record.name, record.time_close)):
+        trades, wins, net, equity, peak, drawdown = curves.get(record.name, (0, 0, 0, 0, 0, 0))
+        equity += record.profit
+        peak = max(peak, equity)
+        curves[record.name] = (trades + 1, wins + (record.profit > 0), net + record.profit, equity, peak,
+                               max(drawdown, peak - equity))
+    return curves
+
+
+def report():
+    report = ResultReport()
+    return report.summary(by=("name",)), report.drawdown(by="name")
+
+
+SCENARIOS = {
+    "filter and compute in Python (previous)": load_and_compute,
+    "ResultReport summary and drawdown": report,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        Config().db_name = str(Path(tmp) / "benchmark.sqlite3")
+        ResultDB.save_many(records(args.rows))
+        print(f"{'scenario':<42}{'seconds':>12}")
+        for name, scenario in SCENARIOS.items():
+            start = time.perf_counter()
+            scenario()
+            print(f"{name:<42}{time.perf_counter() - start:>12.3f}")
+        DB.close_connections()
+
+
+if __name__ == "__main__":
+    main()
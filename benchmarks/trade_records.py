@@ -0,0 +1,104 @@
+"""Seconds taken to update hundreds of trade record files.
+
+Compares update_csv_records and update_json_records, which read and write
+every file on the event loop and fetch the deals of every file separately,
+with update_records, which reads and writes the files on a thread pool and
+matches all of them against a single snapshot of the deals. The terminal is
+simulated: every history_deals_get call waits --latency milliseconds and
+returns the closing deals of half the trades.
+
+Usage:
+    python benchmarks/trade_records.py [--files 300] [--rows 50] [--latency 20]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from aiomql.lib.trade_records import TradeRecords
+
+
+class Deal(NamedTuple):
+    position_id: int
+    order: int
+    entry: int
+    profit: float
+    time_msc: int
+    price: float
+
+
+class Terminal:
+    """Stands in for MetaTrader, returning the same deals for every window."""
+    DEAL_ENTRY_OUT = 1
+
+    def __init__(self, deals: list[Deal], latency: float):
+        self.deals = deals
+        self.latency = latency
+        self.calls = 0
+
+    async def history_deals_get(self, *, date_from, date_to):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.deals
+
+
+def write_files(folder: Path, files: int, rows: int) -> list[Deal]:
+    opened = (datetime.now() - timedelta(days=1)).timestamp()
+    deals = []
+    for index in range(files):
+        trades = [{"order": order, "time": opened * 1000, "profit": 0, "closed": False, "win": False}
+                  for order in range(index * rows, (index + 1) * rows)]
+        deals.extend(Deal(trade["order"], trade["order"] + 10 ** 9, 1, 1.0, int(opened * 1000) + 60000, 1.1)
+                     for trade in trades[::2])
+        if index % 2:
+            (folder / f"strategy{index}.json").write_text(json.dumps(trades, indent=2))
+            continue
+        for trade in trades:
+            trade["time"] = opened
+        with open(folder / f"strategy{index}.csv", "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=list(trades[0]))
+            writer.writeheader()
+            writer.writerows(trades)
+    return deals
+
+
+async def per_file(records: TradeRecords):
+    await records.update_csv_records()
+    await records.update_json_records()
+
+
+async def bulk(records: TradeRecords):
+    await records.update_records()
+
+
+SCENARIOS = {
+    "update_csv_records + update_json_records": per_file,
+    "update_records": bulk,
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=20, help="milliseconds per history_deals_get call")
+    args = parser.parse_args()
+    print(f"{'scenario':<44}{'seconds':>10}{'history calls':>16}")
+    for name, scenario in SCENARIOS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            deals = write_files(Path(tmp), args.files, args.rows)
+            records = TradeRecords(records_dir=Path(tmp), store={})
+            records.mt5 = terminal = Terminal(deals, args.latency / 1000)
+            start = time.perf_counter()
+            await scenario(records)
+            print(f"{name:<44}{time.perf_counter() - start:>10.3f}{terminal.calls:>16}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
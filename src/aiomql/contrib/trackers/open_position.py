@@ -12,7 +12,7 @@ from typing import ClassVar, Self
 from logging import getLogger
 import asyncio
 
-from ...lib import Symbol, Positions, Order
+from ...lib import Symbol, Positions, PositionsSnapshot, Order
 from ...core.models import TradePosition, TradeAction, OrderSendResult
 from ...core.constants import OrderType
 from ...core.config import Config
@@ -70,9 +70,15 @@ class OpenPosition:
         auto_track_closed: Automatically add tracker for detecting closed positions.
         close_hedges_on_close: Close all hedge positions when this closes.
         close_stacks_on_close: Close all stack positions when this closes.
+        snapshot: The open positions of the current tracking cycle, set by
+            track. While it is set, update_position and check_pending_order
+            read positions from it instead of querying the terminal. It is not
+            pickled with the position.
         positions: Class-level Positions handler shared by all instances.
-        state_key: Key for storing tracked positions in state.
-        archive_key: Key for storing archived (closed) positions in state.
+        state_key: Prefix of the state keys of tracked positions. Every
+            position is stored under a key of its own, f"{state_key}:{ticket}",
+            so a commit only rewrites the positions that changed.
+        archive_key: Prefix of the state keys of archived (closed) positions.
         config: Class-level configuration shared by all instances.
     """
     symbol: Symbol
@@ -94,6 +100,7 @@ class OpenPosition:
     close_hedges_on_close: bool = False
     close_stacks_on_close: bool = False
     _trackers: dict[str, PositionTracker] = field(default_factory=dict)
+    snapshot: PositionsSnapshot | None = field(default=None, init=False, repr=False, compare=False)
     positions: ClassVar[Positions]
     state_key: ClassVar[str] = "tracked_positions"
     archive_key: ClassVar[str] = "archived_positions"
@@ -107,11 +114,45 @@ class OpenPosition:
         return super().__new__(cls)
 
     def __post_init__(self):
-        self.config.state.setdefault(self.state_key, {}).setdefault(self.ticket, self)
+        if self.key not in self.config.state:
+            self.config.state[self.key] = self
         if self.auto_track_closed:
             PositionTracker(self, self.remove_closed, name="remove_closed_tracker", rank=1)
         PositionTracker(self, self.check_pending_orders, name="pending_orders_tracker", rank=2)
 
+    @property
+    def key(self) -> str:
+        """The state key of this position."""
+        return f"{self.state_key}:{self.ticket}"
+
+    def touch(self, *, autocommit: bool = True):
+        """Mark this position as changed, so that it is written on the next commit of the state.
+
+        Tracking marks the positions it changes. Code changing a tracked position outside of the trackers
+        calls this for the change to be persisted.
+
+        Args:
+            autocommit: Whether the state commits as for its other writes. Defaults to True.
+        """
+        self.config.state.touch(self.key, autocommit=autocommit)
+
+    def _persisted(self) -> dict:
+        """A shallow copy of the attributes, compared before and after tracking to find out if the position changed.
+
+        The position is compared by its values, the dictionaries by their items.
+        """
+        values = {name: dict(value) if isinstance(value, dict) else value for name, value in vars(self).items()
+                  if name != "snapshot"}
+        values["position"] = dict(vars(self.position))
+        return values
+
+    def __getstate__(self) -> dict:
+        """Pickle the position without the snapshot of the current cycle, which a commit of the state during
+        tracking would otherwise write while it is being read. Unpickled positions have no snapshot."""
+        state = vars(self).copy()
+        state.pop("snapshot", None)
+        return state
+
     def add_tracker(self, *, tracker: PositionTracker, name: str = None, rank: int = None):
         """Add a tracker to this position.
         
@@ -209,7 +250,10 @@ class OpenPosition:
             True if the position is still open, False if closed.
         """
         try:
-            pos = await self.positions.get_position_by_ticket(ticket=self.ticket)
+            if self.snapshot is not None:
+                pos = self.snapshot.get_position(self.ticket)
+            else:
+                pos = await self.positions.get_position_by_ticket(ticket=self.ticket)
             if pos is not None:
                 self.position = pos
                 self.is_open = True
@@ -270,6 +314,7 @@ class OpenPosition:
             order = Order(position=self.ticket, sl=sl, tp=tp, action=TradeAction.SLTP)
             res = await order.send()
             if res.retcode == 10009:
+                self.snapshot = None  # the snapshot of the cycle has the old stops
                 await self.update_position()
                 return True, res
             else:
@@ -289,8 +334,9 @@ class OpenPosition:
         archived positions in the state.
         """
         try:
-            pos = self.config.state.get(self.state_key, {}).pop(self.ticket, None)
-            self.config.state.setdefault(self.archive_key, {}).setdefault(self.ticket, pos) if pos else ...
+            state = self.config.state
+            if (pos := state.pop(self.key, None)) is not None:
+                state.setdefault(f"{self.archive_key}:{self.ticket}", pos)
         except KeyError as err:
             logger.error("%s: Unable to remove closed position from state in %s", err, self.__class__.__name__)
 
@@ -363,7 +409,10 @@ class OpenPosition:
             pending_order: The PendingOrder to check.
         """
         try:
-            pos = await self.positions.get_position_by_ticket(ticket=pending_order.order.order)
+            if self.snapshot is not None:
+                pos = self.snapshot.get_position(pending_order.order.order)
+            else:
+                pos = await self.positions.get_position_by_ticket(ticket=pending_order.order.order)
             if pos is None:
                 return
             if pending_order.is_hedge:
@@ -396,17 +445,30 @@ class OpenPosition:
             logger.error("%s: Error occurred in %s.check_pending_orders for %s:%d", exe, self.__class__.__name__,
                          self.symbol.name, self.ticket)
 
-    async def track(self):
+    async def track(self, *, snapshot: PositionsSnapshot = None):
         """Execute all registered trackers on this position.
         
         Iterates through all trackers in rank order and executes them.
         Exceptions are logged but do not stop subsequent trackers.
+
+        The position is marked as changed in the state, without committing,
+        if the trackers changed it.
+
+        Args:
+            snapshot: The open positions of the current cycle, shared by all
+                tracked positions. It is cleared when the trackers are done.
         """
+        before = self._persisted()
+        self.snapshot = snapshot
         try:
             for tracker in self.trackers:
                 await tracker()
         except Exception as exe:
             logger.error("%s: Error occurred in %s.track for %s:%d", exe, self.__class__.__name__, self.symbol.name, self.ticket)
+        finally:
+            self.snapshot = None
+        if self._persisted() != before:
+            self.touch(autocommit=False)
 
     async def profit_to_price(self, *, profit: float) -> float:
         """Calculate the price level that would yield a specific profit.
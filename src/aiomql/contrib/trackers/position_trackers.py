@@ -14,7 +14,7 @@ from typing import Any, TypeVar, ClassVar
 from logging import getLogger
 
 from ...core import Config, State, sleep
-from ...lib import Positions
+from ...lib import Positions, PositionsSnapshot
 
 logger = getLogger(__name__)
 
@@ -96,15 +96,19 @@ class OpenPositionsTracker:
     """Manages and tracks all open positions in the trading system.
     
     Runs a continuous loop that executes all trackers on all tracked
-    positions at a specified interval. Supports automatic cleanup of
-    closed positions and optional state persistence.
+    positions at a specified interval. Each cycle takes a single snapshot
+    of the open positions, shared by every tracked position and by the
+    cleanup of closed positions, instead of a terminal call per position.
+    Supports automatic cleanup of closed positions and optional state
+    persistence. Every position is kept in the state under a key of its
+    own, so a commit only rewrites the positions that changed.
     
     Attributes:
         config: Shared configuration instance.
         positions: Positions handler for querying position data.
         state: State manager for persisting tracked positions.
         interval: Time between tracking cycles in seconds.
-        state_key: Key used to store tracked positions in state.
+        state_key: Prefix of the state keys of the tracked positions.
         autocommit: Whether to automatically commit state changes.
         auto_remove_closed: Whether to automatically remove closed positions.
     """
@@ -130,8 +134,8 @@ class OpenPositionsTracker:
         
         Args:
             interval: Time between tracking cycles in seconds. Defaults to 10.
-            state_key: Key used to store tracked positions in the state
-                dictionary. Defaults to "tracked_positions".
+            state_key: Prefix of the state keys of the tracked positions,
+                stored as f"{state_key}:{ticket}". Defaults to "tracked_positions".
             autocommit: If True, automatically commit state changes after
                 each tracking cycle. Defaults to False.
             auto_remove_closed: If True, automatically remove closed positions
@@ -157,26 +161,68 @@ class OpenPositionsTracker:
         while not self.config.shutdown:
             try:
                 await sleep(self.interval)
-                tracked_positions = self.state.get("tracked_positions", {})
-                await asyncio.gather(*(pos.track() for pos in tracked_positions.values()), return_exceptions=True)
+                # the positions tracked before the snapshot, strategies can add positions during the cycle
+                tracked_positions = self.get_tracked_positions()
+                snapshot = await self.get_snapshot() if tracked_positions else None
+                await asyncio.gather(*(pos.track(snapshot=snapshot) for pos in tracked_positions.values()),
+                                     return_exceptions=True)
                 if self.auto_remove_closed:
-                    await self.remove_closed_positions(tracked_positions)
+                    await self.remove_closed_positions(tracked_positions, snapshot=snapshot)
                 if self.autocommit:
+                    # each position marks its own key when tracking changed it
                     await self.state.acommit(conn=conn, close=False)
             except Exception as exe:
                 logger.error("%s: Error occurred in %s.track", exe, self.__class__.__name__)
         conn.close()
 
-    async def remove_closed_positions(self, tracked_positions: dict):
+    def get_tracked_positions(self) -> dict:
+        """Collect the tracked positions from their keys in the state.
+
+        Positions kept in a single dictionary under state_key by previous
+        versions are moved to keys of their own first.
+
+        Returns:
+            Dictionary mapping ticket numbers to OpenPosition instances.
+        """
+        prefix = f"{self.state_key}:"
+        if isinstance(legacy := self.state.get(self.state_key), dict):
+            self.state.update({f"{prefix}{ticket}": pos for ticket, pos in legacy.items()})
+            del self.state[self.state_key]
+        return {pos.ticket: pos for key, pos in list(self.state.items())
+                if isinstance(key, str) and key.startswith(prefix)}
+
+    async def get_snapshot(self) -> PositionsSnapshot | None:
+        """Take the snapshot of the open positions shared by a tracking cycle.
+
+        Returns:
+            The open positions indexed by ticket, or None if the terminal
+            did not return them, in which case each position queries the
+            terminal itself.
+        """
+        try:
+            positions = await self.positions.mt5.positions_get()
+            return PositionsSnapshot(positions) if positions is not None else None
+        except Exception as exe:
+            logger.error("%s: Error occurred in %s.get_snapshot", exe, self.__class__.__name__)
+            return None
+
+    async def remove_closed_positions(self, tracked_positions: dict, snapshot: PositionsSnapshot = None):
         """Remove closed positions from the tracked positions.
         
-        Queries the broker for all current positions and removes any
-        tracked positions that are no longer open.
+        Removes any of the given tracked positions that are no longer open,
+        according to the snapshot of the cycle or, without one, to the
+        broker's current positions. Positions tracked since, which the
+        snapshot can't know about, are kept.
         
         Args:
             tracked_positions: Dictionary mapping ticket numbers to
-                OpenPosition instances.
+                OpenPosition instances, as tracked when the snapshot was taken.
+            snapshot: The open positions of the current cycle.
         """
-        all_pos = await self.positions.get_positions()
-        all_pos = {pos.ticket for pos in all_pos}
-        self.state[self.state_key] = {pos.ticket: pos for pos in tracked_positions.values() if pos.ticket in all_pos}
+        if snapshot is not None:
+            all_pos = snapshot.tickets
+        else:
+            all_pos = {pos.ticket for pos in await self.positions.get_positions()}
+        for pos in tracked_positions.values():
+            if pos.ticket not in all_pos:
+                self.state.pop(f"{self.state_key}:{pos.ticket}", None)
@@ -7,7 +7,9 @@ from .errors import Error
 from .exceptions import *
 from .task_queue import TaskQueue
 from .utils import *
-from .db import DB
+from .db import DB, JSONField
+from .db_worker import DBWorker
 from .state import State
 from .store import Store
+from .write_behind import WriteBehind
 from .sync import *
@@ -22,7 +22,7 @@ Example:
 """
 
 import enum
-from typing import Literal
+from typing import Any, Callable, Iterable, Literal, Self
 from logging import getLogger
 from functools import cache
 
@@ -50,6 +50,26 @@ class BaseMeta(type):
             cls.mt5 = MetaTrader() if cls.__dict__.get("mode", "") != "sync" else MetaTraderSync()
 
 
+def enum_converter(enum_: type[enum.Enum]) -> Callable[[Any], enum.Enum]:
+    """Converts values to members of an enum, looking them up by value before calling the enum.
+
+    Args:
+        enum_ (type[enum.Enum]): The enum class
+
+    Returns:
+        Callable: A function returning the member for a value
+    """
+    members = enum_._value2member_map_
+
+    def convert(value):
+        try:
+            return members[value]
+        except KeyError:
+            return enum_(value)
+
+    return convert
+
+
 class Base:
     """A base class for all data structure classes in the aiomql package.
 
@@ -115,21 +135,129 @@ class Base:
         Notes:
             Only sets attributes that have been annotated on the class body.
         """
+        converters = self.converters()
         for i, j in kwargs.items():
             try:
-                setattr(self, i, self.annotations[i](j))
+                setattr(self, i, converters[i](j))
             except KeyError:
                 logger.debug(f"Attribute {i} does not belong to class {self.__class__.__name__}")
                 continue
 
             except (ValueError, TypeError):
-                logger.debug(f"Cannot covert object of type {type(j)} to type {self.annotations[i]}")
+                logger.debug(f"Cannot covert object of type {type(j)} to type {self.field_types()[i]}")
                 setattr(self, i, j)
 
             except Exception as exe:
                 logger.debug(f"Did not set attribute {i} on class {self.__class__.__name__} due to {exe}")
                 continue
 
+    @classmethod
+    @cache
+    def field_types(cls) -> dict[str, Any]:
+        """Annotations of the class and all its ancestors, computed once per class.
+
+        Returns:
+            dict: A dictionary of attribute names and their annotations
+        """
+        annots = {}
+        for base in cls.__mro__[::-1]:
+            annots |= getattr(base, "__annotations__", {})
+        return annots
+
+    @classmethod
+    @cache
+    def converters(cls) -> dict[str, Callable]:
+        """The callables used to convert the values of annotated attributes, computed once per class.
+
+        Enum members are looked up by value and other annotations are called with the value.
+
+        Returns:
+            dict: A dictionary of attribute names and converters
+        """
+        return {
+            name: enum_converter(annot) if isinstance(annot, type) and issubclass(annot, enum.Enum) else annot
+            for name, annot in cls.field_types().items()
+        }
+
+    @classmethod
+    @cache
+    def builder(cls, fields: tuple[str, ...]) -> Callable[[Iterable], Self]:
+        """A constructor compiled for values arriving in the order of fields, such as an MT5 namedtuple.
+
+        The constructor is generated once per class and fields. It converts each value inline, skipping
+        the conversion when the value already has the annotated builtin type, and sets the attributes of
+        the new instance in a single assignment. Values that can't be converted inline are handed to
+        set_attributes. Classes with their own ``__init__``, ``__setattr__`` or metaclass are
+        constructed by calling the class.
+
+        Args:
+            fields (tuple[str, ...]): Names of the values in the order they are given
+
+        Returns:
+            Callable: A function taking a sequence of values and returning an instance
+        """
+        if cls.__init__ is not Base.__init__ or cls.__setattr__ is not object.__setattr__ or type(cls) is not type:
+            return lambda values: cls(**dict(zip(fields, values)))
+
+        converters, field_types = cls.converters(), cls.field_types()
+        namespace = {"cls": cls, "fields": fields, "zip": zip, "dict": dict}
+        items = []
+        for n, name in enumerate(fields):
+            if name not in converters:
+                continue
+            annot, value = field_types[name], f"_{n}"
+            if annot in (int, float, str, bool):
+                namespace[f"t{n}"] = annot
+                items.append(f"{name!r}: {value} if {value}.__class__ is t{n} else t{n}({value})")
+            elif isinstance(annot, type) and issubclass(annot, enum.Enum):
+                namespace[f"m{n}"], namespace[f"c{n}"] = annot._value2member_map_, annot
+                items.append(f"{name!r}: m{n}[{value}] if {value} in m{n} else c{n}({value})")
+            else:
+                namespace[f"c{n}"] = converters[name]
+                items.append(f"{name!r}: c{n}({value})")
+
+        values = ", ".join(f"_{n}" for n in range(len(fields))) + ","
+        source = (
+            "def build(values):\n"
+            "    self = cls.__new__(cls)\n"
+            "    try:\n"
+            f"        {values} = values\n"
+            f"        self.__dict__ = {{{', '.join(items)}}}\n"
+            "    except Exception:\n"
+            "        self.set_attributes(**dict(zip(fields, values)))\n"
+            "    return self\n"
+        )
+        exec(source, namespace)
+        return namespace["build"]
+
+    @classmethod
+    def from_mt5(cls, obj) -> Self:
+        """Creates an instance from a namedtuple returned by the terminal with the compiled constructor.
+
+        Args:
+            obj: A namedtuple such as a TradeDeal or TradePosition from the MetaTrader5 package
+
+        Returns:
+            Self: An instance of the class
+        """
+        return cls.builder(obj._fields)(obj)
+
+    @classmethod
+    def from_mt5_many(cls, objs: Iterable) -> tuple[Self, ...]:
+        """Creates instances from namedtuples of the same type returned by the terminal.
+
+        Args:
+            objs (Iterable): Namedtuples from the MetaTrader5 package
+
+        Returns:
+            tuple[Self, ...]: Instances of the class in the order of the namedtuples
+        """
+        objs = tuple(objs)
+        if not objs:
+            return ()
+        build = cls.builder(objs[0]._fields)
+        return tuple(build(obj) for obj in objs)
+
     @property
     @cache
     def annotations(self) -> dict:
@@ -156,23 +284,36 @@ class Base:
         Notes:
             You can only set either of include or exclude. If you set both, include will take precedence
         """
-        exclude, include = exclude or set(), include or set()
-        filter_ = include or set(self.dict.keys()).difference(exclude)
-        return {key: value for key, value in self.dict.items() if key in filter_ and value is not None}
+        data = self.dict
+        if include:
+            return {key: value for key, value in data.items() if key in include}
+        if exclude:
+            return {key: value for key, value in data.items() if key not in exclude}
+        return data
+
+    @classmethod
+    @cache
+    def class_var_names(cls) -> tuple[str, ...]:
+        """Names of the annotated attributes with a value on the class or an ancestor, computed once per class.
+
+        Returns:
+            tuple[str, ...]: The names in the order of the class_vars dictionary
+        """
+        names = {}
+        for base in cls.__mro__[::-1]:
+            names |= dict.fromkeys(base.__dict__)
+        annots = cls.field_types()
+        return tuple(name for name in names if name in annots)
 
     @property
-    @cache
     def class_vars(self):
         """Annotated class attributes
 
         Returns:
             dict: A dictionary of available class attributes in all ancestor classes and the current class.
         """
-        clss = self.__class__.__mro__[::-1]
-        cls_dict = {}
-        for cls in clss:
-            cls_dict |= cls.__dict__
-        return {key: value for key, value in cls_dict.items() if key in self.annotations}
+        cls = self.__class__
+        return {name: getattr(cls, name) for name in cls.class_var_names()}
 
     @property
     def dict(self) -> dict:
@@ -188,6 +329,51 @@ class Base:
             if key not in _filter and value is not None
         }
 
+    @classmethod
+    @cache
+    def dict_fields(cls, exclude: frozenset[str] = frozenset()) -> tuple[str, ...]:
+        """Names of the annotated attributes that are not excluded, computed once per class and exclude.
+
+        Args:
+            exclude (frozenset[str]): Attributes to leave out besides those in the exclude set of the class
+
+        Returns:
+            tuple[str, ...]: The names in the order of the annotations
+        """
+        excluded = cls.exclude.difference(cls.include) | exclude
+        return tuple(name for name in cls.field_types() if name not in excluded)
+
+    def to_dict(self, fields: Iterable[str] = None, *, drop_none: bool = True) -> dict:
+        """Returns the given attributes as a dict without filtering the attributes of the instance.
+
+        Args:
+            fields (Iterable[str]): The attributes to return, in order. Defaults to dict_fields()
+            drop_none (bool): Leave out attributes whose value is None. If False attributes that are not
+                set are still left out, but None values are kept.
+
+        Returns:
+            dict: A dictionary of the attributes
+        """
+        data, defaults = self.__dict__, self.class_vars
+        fields = self.dict_fields() if fields is None else fields
+        if drop_none:
+            return {name: value for name in fields if (value := data.get(name, defaults.get(name))) is not None}
+        return {name: data[name] if name in data else defaults[name] for name in fields
+                if name in data or name in defaults}
+
+    def to_tuple(self, fields: Iterable[str] = None) -> tuple:
+        """Returns the values of the given attributes as a tuple, with None for attributes that are not set.
+
+        Args:
+            fields (Iterable[str]): The attributes to return, in order. Defaults to dict_fields()
+
+        Returns:
+            tuple: The values of the attributes
+        """
+        data, defaults = self.__dict__, self.class_vars
+        fields = self.dict_fields() if fields is None else fields
+        return tuple([data.get(name, defaults.get(name)) for name in fields])
+
 
 class _Base(Base, metaclass=BaseMeta):
     """Extended base class with MetaTrader and Config integration.
@@ -37,6 +37,7 @@ from functools import cached_property
 from .task_queue import TaskQueue
 from .state import  State
 from .store import Store
+from .write_behind import WriteBehind
 
 logger = getLogger(__name__)
 Bot = TypeVar("Bot")
@@ -61,7 +62,7 @@ class Config:
             Defaults to 'aiomql.json'.
         root (Path): The root directory of the project. All relative paths
             are resolved from this directory.
-        trade_record_mode (Literal["csv", "json", "sql"]): The format for
+        trade_record_mode (Literal["csv", "json", "jsonl", "sql"]): The format for
             recording trades. Defaults to 'sql'.
         record_trades (bool): Whether to record trades. Defaults to True.
         records_dir (Path): The directory to store trade records.
@@ -85,14 +86,20 @@ class Config:
             Defaults to False.
         db_commit_interval (float): The interval in seconds for database commits.
             Defaults to 30.
-        auto_commit (bool): Whether to auto-commit database changes.
-            Defaults to False.
+        auto_commit (bool): Whether to commit state and store changes in the background
+            (write-behind) instead of on the caller's thread. Defaults to False.
+        db_commit_threshold (int): The number of pending changes in the state or store that
+            triggers a background commit before db_commit_interval elapses. Defaults to 100.
+        record_batch_size (int): The number of trade results buffered by the ResultSink that
+            triggers a save. Defaults to 50.
+        record_flush_interval (float): The interval in seconds between saves of the trade
+            results buffered by the ResultSink. Defaults to 5.
         flush_state (bool): Whether to flush state data on initialization.
             Defaults to False.
         lock (Lock): A threading lock for thread-safe operations.
     """
     login: int
-    trade_record_mode: Literal["csv", "json", "sql"]
+    trade_record_mode: Literal["csv", "json", "jsonl", "sql"]
     password: str
     config_file: str | Path
     server: str
@@ -117,6 +124,9 @@ class Config:
     force_shutdown: bool
     db_commit_interval: float
     auto_commit: bool
+    db_commit_threshold: int
+    record_batch_size: int
+    record_flush_interval: float
     flush_state: bool
     stop_trading: bool
     lock: Lock
@@ -141,6 +151,9 @@ class Config:
         "plots_dir_name": "plots",
         "db_commit_interval": 30,
         "auto_commit": False,
+        "db_commit_threshold": 100,
+        "record_batch_size": 50,
+        "record_flush_interval": 5,
         "flush_state": False,
         "stop_trading": False,
         "auto_commit_state": True
@@ -354,13 +367,34 @@ class Config:
         """
         self._store = value
 
+    @property
+    def write_behind(self) -> WriteBehind:
+        """Returns the WriteBehind flusher used for the state and store when auto_commit is True.
+
+        Returns:
+            WriteBehind: The singleton WriteBehind instance.
+        """
+        return WriteBehind(interval=self.db_commit_interval, threshold=self.db_commit_threshold)
+
     def init_state(self):
-        """Initializes the State instance with the configured database."""
-        self.state = State(db_name=self.db_name, flush=self.flush_state, autocommit=self.auto_commit_state)
+        """Initializes the State instance with the configured database.
+
+        When auto_commit is True the state is committed in the background by the write_behind flusher.
+        """
+        autocommit = self.auto_commit_state and not self.auto_commit
+        self.state = State(db_name=self.db_name, flush=self.flush_state, autocommit=autocommit)
+        if self.auto_commit:
+            self.write_behind.register(self._state)
 
     def init_store(self):
-        """Initializes the Store instance with the configured database."""
-        self.store = Store(db_name=self.db_name, flush=self.flush_state, autocommit=self.auto_commit_state)
+        """Initializes the Store instance with the configured database.
+
+        When auto_commit is True the store is committed in the background by the write_behind flusher.
+        """
+        autocommit = self.auto_commit_state and not self.auto_commit
+        self.store = Store(db_name=self.db_name, flush=self.flush_state, autocommit=autocommit)
+        if self.auto_commit:
+            self.write_behind.register(self._store)
 
     @cached_property
     def records_dir(self):
@@ -25,20 +25,120 @@ Example:
 
         # Query records
         trades = TradeRecord.filter(symbol='EURUSD')
+
+    Every thread keeps one persistent connection per database, tuned with the
+    PRAGMAS of the class, instead of connecting for every operation. Many
+    records are saved in one transaction with save_many::
+
+        TradeRecord.save_many(records)
+
+    Indexes are declared with the INDEX field metadata and richer queries are
+    built with query()::
+
+        @dataclass
+        class TradeRecord(DB):
+            symbol: str = field(metadata={"INDEX": "symbol_time"})
+            time: float = field(metadata={"INDEX": "symbol_time"})
+
+        trades = TradeRecord.query(symbol="EURUSD", time__gte=start).order_by("-time").limit(10).all()
+
+    Dict columns are declared with JSONField. They are stored as JSON text,
+    decoded on first access, and can be filtered on inside SQLite::
+
+        @dataclass
+        class TradeRecord(DB):
+            parameters: dict = JSONField()
+
+        trades = TradeRecord.query(parameters__fast_ema__gte=10).all()
+
+    The async variants (asave, aget, afilter, ...) run on the DBWorker thread
+    of the database, so they don't block the event loop::
+
+        await record.asave()
+        trades = await TradeRecord.afilter(symbol='EURUSD')
 """
 
 import os
+import json
+import pickle
 import sqlite3
 import re
+from inspect import getattr_static
 from logging import getLogger
 from dataclasses import Field, fields, asdict, MISSING, is_dataclass
-from typing import ClassVar
+from threading import local
+from typing import ClassVar, Iterable, Self
 from functools import cached_property
 
 from .config import Config
+from .db_worker import DBWorker
 
 logger = getLogger(__name__)
 
+
+class JSONField:
+    """A dataclass field of a DB class stored as JSON text.
+
+    Assign an instance as the default of the field. Values read from the
+    database are kept as text and only decoded on first access, so loading
+    records whose JSON columns are not used costs no decoding. Values are
+    encoded with sorted keys, so equal dicts give equal text that SQLite can
+    group on. Bytes are read as pickle, the format used before JSONField.
+
+    Example:
+        >>> @dataclass
+        ... class Trade(DB):
+        ...     parameters: dict = JSONField()
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.attr = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            # the default of the dataclass field, decoded to an empty dict
+            return ""
+        value = obj.__dict__.get(self.attr, "")
+        if isinstance(value, (str, bytes)):
+            value = obj.__dict__[self.attr] = self.decode(value)
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
+
+    @staticmethod
+    def decode(value: str | bytes):
+        """Decodes a stored value. Empty values and pickled values that are not dicts give an empty dict, text
+        that is not JSON is kept as is."""
+        if isinstance(value, bytes):
+            value = pickle.loads(value)
+            return value if isinstance(value, dict) else {}
+        if not value:
+            return {}
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    @staticmethod
+    def encode(value) -> str:
+        """Encodes a value as JSON text with sorted keys. Values that are not JSON serializable are written as
+        their string representation."""
+        return json.dumps(value if value is not None else {}, sort_keys=True, default=str)
+
+    def dump(self, obj) -> str:
+        """Returns the JSON text of the field of an instance, without decoding text that is already JSON."""
+        value = obj.__dict__.get(self.attr, "")
+        if isinstance(value, str) and value:
+            try:
+                json.loads(value)
+                return value
+            except ValueError:
+                pass
+        return self.encode(self.__get__(obj))
+
+
 class DB:
     """A base class for ORM-style database operations with SQLite.
 
@@ -53,6 +153,22 @@ class DB:
         TYPES (ClassVar[dict]): Mapping of Python types to SQLite types.
         config (ClassVar[Config]): The global configuration instance.
         db_name (ClassVar[str]): The database file name.
+        PRAGMAS (ClassVar[dict]): Pragmas applied to every connection.
+        INDEXES (ClassVar[dict]): Composite indexes whose columns are not in
+            field order, by name.
+
+    Field metadata:
+        Truthy metadata keys are added to the column definition as SQL
+        constraints (e.g. {"PRIMARY KEY": True}), except INDEX which declares
+        indexes: True for a single column index, or the name, or a tuple of
+        names, of the composite indexes the column belongs to. The columns of
+        a composite index follow the order of the fields, use INDEXES for any
+        other order.
+
+    JSON columns:
+        Fields with a JSONField default are stored as JSON text. Query
+        conditions reach into them with the keys after the column name, e.g.
+        parameters__fast_ema__gte=10.
 
     Example:
         >>> @dataclass
@@ -68,6 +184,9 @@ class DB:
     TYPES: ClassVar[dict] = {str: "TEXT", float: "REAL", int: "INTEGER", bool: "BOOLEAN", None: "NULL", bytes: "BLOB"}
     config: ClassVar[Config]
     db_name: ClassVar[str]
+    PRAGMAS: ClassVar[dict] = {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000}
+    INDEXES: ClassVar[dict[str, tuple[str, ...]]] = {}
+    _local: ClassVar[local] = local()
 
     def __new__(cls, *args, **kwargs):
         """Creates a new instance and initializes the Config.
@@ -110,16 +229,32 @@ class DB:
         """
         cls.config = Config()
         cls.db_name = getattr(cls.config, "db_name", os.getenv("DB_NAME", "db.sqlite3"))
-        conn = sqlite3.connect(cls.db_name)
+        conn = cls.configure(sqlite3.connect(cls.db_name))
         cls.create_table(conn)
         conn.close()
-    
+
+    @classmethod
+    def configure(cls, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Applies the PRAGMAS of the class to a connection.
+
+        Args:
+            conn: The connection to configure.
+
+        Returns:
+            sqlite3.Connection: The configured connection.
+        """
+        for pragma, value in cls.PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+
     @classmethod
     def get_connection(cls):
         """Gets a new database connection.
 
         Initializes the database if not already done, then creates and
-        returns a new SQLite connection with the custom row factory.
+        returns a new SQLite connection with the custom row factory. The
+        caller owns the connection and should close it. Use connection() for
+        the persistent connection of the calling thread.
 
         Returns:
             sqlite3.Connection: A new database connection with the
@@ -128,10 +263,99 @@ class DB:
         if not cls._initialized:
             cls.init_db()
             cls._initialized = True
-        conn = sqlite3.connect(cls.db_name)
+        conn = cls.configure(sqlite3.connect(cls.db_name))
         conn.row_factory = cls.dict_factory()
         return conn
 
+    @classmethod
+    def connection(cls) -> sqlite3.Connection:
+        """Gets the persistent connection of the calling thread to the database.
+
+        The connection is opened on first use and kept open for the lifetime
+        of the thread. It is shared by all the classes using the same
+        database, so it has no row factory; use fetch to get class instances.
+        Don't close it, use close_connections instead.
+
+        Returns:
+            sqlite3.Connection: The connection of the calling thread.
+        """
+        if not cls._initialized:
+            cls.init_db()
+            cls._initialized = True
+        connections = cls._local.__dict__.setdefault("connections", {})
+        if (conn := connections.get(cls.db_name)) is None:
+            conn = connections[cls.db_name] = cls.configure(sqlite3.connect(cls.db_name))
+        return conn
+
+    @classmethod
+    def close_connections(cls):
+        """Closes the persistent connections of the calling thread."""
+        connections = cls._local.__dict__.pop("connections", {})
+        for conn in connections.values():
+            conn.close()
+
+    @classmethod
+    def get_worker(cls) -> DBWorker:
+        """Gets the worker thread of the database.
+
+        Initializes the database if not already done.
+
+        Returns:
+            DBWorker: The worker that runs the async operations of the class.
+        """
+        if not cls._initialized:
+            cls.init_db()
+            cls._initialized = True
+        return DBWorker(cls.db_name)
+
+    @classmethod
+    def fetch(cls, conn: sqlite3.Connection, query: str, params: tuple | dict = (), *, one: bool = False):
+        """Runs a query and converts the rows into class instances.
+
+        The row factory is set on the cursor, so the connection can be shared
+        by different classes.
+
+        Args:
+            conn: The database connection to use.
+            query: The SELECT query.
+            params: Query parameters. Defaults to no parameters.
+            one: If True, returns only the first row. Defaults to False.
+
+        Returns:
+            list | DB | None: The matching records, or the first one if one is True.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = cls.dict_factory()
+        cursor.execute(query, params)
+        return cursor.fetchone() if one else cursor.fetchall()
+
+    @staticmethod
+    def execute_many(conn: sqlite3.Connection, batches: Iterable[tuple[str, list]]) -> int:
+        """Runs write queries with executemany without committing them.
+
+        Args:
+            conn: The database connection to use.
+            batches: Pairs of a query and the parameters of every row.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        return sum(conn.executemany(query, rows).rowcount for query, rows in batches)
+
+    @staticmethod
+    def execute(conn: sqlite3.Connection, query: str, params: tuple | dict = ()) -> int:
+        """Runs a write query without committing it.
+
+        Args:
+            conn: The database connection to use.
+            query: The INSERT, UPDATE or DELETE query.
+            params: Query parameters. Defaults to no parameters.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        return conn.execute(query, params).rowcount
+
     @classmethod
     def create_table(cls, conn: sqlite3.Connection):
         """Creates the database table if it doesn't exist.
@@ -147,11 +371,41 @@ class DB:
             cls._table = cls._table or cls.__name__.lower()
             columns = cls.get_columns()
             conn.execute(f"""CREATE TABLE IF NOT EXISTS'{cls._table}' ({columns})""")
+            for name, index_columns in cls.get_indexes().items():
+                index_columns = ", ".join(cls.sanitize(column) for column in index_columns)
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {cls.sanitize(name)} "
+                             f"ON {cls.sanitize(cls._table)} ({index_columns})")
+            cls.migrate_json(conn)
             conn.commit()
             cls._initialized = True
         except Exception as e:
             logger.error("%s: Failed to create table", e)
 
+    @classmethod
+    def json_fields(cls) -> dict[str, JSONField]:
+        """Returns the JSONField descriptors of the class by field name."""
+        return {name: column for name in cls.fields()
+                if isinstance(column := getattr_static(cls, name, None), JSONField)}
+
+    @classmethod
+    def migrate_json(cls, conn: sqlite3.Connection) -> int:
+        """Rewrites the pickled values of the JSON columns as JSON text, without committing.
+
+        Args:
+            conn: The database connection to use.
+
+        Returns:
+            int: The number of values rewritten.
+        """
+        count, table = 0, cls.sanitize(cls._table)
+        for name, column in cls.json_fields().items():
+            name = cls.sanitize(name)
+            rows = conn.execute(f"SELECT rowid, {name} FROM {table} WHERE typeof({name}) = 'blob'").fetchall()
+            conn.executemany(f"UPDATE {table} SET {name} = ? WHERE rowid = ?",
+                             [(column.encode(column.decode(value)), rowid) for rowid, value in rows])
+            count += len(rows)
+        return count
+
     @classmethod
     def dict_factory(cls):
         """Creates a row factory that returns class instances.
@@ -225,7 +479,26 @@ class DB:
         Returns:
             str: SQL constraints from field metadata (e.g., PRIMARY KEY).
         """
-        return f"{' '.join(meta for meta, value in col.metadata.items() if value)}"
+        return f"{' '.join(meta for meta, value in col.metadata.items() if value and meta != 'INDEX')}"
+
+    @classmethod
+    def get_indexes(cls) -> dict[str, list[str]]:
+        """Collects the indexes declared with the INDEX field metadata and INDEXES.
+
+        Returns:
+            dict[str, list[str]]: The index names and their columns.
+        """
+        table = cls._table or cls.__name__.lower()
+        indexes = {}
+        for col in fields(cls):
+            if not (index := col.metadata.get("INDEX")):
+                continue
+            names = (f"{col.name}",) if index is True else (index,) if isinstance(index, str) else index
+            for name in names:
+                indexes.setdefault(f"{table}_{name}_idx", []).append(col.name)
+        for name, columns in cls.INDEXES.items():
+            indexes[f"{table}_{name}_idx"] = list(columns)
+        return indexes
 
     @classmethod
     def get_columns(cls):
@@ -250,10 +523,16 @@ class DB:
     def get_data(self):
         """Returns the instance data for saving.
 
+        JSON columns are returned as JSON text, without decoding values that
+        were loaded from the database and not changed.
+
         Returns:
             dict: The instance data as a dictionary.
         """
-        return self.asdict()
+        if not (json_fields := self.json_fields()):
+            return self.asdict()
+        return {name: json_fields[name].dump(self) if name in json_fields else getattr(self, name)
+                for name in self.fields()}
 
     @classmethod
     def clear(cls):
@@ -265,10 +544,43 @@ class DB:
         Note:
             This operation is irreversible. Use with caution.
         """
-        conn = cls.get_connection()
+        conn = cls.connection()
         conn.execute(f"DELETE FROM {cls._table}")
         conn.commit()
-        conn.close()
+
+    @classmethod
+    async def aclear(cls):
+        """Deletes all records from the table on the worker thread."""
+        worker = cls.get_worker()
+        await worker.run(cls.execute, f"DELETE FROM {cls._table}", write=True)
+
+    def save_query(self, update: bool = False, data: dict = None, replace: bool = False) -> tuple[str, tuple]:
+        """Builds the INSERT or UPDATE query used to save the instance.
+
+        Args:
+            update: If True, builds an UPDATE using the primary key. Defaults to False.
+            data: Dictionary of field-value pairs to save. If None, uses get_data().
+            replace: If True, builds an INSERT OR REPLACE that overwrites the row with the same primary or unique
+                key. Defaults to False.
+
+        Returns:
+            tuple[str, tuple]: The query and its parameters.
+        """
+        data = data or self.get_data()
+        for name, column in self.json_fields().items():
+            if name in data and not isinstance(data[name], (str, bytes)):
+                data = data | {name: column.encode(data[name])}
+        columns = ", ".join(self.sanitize(key) for key in data.keys())
+        placeholders = ", ".join(["?"] * len(data))
+        values = tuple(data.values())
+        table = self.sanitize(self._table)
+        if update:
+            pk, pk_value = self.pk
+            update_columns = ", ".join(f"{self.sanitize(key)} = ?" for key in data.keys())
+            query = f"UPDATE {table} SET {update_columns} WHERE {self.sanitize(pk)} = {pk_value}"
+        else:
+            query = f"INSERT {'OR REPLACE ' if replace else ''}INTO {table} ({columns}) VALUES ({placeholders})"
+        return query, values
 
     def save(self, commit: bool = True, update: bool = False, data: dict = None, conn: sqlite3.Connection = None):
         """Saves the current instance to the database.
@@ -283,8 +595,9 @@ class DB:
                 If False, performs an INSERT. Defaults to False.
             data: Dictionary of field-value pairs to save. If None,
                 uses get_data() to retrieve instance data.
-            conn: An existing database connection to use. If None,
-                creates a new connection.
+            conn: An existing database connection to use, which is closed
+                after committing. If None, uses the persistent connection of
+                the calling thread.
 
         Example:
             >>> record = TradeRecord(symbol='EURUSD', volume=0.1)
@@ -292,22 +605,183 @@ class DB:
             >>> record.volume = 0.2
             >>> record.save(update=True)  # Update existing record
         """
-        conn = conn or self.get_connection()
-        data = data or self.get_data()
-        columns = ", ".join(self.sanitize(key) for key in data.keys())
-        placeholders = ", ".join(["?"] * len(data))
-        values = tuple(data.values())
-        table = self.sanitize(self._table)
-        if update:
-            pk, pk_value = self.pk
-            update_columns = ", ".join(f"{self.sanitize(key)} = ?" for key in data.keys())
-            query = f"UPDATE {table} SET {update_columns} WHERE {self.sanitize(pk)} = {pk_value}"
-        else:
-            query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        close = conn is not None
+        conn = conn or self.connection()
+        query, values = self.save_query(update=update, data=data)
         conn.execute(query, values)
         if commit:
             conn.commit()
-            conn.close()
+            if close:
+                conn.close()
+
+    @classmethod
+    def insert_batches(cls, records: Iterable[Self], *, replace: bool = False) -> list[tuple[str, list]]:
+        """Groups records by the columns they save into INSERT queries and their rows.
+
+        Args:
+            records: The records to insert.
+            replace: If True, the queries replace existing rows with the same key. Defaults to False.
+
+        Returns:
+            list[tuple[str, list]]: Pairs of an INSERT query and the parameters of its rows.
+        """
+        batches = {}
+        for record in records:
+            data = record.get_data()
+            if (batch := batches.get(columns := tuple(data))) is None:
+                batch = batches[columns] = (record.save_query(data=data, replace=replace)[0], [])
+            batch[1].append(tuple(data.values()))
+        return list(batches.values())
+
+    @classmethod
+    def save_many(cls, records: Iterable[Self], *, commit: bool = True, conn: sqlite3.Connection = None,
+                  replace: bool = False) -> int:
+        """Inserts many records with executemany in a single transaction.
+
+        Args:
+            records: The records to insert.
+            commit: If True, commits the transaction, or rolls it back if an
+                insert fails. Defaults to True.
+            conn: An existing database connection to use. If None, uses the
+                persistent connection of the calling thread.
+            replace: If True, records replace the rows with the same primary
+                or unique key instead of failing. Defaults to False.
+
+        Returns:
+            int: The number of inserted rows.
+
+        Example:
+            >>> TradeRecord.save_many([TradeRecord(symbol='EURUSD', volume=0.1), TradeRecord(symbol='GBPUSD')])
+            2
+        """
+        conn = conn or cls.connection()
+        try:
+            count = cls.execute_many(conn, cls.insert_batches(records, replace=replace))
+        except Exception:
+            if commit:
+                conn.rollback()
+            raise
+        if commit:
+            conn.commit()
+        return count
+
+    @classmethod
+    async def asave_many(cls, records: Iterable[Self], *, replace: bool = False) -> int:
+        """Inserts many records on the worker thread in a single transaction.
+
+        Args:
+            records: The records to insert.
+            replace: If True, records replace the rows with the same primary or unique key. Defaults to False.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        worker = cls.get_worker()
+        return await worker.run(cls.execute_many, cls.insert_batches(records, replace=replace), write=True)
+
+    async def asave(self, update: bool = False, data: dict = None):
+        """Saves the current instance to the database on the worker thread.
+
+        The write is committed together with the other writes queued on the
+        worker at the same time.
+
+        Args:
+            update: If True, performs an UPDATE using the primary key.
+                If False, performs an INSERT. Defaults to False.
+            data: Dictionary of field-value pairs to save. If None,
+                uses get_data() to retrieve instance data.
+        """
+        worker = self.get_worker()
+        query, values = self.save_query(update=update, data=data)
+        await worker.run(self.execute, query, values, write=True)
+
+    @classmethod
+    def select_query(cls, limit: int | None = None, **kwargs) -> str:
+        """Builds the SELECT query used by get, filter and all.
+
+        Args:
+            limit: Maximum number of records. Defaults to None, no limit.
+            **kwargs: Field-value pairs to filter by.
+
+        Returns:
+            str: The query.
+        """
+        _query = " AND ".join([f'"{key}" = "{value}"' for key, value in kwargs.items()])
+        _query = f"WHERE {_query}" if _query else ""
+        _limit = f"LIMIT {limit}" if limit is not None else ""
+        return f"SELECT * FROM {cls.sanitize(cls._table)} {_query} {_limit}"
+
+    @classmethod
+    def update_query(cls, data: dict = None, /, **kwargs) -> str:
+        """Builds the UPDATE query used by update.
+
+        Args:
+            data: Dictionary of field-value pairs to update.
+            **kwargs: Field-value pairs to filter which records to update.
+
+        Returns:
+            str: The query.
+        """
+        update = data or {}
+        _query = " AND ".join([f'"{key}" = "{value}"' for key, value in kwargs.items()])
+        update = ", ".join([f'"{key}" = "{value}"' for key, value in update.items()])
+        table = cls.sanitize(cls._table)
+        _query = f"WHERE {_query}" if _query else ""
+        return f"""UPDATE {table} SET {update} {_query}"""
+
+    @classmethod
+    async def aget(cls, **kwargs):
+        """Retrieves a single record matching the criteria on the worker thread.
+
+        Args:
+            **kwargs: Field-value pairs to filter by.
+
+        Returns:
+            The first matching record as a class instance, or None.
+        """
+        worker = cls.get_worker()
+        return await worker.run(cls.fetch, cls.select_query(**kwargs), one=True, conn=True)
+
+    @classmethod
+    async def afilter(cls, **kwargs):
+        """Retrieves all records matching the criteria on the worker thread.
+
+        Args:
+            **kwargs: Field-value pairs to filter by. If empty, returns all.
+
+        Returns:
+            list: Matching records as class instances.
+        """
+        worker = cls.get_worker()
+        return await worker.run(cls.fetch, cls.select_query(**kwargs), conn=True)
+
+    @classmethod
+    async def aall(cls, limit: int | None = None):
+        """Returns all records from the table on the worker thread.
+
+        Args:
+            limit: Maximum number of records to return. Defaults to None, all records.
+
+        Returns:
+            list: All records as class instances.
+        """
+        worker = cls.get_worker()
+        return await worker.run(cls.fetch, cls.select_query(limit=limit), conn=True)
+
+    @classmethod
+    async def aupdate(cls, data=None, /, **kwargs):
+        """Updates records matching the criteria on the worker thread.
+
+        Args:
+            data: Dictionary of field-value pairs to update.
+            **kwargs: Field-value pairs to filter which records to update.
+
+        Returns:
+            bool: True if the update was successful.
+        """
+        worker = cls.get_worker()
+        await worker.run(cls.execute, cls.update_query(data, **kwargs), write=True)
+        return True
 
     @classmethod
     def get(cls, **kwargs):
@@ -319,12 +793,7 @@ class DB:
         Returns:
             The first matching record as a class instance, or None.
         """
-        conn = cls.get_connection()
-        _query = " AND ".join([f'"{key}" = "{value}"' for key, value in kwargs.items()])
-        query = f"""SELECT * FROM {cls.sanitize(cls._table)} WHERE {_query}"""
-        res = conn.execute(query).fetchone()
-        conn.close()
-        return res
+        return cls.fetch(cls.connection(), cls.select_query(**kwargs), one=True)
 
     @classmethod
     def filter(cls, **kwargs):
@@ -336,13 +805,7 @@ class DB:
         Returns:
             list: Matching records as class instances.
         """
-        conn = cls.get_connection()
-        _query = " AND ".join([f'"{key}" = "{value}"' for key, value in kwargs.items()])
-        _query = f"WHERE {_query}" if _query else ""
-        query = f"SELECT * FROM {cls.sanitize(cls._table)} {_query}"
-        res = conn.execute(query).fetchall()
-        conn.close()
-        return res
+        return cls.fetch(cls.connection(), cls.select_query(**kwargs))
 
     @classmethod
     def update(cls, data=None, /, **kwargs):
@@ -355,16 +818,9 @@ class DB:
         Returns:
             bool: True if the update was successful.
         """
-        conn = cls.get_connection()
-        update = data or {}
-        _query = " AND ".join([f'"{key}" = "{value}"' for key, value in kwargs.items()])
-        update = ", ".join([f'"{key}" = "{value}"' for key, value in update.items()])
-        table = cls.sanitize(cls._table)
-        _query = f"WHERE {_query}" if _query else ""
-        query = f"""UPDATE {table} SET {update} {_query}"""
-        conn.execute(query)
+        conn = cls.connection()
+        conn.execute(cls.update_query(data, **kwargs))
         conn.commit()
-        conn.close()
         return True
 
     @classmethod
@@ -388,10 +844,9 @@ class DB:
             This operation is irreversible. All data in the table
             will be permanently deleted.
         """
-        conn = cls.get_connection()
+        conn = cls.connection()
         conn.execute(f"DROP TABLE IF EXISTS {cls._table}")
         conn.commit()
-        conn.close()
 
 
     @classmethod
@@ -415,14 +870,7 @@ class DB:
             >>> # Get first 10 records
             >>> recent_trades = TradeRecord.all(limit=10)
         """
-        conn = cls.get_connection()
-        if limit is None:
-            query = f"SELECT * FROM {cls._table}"
-        else:
-            query = f"SELECT * FROM {cls._table} LIMIT {limit}"
-        res = conn.execute(query).fetchall()
-        conn.close()
-        return res
+        return cls.fetch(cls.connection(), cls.select_query(limit=limit))
 
     @classmethod
     def execute_raw(cls, sql: str, params: tuple | list | dict = None, *, allow_write: bool = False):
@@ -528,31 +976,322 @@ class DB:
             raise ValueError("params must be tuple, list, or dict")
 
         # Execute the query with parameterized values
-        conn = cls.get_connection()
+        conn = cls.connection()
         try:
-            if params:
-                cursor = conn.execute(sql, params)
-            else:
-                cursor = conn.execute(sql)
-
             if sql_type == "SELECT":
-                results = cursor.fetchall()
-                conn.close()
-                return results
-            else:
-                # For write operations, commit and return affected row count
-                affected_rows = cursor.rowcount
-                conn.commit()
-                conn.close()
-                return affected_rows
+                return cls.fetch(conn, sql, params or ())
+
+            # For write operations, commit and return affected row count
+            affected_rows = cls.execute(conn, sql, params or ())
+            conn.commit()
+            return affected_rows
 
         except sqlite3.Error as e:
-            conn.close()
+            conn.rollback()
             logger.error("SQL execution error: %s", e)
             raise ValueError(f"SQL execution failed: {e}") from e
 
+    @classmethod
+    def query(cls, **conditions) -> "Query":
+        """Starts a query on the table.
+
+        Args:
+            **conditions: Conditions as accepted by Query.where.
+
+        Returns:
+            Query: A query builder for the class.
+
+        Example:
+            >>> ResultDB.query(name="scalper", closed=True, time__gte=start).order_by("time").all()
+        """
+        return Query(cls).where(**conditions)
+
     @classmethod
     def filter_dict(cls, data: dict, exclude: set[str] = None, include: set[str] = None) -> dict:
         exclude, include = exclude or set(), include or set(cls.fields())
         filter_ = include.difference(exclude)
-        return {key: value for key, value in data.items() if key in filter_ and value is not None}
\ No newline at end of file
+        return {key: value for key, value in data.items() if key in filter_ and value is not None}
+
+
+class Query:
+    """A chainable query builder for DB classes.
+
+    Conditions are given as keyword arguments, the column name optionally
+    followed by a double underscore and an operator: eq (the default), ne, lt,
+    lte, gt, gte, in, not_in, between, like and is_null. The keys of a JSON
+    column go between the column name and the operator, e.g.
+    parameters__fast_ema__gte. Every value is passed as a query parameter. Results are class instances, returned as a list by
+    all or yielded lazily from a cursor when iterating the query.
+
+    Keyset pagination continues after a given row in the query order, which
+    stays fast on large tables when the order columns are indexed, unlike
+    offset which scans the skipped rows.
+
+    Example:
+        >>> query = ResultDB.query(symbol__in=["EURUSD", "GBPUSD"], time__between=(start, end))
+        >>> for record in query.order_by("time", "order"):
+        ...     print(record.profit)
+        >>> for page in query.order_by("time", "order").pages(500):
+        ...     process(page)
+    """
+    OPERATORS: ClassVar[dict] = {"eq": "=", "ne": "!=", "lt": "<", "lte": "<=", "gt": ">", "gte": ">=",
+                                 "like": "LIKE"}
+    RANGES: ClassVar[tuple[str, ...]] = ("in", "not_in", "between", "is_null")
+
+    def __init__(self, model: type[DB]):
+        """Create a query on the table of a DB class.
+
+        Args:
+            model: The DB class to query.
+        """
+        if not model._initialized:
+            model.init_db()
+            model._initialized = True
+        self.model = model
+        self._where: list[str] = []
+        self._params: list = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset: int | None = None
+        self._after: tuple[str, list] | None = None
+
+    def copy(self) -> "Query":
+        """Returns a copy of the query that can be changed independently."""
+        query = Query(self.model)
+        query._where, query._params, query._order = list(self._where), list(self._params), list(self._order)
+        query._limit, query._offset, query._after = self._limit, self._offset, self._after
+        return query
+
+    def column(self, name: str) -> str:
+        """Returns the sanitized name of a column of the model.
+
+        Raises:
+            ValueError: If the model has no such column.
+        """
+        if name not in self.model.fields():
+            raise ValueError(f"{self.model.__name__} has no column {name!r}")
+        return self.model.sanitize(name)
+
+    def expression(self, key: str) -> str:
+        """Returns the SQL expression of a column, or of a value inside a JSON column.
+
+        Args:
+            key: The column name, followed for JSON columns by keys separated with double underscores,
+                e.g. parameters__fast_ema.
+
+        Raises:
+            ValueError: For unknown columns, keys into columns that are not JSON columns, or keys with quotes.
+        """
+        name, *keys = key.split("__")
+        column = self.column(name)
+        if not keys:
+            return column
+        if name not in self.model.json_fields():
+            raise ValueError(f"{self.model.__name__}.{name} is not a JSON column")
+        if any('"' in key or "'" in key for key in keys):
+            raise ValueError(f"Invalid JSON key in {key!r}")
+        path = "$" + "".join(f'."{key}"' for key in keys)
+        return f"json_extract({column}, '{path}')"
+
+    def where(self, **conditions) -> Self:
+        """Adds conditions, combined with AND.
+
+        Args:
+            **conditions: Column conditions such as symbol="EURUSD", time__gte=start, order__in=[1, 2],
+                time_close__between=(start, end) or parameters__fast_ema=8.
+
+        Returns:
+            Query: The query.
+
+        Raises:
+            ValueError: For unknown columns, or keys into columns that are not JSON columns.
+        """
+        for key, value in conditions.items():
+            name, _, operator = key.rpartition("__")
+            if not name or (operator not in self.OPERATORS and operator not in self.RANGES):
+                name, operator = key, "eq"
+            column = self.expression(name)
+            if operator in self.OPERATORS:
+                self._where.append(f"{column} {self.OPERATORS[operator]} ?")
+                self._params.append(value)
+            elif operator in ("in", "not_in"):
+                values = list(value)
+                negate = "NOT " if operator == "not_in" else ""
+                self._where.append(f"{column} {negate}IN ({', '.join('?' * len(values))})" if values else
+                                   ("1" if negate else "0"))
+                self._params.extend(values)
+            elif operator == "between":
+                low, high = value
+                self._where.append(f"{column} BETWEEN ? AND ?")
+                self._params.extend((low, high))
+            elif operator == "is_null":
+                self._where.append(f"{column} IS {'' if value else 'NOT '}NULL")
+        return self
+
+    def order_by(self, *columns: str) -> Self:
+        """Sets the order of the results.
+
+        Args:
+            *columns: Column names, or keys into JSON columns such as parameters__fast_ema, prefixed with '-' for
+                descending order.
+
+        Returns:
+            Query: The query.
+
+        Raises:
+            ValueError: For unknown columns or invalid JSON keys.
+        """
+        self._order = [(name.lstrip("-"), name.startswith("-")) for name in columns]
+        [self.expression(name) for name, _ in self._order]
+        return self
+
+    def limit(self, limit: int | None) -> Self:
+        """Sets the maximum number of results.
+
+        Returns:
+            Query: The query.
+        """
+        self._limit = limit
+        return self
+
+    def offset(self, offset: int | None) -> Self:
+        """Skips the given number of results.
+
+        Returns:
+            Query: The query.
+        """
+        self._offset = offset
+        return self
+
+    def after(self, row: DB | dict) -> Self:
+        """Continues after a row in the query order (keyset pagination).
+
+        Args:
+            row: A record, or a mapping of the order_by columns to their values, of the last row seen.
+
+        Returns:
+            Query: The query.
+
+        Raises:
+            ValueError: If the query has no order.
+        """
+        if not self._order:
+            raise ValueError("Keyset pagination requires order_by")
+        values = [row[name] if isinstance(row, dict) else getattr(row, name) for name, _ in self._order]
+        clauses, params = [], []
+        for index, (name, descending) in enumerate(self._order):
+            equal = [f"{self.expression(column)} = ?" for column, _ in self._order[:index]]
+            clauses.append(" AND ".join(equal + [f"{self.expression(name)} {'<' if descending else '>'} ?"]))
+            params.extend(values[:index + 1])
+        self._after = (f"({' OR '.join(clauses)})", params)
+        return self
+
+    def sql(self, select: str = "*") -> tuple[str, list]:
+        """Builds the SELECT statement.
+
+        Args:
+            select: The selected columns or expression. Defaults to '*'.
+
+        Returns:
+            tuple[str, list]: The statement and its parameters.
+        """
+        where, params = list(self._where), list(self._params)
+        if self._after is not None:
+            where.append(self._after[0])
+            params.extend(self._after[1])
+        query = f"SELECT {select} FROM {self.model.sanitize(self.model._table)}"
+        if where:
+            query += f" WHERE {' AND '.join(where)}"
+        if self._order:
+            query += " ORDER BY " + ", ".join(f"{self.expression(name)}{' DESC' if desc else ''}"
+                                              for name, desc in self._order)
+        if self._limit is not None or self._offset is not None:
+            query += " LIMIT ?"
+            params.append(-1 if self._limit is None else self._limit)
+        if self._offset is not None:
+            query += " OFFSET ?"
+            params.append(self._offset)
+        return query, params
+
+    def all(self) -> list[DB]:
+        """Returns all the results.
+
+        Returns:
+            list[DB]: The matching records.
+        """
+        return self.model.fetch(self.model.connection(), *self.sql())
+
+    def first(self) -> DB | None:
+        """Returns the first result.
+
+        Returns:
+            DB | None: The first matching record, or None.
+        """
+        return self.model.fetch(self.model.connection(), *self.copy().limit(1).sql(), one=True)
+
+    def count(self) -> int:
+        """Returns the number of results, ignoring limit and offset.
+
+        Returns:
+            int: The number of matching records.
+        """
+        query = self.copy()
+        query._order, query._limit, query._offset = [], None, None
+        return self.model.connection().execute(*query.sql("COUNT(*)")).fetchone()[0]
+
+    def iter(self, batch_size: int = 500):
+        """Yields the results lazily, fetching batch_size rows at a time from a cursor.
+
+        Args:
+            batch_size: Number of rows fetched at a time. Defaults to 500.
+
+        Yields:
+            DB: The matching records.
+        """
+        cursor = self.model.connection().cursor()
+        cursor.row_factory = self.model.dict_factory()
+        try:
+            cursor.execute(*self.sql())
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cursor.close()
+
+    def __iter__(self):
+        return self.iter()
+
+    def pages(self, size: int):
+        """Yields the results in pages using keyset pagination.
+
+        The order_by columns must identify a row uniquely, e.g. by ending with the primary key.
+
+        Args:
+            size: Number of records per page.
+
+        Yields:
+            list[DB]: The pages of records.
+        """
+        query = self.copy().limit(size).offset(None)
+        while page := query.all():
+            yield page
+            if len(page) < size:
+                break
+            query = query.after(page[-1])
+
+    async def aall(self) -> list[DB]:
+        """Returns all the results, running the query on the worker thread.
+
+        Returns:
+            list[DB]: The matching records.
+        """
+        return await self.model.get_worker().run(self.model.fetch, *self.sql(), conn=True)
+
+    async def afirst(self) -> DB | None:
+        """Returns the first result, running the query on the worker thread.
+
+        Returns:
+            DB | None: The first matching record, or None.
+        """
+        return await self.model.get_worker().run(self.model.fetch, *self.copy().limit(1).sql(), one=True,
+                                                 conn=True)
+
@@ -0,0 +1,294 @@
+"""A dedicated database thread for non-blocking persistence.
+
+This module provides the DBWorker class. Each database file gets one worker
+thread that owns a connection and executes requests taken from a queue, so
+coroutines await database work instead of blocking their event loop on
+sqlite3 I/O. Requests are executed one at a time, which serializes every write
+to the database, and the writes that are queued together are committed in a
+single transaction.
+
+Example:
+    Running a query on the worker thread::
+
+        worker = DBWorker("db.sqlite3")
+        rows = await worker.run(lambda conn: conn.execute("SELECT * FROM store").fetchall(), conn=True)
+"""
+
+import asyncio
+import queue
+import sqlite3
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Callable, ClassVar, Self
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class DBRequest:
+    """A unit of work for a DBWorker.
+
+    Attributes:
+        func (Callable): The function to call on the worker thread.
+        args (tuple): Positional arguments for the function.
+        kwargs (dict): Keyword arguments for the function.
+        conn (bool): If True, the worker connection is passed as the first argument.
+        write (bool): If True, the function writes through the worker connection and is run inside the
+            batch transaction.
+        future (Future): Resolves to the return value of the function.
+    """
+    func: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    conn: bool = False
+    write: bool = False
+    future: Future = field(default_factory=Future)
+
+
+class DBWorker:
+    """A worker thread per database file that executes database requests from a queue.
+
+    Requests are handled in batches of the requests already waiting in the queue. The write requests of a
+    batch run inside one transaction, each one in its own savepoint so that a failing request is rolled back
+    without affecting the others, and their futures resolve once the transaction is committed. Requests that
+    don't use the worker connection, such as the commits of State and Store which have their own
+    connections, are serialized with the rest. The open transaction is committed before such a request
+    runs, so that its writes don't wait for the write lock held by the worker connection.
+
+    A worker whose connection can't be opened stops, fails the queued requests and is replaced by the next
+    instantiation for its database.
+
+    Attributes:
+        db_name (str): Path to the SQLite database file.
+        max_batch (int): Maximum number of requests handled in one batch.
+        conn (sqlite3.Connection): The worker connection. Only used on the worker thread.
+    """
+    _instances: ClassVar[dict[str, Self]] = {}
+    _lock: ClassVar[Lock] = Lock()
+    db_name: str
+    max_batch: int
+    conn: sqlite3.Connection | None
+
+    def __new__(cls, db_name: str | Path, **kwargs):
+        db_name = str(db_name)
+        with cls._lock:
+            if (worker := cls._instances.get(db_name)) is None or worker._stopped:
+                worker = super().__new__(cls)
+                worker._initialized = False
+                cls._instances[db_name] = worker
+        return worker
+
+    def __init__(self, db_name: str | Path, *, max_batch: int = 256):
+        """Start the worker of a database. Only the first instantiation per database sets the options.
+
+        Args:
+            db_name: Path to the SQLite database file.
+            max_batch: Maximum number of requests handled in one batch. Defaults to 256.
+        """
+        if self._initialized:
+            return
+        self.db_name = str(db_name)
+        self.max_batch = max_batch
+        self.conn = None
+        self._requests: queue.Queue[DBRequest | None] = queue.Queue()
+        self._stopped = False
+        self._thread = Thread(target=self._run, daemon=True, name=f"DBWorker({self.db_name})")
+        self._initialized = True
+        self._thread.start()
+
+    def submit(self, func: Callable, *args, conn: bool = False, write: bool = False, **kwargs) -> Future:
+        """Queue a function to run on the worker thread.
+
+        Args:
+            func: The function to run.
+            *args: Positional arguments for the function.
+            conn: If True, the worker connection is passed as the first argument. Defaults to False.
+            write: If True, the function writes through the worker connection and is run inside the batch
+                transaction. Implies conn. Defaults to False.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Future: A concurrent Future that resolves to the return value of the function.
+        """
+        request = DBRequest(func=func, args=args, kwargs=kwargs, conn=conn or write, write=write)
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError(f"DBWorker for {self.db_name} is stopped")
+            self._requests.put(request)
+        return request.future
+
+    async def run(self, func: Callable, *args, conn: bool = False, write: bool = False, **kwargs) -> Any:
+        """Run a function on the worker thread and wait for its result without blocking the event loop.
+
+        Args:
+            func: The function to run.
+            *args: Positional arguments for the function.
+            conn: If True, the worker connection is passed as the first argument. Defaults to False.
+            write: If True, the function writes through the worker connection and is run inside the batch
+                transaction. Implies conn. Defaults to False.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await asyncio.wrap_future(self.submit(func, *args, conn=conn, write=write, **kwargs))
+
+    def _next_batch(self) -> tuple[list[DBRequest], bool]:
+        """Wait for a request and collect the requests already queued behind it.
+
+        Returns:
+            tuple[list[DBRequest], bool]: The batch and whether the worker was asked to stop.
+        """
+        batch, stop = [], False
+        item = self._requests.get()
+        while True:
+            if item is None:
+                stop = True
+            else:
+                batch.append(item)
+            if len(batch) >= self.max_batch:
+                break
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+        return batch, stop
+
+    def _call(self, request: DBRequest):
+        """Call the function of a request and return its result or the exception it raised."""
+        try:
+            args = (self.conn, *request.args) if request.conn else request.args
+            return request.func(*args, **request.kwargs)
+        except Exception as err:
+            return err
+
+    def _write(self, request: DBRequest):
+        """Run a write request inside its own savepoint."""
+        self.conn.execute("SAVEPOINT request")
+        outcome = self._call(request)
+        if isinstance(outcome, Exception):
+            self.conn.execute("ROLLBACK TO request")
+        self.conn.execute("RELEASE request")
+        return outcome
+
+    def _commit(self, outcomes: list, writes: list[int]):
+        """Commit the open transaction, or roll it back and fail its writes if the commit fails.
+
+        Args:
+            outcomes: The outcomes of the requests of the batch.
+            writes: The indexes of the write requests of the transaction in outcomes.
+        """
+        try:
+            self.conn.execute("COMMIT")
+        except Exception as err:
+            logger.error("%s: Unable to commit %d writes to %s", err, len(writes), self.db_name)
+            self.conn.rollback()
+            for index in writes:
+                outcomes[index] = err
+
+    def _handle(self, batch: list[DBRequest]):
+        """Run a batch of requests, committing its consecutive writes in one transaction."""
+        outcomes, writes = [], []
+        for request in batch:
+            if request.write:
+                if not writes:
+                    self.conn.execute("BEGIN")
+                writes.append(len(outcomes))
+                outcomes.append(self._write(request))
+                continue
+            if writes and not request.conn:
+                # the request writes through its own connection, which would wait for the open transaction
+                self._commit(outcomes, writes)
+                writes = []
+            outcomes.append(self._call(request))
+        if writes:
+            self._commit(outcomes, writes)
+        for request, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                request.future.set_exception(outcome)
+            else:
+                request.future.set_result(outcome)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the worker connection, switching the database to write-ahead logging if it is free."""
+        # transactions are managed explicitly, see _handle
+        conn = sqlite3.connect(self.db_name, isolation_level=None)
+        try:
+            # the switch needs the database to itself, a locked one keeps its journal mode
+            conn.execute("PRAGMA busy_timeout=0")
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError as err:
+            logger.warning("%s: Unable to switch %s to WAL", err, self.db_name)
+        finally:
+            conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _abort(self, err: Exception):
+        """Stop a worker that can't run, failing the queued requests."""
+        with self._lock:
+            self._stopped = True
+            if self._instances.get(self.db_name) is self:
+                del self._instances[self.db_name]
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.set_exception(err)
+
+    def _run(self):
+        """Open the worker connection and handle batches until stopped."""
+        try:
+            self.conn = self._connect()
+        except Exception as err:
+            logger.error("%s: Unable to open the DBWorker connection to %s", err, self.db_name)
+            self._abort(err)
+            return
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    try:
+                        self._handle(batch)
+                    except Exception as err:
+                        logger.error("%s: Unable to handle %d requests on %s", err, len(batch), self.db_name)
+                        if self.conn.in_transaction:
+                            self.conn.rollback()
+                        for request in batch:
+                            if not request.future.done():
+                                request.future.set_exception(err)
+                if stop:
+                    break
+        finally:
+            self.conn.close()
+
+    def stop(self, wait: bool = True):
+        """Handle the queued requests and stop the worker thread.
+
+        Args:
+            wait: If True, block until the queued requests are handled. Defaults to True.
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            if self._instances.get(self.db_name) is self:
+                del self._instances[self.db_name]
+        self._requests.put(None)
+        if wait:
+            self._thread.join()
+
+    @classmethod
+    def stop_all(cls, wait: bool = True):
+        """Stop the workers of every database.
+
+        Args:
+            wait: If True, block until the queued requests are handled. Defaults to True.
+        """
+        for worker in list(cls._instances.values()):
+            worker.stop(wait=wait)
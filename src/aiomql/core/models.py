@@ -497,7 +497,11 @@ class TradeRequest(Base):
         magic: int
         deviation: int
         comment: str
+
+    Notes:
+        MT5_FIELDS holds the fields of the request dictionary accepted by order_send and order_check.
     """
+    MT5_FIELDS = mt5.TradeRequest.__match_args__
 
     action: TradeAction
     type: OrderType
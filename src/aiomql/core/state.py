@@ -5,9 +5,9 @@ persistent dictionary-like storage backed by SQLite. The State class
 implements the MutableMapping interface, providing dict-like access to
 data that is automatically persisted to a database.
 
-The entire state is stored as a single pickled dictionary in the database,
-making it suitable for storing application-wide configuration and state
-that needs to persist across sessions.
+Every key is stored as its own pickled row in the database. Changed and
+deleted keys are tracked in memory, so a commit only writes the rows of the
+keys that changed since the last commit, in a single transaction.
 
 Example:
     Basic usage::
@@ -29,11 +29,15 @@ import os
 import pickle
 import sqlite3
 from pathlib import Path
-from threading import Lock
+from functools import partial
+from threading import RLock
 from typing import Self
 from typing import MutableMapping, Iterable, Any, ClassVar
 from logging import getLogger
 
+from .db_worker import DBWorker
+from .write_behind import WriteBehind
+
 SENTINEL = object()
 logger = getLogger(__name__)
 sqlite3.register_converter("pickle", pickle.loads)
@@ -43,9 +47,11 @@ class State(MutableMapping):
     """A singleton persistent key-value store backed by SQLite.
 
     Implements the MutableMapping interface, providing dict-like access to
-    data that is automatically persisted to a SQLite database. The entire
-    state is stored as a single pickled dictionary, making it suitable for
-    application-wide state management.
+    data that is automatically persisted to a SQLite database. Every key is
+    stored as its own pickled row, and a commit only rewrites the rows of the
+    keys changed since the last commit, making it suitable for
+    application-wide state management. Values kept under keys of their own
+    are cheaper to update than values gathered in one large dictionary.
 
     This class uses the singleton pattern - all instances share the same
     underlying data and database connection.
@@ -53,9 +59,14 @@ class State(MutableMapping):
     Attributes:
         _data (ClassVar[dict]): The shared dictionary storing all state data.
         _instance (Self): The singleton instance.
-        _lock (Lock): Thread lock for thread-safe operations.
+        _dirty (ClassVar[set]): Keys set or changed since the last commit.
+        _deleted (ClassVar[set]): Keys deleted since the last commit.
+        _cleared (ClassVar[bool]): Whether the stored rows must be cleared on the next commit.
+        _lock (RLock): Thread lock for thread-safe operations.
         db_name (str): Path to the SQLite database file.
         autocommit (bool): If True, changes are committed immediately.
+        write_behind (WriteBehind | None): The background flusher committing the changes, if registered.
+            Takes precedence over autocommit.
         _initialized (bool): Whether the state has been initialized.
 
     Example:
@@ -67,10 +78,14 @@ class State(MutableMapping):
     """
 
     _data: ClassVar
+    _dirty: ClassVar[set]
+    _deleted: ClassVar[set]
+    _cleared: ClassVar[bool]
     _instance: Self
-    _lock: Lock
+    _lock: RLock
     db_name: str
     autocommit: bool
+    write_behind: WriteBehind | None = None
     _initialized = False
 
     def __new__(cls, *args, **kwargs):
@@ -79,9 +94,12 @@ class State(MutableMapping):
         Returns:
             State: The singleton State instance.
         """
-        with (lock := Lock()) as _:
+        with (lock := RLock()) as _:
             if not hasattr(cls, '_instance'):
                 cls._data = {}
+                cls._dirty = set()
+                cls._deleted = set()
+                cls._cleared = False
                 cls._lock = lock
                 cls._instance = super().__new__(cls)
         return cls._instance
@@ -113,7 +131,7 @@ class State(MutableMapping):
 
     @data.setter
     def data(self, value):
-        """Sets the state dictionary.
+        """Sets the state dictionary. All the stored rows are replaced on the next commit.
 
         Args:
             value: The dictionary to set as state data.
@@ -122,7 +140,70 @@ class State(MutableMapping):
             AssertionError: If value is not a dictionary.
         """
         assert isinstance(value, dict)
-        self.__class__._data = value
+        cls = self.__class__
+        with self._lock:
+            cls._data = value
+            cls._cleared = True
+            cls._deleted.clear()
+            cls._dirty.clear()
+            cls._dirty.update(value)
+
+    @property
+    def dirty(self) -> set:
+        """Returns the keys that will be written on the next commit.
+
+        Returns:
+            set: The keys set or changed since the last commit.
+        """
+        return set(self._dirty)
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of changes not yet committed.
+
+        Returns:
+            int: The number of changed and deleted keys.
+        """
+        return len(self._dirty) + len(self._deleted) + self._cleared
+
+    def _autocommit(self):
+        """Hands the changes to the write-behind flusher if registered, or commits them if autocommit is on."""
+        if self.write_behind is not None:
+            self.write_behind.notify(self)
+        elif self.autocommit:
+            self.commit()
+
+    def _mark(self, *keys):
+        """Marks keys as changed.
+
+        Args:
+            *keys: The changed keys.
+        """
+        with self._lock:
+            self._dirty.update(keys)
+            self._deleted.difference_update(keys)
+
+    def _unmark(self, key):
+        """Marks a key as deleted.
+
+        Args:
+            key: The deleted key.
+        """
+        with self._lock:
+            self._dirty.discard(key)
+            self._deleted.add(key)
+
+    def touch(self, *keys, autocommit: bool = True):
+        """Marks keys whose values were mutated in place as changed so that they are written on the next commit.
+
+        Args:
+            *keys: The keys to mark. Keys not in the state are ignored.
+            autocommit: Whether to commit, or notify the write-behind flusher, as the other writes do. Pass False
+                when the caller commits the changes itself. Defaults to True.
+        """
+        self._mark(*(key for key in keys if key in self.data))
+        if autocommit:
+            self._autocommit()
 
     def __repr__(self):
         """Returns a string representation of the state.
@@ -167,8 +248,8 @@ class State(MutableMapping):
             value: The value to associate with the key.
         """
         self.data[key] = value
-        if self.autocommit:
-            self.commit()
+        self._mark(key)
+        self._autocommit()
 
     def __getitem__(self, key):
         """Retrieves a value by its key.
@@ -195,8 +276,8 @@ class State(MutableMapping):
             KeyError: If the key does not exist.
         """
         del self.data[key]
-        if self.autocommit:
-            self.commit()
+        self._unmark(key)
+        self._autocommit()
 
     def pop(self, key, default=SENTINEL):
         """Removes and returns the value for the given key.
@@ -214,10 +295,12 @@ class State(MutableMapping):
         """
         if default is SENTINEL:
             value = self.data.pop(key)
+        elif key in self.data:
+            value = self.data.pop(key)
         else:
-            value = self.data.pop(key, default)
-        if self.autocommit:
-            self.commit()
+            return default
+        self._unmark(key)
+        self._autocommit()
         return value
 
     def get(self, key, default=None):
@@ -240,9 +323,10 @@ class State(MutableMapping):
             data: A mapping or iterable of key-value pairs to add.
             **kwargs: Additional key-value pairs to add.
         """
-        self.data.update(data, **kwargs)
-        if self.autocommit:
-            self.commit()
+        data = dict(data or {}, **kwargs)
+        self.data.update(data)
+        self._mark(*data)
+        self._autocommit()
 
     def setdefault(self, key, default = None, /):
         """Returns the value for key if it exists, otherwise sets and returns default.
@@ -255,8 +339,8 @@ class State(MutableMapping):
             The existing value if the key exists, otherwise the default value.
         """
         value = self.data.setdefault(key, default)
-        if self.autocommit:
-            self.commit()
+        self._mark(key)
+        self._autocommit()
         return value
 
     def keys(self):
@@ -286,8 +370,10 @@ class State(MutableMapping):
     def load(self, *, conn = None, data: dict = None):
         """Loads state data from the database.
 
-        Retrieves the persisted state from the database and merges it with
-        any provided data. The merged result is then committed back.
+        Reads every stored key and merges the provided data into the loaded
+        state. A state saved as a single pickled dictionary by previous
+        versions is migrated to one row per key. The merged result is then
+        committed back.
 
         Args:
             conn: An existing database connection to use. If None, a new
@@ -296,10 +382,16 @@ class State(MutableMapping):
         """
         try:
             conn = conn or self.conn
-            res = conn.execute("SELECT value FROM state where key = 'data'").fetchone()
-            db_data = pickle.loads(res[0]) if res else {}
-            db_data |= (data or {})
-            self.update(db_data)
+            db_data = {key: pickle.loads(value) for key, value in conn.execute("SELECT key, value FROM state_items")}
+            self.data.update(db_data)
+            legacy = conn.execute("SELECT value FROM state WHERE key = 'data'").fetchone()
+            if legacy:
+                legacy = pickle.loads(legacy[0])
+                self.data.update(legacy)
+                self._mark(*legacy)
+                conn.execute("DELETE FROM state WHERE key = 'data'")
+            self.data.update(data or {})
+            self._mark(*(data or {}))
             self.commit(conn=conn)
         except Exception as err:
             logger.error("%s: Failed to load state data from database", err)
@@ -307,8 +399,9 @@ class State(MutableMapping):
     def init(self, data: dict = None, flush: bool = False, db_name: str = ""):
         """Initializes the state with the database.
 
-        Creates the state table if it doesn't exist and loads or flushes
-        the data based on the flush parameter.
+        Creates the state tables if they don't exist, switches the database
+        to write-ahead logging and loads or flushes the data based on the
+        flush parameter.
 
         Args:
             data: Initial data to populate the state with.
@@ -320,10 +413,13 @@ class State(MutableMapping):
             return
         self.db_name = db_name or os.environ.get("DB_NAME", "db.sqlite3")
         conn = self.conn
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("CREATE TABLE IF NOT EXISTS state (key text unique, value blob)")
+        conn.execute("CREATE TABLE IF NOT EXISTS state_items (key unique, value blob)")
         self._initialized = True
         if flush:
             self.data = data or {}
+            conn.execute("DELETE FROM state WHERE key = 'data'")
             self.commit(conn=conn)
         else:
             self.load(conn=conn, data=data)
@@ -338,10 +434,11 @@ class State(MutableMapping):
         self.commit()
 
     def commit(self, *, conn: sqlite3.Connection = None, close: bool = True):
-        """Commits the current state to the database.
+        """Commits the changed keys to the database.
 
-        Serializes the state dictionary using pickle and saves it to the
-        SQLite database.
+        Pickles the values of the keys changed since the last commit and
+        writes them, together with the deletions, in a single transaction.
+        Nothing is written when no key changed.
 
         Args:
             conn: An existing database connection to use. If None, a new
@@ -349,13 +446,28 @@ class State(MutableMapping):
             close: If True, closes the connection after committing.
                 Defaults to True.
         """
-        value = pickle.dumps(self.data, protocol=pickle.HIGHEST_PROTOCOL)
-        value = sqlite3.Binary(value)
-        conn = conn or self.conn
-        conn.execute("REPLACE INTO state (key, value) VALUES ('data', ?)", (value,))
-        conn.commit()
-        if close:
-            conn.close()
+        with self._lock:
+            cleared, dirty, deleted = self._cleared, self._dirty.copy(), self._deleted.copy()
+            rows = [(key, sqlite3.Binary(pickle.dumps(self.data[key], protocol=pickle.HIGHEST_PROTOCOL)))
+                    for key in dirty if key in self.data]
+            if not (cleared or rows or deleted):
+                if conn is not None and close:
+                    conn.close()
+                return
+            conn = conn or self.conn
+            try:
+                with conn:
+                    if cleared:
+                        conn.execute("DELETE FROM state_items")
+                    else:
+                        conn.executemany("DELETE FROM state_items WHERE key = ?", ((key,) for key in deleted))
+                    conn.executemany("REPLACE INTO state_items (key, value) VALUES (?, ?)", rows)
+                self.__class__._cleared = False
+                self._dirty.difference_update(dirty)
+                self._deleted.difference_update(deleted)
+            finally:
+                if close:
+                    conn.close()
 
     @property
     def conn(self):
@@ -364,12 +476,15 @@ class State(MutableMapping):
         Returns:
             sqlite3.Connection: A new connection to the state database.
         """
-        return sqlite3.connect(self.db_name)
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
 
     async def acommit(self, conn=None, close=True):
-        """Asynchronously commits the current state to the database.
+        """Asynchronously commits the changed keys to the database.
 
-        This is a convenience wrapper for async contexts.
+        The commit runs on the DBWorker thread of the database, so the event
+        loop is not blocked while the values are pickled and written.
 
         Args:
             conn: An existing database connection to use. If None, a new
@@ -377,10 +492,47 @@ class State(MutableMapping):
             close: If True, closes the connection after committing.
                 Defaults to True.
         """
-        conn = conn or self.conn
-        value = pickle.dumps(self.data, protocol=pickle.HIGHEST_PROTOCOL)
-        value = sqlite3.Binary(value)
-        conn.execute("REPLACE INTO state (key, value) VALUES ('data', ?)", (value,))
-        conn.commit()
-        if close:
-            conn.close()
+        await DBWorker(self.db_name).run(partial(self.commit, conn=conn, close=close))
+
+    async def _aautocommit(self):
+        """Async counterpart of _autocommit."""
+        if self.write_behind is not None:
+            self.write_behind.notify(self)
+        elif self.autocommit:
+            await self.acommit()
+
+    async def aset(self, key, value):
+        """Sets a value for the given key, committing on the worker thread if autocommit is on.
+
+        Args:
+            key: The key to set.
+            value: The value to associate with the key.
+        """
+        self.data[key] = value
+        self._mark(key)
+        await self._aautocommit()
+
+    async def adelete(self, key):
+        """Deletes a key, committing on the worker thread if autocommit is on.
+
+        Args:
+            key: The key to delete.
+
+        Raises:
+            KeyError: If the key does not exist.
+        """
+        del self.data[key]
+        self._unmark(key)
+        await self._aautocommit()
+
+    async def aupdate(self, data: MutableMapping | Iterable[Iterable[Any]] = None, /, **kwargs):
+        """Updates the state with multiple key-value pairs, committing on the worker thread if autocommit is on.
+
+        Args:
+            data: A mapping or iterable of key-value pairs to add.
+            **kwargs: Additional key-value pairs to add.
+        """
+        data = dict(data or {}, **kwargs)
+        self.data.update(data)
+        self._mark(*data)
+        await self._aautocommit()
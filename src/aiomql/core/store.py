@@ -1,12 +1,15 @@
 """Store module for persistent key-value storage backed by SQLite.
 
 This module provides the Store class, a persistent dictionary-like storage
-backed by SQLite. Unlike the State class which stores all data as a single
-pickled dictionary, Store saves each key-value pair as individual rows in
-the database table, making it more suitable for larger datasets.
+backed by SQLite. Unlike the State class, which keeps all its data in memory
+and pickles every value, Store reads and writes each key-value pair as an
+individual row of the database table, making it more suitable for larger
+datasets.
 
 The Store class implements the MutableMapping interface, providing dict-like
-access to data that is automatically persisted to the database.
+access to data that is automatically persisted to the database. An optional
+bounded read cache serves hot keys without querying SQLite, and the bulk
+methods and transaction context managers write many rows in one transaction.
 
 Example:
     Basic usage::
@@ -27,16 +30,30 @@ Example:
         all_data = store.data
 """
 
+import asyncio
 import os
 import sqlite3
-from threading import Lock
-from typing import MutableMapping, Iterable, Any
+from collections import OrderedDict
+from contextlib import contextmanager, asynccontextmanager
+from functools import partial
+from threading import Lock, RLock
+from typing import MutableMapping, Iterable, Iterator, Any
+from weakref import WeakKeyDictionary
 from logging import getLogger
 from pathlib import Path
 
+from .db_worker import DBWorker
+from .write_behind import WriteBehind
+
 
 SENTINEL = object()
+# marks a key deleted in the write-behind buffer
+DELETED = object()
 logger = getLogger(__name__)
+# stays below the host parameter limit of older SQLite builds
+MAX_PARAMS = 900
+# rows fetched at a time by the iterators, each batch under the store lock
+FETCH_ROWS = 500
 
 
 class Store(MutableMapping):
@@ -50,8 +67,20 @@ class Store(MutableMapping):
             modification.
         db_name: Path to the SQLite database file.
         table_name: Name of the table used for storage.
-        cursor: SQLite cursor for executing queries.
+        cursor: SQLite cursor of the connection. Queries don't use it, each runs on a cursor of its own.
         conn: SQLite database connection.
+        lock: Serializes the queries and commits of every store, so that the event loop and the DBWorker
+            thread running the async methods never use a connection at the same time.
+        write_behind: The background flusher committing the changes, if registered. Takes precedence
+            over autocommit. Stores handed to a flusher must be created with autocommit set to False, so
+            that they read through the shared connection committed by Store.commit. Their changes are
+            buffered in memory and written by Store.commit in one short transaction, so the connection
+            doesn't hold the write lock of the database between flushes.
+        cache_size: Maximum number of values kept in the read cache. 0 disables the cache.
+
+    Note:
+        The read cache is kept coherent with the writes made through this instance. Writes made
+        through other Store instances or connections on the same table are not seen by it.
     """
 
     autocommit: bool
@@ -60,8 +89,18 @@ class Store(MutableMapping):
     cursor: sqlite3.Cursor
     _conn: sqlite3.Connection = None
     conn: sqlite3.Connection
-    lock: Lock = Lock()
-    def __init__(self, db_name: str | Path = "", table_name="store", data: dict = None, flush: bool = False, autocommit: bool = True):
+    lock: RLock = RLock()
+    write_behind: WriteBehind | None = None
+    cache_size: int
+    _buffers: dict[str, dict] = {}
+    _cleared: set[str] = set()
+    _cache: OrderedDict
+    _cache_lock: Lock
+    _in_transaction: bool
+    _alocks: WeakKeyDictionary
+
+    def __init__(self, db_name: str | Path = "", table_name="store", data: dict = None, flush: bool = False,
+                 autocommit: bool = True, cache_size: int = 0):
         """Initializes the Store with a SQLite database.
 
         Args:
@@ -75,8 +114,15 @@ class Store(MutableMapping):
                 Defaults to False.
             autocommit: If True, commits changes immediately after each
                 modification. Defaults to True.
+            cache_size: Maximum number of values kept in the least recently
+                used read cache. Defaults to 0, no cache.
         """
         self.autocommit = autocommit
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = Lock()
+        self._in_transaction = False
+        self._alocks = WeakKeyDictionary()
         self.db_name = db_name or os.environ.get("DB_NAME", "db.sqlite3")
         self.table_name = table_name
         if not self.autocommit:
@@ -85,15 +131,16 @@ class Store(MutableMapping):
             self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
         self.cursor = self.conn.cursor()
         make_table_query = f"CREATE TABLE IF NOT EXISTS {self.table_name} (key unique, value)"
-        self.conn.execute(make_table_query)
-        if flush:
-            flush_query = f"DELETE FROM {self.table_name}"
-            self.conn.execute(flush_query)
-            self.conn.commit()
-        if data:
-            load_query = f"REPLACE INTO {self.table_name} VALUES(?, ?)"
-            self.conn.executemany(load_query, data.items())
-            self.conn.commit()
+        with self.lock:
+            self.conn.execute(make_table_query)
+            if flush:
+                flush_query = f"DELETE FROM {self.table_name}"
+                self.conn.execute(flush_query)
+                self.conn.commit()
+            if data:
+                load_query = f"REPLACE INTO {self.table_name} VALUES(?, ?)"
+                self.conn.executemany(load_query, data.items())
+                self.conn.commit()
 
     @classmethod
     def connection(cls, db_name: str | Path = ""):
@@ -102,14 +149,114 @@ class Store(MutableMapping):
         cls._conn = sqlite3.connect(db_name, check_same_thread=False)
         return cls._conn
 
+    @property
+    def pending(self) -> int:
+        """Returns the number of buffered write-behind changes not yet committed.
+
+        Returns:
+            int: The number of buffered changed keys and cleared tables.
+        """
+        return sum(map(len, self._buffers.values())) + len(self._cleared)
+
+    def _autocommit(self):
+        """Hands the changes to the write-behind flusher if registered, or commits them if autocommit is on."""
+        if self.write_behind is not None:
+            if not self._in_transaction:
+                self.write_behind.notify(self)
+        elif self.autocommit and not self._in_transaction:
+            with self.lock:
+                self.conn.commit()
+
+    def _fetch(self, query: str, params: Iterable = ()) -> list[tuple]:
+        """Runs a query on a cursor of its own under the store lock and returns its rows."""
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def _rows(self, query: str) -> Iterator[tuple]:
+        """Yields the rows of a query, fetched in batches under the store lock on a cursor of its own.
+
+        The lock isn't held between batches, so other threads can use the store while the rows are consumed.
+        """
+        with self.lock:
+            cursor = self.conn.execute(query)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                return
+            yield from rows
+
+    @property
+    def _buffering(self) -> bool:
+        """Whether the table has write-behind changes not yet committed."""
+        return bool(self._buffers.get(self.table_name)) or self.table_name in self._cleared
+
+    def _buffered(self, key):
+        """Returns the buffered value of a key, DELETED if it was deleted, or SENTINEL if it isn't buffered."""
+        if (buffer := self._buffers.get(self.table_name)) and (value := buffer.get(key, SENTINEL)) is not SENTINEL:
+            return value
+        return DELETED if self.table_name in self._cleared else SENTINEL
+
+    def _buffer(self, items: Iterable[tuple[Any, Any]]):
+        """Buffers key-value pairs for the write-behind flusher. A DELETED value deletes the key."""
+        with self.lock:
+            self._buffers.setdefault(self.table_name, {}).update(items)
+
+    @classmethod
+    def _write_buffers(cls, conn: sqlite3.Connection):
+        """Writes the buffered write-behind changes of every table through a connection."""
+        for table in cls._cleared:
+            conn.execute(f"DELETE FROM {table}")
+        for table, buffer in cls._buffers.items():
+            conn.executemany(f"REPLACE INTO {table} VALUES(?, ?)",
+                             [(key, value) for key, value in buffer.items() if value is not DELETED])
+            conn.executemany(f"DELETE FROM {table} WHERE key = ?",
+                             [(key,) for key, value in buffer.items() if value is DELETED])
+
+    def _cache_get(self, key):
+        """Returns the cached value of a key or SENTINEL on a cache miss."""
+        if not self.cache_size:
+            return SENTINEL
+        with self._cache_lock:
+            value = self._cache.get(key, SENTINEL)
+            if value is not SENTINEL:
+                self._cache.move_to_end(key)
+            return value
+
+    def _cache_set(self, items: Iterable[tuple[Any, Any]]):
+        """Caches key-value pairs, evicting the least recently used keys beyond cache_size."""
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            for key, value in items:
+                self._cache[key] = value
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_pop(self, keys: Iterable):
+        """Removes keys from the cache."""
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def clear_cache(self):
+        """Empties the read cache."""
+        with self._cache_lock:
+            self._cache.clear()
+
     def __len__(self):
         """Returns the number of items in the store.
 
         Returns:
             int: The total count of key-value pairs in the store.
         """
+        if self._buffering:
+            return sum(1 for _ in self.iterkeys())
         count_query = f"SELECT COUNT(*) FROM {self.table_name}"
-        rows = self.cursor.execute(count_query).fetchone()[0]
+        rows = self._fetch(count_query)[0][0]
         return rows if rows is not None else 0
 
     def __contains__(self, key):
@@ -121,8 +268,12 @@ class Store(MutableMapping):
         Returns:
             bool: True if the key exists, False otherwise.
         """
+        if (value := self._buffered(key)) is not SENTINEL:
+            return value is not DELETED
+        if self._cache_get(key) is not SENTINEL:
+            return True
         contains_query = f"SELECT 1 FROM {self.table_name} WHERE key = ?"
-        return self.cursor.execute(contains_query, (key,)).fetchone() is not None
+        return bool(self._fetch(contains_query, (key,)))
 
     def __getitem__(self, key):
         """Retrieves a value by its key.
@@ -136,11 +287,18 @@ class Store(MutableMapping):
         Raises:
             KeyError: If the key does not exist in the store.
         """
+        if (value := self._buffered(key)) is DELETED:
+            raise KeyError(key)
+        if value is not SENTINEL:
+            return value
+        if (value := self._cache_get(key)) is not SENTINEL:
+            return value
         get_query = f"SELECT value FROM {self.table_name} WHERE key = ?"
-        item = self.cursor.execute(get_query, (key,)).fetchone()
-        if item is None:
+        rows = self._fetch(get_query, (key,))
+        if not rows:
             raise KeyError(key)
-        return item[0]
+        self._cache_set(((key, rows[0][0]),))
+        return rows[0][0]
 
     def __setitem__(self, key, value):
         """Sets a value for the given key.
@@ -151,10 +309,14 @@ class Store(MutableMapping):
             key: The key to set.
             value: The value to associate with the key.
         """
-        set_query = f"REPLACE INTO {self.table_name} VALUES (?, ?)"
-        self.cursor.execute(set_query, (key, value))
-        if self.autocommit:
-            self.conn.commit()
+        if self.write_behind is not None:
+            self._buffer(((key, value),))
+        else:
+            set_query = f"REPLACE INTO {self.table_name} VALUES (?, ?)"
+            with self.lock:
+                self.conn.execute(set_query, (key, value))
+        self._cache_set(((key, value),))
+        self._autocommit()
 
     def __delitem__(self, key):
         """Deletes a key-value pair from the store.
@@ -165,12 +327,20 @@ class Store(MutableMapping):
         Raises:
             KeyError: If the key does not exist in the store.
         """
-        if key not in self:
-            raise KeyError(key)
+        if self.write_behind is not None:
+            if key not in self:
+                raise KeyError(key)
+            self._cache_pop((key,))
+            self._buffer(((key, DELETED),))
+            self._autocommit()
+            return
         delete_query = f"DELETE FROM {self.table_name} WHERE key = ?"
-        self.cursor.execute(delete_query, (key,))
-        if self.autocommit:
-            self.conn.commit()
+        self._cache_pop((key,))
+        with self.lock:
+            deleted = self.conn.execute(delete_query, (key,)).rowcount
+        if deleted == 0:
+            raise KeyError(key)
+        self._autocommit()
 
     def __iter__(self):
         """Returns an iterator over the keys in the store.
@@ -194,8 +364,11 @@ class Store(MutableMapping):
         Yields:
             Keys stored in the database.
         """
+        if self._buffering:
+            yield from (key for key, _ in self.iteritems())
+            return
         key_query = f"SELECT key FROM {self.table_name}"
-        for row in self.cursor.execute(key_query):
+        for row in self._rows(key_query):
             yield row[0]
 
     def itervalues(self):
@@ -204,8 +377,11 @@ class Store(MutableMapping):
         Yields:
             Values stored in the database.
         """
+        if self._buffering:
+            yield from (value for _, value in self.iteritems())
+            return
         value_query = f"SELECT value FROM {self.table_name}"
-        for row in self.cursor.execute(value_query):
+        for row in self._rows(value_query):
             yield row[0]
 
     def iteritems(self):
@@ -214,9 +390,17 @@ class Store(MutableMapping):
         Yields:
             tuple: A (key, value) pair.
         """
-        item_query = f"SELECT key, value FROM {self.table_name}"
-        for row in self.cursor.execute(item_query):
-            yield row[0], row[1]
+        with self.lock:
+            buffer = dict(self._buffers.get(self.table_name, {}))
+            cleared = self.table_name in self._cleared
+        if not cleared:
+            item_query = f"SELECT key, value FROM {self.table_name}"
+            for row in self._rows(item_query):
+                if row[0] not in buffer:
+                    yield row[0], row[1]
+        for key, value in buffer.items():
+            if value is not DELETED:
+                yield key, value
 
     def keys(self):
         """Returns a list of all keys in the store.
@@ -250,10 +434,152 @@ class Store(MutableMapping):
             **kwargs: Additional key-value pairs to add.
         """
         data = (dict(data if data is not None else {}) or {}) | kwargs
-        update_query = f"REPLACE INTO {self.table_name} VALUES(?, ?)"
-        self.conn.executemany(update_query, data.items())
-        if self.autocommit:
-            self.conn.commit()
+        self.set_many(data)
+
+    def set_many(self, data: MutableMapping | Iterable[Iterable[Any]]):
+        """Sets multiple key-value pairs with a single executemany call.
+
+        Args:
+            data: A mapping or iterable of key-value pairs.
+        """
+        data = dict(data)
+        if self.write_behind is not None:
+            self._buffer(data.items())
+        else:
+            update_query = f"REPLACE INTO {self.table_name} VALUES(?, ?)"
+            with self.lock:
+                self.conn.executemany(update_query, data.items())
+        self._cache_set(data.items())
+        self._autocommit()
+
+    def get_many(self, keys: Iterable) -> dict:
+        """Returns the values of multiple keys. Keys that don't exist are left out.
+
+        Cached keys are served from the cache and the rest are fetched with
+        one query per chunk of keys.
+
+        Args:
+            keys: The keys to look up.
+
+        Returns:
+            dict: The found keys and their values.
+        """
+        found, missing = {}, []
+        for key in dict.fromkeys(keys):
+            if (value := self._buffered(key)) is DELETED:
+                continue
+            if value is not SENTINEL or (value := self._cache_get(key)) is not SENTINEL:
+                found[key] = value
+            else:
+                missing.append(key)
+        for start in range(0, len(missing), MAX_PARAMS):
+            chunk = missing[start: start + MAX_PARAMS]
+            get_query = f"SELECT key, value FROM {self.table_name} WHERE key IN ({', '.join('?' * len(chunk))})"
+            rows = self._fetch(get_query, chunk)
+            self._cache_set(rows)
+            found.update(rows)
+        return found
+
+    def delete_many(self, keys: Iterable) -> int:
+        """Deletes multiple keys with a single executemany call. Keys that don't exist are ignored.
+
+        Args:
+            keys: The keys to delete.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        keys = list(dict.fromkeys(keys))
+        if self.write_behind is not None:
+            keys = [key for key in keys if key in self]
+            self._cache_pop(keys)
+            self._buffer((key, DELETED) for key in keys)
+            self._autocommit()
+            return len(keys)
+        delete_query = f"DELETE FROM {self.table_name} WHERE key = ?"
+        self._cache_pop(keys)
+        with self.lock:
+            deleted = self.conn.executemany(delete_query, ((key,) for key in keys)).rowcount
+        self._autocommit()
+        return deleted
+
+    @contextmanager
+    def transaction(self):
+        """Groups writes into a single transaction.
+
+        Writes made inside the block are committed together when it exits, or
+        rolled back if it raises. With a write-behind flusher registered the
+        writes are buffered for the flusher instead of being committed, and
+        dropped from the buffer if the block raises. The flusher can't commit
+        while the block runs. Nested blocks join the outermost transaction.
+
+        Note:
+            Stores created with autocommit set to False share one connection,
+            so a rollback also discards the uncommitted writes of other stores.
+
+        Yields:
+            Store: The store.
+        """
+        with self.lock:
+            if self._in_transaction:
+                yield self
+                return
+            self._in_transaction = True
+            buffer = dict(self._buffers.get(self.table_name, {}))
+            cleared = self.table_name in self._cleared
+            try:
+                yield self
+            except BaseException:
+                if self.write_behind is not None:
+                    # the writes of the block are only buffered, restore the buffer it started with
+                    if buffer:
+                        self._buffers[self.table_name] = buffer
+                    else:
+                        self._buffers.pop(self.table_name, None)
+                    if not cleared:
+                        self._cleared.discard(self.table_name)
+                else:
+                    self.conn.rollback()
+                self.clear_cache()
+                raise
+            else:
+                if self.write_behind is not None:
+                    self.write_behind.notify(self)
+                else:
+                    self.conn.commit()
+            finally:
+                self._in_transaction = False
+
+    @asynccontextmanager
+    async def atransaction(self):
+        """Async counterpart of transaction for use in async contexts.
+
+        The writes made through the yielded StoreTransaction are staged in
+        memory and applied in a single transaction on the worker thread when
+        the block exits, or dropped if it raises. No lock or open transaction
+        is held while the block awaits. Async transactions of the store on an
+        event loop run one at a time and don't nest.
+
+        Yields:
+            StoreTransaction: The staged writes of the block.
+        """
+        loop = asyncio.get_running_loop()
+        with self._cache_lock:
+            lock = self._alocks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            staged = StoreTransaction(self)
+            yield staged
+            await self.worker.run(self._apply, staged.writes, staged.cleared)
+
+    def _apply(self, writes: dict, cleared: bool):
+        """Applies the staged writes of an async transaction in one transaction. Runs on the worker thread."""
+        with self.transaction():
+            if cleared:
+                self.clear()
+            if deleted := [key for key, value in writes.items() if value is DELETED]:
+                self.delete_many(deleted)
+            if data := {key: value for key, value in writes.items() if value is not DELETED}:
+                self.set_many(data)
 
     def setdefault(self, key, default = None, /):
         """Returns the value for key if it exists, otherwise sets and returns default.
@@ -289,10 +615,16 @@ class Store(MutableMapping):
 
     def clear(self):
         """Removes all key-value pairs from the store."""
-        clear_query = f"DELETE FROM {self.table_name}"
-        self.cursor.execute(clear_query)
-        if self.autocommit:
-            self.conn.commit()
+        if self.write_behind is not None:
+            with self.lock:
+                self._buffers.pop(self.table_name, None)
+                self._cleared.add(self.table_name)
+        else:
+            clear_query = f"DELETE FROM {self.table_name}"
+            with self.lock:
+                self.conn.execute(clear_query)
+        self.clear_cache()
+        self._autocommit()
 
     def pop(self, key, /, default=SENTINEL):
         """Removes and returns the value for the given key.
@@ -321,6 +653,10 @@ class Store(MutableMapping):
     def commit(cls, conn: sqlite3.Connection = None, close: bool = False):
         """Commits pending changes to the database.
 
+        The changes buffered for the write-behind flusher are written first. If
+        they can't be written and committed the transaction is rolled back and
+        they stay buffered for the next commit.
+
         Args:
             conn: The database connection to use. Defaults to self.conn.
             close: If True, closes the connection after committing.
@@ -328,21 +664,106 @@ class Store(MutableMapping):
         """
         with cls.lock:
             conn = conn or cls.connection()
-            conn.commit()
+            if cls._buffers or cls._cleared:
+                try:
+                    cls._write_buffers(conn)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                cls._buffers.clear()
+                cls._cleared.clear()
+            else:
+                conn.commit()
             if close:
                 conn.close()
 
     async def acommit(self, conn: sqlite3.Connection = None, close: bool = False):
         """Asynchronously commits pending changes to the database.
 
-        This is a convenience wrapper around commit() for async contexts.
+        The commit runs on the DBWorker thread of the database.
 
         Args:
             conn: The database connection to use. Defaults to self.conn.
             close: If True, closes the connection after committing.
                 Defaults to False.
         """
-        self.commit(conn=conn, close=close)
+        await self.worker.run(partial(self.commit, conn=conn, close=close))
+
+    @property
+    def worker(self) -> DBWorker:
+        """Returns the worker thread that runs the async operations of the store.
+
+        Returns:
+            DBWorker: The worker of the database.
+        """
+        return DBWorker(self.db_name)
+
+    async def aget(self, key, /, default=None):
+        """Returns the value for key, or default, without blocking the event loop.
+
+        Cached keys are returned directly, the others are read on the worker thread.
+
+        Args:
+            key: The key to look up.
+            default: The value to return if the key doesn't exist. Defaults to None.
+
+        Returns:
+            The value associated with the key, or default if not found.
+        """
+        if (value := self._cache_get(key)) is not SENTINEL:
+            return value
+        return await self.worker.run(self.get, key, default)
+
+    async def aset(self, key, value):
+        """Sets a value for the given key on the worker thread.
+
+        Args:
+            key: The key to set.
+            value: The value to associate with the key.
+        """
+        await self.worker.run(self.__setitem__, key, value)
+
+    async def adelete(self, key):
+        """Deletes a key on the worker thread.
+
+        Args:
+            key: The key to delete.
+
+        Raises:
+            KeyError: If the key does not exist in the store.
+        """
+        await self.worker.run(self.__delitem__, key)
+
+    async def aget_many(self, keys: Iterable) -> dict:
+        """Async counterpart of get_many, run on the worker thread.
+
+        Args:
+            keys: The keys to look up.
+
+        Returns:
+            dict: The found keys and their values.
+        """
+        return await self.worker.run(self.get_many, list(keys))
+
+    async def aset_many(self, data: MutableMapping | Iterable[Iterable[Any]]):
+        """Async counterpart of set_many, run on the worker thread.
+
+        Args:
+            data: A mapping or iterable of key-value pairs.
+        """
+        await self.worker.run(self.set_many, dict(data))
+
+    async def adelete_many(self, keys: Iterable) -> int:
+        """Async counterpart of delete_many, run on the worker thread.
+
+        Args:
+            keys: The keys to delete.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        return await self.worker.run(self.delete_many, list(keys))
 
     @property
     def data(self):
@@ -351,6 +772,88 @@ class Store(MutableMapping):
         Returns:
             dict: A dictionary containing all key-value pairs in the store.
         """
+        if self._buffering:
+            return dict(self.iteritems())
         select_query = f"SELECT * FROM {self.table_name}"
-        res = self.cursor.execute(select_query).fetchall()
+        res = self._fetch(select_query)
         return {key: value for key, value in res}
+
+
+class StoreTransaction:
+    """The staged writes of an async Store transaction.
+
+    Writes are kept in memory until the transaction is applied. Reads see the
+    staged writes and fall through to the store for the other keys.
+
+    Attributes:
+        store: The store the writes are applied to.
+        writes: The staged values by key. Deleted keys map to DELETED.
+        cleared: Whether the store is cleared before the writes are applied.
+    """
+
+    store: Store
+    writes: dict
+    cleared: bool
+
+    def __init__(self, store: Store):
+        """Initializes an empty transaction on a store.
+
+        Args:
+            store: The store the writes are applied to.
+        """
+        self.store = store
+        self.writes = {}
+        self.cleared = False
+
+    def __getitem__(self, key):
+        """Returns the staged value of a key, or its value in the store.
+
+        Raises:
+            KeyError: If the key was deleted or does not exist.
+        """
+        value = self.writes.get(key, SENTINEL)
+        if value is DELETED or (value is SENTINEL and self.cleared):
+            raise KeyError(key)
+        return self.store[key] if value is SENTINEL else value
+
+    def __setitem__(self, key, value):
+        """Stages a value for a key."""
+        self.writes[key] = value
+
+    def __delitem__(self, key):
+        """Stages the deletion of a key.
+
+        Raises:
+            KeyError: If the key does not exist.
+        """
+        if key not in self:
+            raise KeyError(key)
+        self.writes[key] = DELETED
+
+    def __contains__(self, key):
+        """Checks if a key exists after the staged writes."""
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        """Returns the value of a key after the staged writes, or default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def set_many(self, data: MutableMapping | Iterable[Iterable[Any]]):
+        """Stages multiple key-value pairs."""
+        self.writes.update(dict(data))
+
+    def delete_many(self, keys: Iterable):
+        """Stages the deletion of multiple keys. Keys that don't exist are ignored."""
+        self.writes.update((key, DELETED) for key in keys if key in self)
+
+    def clear(self):
+        """Stages the removal of every key."""
+        self.writes.clear()
+        self.cleared = True
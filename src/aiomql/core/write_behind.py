@@ -0,0 +1,191 @@
+"""Write-behind flushing for State and Store.
+
+This module provides the WriteBehind class, a background flusher for the
+persistent key-value stores. Stores registered with it apply mutations in
+memory and leave the commit, and the fsync that comes with it, to a background
+thread. The thread flushes every `interval` seconds, or as soon as a store has
+`threshold` pending changes. Flush requests that arrive while a flush is
+running are coalesced into the next one.
+
+Example:
+    Enabling write-behind for the state and store of a bot::
+
+        config = Config(auto_commit=True, db_commit_interval=10)
+        config.state["key"] = "value"  # flushed within 10 seconds
+"""
+
+import atexit
+import time
+from logging import getLogger
+from threading import Event, Lock, RLock, Thread
+from typing import Protocol, Self
+
+logger = getLogger(__name__)
+
+
+class Flushable(Protocol):
+    """A store that can be flushed by WriteBehind."""
+    write_behind: "WriteBehind | None"
+
+    @property
+    def pending(self) -> int:
+        """Number of changes not yet committed."""
+
+    def commit(self):
+        """Commit the pending changes."""
+
+
+class WriteBehind:
+    """A singleton that commits registered stores on a background thread.
+
+    Attributes:
+        interval (float): Seconds between background flushes.
+        threshold (int): Number of pending changes in a store that triggers an early flush.
+        flushes (int): Number of flushes that committed at least one store.
+        errors (int): Number of failed store commits.
+        last_latency (float): Duration of the last flush in seconds.
+        max_latency (float): Longest flush in seconds.
+        total_latency (float): Total time spent flushing in seconds.
+    """
+    _instance: Self
+    interval: float
+    threshold: int
+    flushes: int
+    errors: int
+    last_latency: float
+    max_latency: float
+    total_latency: float
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, *, interval: float = 30, threshold: int = 100):
+        """Initialize the flusher. Only the first instantiation sets the options.
+
+        Args:
+            interval: Seconds between background flushes. Defaults to 30.
+            threshold: Number of pending changes in a store that triggers an early flush. Defaults to 100.
+        """
+        if self._initialized:
+            return
+        self.interval = interval
+        self.threshold = threshold
+        self.flushes = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self._targets: list[Flushable] = []
+        self._wake = Event()
+        self._stop = Event()
+        self._lock = Lock()
+        self._flush_lock = RLock()
+        self._thread: Thread | None = None
+        self._initialized = True
+        # last resort final flush for bots that exit without going through Executor.exit
+        atexit.register(self.stop)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> dict:
+        """Flush latency metrics.
+
+        Returns:
+            dict: The number of flushes and errors, and the last, mean and max flush latency in milliseconds.
+        """
+        return {
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "last_ms": self.last_latency * 1000,
+            "mean_ms": self.total_latency * 1000 / self.flushes if self.flushes else 0.0,
+            "max_ms": self.max_latency * 1000,
+        }
+
+    def register(self, target: Flushable):
+        """Hand over the commits of a store to the flusher and start the background thread.
+
+        Args:
+            target: A State or Store instance.
+        """
+        with self._lock:
+            target.write_behind = self
+            if all(target is not registered for registered in self._targets):
+                self._targets.append(target)
+            if not self.running:
+                self._stop.clear()
+                self._thread = Thread(target=self._run, daemon=True, name="WriteBehind")
+                self._thread.start()
+
+    def unregister(self, target: Flushable):
+        """Flush a store and give its commits back to it.
+
+        Args:
+            target: A registered State or Store instance.
+        """
+        with self._lock:
+            self._targets = [registered for registered in self._targets if registered is not target]
+        with self._flush_lock:
+            self._commit(target)
+        target.write_behind = None
+
+    def notify(self, target: Flushable):
+        """Called by a store after a mutation. Wakes the flusher when the store reaches the threshold.
+
+        Args:
+            target: The mutated store.
+        """
+        if target.pending >= self.threshold:
+            self._wake.set()
+
+    def _commit(self, target: Flushable) -> bool:
+        """Commit a store if it has pending changes.
+
+        Returns:
+            bool: True if the store was committed.
+        """
+        if not target.pending:
+            return False
+        try:
+            target.commit()
+            return True
+        except Exception as err:
+            self.errors += 1
+            logger.error("%s: Unable to flush %s", err, target.__class__.__name__)
+            return False
+
+    def flush(self):
+        """Commit every registered store with pending changes on the calling thread."""
+        with self._flush_lock:
+            start = time.perf_counter()
+            committed = [self._commit(target) for target in list(self._targets)]
+            if not any(committed):
+                return
+            latency = time.perf_counter() - start
+            self.flushes += 1
+            self.last_latency = latency
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def _run(self):
+        """Flush every interval or when woken up, until stopped."""
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self):
+        """Stop the background thread and run a final flush."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join()
+        self.flush()
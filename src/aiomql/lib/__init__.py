@@ -1,12 +1,15 @@
 from .account import Account
 from .bot import Bot
 from .candle import Candle, Candles, CandleProtocol, CandleBase
+from .plots import PlotRenderer
 from .executor import Executor
-from .history import History
+from .history import History, HistoryIndex
+from .history_cache import HistoryCache, HistoryDeal, HistoryOrder
 from .order import Order
-from .positions import Positions
+from .positions import Positions, PositionsSnapshot
 from .ram import RAM
-from .result import Result
+from .result import Result, ResultSink
+from .record_writers import RecordWriter, CSVWriter, JSONLWriter
 from .symbol import Symbol
 from .ticks import Tick, Ticks
 from .trader import Trader
@@ -15,3 +18,4 @@ from .sessions import Sessions, Session
 from .trade_records import TradeRecords
 from .terminal import Terminal
 from .result_db import ResultDB
+from .result_report import ResultReport, Performance, Drawdown, EquityPoint
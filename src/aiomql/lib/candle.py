@@ -3,6 +3,7 @@
 This module provides classes for working with candlestick/bar data from
 MetaTrader 5. Includes support for technical analysis via pandas_ta,
 charting with mplfinance, and various data manipulation operations.
+The indicators and mplfinance are only imported on first use.
 
 Example:
     Working with candles::
@@ -12,21 +13,60 @@ Example:
         candles.plot(type='candle', volume=True)
 """
 
+import asyncio
 from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
 from typing import Type, Self, Iterable, Protocol, runtime_checkable, Optional
 from logging import getLogger
 
+import numpy as np
 import pandas as pd
-import mplfinance as mpf
 from pandas import DataFrame, Series, DatetimeIndex, Timestamp
 
 from ..ta_libs import pandas_ta_classic as ta
 from ..core.constants import TimeFrame
 from ..core.config import Config
+from .plots import PlotRenderer
 
 logger = getLogger(__name__)
 
 
+def _run_lengths(values: np.ndarray) -> np.ndarray:
+    """Count consecutive rising (positive) and falling (negative) bars.
+
+    Args:
+        values: Array of values. The first element has no previous value and always gets zero.
+
+    Returns:
+        np.ndarray: Signed run lengths, zero where the value did not change.
+    """
+    sign = np.zeros(len(values), dtype=np.int64)
+    sign[1:] = np.sign(np.nan_to_num(np.diff(values)))
+    change = np.ones(len(sign), dtype=bool)
+    change[1:] = sign[1:] != sign[:-1]
+    starts = np.flatnonzero(change)
+    positions = np.arange(len(sign))
+    lengths = positions - starts[np.cumsum(change) - 1] + 1
+    return lengths * sign
+
+
+def _bars_since(mask: np.ndarray) -> np.ndarray:
+    """Count the bars since the mask was last True.
+
+    Args:
+        mask: Boolean array.
+
+    Returns:
+        np.ndarray: Float array of bar counts, NaN before the first True value.
+    """
+    positions = np.arange(len(mask))
+    last_true = np.maximum.accumulate(np.where(mask, positions, -1))
+    counts = (positions - last_true).astype(float)
+    counts[last_true < 0] = np.nan
+    return counts
+
+
 @runtime_checkable
 class CandleProtocol(Protocol):
     """Protocol defining the minimal interface for Candle classes.
@@ -792,6 +832,281 @@ class Candles:
         else:
             raise TypeError("Expected Series, DataFrame or Candle, got {}".format(type(obj)))
 
+    def _ohlc(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the open, high, low and close columns as float arrays.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (open, high, low, close)
+        """
+        return tuple(self._data[column].to_numpy(dtype=float) for column in ("open", "high", "low", "close"))
+
+    def _columns_frame(self, columns: dict[str, np.ndarray], append: bool) -> DataFrame:
+        """Wrap computed arrays in a DataFrame aligned with the candles index.
+
+        Args:
+            columns: Mapping of column names to arrays of the same length as the data.
+            append: If True, also add the columns to the underlying DataFrame.
+
+        Returns:
+            DataFrame: The computed columns indexed like the candle data.
+        """
+        frame = DataFrame(columns, index=self._data.index)
+        if append:
+            for name, column in frame.items():
+                self._data[name] = column
+        return frame
+
+    def candle_metrics(self, *, append: bool = False) -> DataFrame:
+        """Compute body, wick and range metrics for all candles in one pass.
+
+        This is the column-level equivalent of the CandleBase properties. Percentages are
+        relative to the candle range, zero-range candles yield NaN percentages.
+
+        Args:
+            append: If True, add the columns to the underlying DataFrame. Defaults to False.
+
+        Returns:
+            DataFrame: Columns cdl_body, cdl_upper_wick, cdl_lower_wick, cdl_range, cdl_body_pct,
+                cdl_upper_wick_pct, cdl_lower_wick_pct, cdl_bullish and cdl_bearish.
+        """
+        open_, high, low, close = self._ohlc()
+        top = np.maximum(open_, close)
+        bottom = np.minimum(open_, close)
+        body = top - bottom
+        range_ = high - low
+        upper_wick = high - top
+        lower_wick = bottom - low
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(range_ > 0, 100 / range_, np.nan)
+        columns = {
+            "cdl_body": body,
+            "cdl_upper_wick": upper_wick,
+            "cdl_lower_wick": lower_wick,
+            "cdl_range": range_,
+            "cdl_body_pct": body * scale,
+            "cdl_upper_wick_pct": upper_wick * scale,
+            "cdl_lower_wick_pct": lower_wick * scale,
+            "cdl_bullish": close >= open_,
+            "cdl_bearish": close < open_,
+        }
+        return self._columns_frame(columns, append)
+
+    def candle_patterns(self, *, doji_body: float = 10, pin_wick: float = 66, append: bool = False) -> DataFrame:
+        """Detect common single and two bar candlestick patterns for all candles in one pass.
+
+        Every column is a boolean mask aligned with the candles, so it can be used directly for
+        selection e.g. `candles.data[patterns.cdl_bullish_engulfing]`. Two bar patterns are always
+        False for the first candle.
+
+        Args:
+            doji_body: Maximum body size as a percentage of the range for a doji. Defaults to 10.
+            pin_wick: Minimum wick size as a percentage of the range for a pin bar. Defaults to 66.
+            append: If True, add the columns to the underlying DataFrame. Defaults to False.
+
+        Returns:
+            DataFrame: Columns cdl_doji, cdl_bullish_pin_bar, cdl_bearish_pin_bar, cdl_inside_bar,
+                cdl_bullish_engulfing and cdl_bearish_engulfing.
+        """
+        open_, high, low, close = self._ohlc()
+        top = np.maximum(open_, close)
+        bottom = np.minimum(open_, close)
+        range_ = high - low
+        bullish = close >= open_
+        bearish = close < open_
+        valid = range_ > 0
+        doji = valid & ((top - bottom) * 100 <= doji_body * range_)
+        bullish_pin_bar = valid & ((bottom - low) * 100 >= pin_wick * range_)
+        bearish_pin_bar = valid & ((high - top) * 100 >= pin_wick * range_)
+
+        inside_bar = np.zeros(len(close), dtype=bool)
+        bullish_engulfing = np.zeros(len(close), dtype=bool)
+        bearish_engulfing = np.zeros(len(close), dtype=bool)
+        inside_bar[1:] = (high[1:] < high[:-1]) & (low[1:] > low[:-1])
+        bullish_engulfing[1:] = bearish[:-1] & bullish[1:] & (open_[1:] <= close[:-1]) & (close[1:] >= open_[:-1])
+        bearish_engulfing[1:] = bullish[:-1] & bearish[1:] & (open_[1:] >= close[:-1]) & (close[1:] <= open_[:-1])
+        columns = {
+            "cdl_doji": doji,
+            "cdl_bullish_pin_bar": bullish_pin_bar,
+            "cdl_bearish_pin_bar": bearish_pin_bar,
+            "cdl_inside_bar": inside_bar,
+            "cdl_bullish_engulfing": bullish_engulfing,
+            "cdl_bearish_engulfing": bearish_engulfing,
+        }
+        return self._columns_frame(columns, append)
+
+    def _column_values(self, column: str | float, start: int = 0) -> np.ndarray:
+        """Return a column, or a constant for a number, as a float array from the start position.
+
+        Args:
+            column: Column name or a constant value.
+            start: Position of the first row. Defaults to 0.
+
+        Returns:
+            np.ndarray: The values as floats.
+        """
+        if isinstance(column, str):
+            return self._data[column].to_numpy(dtype=float)[start:]
+        return np.full(len(self._data) - start, float(column))
+
+    def _cross(self, first: str, second: str | float, *, above: bool, last: int | None) -> Series:
+        """Detect the bars where the first column crosses the second one.
+
+        Args:
+            first: Column name.
+            second: Column name or a threshold value.
+            above: If True detect crosses above otherwise crosses below.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series, True on the bar where the cross happened.
+        """
+        start = 0 if last is None else max(len(self._data) - last - 1, 0)
+        a = self._column_values(first, start)
+        b = self._column_values(second, start)
+        cross = np.zeros(len(a), dtype=bool)
+        if above:
+            cross[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+        else:
+            cross[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+        name = f"{first}_{'XA' if above else 'XB'}_{second}"
+        series = Series(cross, index=self._data.index[start:], name=name)
+        return series if last is None else series.iloc[-last:]
+
+    def crossover(self, first: str, second: str | float, *, last: int = None) -> Series:
+        """Detect the bars where the first column crosses above the second column or a threshold.
+
+        Args:
+            first: Column name.
+            second: Column name or a threshold value.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series, True on the bar where the cross happened.
+
+        Example:
+            >>> if candles.crossover("fast_ema", "slow_ema", last=1).iloc[-1]:
+            ...     order_type = OrderType.BUY
+        """
+        return self._cross(first, second, above=True, last=last)
+
+    def crossunder(self, first: str, second: str | float, *, last: int = None) -> Series:
+        """Detect the bars where the first column crosses below the second column or a threshold.
+
+        Args:
+            first: Column name.
+            second: Column name or a threshold value.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series, True on the bar where the cross happened.
+        """
+        return self._cross(first, second, above=False, last=last)
+
+    def breaches(self, column: str, *, upper: float = None, lower: float = None, last: int = None) -> Series:
+        """Detect the bars where a column is beyond the upper or lower threshold.
+
+        Args:
+            column: Column name.
+            upper: Values strictly above this threshold are breaches. Defaults to None.
+            lower: Values strictly below this threshold are breaches. Defaults to None.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series, True where the value is beyond any of the thresholds.
+        """
+        start = 0 if last is None else max(len(self._data) - last, 0)
+        values = self._column_values(column, start)
+        breach = np.zeros(len(values), dtype=bool)
+        if upper is not None:
+            breach |= values > upper
+        if lower is not None:
+            breach |= values < lower
+        return Series(breach, index=self._data.index[start:], name=f"{column}_BREACH")
+
+    def runs(self, column: str, *, last: int = None) -> Series:
+        """Count the consecutive rising and falling bars of a column.
+
+        Rising runs are positive, falling runs are negative and unchanged values are zero. In
+        incremental mode the window is extended backwards only as far as needed to count the
+        run of the oldest requested bar.
+
+        Args:
+            column: Column name.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Integer Series of signed run lengths.
+        """
+        values = self._column_values(column)
+        size = len(values)
+        name = f"{column}_RUN"
+        if last is None or last >= size:
+            return Series(_run_lengths(values), index=self._data.index, name=name)
+
+        window = min(size, 2 * last + 1)
+        while True:
+            runs = _run_lengths(values[size - window:])
+            first = window - last
+            if window == size or abs(runs[first]) < first:
+                break
+            window = min(size, window * 2)
+        return Series(runs[-last:], index=self._data.index[-last:], name=name)
+
+    def rising(self, column: str, bars: int = 1, *, last: int = None) -> Series:
+        """Detect the bars where a column has risen for at least 'bars' consecutive bars.
+
+        Args:
+            column: Column name.
+            bars: Minimum length of the rising run. Defaults to 1.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series.
+        """
+        return (self.runs(column, last=last) >= bars).rename(f"{column}_RISING")
+
+    def falling(self, column: str, bars: int = 1, *, last: int = None) -> Series:
+        """Detect the bars where a column has fallen for at least 'bars' consecutive bars.
+
+        Args:
+            column: Column name.
+            bars: Minimum length of the falling run. Defaults to 1.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Boolean Series.
+        """
+        return (self.runs(column, last=last) <= -bars).rename(f"{column}_FALLING")
+
+    def bars_since(self, condition: str | Series, *, last: int = None) -> Series:
+        """Count the bars since a condition was last True.
+
+        In incremental mode the window is extended backwards only until the condition is found.
+
+        Args:
+            condition: Name of a boolean column or a boolean Series aligned with the candles.
+            last: Only evaluate the newest 'n' bars. Defaults to None (all bars).
+
+        Returns:
+            Series: Float Series of bar counts, zero on the bars where the condition is True and
+                NaN before it was first True, named after the condition, or BARS_SINCE for an
+                unnamed Series.
+        """
+        series = self._data[condition] if isinstance(condition, str) else condition
+        mask = series.to_numpy(dtype=bool, na_value=False)
+        size = len(mask)
+        name = "BARS_SINCE" if series.name is None else f"{series.name}_BARS_SINCE"
+        if last is None or last >= size:
+            return Series(_bars_since(mask), index=self._data.index, name=name)
+
+        window = min(size, 2 * last)
+        while True:
+            counts = _bars_since(mask[size - window:])
+            if window == size or not np.isnan(counts[window - last]):
+                break
+            window = min(size, window * 2)
+        return Series(counts[-last:], index=self._data.index[-last:], name=name)
+
     def plot(self, subplots: dict = None, span: int = None, filename="", **kwargs):
         """Create a candlestick chart of the candle data.
 
@@ -801,6 +1116,8 @@ class Candles:
             filename: Filename to save the plot. Defaults to empty string.
             **kwargs: Additional keyword arguments passed to mplfinance.plot().
         """
+        import mplfinance as mpf
+
         type_ = kwargs.pop("type", "candle")
         subplots = subplots or []
         span = 0 if span is None else span
@@ -810,6 +1127,45 @@ class Candles:
 
         mpf.plot(data, type=type_, addplot=subplots, **kwargs)
 
+    def aplot(self, subplots: list[dict] = None, span: int = None, filename: str = "", **kwargs) -> asyncio.Future:
+        """Render a candlestick chart in a worker process without blocking the event loop.
+
+        Only the OHLC columns, the volume column when requested and the subplot columns of the last 'span'
+        candles are sent to the worker. The chart is saved in the plots directory of the config.
+
+        Args:
+            subplots: Subplot specifications. Each is a dict with the 'column' (a column name or a list of
+                column names) to plot and keyword arguments for mplfinance.make_addplot(). Defaults to None.
+            span: Last 'n' candles to be used for the plot. Defaults to None (all candles).
+            filename: Filename of the saved chart. Defaults to a random name.
+            **kwargs: Additional keyword arguments passed to mplfinance.plot().
+
+        Returns:
+            asyncio.Future: Resolves to the Path of the saved chart.
+
+        Example:
+            >>> path = await candles.aplot(filename="entry.png", subplots=[{"column": "ema", "color": "b"}])
+        """
+        subplots = subplots or []
+        span = 0 if span is None else span
+        columns = ["open", "high", "low", "close"]
+        if kwargs.get("volume") is True:
+            columns.append("volume" if "volume" in self._data.columns else "tick_volume")
+        for spec in subplots:
+            column = spec["column"]
+            columns.extend(column if isinstance(column, list) else [column])
+        data = self._data.iloc[-span:][list(dict.fromkeys(columns))]
+        if "volume" not in data.columns and "tick_volume" in data.columns:
+            data = data.rename(columns={"tick_volume": "volume"})
+        job = {
+            "data": data,
+            "type": kwargs.pop("type", "candle"),
+            "subplots": subplots,
+            "savefig": str(Path(self.config.plots_dir) / (filename or f"{uuid4().hex}.png")),
+            "kwargs": kwargs,
+        }
+        return asyncio.wrap_future(PlotRenderer().submit(job))
+
     def make_subplot(self, *, column: str | list[str], span: int = None, **kwargs) -> dict:
         """Create a subplot for use with the plot method.
 
@@ -821,6 +1177,8 @@ class Candles:
         Returns:
             dict: Subplot configuration for mplfinance.
         """
+        import mplfinance as mpf
+
         column = column if isinstance(column, list) else [column]
         span = 0 if span is None else span
         data = self._data[-span:]
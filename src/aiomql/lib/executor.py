@@ -21,6 +21,10 @@ from typing import Coroutine, Callable
 from logging import getLogger
 
 from ..core.config import Config
+from ..core.db_worker import DBWorker
+from .plots import PlotRenderer
+from .record_writers import RecordWriter
+from .result import ResultSink
 from .strategy import Strategy
 
 logger = getLogger(__name__)
@@ -147,7 +151,9 @@ class Executor:
 
         Runs in a loop checking for shutdown or timeout conditions.
         When triggered, stops all strategies, cancels the task queue,
-        and shuts down the thread pool executor.
+        saves the buffered trade results, renders the queued charts, flushes
+        pending state and store changes, closes the trade record files and
+        shuts down the thread pool executor.
         """
         start = time.time()
         try:
@@ -164,6 +170,14 @@ class Executor:
             for strategy in self.strategy_runners:
                 strategy.running = False
             self.config.task_queue.cancel()
+            # save the buffered trade results before the files are closed
+            ResultSink().stop()
+            # render the charts still queued
+            PlotRenderer().stop()
+            # finish the queued database requests, then flush the changes held by the write-behind flusher
+            DBWorker.stop_all()
+            self.config.write_behind.stop()
+            RecordWriter.close_all()
             self.executor.shutdown(wait=False, cancel_futures=False)
 
             if self.config.force_shutdown:
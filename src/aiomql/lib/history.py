@@ -11,34 +11,163 @@ Example:
         await history.initialize()
         for deal in history.deals:
             print(f"Deal {deal.ticket}: {deal.profit}")
+
+    Analysing the deals as columns, without building a TradeDeal per deal::
+
+        deals = history.deals_frame()
+        deals.groupby("symbol")["profit"].sum()
 """
 
 import asyncio
-from typing import ClassVar
+from bisect import bisect_left, bisect_right
+from typing import Callable, ClassVar, Generic, Iterable, Sequence, TypeVar
 from datetime import datetime, UTC
 from logging import getLogger
 
+import numpy as np
+import pandas as pd
+
 from ..core.config import Config
 from ..core.meta_trader import MetaTrader
 from ..core.models import TradeDeal, TradeOrder
 from ..core.base import BaseMeta
 from ..core.exceptions import InvalidRequest
+from .history_cache import HistoryCache
 
 logger = getLogger(__name__)
 
+Item = TypeVar("Item", TradeDeal, TradeOrder)
+
+
+class HistoryIndex(Generic[Item]):
+    """Hash and time indexes over history deals or orders.
+
+    The rows are indexed by ticket and grouped by position id, symbol and magic number in one pass, so
+    looking them up doesn't scan every item. A sorted array of their times answers time range queries
+    with a binary search. The items can be the named tuples of the terminal, in which case only the items
+    a lookup returns are built into objects, once each.
+
+    Attributes:
+        items (Sequence): The indexed deals or orders, objects or named tuples.
+        build (Callable | None): Builds the object of a named tuple, None when the items are objects.
+        tickets (dict): The rows by ticket.
+        groups (dict): The rows by the value of each of KEYS.
+        times (list[int]): The times in milliseconds of the items, sorted.
+        ordered (tuple): The rows sorted by time.
+    """
+    KEYS: ClassVar[tuple[str, ...]] = ("position_id", "symbol", "magic")
+
+    def __init__(self, items: Sequence = (), *, time: str = "time_msc", build: Callable[..., Item] = None):
+        """Index the items.
+
+        Args:
+            items: The deals or orders to index.
+            time: The time attribute of the items in milliseconds. Defaults to time_msc.
+            build: Builds the object of an item, such as TradeDeal.from_mt5. Defaults to None, for items that
+                are objects already.
+        """
+        self.items = items
+        self.build = build
+        self._built: dict[int, Item] = {}
+        self.tickets: dict[int, int] = {item.ticket: row for row, item in enumerate(items)}
+        groups = {key: {} for key in self.KEYS}
+        for row, item in enumerate(items):
+            for key, group in groups.items():
+                group.setdefault(getattr(item, key), []).append(row)
+        self.groups: dict[str, dict[int | str, tuple[int, ...]]] = {
+            key: {value: tuple(rows) for value, rows in group.items()} for key, group in groups.items()}
+        times = [getattr(item, time) for item in items]
+        self.ordered: tuple[int, ...] = tuple(sorted(range(len(items)), key=times.__getitem__))
+        self.times: list[int] = [times[row] for row in self.ordered]
+
+    def rows(self, rows: Iterable[int]) -> tuple[Item, ...]:
+        """The items at the rows, built on first use when build is set."""
+        items = self.items
+        if self.build is None:
+            return tuple(items[row] for row in rows)
+        built, build = self._built, self.build
+        return tuple(built[row] if row in built else built.setdefault(row, build(items[row])) for row in rows)
+
+    def get(self, ticket: int) -> tuple[Item, ...]:
+        """The item with the ticket, as a tuple of one item or an empty tuple."""
+        return self.rows((row,)) if (row := self.tickets.get(ticket)) is not None else ()
+
+    def filter(self, key: str, value: int | str) -> tuple[Item, ...]:
+        """The items with the value for one of KEYS."""
+        return self.rows(self.groups[key].get(value, ()))
+
+    def between(self, start: datetime | float, end: datetime | float) -> tuple[Item, ...]:
+        """The items with a time from start to end inclusive, in order of time.
+
+        Args:
+            start: The start of the range, a datetime or a timestamp in seconds.
+            end: The end of the range, a datetime or a timestamp in seconds.
+        """
+        start, end = (value.timestamp() if isinstance(value, datetime) else value for value in (start, end))
+        return self.rows(self.ordered[bisect_left(self.times, start * 1000):bisect_right(self.times, end * 1000)])
+
+
+# The column types of the arrays of deals and orders, in the field order of the terminal. Enums are small ints,
+# times int64, and text columns hold Python strings.
+DEAL_COLUMNS: dict[str, str] = {
+    "ticket": "i8", "order": "i8", "time": "i8", "time_msc": "i8", "type": "i1", "entry": "i1", "magic": "i8",
+    "position_id": "i8", "reason": "i1", "volume": "f8", "price": "f8", "commission": "f8", "swap": "f8",
+    "profit": "f8", "fee": "f8", "sl": "f8", "tp": "f8", "symbol": "O", "comment": "O", "external_id": "O"}
+ORDER_COLUMNS: dict[str, str] = {
+    "ticket": "i8", "time_setup": "i8", "time_setup_msc": "i8", "time_expiration": "i8", "time_done": "i8",
+    "time_done_msc": "i8", "type": "i1", "type_time": "i1", "type_filling": "i1", "state": "i1", "magic": "i8",
+    "position_id": "i8", "position_by_id": "i8", "reason": "i1", "volume_current": "f8", "volume_initial": "f8",
+    "price_open": "f8", "sl": "f8", "tp": "f8", "price_current": "f8", "price_stoplimit": "f8", "symbol": "O",
+    "comment": "O", "external_id": "O"}
+
+
+def history_array(items: Sequence, columns: dict[str, str]) -> np.ndarray:
+    """Builds a structured array of deals or orders in one pass.
+
+    Named tuples, as returned by the terminal, are copied into the array directly. Their fields decide the
+    columns, typed by columns, unknown fields as objects. Other items, such as TradeDeal objects, are read
+    attribute by attribute into the given columns.
+
+    Args:
+        items: The deals or orders.
+        columns: The column types, DEAL_COLUMNS or ORDER_COLUMNS.
+
+    Returns:
+        np.ndarray: A structured array with a field per column.
+    """
+    raw = bool(items) and hasattr(items[0], "_fields")
+    names = items[0]._fields if raw else tuple(columns)
+    dtype = np.dtype([(name, columns.get(name, "O")) for name in names])
+    rows = items if raw else (tuple(getattr(item, name, 0) for name in names) for item in items)
+    return np.fromiter(rows, dtype=dtype, count=len(items))
+
 
 class History(metaclass=BaseMeta):
     """Handles completed trade deals and orders from account history.
 
     Provides methods to retrieve and filter historical trade deals and orders
     within a specified date range. Supports filtering by symbol group, order
-    ticket, and position ID.
+    ticket, position ID, symbol, magic number and time. The filters look the
+    deals and orders up in indexes built on first use instead of scanning them.
+
+    The deals and orders are kept as returned by the terminal. TradeDeal and
+    TradeOrder objects are only built when deals or orders is first accessed,
+    and deal_array, order_array, deals_frame and orders_frame build columns
+    straight from the terminal tuples, without any objects.
+
+    With a HistoryCache, only the parts of the date range missing from the local
+    journal are fetched from the terminal.
 
     Attributes:
-        deals: Tuple of trade deals retrieved from history.
-        orders: Tuple of trade orders retrieved from history.
+        deals: Tuple of trade deals retrieved from history, built on first access.
+        orders: Tuple of trade orders retrieved from history, built on first access.
+        deal_array: Structured NumPy array of the deals, typed by DEAL_COLUMNS.
+        order_array: Structured NumPy array of the orders, typed by ORDER_COLUMNS.
         total_deals: Total number of deals retrieved.
         total_orders: Total number of orders retrieved.
+        deal_index: HistoryIndex of the deals, by time_msc.
+        order_index: HistoryIndex of the orders, by time_setup_msc.
+        cache: The local journal the history is read from, or None.
         group: Symbol filter pattern for selecting history.
         date_from: Start date for history query.
         date_to: End date for history query.
@@ -72,7 +201,8 @@ class History(metaclass=BaseMeta):
     total_orders: int
     group: str
 
-    def __init__(self, *, date_from: datetime | float, date_to: datetime | float, group: str = "", use_utc: bool = False):
+    def __init__(self, *, date_from: datetime | float, date_to: datetime | float, group: str = "", use_utc: bool = False,
+                 cache: HistoryCache | None = None):
         """Initialize a History instance with date range and filters.
 
         Args:
@@ -84,6 +214,8 @@ class History(metaclass=BaseMeta):
                 wildcard. Defaults to empty string (all symbols).
             use_utc: If True, convert date_from and date_to to UTC timezone.
                 Defaults to False.
+            cache: A local journal to read the history from, fetching only
+                what it is missing. Defaults to None, fetching everything.
 
         Example:
             Create history for specific date range::
@@ -112,10 +244,13 @@ class History(metaclass=BaseMeta):
         self.date_from = date_from.astimezone(UTC) if use_utc else date_from
         self.date_to = date_to.astimezone(UTC) if use_utc else date_to
         self.group = group
-        self.deals: tuple[TradeDeal, ...] = ()
-        self.orders: tuple[TradeOrder, ...] = ()
+        self.cache = cache
+        self.deals = ()
+        self.orders = ()
         self.total_deals: int = 0
         self.total_orders: int = 0
+        self._deal_index: HistoryIndex[TradeDeal] = HistoryIndex()
+        self._order_index: HistoryIndex[TradeOrder] = HistoryIndex(time="time_setup_msc")
 
     async def initialize(self) -> None:
         """Fetch history deals and orders from the trading account.
@@ -127,6 +262,7 @@ class History(metaclass=BaseMeta):
         Note:
             This method handles exceptions gracefully. If fetching deals
             or orders fails, the corresponding attribute will be an empty tuple.
+            With a cache, what the cache holds is used instead.
 
         Example:
             Initialize and access history::
@@ -135,11 +271,109 @@ class History(metaclass=BaseMeta):
                 await history.initialize()
                 print(f"Found {history.total_deals} deals")
         """
-        deals, orders = await asyncio.gather(self.get_deals(), self.get_orders(), return_exceptions=True)
-        self.deals = deals if isinstance(deals, tuple) else ()
-        self.orders = orders if isinstance(orders, tuple) else ()
-        self.total_deals = len(self.deals)
-        self.total_orders = len(self.orders)
+        if self.cache is not None:
+            deals, orders = await self.sync_cache()
+        else:
+            deals, orders = await asyncio.gather(
+                self.mt5.history_deals_get(date_from=self.date_from, date_to=self.date_to, group=self.group),
+                self.mt5.history_orders_get(date_from=self.date_from, date_to=self.date_to, group=self.group),
+                return_exceptions=True)
+        self.set_raw(deals=deals if isinstance(deals, tuple) else (),
+                     orders=orders if isinstance(orders, tuple) else ())
+
+    def set_raw(self, *, deals: tuple, orders: tuple):
+        """Keep deals and orders as returned by the terminal, building objects and arrays from them on first use.
+
+        Args:
+            deals: The deals, as named tuples.
+            orders: The orders, as named tuples.
+        """
+        self._raw_deals, self._raw_orders = deals, orders
+        self._deals = self._orders = self._deal_array = self._order_array = None
+        self.total_deals = len(deals)
+        self.total_orders = len(orders)
+
+    @property
+    def deals(self) -> tuple[TradeDeal, ...]:
+        """The deals as TradeDeal objects, built on first access."""
+        if self._deals is None:
+            self._deals = TradeDeal.from_mt5_many(self._raw_deals)
+        return self._deals
+
+    @deals.setter
+    def deals(self, deals: tuple[TradeDeal, ...]):
+        self._deals, self._raw_deals, self._deal_array = deals, None, None
+
+    @property
+    def orders(self) -> tuple[TradeOrder, ...]:
+        """The orders as TradeOrder objects, built on first access."""
+        if self._orders is None:
+            self._orders = TradeOrder.from_mt5_many(self._raw_orders)
+        return self._orders
+
+    @orders.setter
+    def orders(self, orders: tuple[TradeOrder, ...]):
+        self._orders, self._raw_orders, self._order_array = orders, None, None
+
+    @property
+    def deal_array(self) -> np.ndarray:
+        """The deals as a structured array, built in one pass from the terminal tuples when available."""
+        if self._deal_array is None:
+            self._deal_array = history_array(self.deals if self._raw_deals is None else self._raw_deals,
+                                             DEAL_COLUMNS)
+        return self._deal_array
+
+    @property
+    def order_array(self) -> np.ndarray:
+        """The orders as a structured array, built in one pass from the terminal tuples when available."""
+        if self._order_array is None:
+            self._order_array = history_array(self.orders if self._raw_orders is None else self._raw_orders,
+                                              ORDER_COLUMNS)
+        return self._order_array
+
+    def deals_frame(self) -> pd.DataFrame:
+        """The deals as a DataFrame with a column per field, enums as small ints and times as int64."""
+        return pd.DataFrame(self.deal_array)
+
+    def orders_frame(self) -> pd.DataFrame:
+        """The orders as a DataFrame with a column per field, enums as small ints and times as int64."""
+        return pd.DataFrame(self.order_array)
+
+    @property
+    def deal_index(self) -> HistoryIndex[TradeDeal]:
+        """The index of the deals, rebuilt when the deals have been replaced. Until the TradeDeal objects are
+        built, it indexes the terminal tuples and builds only the deals a lookup returns."""
+        raw = self._deals is None
+        if self._deal_index.items is not (deals := self._raw_deals if raw else self._deals):
+            self._deal_index = HistoryIndex(deals, build=TradeDeal.from_mt5 if raw else None)
+        return self._deal_index
+
+    @property
+    def order_index(self) -> HistoryIndex[TradeOrder]:
+        """The index of the orders, rebuilt when the orders have been replaced. Until the TradeOrder objects
+        are built, it indexes the terminal tuples and builds only the orders a lookup returns."""
+        raw = self._orders is None
+        if self._order_index.items is not (orders := self._raw_orders if raw else self._orders):
+            self._order_index = HistoryIndex(orders, time="time_setup_msc", build=TradeOrder.from_mt5 if raw else None)
+        return self._order_index
+
+    async def sync_cache(self) -> tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]:
+        """Fetch the parts of the date range the cache is missing, then read the range from the cache.
+
+        The missing ranges are fetched for all symbols, so the cache can answer any group.
+
+        Returns:
+            tuple[tuple, tuple]: The deals and orders of the date range, as named tuples.
+        """
+        for date_from, date_to in self.cache.windows(self.date_from, self.date_to):
+            deals, orders = await asyncio.gather(self.mt5.history_deals_get(date_from=date_from, date_to=date_to),
+                                                 self.mt5.history_orders_get(date_from=date_from, date_to=date_to),
+                                                 return_exceptions=True)
+            if deals is None or orders is None or isinstance(deals, Exception) or isinstance(orders, Exception):
+                logger.warning("Failed to fetch the history from %s to %s into the cache", date_from, date_to)
+                continue
+            await self.cache.asave(deals=deals, orders=orders, date_from=date_from, date_to=date_to)
+        return await self.cache.aload(date_from=self.date_from, date_to=self.date_to, group=self.group, raw=True)
 
     async def get_deals(self) -> tuple[TradeDeal, ...]:
         """Retrieve trade deals from history.
@@ -155,7 +389,7 @@ class History(metaclass=BaseMeta):
             Logs a warning if fetching deals fails.
         """
         deals = await self.mt5.history_deals_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
-        return tuple(TradeDeal(**deal._asdict()) for deal in deals)
+        return TradeDeal.from_mt5_many(deals)
 
     async def get_orders(self) -> tuple[TradeOrder, ...]:
         """Retrieve trade orders from history.
@@ -171,7 +405,7 @@ class History(metaclass=BaseMeta):
             Logs a warning if fetching orders fails.
         """
         orders = await self.mt5.history_orders_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
-        return tuple(TradeOrder(**order._asdict()) for order in orders)
+        return TradeOrder.from_mt5_many(orders)
 
     def filter_deals_by_ticket(self, *, ticket: int) -> tuple[TradeDeal, ...]:
         """Filters cached deals by ticket number.
@@ -182,7 +416,7 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeDeal, ...]: Deals matching the specified ticket.
         """
-        return tuple(deal for deal in self.deals if deal.ticket == ticket)
+        return self.deal_index.get(ticket)
 
     def filter_deals_by_position(self, *, position: int) -> tuple[TradeDeal, ...]:
         """Filters cached deals by position identifier.
@@ -193,7 +427,41 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeDeal, ...]: Deals matching the specified position.
         """
-        return tuple(deal for deal in self.deals if deal.position_id == position)
+        return self.deal_index.filter("position_id", position)
+
+    def filter_deals_by_symbol(self, *, symbol: str) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by symbol.
+
+        Args:
+            symbol: The symbol name to filter by.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals of the specified symbol.
+        """
+        return self.deal_index.filter("symbol", symbol)
+
+    def filter_deals_by_magic(self, *, magic: int) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by magic number.
+
+        Args:
+            magic: The expert advisor magic number to filter by.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals with the specified magic number.
+        """
+        return self.deal_index.filter("magic", magic)
+
+    def filter_deals_by_time(self, *, start: datetime | float, end: datetime | float) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by execution time.
+
+        Args:
+            start: Start of the range, a datetime or a timestamp in seconds.
+            end: End of the range, inclusive, a datetime or a timestamp in seconds.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals executed in the range, in order of time.
+        """
+        return self.deal_index.between(start, end)
 
     def filter_orders_by_ticket(self, *, ticket: int) -> tuple[TradeOrder, ...]:
         """Filters cached orders by ticket number.
@@ -204,7 +472,7 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeOrder, ...]: Orders matching the specified ticket.
         """
-        return tuple(order for order in self.orders if order.ticket == ticket)
+        return self.order_index.get(ticket)
 
     def filter_orders_by_position(self, *, position: int) -> tuple[TradeOrder, ...]:
         """Filters cached orders by position identifier.
@@ -215,14 +483,49 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeOrder, ...]: Orders matching the specified position.
         """
-        return tuple(order for order in self.orders if order.position_id == position)
+        return self.order_index.filter("position_id", position)
+
+    def filter_orders_by_symbol(self, *, symbol: str) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by symbol.
+
+        Args:
+            symbol: The symbol name to filter by.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders of the specified symbol.
+        """
+        return self.order_index.filter("symbol", symbol)
+
+    def filter_orders_by_magic(self, *, magic: int) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by magic number.
+
+        Args:
+            magic: The expert advisor magic number to filter by.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders with the specified magic number.
+        """
+        return self.order_index.filter("magic", magic)
+
+    def filter_orders_by_time(self, *, start: datetime | float, end: datetime | float) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by setup time.
+
+        Args:
+            start: Start of the range, a datetime or a timestamp in seconds.
+            end: End of the range, inclusive, a datetime or a timestamp in seconds.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders placed in the range, in order of time.
+        """
+        return self.order_index.between(start, end)
 
     @classmethod
-    async def get_deal_by_ticket(cls, *, ticket: int) -> TradeDeal:
+    async def get_deal_by_ticket(cls, *, ticket: int, cache: HistoryCache | None = None) -> TradeDeal:
         """Fetches a single deal from history by its ticket number.
 
         Args:
             ticket: The deal ticket number.
+            cache: A local journal to look the deal up in before asking the terminal. Defaults to None.
 
         Returns:
             TradeDeal: The matching deal.
@@ -230,30 +533,45 @@ class History(metaclass=BaseMeta):
         Raises:
             InvalidRequest: If no deal matches the given ticket.
         """
+        if cache is not None and (deals := await cache.aget_deals(ticket=ticket)):
+            return deals[0]
         deals = await cls.mt5.history_deals_get(ticket=ticket)
+        if cache is not None and deals:
+            await cache.asave(deals=deals, orders=())
         if (deal := deals[0]).ticket == ticket:
-            return TradeDeal(**deal._asdict())
+            return TradeDeal.from_mt5(deal)
         raise InvalidRequest("Ticket not found")
 
     @classmethod
-    async def get_deals_by_position(cls, *, position: int = None) -> tuple[TradeDeal, ...]:
+    async def get_deals_by_position(cls, *, position: int = None, cache: HistoryCache | None = None) \
+            -> tuple[TradeDeal, ...]:
         """Fetches deals from history by position identifier.
 
         Args:
             position: The position ID to filter by.
+            cache: A local journal to read the deals from while it is fresh and holds the whole position, see
+                HistoryCache.is_fresh and HistoryCache.holds_position, and to store them in otherwise. Defaults to
+                None.
 
         Returns:
             tuple[TradeDeal, ...]: Deals associated with the position.
         """
+        if cache is not None and cache.is_fresh():
+            cached = await cache.aget_deals(position_id=position)
+            if cache.holds_position(position, deals=cached):
+                return cached
         deals = await cls.mt5.history_deals_get(position=position)
-        return tuple(TradeDeal(**deal._asdict()) for deal in deals if deal.position_id == position)
+        if cache is not None and deals:
+            await cache.asave(deals=deals, orders=())
+        return TradeDeal.from_mt5_many(deal for deal in deals if deal.position_id == position)
 
     @classmethod
-    async def get_order_by_ticket(cls, *, ticket: int) -> TradeOrder:
+    async def get_order_by_ticket(cls, *, ticket: int, cache: HistoryCache | None = None) -> TradeOrder:
         """Fetches a single order from history by its ticket number.
 
         Args:
             ticket: The order ticket number.
+            cache: A local journal to look the order up in before asking the terminal. Defaults to None.
 
         Returns:
             TradeOrder: The matching order.
@@ -261,20 +579,34 @@ class History(metaclass=BaseMeta):
         Raises:
             InvalidRequest: If no order matches the given ticket.
         """
+        if cache is not None and (orders := await cache.aget_orders(ticket=ticket)):
+            return orders[0]
         orders = await cls.mt5.history_orders_get(ticket=ticket)
+        if cache is not None and orders:
+            await cache.asave(deals=(), orders=orders)
         if (order := orders[0]).ticket == ticket:
-            return TradeOrder(**order._asdict())
+            return TradeOrder.from_mt5(order)
         raise InvalidRequest("Ticket not found")
 
     @classmethod
-    async def get_orders_by_position(cls, *, position: int) -> tuple[TradeOrder, ...]:
+    async def get_orders_by_position(cls, *, position: int, cache: HistoryCache | None = None) \
+            -> tuple[TradeOrder, ...]:
         """Fetches orders from history by position identifier.
 
         Args:
             position: The position ID to filter by.
+            cache: A local journal to read the orders from while it is fresh and holds the whole position, see
+                HistoryCache.is_fresh and HistoryCache.holds_position, and to store them in otherwise. Defaults to
+                None.
 
         Returns:
             tuple[TradeOrder, ...]: Orders associated with the position.
         """
+        if cache is not None and cache.is_fresh():
+            cached = await cache.aget_orders(position_id=position)
+            if cache.holds_position(position, orders=cached):
+                return cached
         orders = await cls.mt5.history_orders_get(position=position)
-        return tuple(TradeOrder(**order._asdict()) for order in orders)
+        if cache is not None and orders:
+            await cache.asave(deals=(), orders=orders)
+        return TradeOrder.from_mt5_many(orders)
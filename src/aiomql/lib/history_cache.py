@@ -0,0 +1,421 @@
+"""Local journal of the history deals and orders of the trading account.
+
+This module provides the HistoryCache class and the HistoryDeal and
+HistoryOrder tables it keeps in the SQLite database. History and its
+synchronous counterpart use a cache to fetch from the terminal only the parts
+of a date range that haven't been fetched before, and answer range, position
+and ticket queries from the local tables.
+
+Example:
+    Reusing the history fetched by earlier runs::
+
+        cache = HistoryCache(refresh="auto", max_age=60)
+        history = History(date_from=datetime(2024, 1, 1), date_to=datetime.now(), cache=cache)
+        await history.initialize()
+
+        deals = await History.get_deals_by_position(position=12345, cache=cache)
+"""
+
+import json
+import sqlite3
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from fnmatch import fnmatchcase
+from functools import cache
+from logging import getLogger
+from typing import Callable, ClassVar, Iterable, MutableMapping, NamedTuple
+
+from ..core.config import Config
+from ..core.constants import DealEntry
+from ..core.db import DB
+from ..core.models import TradeDeal, TradeOrder
+
+logger = getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class HistoryDeal(DB):
+    """A deal of the account history, as returned by history_deals_get.
+
+    Indexes:
+        time_msc for date ranges and position_id for the deals of a position.
+    """
+    _table: ClassVar[str] = "history_deal"
+    ticket: int = field(metadata={"PRIMARY KEY": True, "NOT NULL": True})
+    order: int = 0
+    time: int = 0
+    time_msc: int = field(default=0, metadata={"INDEX": True})
+    type: int = 0
+    entry: int = 0
+    magic: int = 0
+    position_id: int = field(default=0, metadata={"INDEX": True})
+    reason: int = 0
+    volume: float = 0
+    price: float = 0
+    commission: float = 0
+    swap: float = 0
+    profit: float = 0
+    fee: float = 0
+    sl: float = 0
+    tp: float = 0
+    symbol: str = ""
+    comment: str = ""
+    external_id: str = ""
+
+
+@dataclass(kw_only=True)
+class HistoryOrder(DB):
+    """An order of the account history, as returned by history_orders_get.
+
+    Indexes:
+        time_setup_msc for date ranges and position_id for the orders of a position.
+    """
+    _table: ClassVar[str] = "history_order"
+    ticket: int = field(metadata={"PRIMARY KEY": True, "NOT NULL": True})
+    time_setup: int = 0
+    time_setup_msc: int = field(default=0, metadata={"INDEX": True})
+    time_expiration: int = 0
+    time_done: int = 0
+    time_done_msc: int = 0
+    type: int = 0
+    type_time: int = 0
+    type_filling: int = 0
+    state: int = 0
+    magic: int = 0
+    position_id: int = field(default=0, metadata={"INDEX": True})
+    position_by_id: int = 0
+    reason: int = 0
+    volume_current: float = 0
+    volume_initial: float = 0
+    price_open: float = 0
+    sl: float = 0
+    tp: float = 0
+    price_current: float = 0
+    price_stoplimit: float = 0
+    symbol: str = ""
+    comment: str = ""
+    external_id: str = ""
+
+
+class Coverage(NamedTuple):
+    """The time range, as timestamps in seconds, that has been fetched into a cache."""
+    start: float | None = None
+    end: float | None = None
+
+
+class HistoryCache:
+    """A persistent journal of the deals and orders of the account history.
+
+    Deals and orders are stored by ticket in the HistoryDeal and HistoryOrder tables, so fetching a range again
+    replaces them instead of adding duplicates. The cache keeps a single contiguous coverage, the time range
+    fetched so far, in the store. A date range is answered from the tables once it is covered, and only the parts
+    before or after the coverage are fetched from the terminal.
+
+    The refresh policy decides when the end of the coverage, where new deals arrive, is fetched again:
+
+    - auto: when the coverage ended more than max_age seconds ago.
+    - always: every time a range goes past the end of the coverage.
+    - never: never, the tables are only read and nothing is fetched.
+
+    The end is fetched again from overlap seconds before it, so deals timestamped slightly in the past by the
+    clock of the trade server aren't missed.
+
+    Attributes:
+        refresh (str): The refresh policy, one of REFRESH.
+        max_age (float): Seconds after which the end of the coverage is refreshed under the auto policy.
+        overlap (float): Seconds before the end of the coverage fetched again when refreshing.
+        deal_model (type[HistoryDeal]): The table of the deals.
+        order_model (type[HistoryOrder]): The table of the orders.
+    """
+    REFRESH: ClassVar[tuple[str, ...]] = ("auto", "always", "never")
+    COVERAGE_KEY: ClassVar[str] = "history_cache:{table}"
+
+    def __init__(self, *, refresh: str = "auto", max_age: float = 60, overlap: float = 86400,
+                 store: MutableMapping = None, deal_model: type[HistoryDeal] = HistoryDeal,
+                 order_model: type[HistoryOrder] = HistoryOrder):
+        """Create a cache.
+
+        Keyword Args:
+            refresh (str): The refresh policy, auto, always or never. Defaults to auto.
+            max_age (float): Seconds after which the end of the coverage is refreshed under the auto policy.
+                Defaults to 60.
+            overlap (float): Seconds before the end of the coverage fetched again when refreshing. Defaults to a day.
+            store (MutableMapping): Where the coverage is persisted. Defaults to config.store.
+            deal_model (type[HistoryDeal]): The table of the deals. Defaults to HistoryDeal.
+            order_model (type[HistoryOrder]): The table of the orders. Defaults to HistoryOrder.
+
+        Raises:
+            ValueError: For an unknown refresh policy.
+        """
+        if refresh not in self.REFRESH:
+            raise ValueError(f"Unknown refresh policy {refresh!r}, choose from {self.REFRESH}")
+        self.refresh = refresh
+        self.max_age = max_age
+        self.overlap = overlap
+        self.deal_model = deal_model
+        self.order_model = order_model
+        self._store = store
+
+    @property
+    def store(self) -> MutableMapping:
+        """The mapping in which the coverage is persisted."""
+        if self._store is None:
+            self._store = Config().store
+        return self._store
+
+    @property
+    def coverage_key(self) -> str:
+        """The key of the coverage in the store."""
+        return self.COVERAGE_KEY.format(table=self.deal_model._table)
+
+    def get_coverage(self) -> Coverage:
+        """The time range fetched so far, with None bounds before the first fetch."""
+        value = self.store.get(self.coverage_key)
+        try:
+            return Coverage(*json.loads(value)) if value else Coverage()
+        except (TypeError, ValueError):
+            # an unreadable coverage only costs fetching the ranges again
+            logger.warning("Unable to read the coverage of %s", self.deal_model._table)
+            return Coverage()
+
+    def set_coverage(self, coverage: Coverage):
+        """Persist the time range fetched so far, as JSON text that any store, including a Store, can keep."""
+        self.store[self.coverage_key] = json.dumps(list(coverage))
+
+    def extend(self, date_from: datetime, date_to: datetime):
+        """Add a fetched range to the coverage. The end is never later than now, since later deals can still come.
+
+        Args:
+            date_from: The start of the fetched range.
+            date_to: The end of the fetched range.
+        """
+        start, end = date_from.timestamp(), min(date_to.timestamp(), time.time())
+        coverage = self.get_coverage()
+        if coverage.start is not None:
+            start, end = min(start, coverage.start), max(end, coverage.end)
+        self.set_coverage(Coverage(start, end))
+
+    def clear(self):
+        """Delete the cached deals and orders and forget the coverage."""
+        self.deal_model.clear()
+        self.order_model.clear()
+        self.store.pop(self.coverage_key, None)
+
+    def is_fresh(self) -> bool:
+        """Whether queries that can't be bounded in time, such as the deals of a position, can be answered from
+        the cache: always under the never policy, and under the auto policy when the coverage ended less than
+        max_age seconds ago."""
+        if self.refresh == "never":
+            return True
+        coverage = self.get_coverage()
+        return self.refresh == "auto" and coverage.end is not None and time.time() - coverage.end < self.max_age
+
+    def holds_position(self, position: int, *, deals: Iterable[TradeDeal] = (),
+                       orders: Iterable[TradeOrder] = ()) -> bool:
+        """Whether the cached deals or orders of a position are all of them: the deal or the order opening the
+        position has to be among them, and, unless the policy is never, not before the start of the coverage,
+        since an older position can have deals the cache has never fetched.
+
+        Args:
+            position: The position ID.
+            deals: The cached deals of the position.
+            orders: The cached orders of the position.
+
+        Returns:
+            bool: True if the position can be answered from the cache.
+        """
+        opened = [deal.time_msc for deal in deals if deal.entry == DealEntry.IN]
+        opened += [order.time_setup_msc for order in orders if order.ticket == position]
+        if not opened:
+            return False
+        if self.refresh == "never":
+            return True
+        start = self.get_coverage().start
+        return start is not None and min(opened) / 1000 >= start
+
+    def windows(self, date_from: datetime, date_to: datetime) -> list[tuple[datetime, datetime]]:
+        """The ranges to fetch from the terminal before a date range can be answered from the cache.
+
+        The ranges join the coverage, so it stays contiguous.
+
+        Args:
+            date_from: The start of the date range.
+            date_to: The end of the date range.
+
+        Returns:
+            list[tuple[datetime, datetime]]: The ranges to fetch, none when the range is covered or the policy is
+                never.
+        """
+        if self.refresh == "never":
+            return []
+        coverage = self.get_coverage()
+        if coverage.start is None:
+            return [(date_from, date_to)]
+        windows = []
+        tz = date_from.tzinfo
+        if date_from.timestamp() < coverage.start:
+            windows.append((date_from, datetime.fromtimestamp(coverage.start, tz)))
+        if date_to.timestamp() > coverage.end and (self.refresh == "always"
+                                                    or time.time() - coverage.end >= self.max_age):
+            windows.append((datetime.fromtimestamp(coverage.end - self.overlap, tz), date_to))
+        return windows
+
+    def batches(self, deals: Iterable, orders: Iterable) -> list[tuple[str, list]]:
+        """The queries replacing the deals and orders by ticket, built before writing, since creating a record
+        creates its table on a connection of its own.
+        """
+        deals = [self.deal_model(**deal._asdict()) for deal in deals or ()]
+        orders = [self.order_model(**order._asdict()) for order in orders or ()]
+        return (self.deal_model.insert_batches(deals, replace=True)
+                + self.order_model.insert_batches(orders, replace=True))
+
+    def save(self, *, deals: Iterable, orders: Iterable, date_from: datetime = None, date_to: datetime = None) -> int:
+        """Store the deals and orders fetched from the terminal, replacing those with the same tickets.
+
+        Args:
+            deals: The deals, as returned by history_deals_get.
+            orders: The orders, as returned by history_orders_get.
+            date_from: The start of the range they were fetched for, added to the coverage with date_to. Defaults
+                to None, for deals and orders fetched by ticket or position.
+            date_to: The end of the range they were fetched for.
+
+        Returns:
+            int: The number of rows written.
+        """
+        batches = self.batches(deals, orders)
+        conn = self.deal_model.connection()
+        try:
+            count = self.deal_model.execute_many(conn, batches)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        if date_from is not None:
+            self.extend(date_from, date_to)
+        return count
+
+    async def asave(self, *, deals: Iterable, orders: Iterable, date_from: datetime = None,
+                    date_to: datetime = None) -> int:
+        """Store the deals and orders fetched from the terminal on the worker thread of the database.
+
+        Args:
+            deals: The deals, as returned by history_deals_get.
+            orders: The orders, as returned by history_orders_get.
+            date_from: The start of the range they were fetched for, added to the coverage with date_to. Defaults
+                to None, for deals and orders fetched by ticket or position.
+            date_to: The end of the range they were fetched for.
+
+        Returns:
+            int: The number of rows written.
+        """
+        batches = self.batches(deals, orders)
+        count = await self.deal_model.get_worker().run(self.deal_model.execute_many, batches, write=True)
+        if date_from is not None:
+            self.extend(date_from, date_to)
+        return count
+
+    @staticmethod
+    def group_filter(group: str) -> Callable[[str], bool]:
+        """A predicate matching symbols the way the group argument of the terminal does.
+
+        The group is a comma separated list of patterns with * wildcards. Patterns starting with ! exclude the
+        symbols they match.
+
+        Args:
+            group: The group, e.g. "*USD*,!EUR*".
+
+        Returns:
+            Callable[[str], bool]: Whether a symbol belongs to the group.
+        """
+        patterns = [pattern.strip() for pattern in group.split(",") if pattern.strip()]
+        include = [pattern for pattern in patterns if not pattern.startswith("!")]
+        exclude = [pattern[1:] for pattern in patterns if pattern.startswith("!")]
+
+        def matches(symbol: str) -> bool:
+            return ((not include or any(fnmatchcase(symbol, pattern) for pattern in include))
+                    and not any(fnmatchcase(symbol, pattern) for pattern in exclude))
+
+        return matches
+
+    @staticmethod
+    @cache
+    def row_type(name: str, columns: tuple[str, ...]) -> type[tuple]:
+        """The named tuple type of the rows of a table, like the tuples returned by the terminal."""
+        return namedtuple(name, columns)
+
+    @staticmethod
+    def _select(conn: sqlite3.Connection, model: type[DB], item: type | None, group: str = "", order: str = "",
+                **conditions) -> tuple:
+        query = model.query(**conditions)
+        if order:
+            query.order_by(order, "ticket")
+        cursor = conn.execute(*query.sql())
+        rows = map(HistoryCache.row_type(model.__name__, tuple(column[0] for column in cursor.description))._make,
+                   cursor)
+        if group:
+            matches = HistoryCache.group_filter(group)
+            rows = (row for row in rows if matches(row.symbol))
+        return tuple(rows) if item is None else tuple(item(**row._asdict()) for row in rows)
+
+    def _load(self, conn: sqlite3.Connection, date_from: datetime, date_to: datetime, group: str = "",
+              raw: bool = False) -> tuple[tuple, tuple]:
+        msc = (int(date_from.timestamp() * 1000), int(date_to.timestamp() * 1000))
+        deals = self._select(conn, self.deal_model, None if raw else TradeDeal, group, "time_msc",
+                             time_msc__between=msc)
+        orders = self._select(conn, self.order_model, None if raw else TradeOrder, group, "time_setup_msc",
+                              time_setup_msc__between=msc)
+        return deals, orders
+
+    def load(self, *, date_from: datetime, date_to: datetime, group: str = "", raw: bool = False) \
+            -> tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]:
+        """The cached deals and orders of a date range, in order of time.
+
+        Args:
+            date_from: The start of the range.
+            date_to: The end of the range, inclusive.
+            group: Only the symbols of the group, see group_filter. Defaults to all symbols.
+            raw: Return the rows as named tuples, like the terminal does, instead of TradeDeal and TradeOrder
+                objects. Defaults to False.
+
+        Returns:
+            tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]: The deals and the orders.
+        """
+        return self._load(self.deal_model.connection(), date_from, date_to, group, raw)
+
+    async def aload(self, *, date_from: datetime, date_to: datetime, group: str = "", raw: bool = False) \
+            -> tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]:
+        """The cached deals and orders of a date range, read on the worker thread of the database.
+
+        Args:
+            date_from: The start of the range.
+            date_to: The end of the range, inclusive.
+            group: Only the symbols of the group, see group_filter. Defaults to all symbols.
+            raw: Return the rows as named tuples, like the terminal does, instead of TradeDeal and TradeOrder
+                objects. Defaults to False.
+
+        Returns:
+            tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]: The deals and the orders.
+        """
+        return await self.deal_model.get_worker().run(self._load, date_from, date_to, group, raw, conn=True)
+
+    def get_deals(self, **conditions) -> tuple[TradeDeal, ...]:
+        """The cached deals matching the conditions, e.g. position_id=12345 or ticket=67890, in order of time."""
+        return self._select(self.deal_model.connection(), self.deal_model, TradeDeal, order="time_msc",
+                            **conditions)
+
+    def get_orders(self, **conditions) -> tuple[TradeOrder, ...]:
+        """The cached orders matching the conditions, e.g. position_id=12345 or ticket=67890, in order of time."""
+        return self._select(self.order_model.connection(), self.order_model, TradeOrder, order="time_setup_msc",
+                            **conditions)
+
+    async def aget_deals(self, **conditions) -> tuple[TradeDeal, ...]:
+        """The cached deals matching the conditions, read on the worker thread of the database."""
+        return await self.deal_model.get_worker().run(self._select, self.deal_model, TradeDeal, order="time_msc",
+                                                      conn=True, **conditions)
+
+    async def aget_orders(self, **conditions) -> tuple[TradeOrder, ...]:
+        """The cached orders matching the conditions, read on the worker thread of the database."""
+        return await self.order_model.get_worker().run(self._select, self.order_model, TradeOrder,
+                                                       order="time_setup_msc", conn=True, **conditions)
@@ -73,7 +73,7 @@ class Order(_Base, TradeRequest):
         orders = await cls.mt5.orders_get(ticket=ticket)
         for order_ in orders:
             if order_.ticket == ticket:
-                return TradeOrder(**order_._asdict())
+                return TradeOrder.from_mt5(order_)
         return None
 
     @classmethod
@@ -90,7 +90,7 @@ class Order(_Base, TradeRequest):
         """
         orders = await cls.mt5.orders_get(symbol=symbol, ticket=ticket, group=group)
         if orders is not None:
-            return tuple(TradeOrder(**order._asdict()) for order in orders)
+            return TradeOrder.from_mt5_many(orders)
         return tuple()
 
     @classmethod
@@ -174,7 +174,7 @@ class Order(_Base, TradeRequest):
     @property
     def request(self) -> dict:
         """Return the order request as a dictionary."""
-        return {key: value for key, value in self.dict.items() if key in self.mt5.TradeRequest.__match_args__}
+        return self.to_dict(self.MT5_FIELDS)
 
     @classmethod
     async def profit_to_price(cls, *, profit: float, order_type: OrderType, volume: float, symbol: str, price_open: float):
@@ -189,5 +189,5 @@ class Order(_Base, TradeRequest):
     async def get_history_order_by_ticket(cls, *, ticket: int) -> TradeOrder | None:
         res = await cls.mt5.history_orders_get(ticket=ticket)
         if res is not None and len(res) > 0 and res[0].ticket == ticket:
-            return TradeOrder(**res[0]._asdict())
+            return TradeOrder.from_mt5(res[0])
         return None
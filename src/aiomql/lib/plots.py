@@ -0,0 +1,211 @@
+"""Off-loop chart rendering for Candles.
+
+This module provides the PlotRenderer class which renders mplfinance charts in
+a process pool so that strategies do not block their event loop while a chart
+is drawn. Jobs are grouped into batches, each batch is rendered by a single
+worker and the number of batches rendering at the same time is capped.
+
+Example:
+    Rendering a chart from a strategy::
+
+        candles = await symbol.copy_rates_from_pos(timeframe=TimeFrame.H1, count=100)
+        path = await candles.aplot(filename="entry.png", subplots=[{"column": "ema", "color": "b"}])
+"""
+
+import multiprocessing
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging import getLogger
+from pathlib import Path
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Self
+
+logger = getLogger(__name__)
+
+
+def render_plots(jobs: list[dict]) -> list[str | Exception]:
+    """Render a batch of charts with mplfinance. Runs inside a worker process.
+
+    Args:
+        jobs: Plot jobs. Each job has the DataFrame to plot under 'data', the chart 'type', the 'subplots'
+            specifications, the 'savefig' path and extra mplfinance.plot keyword arguments under 'kwargs'.
+
+    Returns:
+        list[str | Exception]: The saved file path of each job or the exception that made it fail.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import mplfinance as mpf
+
+    results = []
+    for job in jobs:
+        try:
+            data = job["data"]
+            addplot = []
+            for spec in job["subplots"]:
+                spec = dict(spec)
+                addplot.append(mpf.make_addplot(data[spec.pop("column")], **spec))
+            mpf.plot(data, type=job["type"], addplot=addplot, savefig=job["savefig"], **job["kwargs"])
+            results.append(job["savefig"])
+        except Exception as err:
+            results.append(err)
+    return results
+
+
+class PlotRenderer:
+    """A singleton that renders charts in a process pool.
+
+    Jobs submitted from any thread or event loop are collected by a dispatcher thread into batches of up
+    to batch_size jobs, waiting at most batch_delay seconds for a batch to fill. Every batch is rendered by
+    one worker process and at most max_concurrent batches are rendered at the same time.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+        max_concurrent (int): Maximum number of batches rendering at the same time.
+        batch_size (int): Maximum number of jobs per batch.
+        batch_delay (float): Seconds to wait for more jobs before dispatching a batch.
+    """
+    _instance: Self
+    max_workers: int
+    max_concurrent: int
+    batch_size: int
+    batch_delay: float
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, *, max_workers: int = 2, max_concurrent: int = None, batch_size: int = 4,
+                 batch_delay: float = 0.05):
+        """Initialize the renderer. Only the first instantiation sets the options.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to 2.
+            max_concurrent: Maximum number of batches rendering at the same time. Defaults to max_workers.
+            batch_size: Maximum number of jobs per batch. Defaults to 4.
+            batch_delay: Seconds to wait for more jobs before dispatching a batch. Defaults to 0.05.
+        """
+        if self._initialized:
+            return
+        self.max_workers = max_workers
+        self.max_concurrent = max_concurrent or max_workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._jobs: queue.Queue[tuple[dict, Future] | None] = queue.Queue()
+        self._slots = BoundedSemaphore(self.max_concurrent)
+        self._lock = Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._dispatcher: Thread | None = None
+        self._stopping: Thread | None = None
+        self._initialized = True
+
+    def submit(self, job: dict) -> Future:
+        """Queue a plot job for rendering.
+
+        Args:
+            job: The plot job. See render_plots for the expected keys.
+
+        Returns:
+            Future: A concurrent Future that resolves to the Path of the saved chart.
+        """
+        future = Future()
+        with self._lock:
+            if self._pool is None:
+                # the dispatcher of a renderer stopped without waiting must be done with its pool first
+                if self._stopping is not None:
+                    self._stopping.join()
+                    self._stopping = None
+                # spawn, as on Windows, so workers never inherit the threads of the bot
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                self._jobs = queue.Queue()
+                self._dispatcher = Thread(target=self._dispatch, args=(self._pool, self._jobs), daemon=True,
+                                          name="PlotRenderer")
+                self._dispatcher.start()
+            self._jobs.put((job, future))
+        return future
+
+    def _next_batch(self, jobs: queue.Queue) -> list[tuple[dict, Future]] | None:
+        """Wait for a job and collect up to batch_size jobs into a batch.
+
+        Args:
+            jobs: The queue of the dispatcher.
+
+        Returns:
+            list[tuple[dict, Future]] | None: The batch, or None when the renderer is stopped.
+        """
+        item = jobs.get()
+        if item is None:
+            return None
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = jobs.get(timeout=self.batch_delay)
+            except queue.Empty:
+                break
+            if item is None:
+                jobs.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self, pool: ProcessPoolExecutor, jobs: queue.Queue):
+        """Send batches to the process pool, waiting for a free slot before each one.
+
+        Once stopped, waits for the batches sent to the pool and shuts it down.
+
+        Args:
+            pool: The process pool of the dispatcher.
+            jobs: The queue of the dispatcher.
+        """
+        while (batch := self._next_batch(jobs)) is not None:
+            self._slots.acquire()
+            try:
+                result = pool.submit(render_plots, [job for job, _ in batch])
+                result.add_done_callback(lambda res, batch=batch: self._resolve(batch, res))
+            except Exception as err:
+                self._slots.release()
+                logger.error("%s: Unable to submit plot jobs", err)
+                [future.set_exception(err) for _, future in batch]
+        pool.shutdown(wait=True)
+
+    def _resolve(self, batch: list[tuple[dict, Future]], result: Future):
+        """Set the outcome of every job in a rendered batch.
+
+        Args:
+            batch: The jobs and their futures.
+            result: The future of the render_plots call.
+        """
+        self._slots.release()
+        try:
+            outcomes = result.result()
+        except Exception as err:
+            logger.error("%s: Unable to render plots", err)
+            outcomes = [err] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(Path(outcome))
+
+    def stop(self, wait: bool = True):
+        """Render the queued jobs and stop the worker processes.
+
+        Jobs submitted afterwards start a new pool.
+
+        Args:
+            wait: If True, block until all queued charts are rendered. Defaults to True.
+        """
+        with self._lock:
+            if self._pool is None:
+                return
+            self._jobs.put(None)
+            self._stopping = self._dispatcher
+            self._pool = None
+            self._dispatcher = None
+            if wait:
+                self._stopping.join()
+                self._stopping = None
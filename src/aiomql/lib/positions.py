@@ -12,7 +12,13 @@ Example:
 """
 
 import asyncio
+from functools import cached_property
 from logging import getLogger
+from operator import attrgetter
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
 
 from ..core.meta_trader import MetaTrader
 from ..core.base import BaseMeta
@@ -25,6 +31,117 @@ from .order import Order
 
 logger = getLogger(__name__)
 
+# The columns of a positions snapshot. Symbols are stored as codes into PositionsSnapshot.symbols.
+POSITION_COLUMNS: dict[str, str] = {
+    "ticket": "i8", "symbol": "i4", "type": "i1", "volume": "f8", "price_open": "f8", "sl": "f8", "tp": "f8",
+    "profit": "f8", "magic": "i8"}
+
+
+class PositionsSnapshot:
+    """Open positions as columnar arrays, for risk checks over many positions without a Python loop.
+
+    The positions are transposed into one array per column of POSITION_COLUMNS. Symbols are coded as
+    indexes into ``symbols``, so aggregations per symbol are a bincount over the codes.
+
+    Attributes:
+        positions (tuple): The positions the snapshot was built from, as given.
+        tickets (dict[int, Any]): The positions by ticket.
+        symbols (tuple[str, ...]): The symbols of the positions in order of appearance; a symbol code
+            indexes this tuple.
+        columns (dict[str, np.ndarray]): The arrays by column name.
+        ticket, symbol, type, volume, price_open, sl, tp, profit, magic (np.ndarray): The columns.
+
+    Example:
+        Exposure and losers of the open positions::
+
+            snapshot = await Positions.get_snapshot()
+            snapshot.exposure()  # {'EURUSD': 0.3, 'XAUUSD': -0.1}
+            snapshot.count_losers()
+    """
+
+    def __init__(self, positions: Iterable = ()):
+        """Builds the arrays of a snapshot.
+
+        Args:
+            positions (Iterable): Positions as returned by positions_get, or TradePosition objects.
+        """
+        self.positions = positions = tuple(positions)
+        if positions and hasattr(positions[0], "_fields"):
+            values = dict(zip(positions[0]._fields, zip(*positions)))
+        else:
+            values = dict(zip(POSITION_COLUMNS, zip(*map(attrgetter(*POSITION_COLUMNS), positions))))
+        symbols = values.get("symbol", ())
+        codes = {symbol: code for code, symbol in enumerate(dict.fromkeys(symbols))}
+        self.symbols = tuple(codes)
+        values["symbol"] = map(codes.__getitem__, symbols)
+        self.columns = {name: np.fromiter(values.get(name, ()), dtype=kind, count=len(positions))
+                        for name, kind in POSITION_COLUMNS.items()}
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @cached_property
+    def tickets(self) -> dict[int, Any]:
+        """The positions by ticket, built on first use."""
+        return dict(zip(self.ticket.tolist(), self.positions))
+
+    def get_position(self, ticket: int) -> TradePosition | None:
+        """The open position with a ticket as a TradePosition, or None if it is not in the snapshot."""
+        position = self.tickets.get(ticket)
+        if position is None or isinstance(position, TradePosition):
+            return position
+        return TradePosition.from_mt5(position)
+
+    def code(self, symbol: str) -> int:
+        """The code of a symbol, or -1 if there is no position on it."""
+        try:
+            return self.symbols.index(symbol)
+        except ValueError:
+            return -1
+
+    @property
+    def signed_volume(self) -> np.ndarray:
+        """The volume of each position, negative for sell positions."""
+        return np.where(self.type == OrderType.BUY, self.volume, -self.volume)
+
+    def exposure(self, *, gross: bool = False) -> dict[str, float]:
+        """The volume per symbol.
+
+        Args:
+            gross (bool): Add up the volumes of buy and sell positions instead of netting them.
+
+        Returns:
+            dict[str, float]: The net, or gross, volume of each symbol
+        """
+        weights = self.volume if gross else self.signed_volume
+        totals = np.bincount(self.symbol, weights=weights, minlength=len(self.symbols))
+        return dict(zip(self.symbols, totals.tolist()))
+
+    def net_volume(self, symbol: str = None) -> float:
+        """The buy volume less the sell volume, of all positions or of the positions on a symbol."""
+        volume = self.signed_volume
+        if symbol is not None:
+            volume = volume[self.symbol == self.code(symbol)]
+        return float(volume.sum())
+
+    def profit_by_magic(self) -> dict[int, float]:
+        """The total profit of the positions of each magic number."""
+        magics, codes = np.unique(self.magic, return_inverse=True)
+        return dict(zip(magics.tolist(), np.bincount(codes, weights=self.profit, minlength=len(magics)).tolist()))
+
+    def count_losers(self, threshold: float = 0) -> int:
+        """The number of positions whose profit is less than or equal to threshold."""
+        return int(np.count_nonzero(self.profit <= threshold))
+
+    def frame(self) -> pd.DataFrame:
+        """The snapshot as a DataFrame indexed by ticket, with symbol names instead of codes."""
+        frame = pd.DataFrame(self.columns).set_index("ticket")
+        frame["symbol"] = np.array(self.symbols, dtype=object)[self.symbol] if self.symbols else []
+        return frame
+
+
 class Positions(metaclass=BaseMeta):
     """Get Open Positions.
 
@@ -46,10 +163,28 @@ class Positions(metaclass=BaseMeta):
             kwargs["group"] = group
         positions = await cls.mt5.positions_get(**kwargs)
         if positions is not None:
-            return tuple(TradePosition(**pos._asdict()) for pos in positions)
+            return TradePosition.from_mt5_many(positions)
         logger.warning("Failed to get open positions")
         return ()
 
+    @classmethod
+    async def get_snapshot(cls, *, symbol: str = None, group: str = None) -> PositionsSnapshot:
+        """Get the open positions as columnar arrays, without building a TradePosition per position.
+
+        Args:
+            symbol (str): Only the positions of this symbol.
+            group (str): Only the positions of the symbols matching this group.
+
+        Returns:
+            PositionsSnapshot: The open positions, empty if they could not be retrieved
+        """
+        kwargs = {key: value for key, value in (("symbol", symbol), ("group", group)) if value is not None}
+        positions = await cls.mt5.positions_get(**kwargs)
+        if positions is None:
+            logger.warning("Failed to get open positions")
+            positions = ()
+        return PositionsSnapshot(positions)
+
     @classmethod
     async def get_position_by_ticket(cls, *, ticket: int) -> TradePosition | None:
         """Get an open position by ticket.
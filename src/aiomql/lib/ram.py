@@ -13,7 +13,7 @@ Example:
 """
 
 from .account import Account
-from .positions import Positions
+from .positions import Positions, PositionsSnapshot
 
 
 class RAM:
@@ -90,8 +90,7 @@ class RAM:
             bool: True if the number of losing positions is less than or equal the loss limit
         """
         positions = await self.account.mt5.positions_get()
-        loosing = [position for position in positions if position.profit <= 0]
-        return len(loosing) <= self.loss_limit
+        return PositionsSnapshot(positions).count_losers() <= self.loss_limit
 
     async def check_open_positions(self) -> bool:
         """Check if the number of open positions is less than or equal the loss limit.
@@ -109,8 +108,7 @@ class RAM:
             bool: True if the number of losing positions is less than or equal the loss limit
         """
         positions = self.account.mt5._positions_get()
-        loosing = [position for position in positions if position.profit <= 0]
-        return len(loosing) <= self.loss_limit
+        return PositionsSnapshot(positions).count_losers() <= self.loss_limit
 
     def check_open_positions_sync(self) -> bool:
         """Check if the number of open positions is less than or equal the loss limit.
@@ -0,0 +1,200 @@
+"""Append-only writers for trade record files.
+
+This module provides the CSVWriter and JSONLWriter classes. A writer keeps its
+trade record file open in append mode and adds one row per trade, so recording
+a trade costs the same no matter how many trades the file already holds.
+Writers are shared per file and writes to the same file are serialized with a
+per-file lock, so strategies running on different threads can record to the
+same file.
+
+Example:
+    Appending a row to a trade record file::
+
+        writer = CSVWriter(config.records_dir / "MyStrategy.csv")
+        writer.write({"order": 1234, "symbol": "EURUSD", "profit": 0})
+"""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from logging import getLogger
+from pathlib import Path
+from threading import Lock, RLock
+from typing import ClassVar, Iterator, Self, TextIO
+
+logger = getLogger(__name__)
+
+
+class RecordWriter(ABC):
+    """Base class of the append-only trade record writers, one writer per file and writer class.
+
+    Attributes:
+        file (Path): The trade record file.
+        lock (RLock): Serializes the writes to the file.
+    """
+    _instances: ClassVar[dict[tuple[type, str], Self]] = {}
+    _lock: ClassVar[Lock] = Lock()
+    file: Path
+    lock: RLock
+
+    def __new__(cls, file: str | Path):
+        key = (cls, str(Path(file).absolute()))
+        with cls._lock:
+            if (writer := cls._instances.get(key)) is None:
+                writer = super().__new__(cls)
+                writer._initialized = False
+                cls._instances[key] = writer
+        return writer
+
+    def __init__(self, file: str | Path):
+        """Get the writer of a file. The file is opened on the first write.
+
+        Args:
+            file: Path to the trade record file.
+        """
+        if self._initialized:
+            return
+        self.file = Path(file)
+        self.lock = RLock()
+        self._handle: TextIO | None = None
+        self._initialized = True
+
+    def _open(self):
+        """Open the file for appending."""
+        self._handle = self.file.open("a", newline="")
+
+    @abstractmethod
+    def _write_rows(self, rows: list[dict]):
+        """Write rows to the open file."""
+
+    def write(self, row: dict):
+        """Append a row to the file.
+
+        Args:
+            row: The row.
+        """
+        self.write_many([row])
+
+    def write_many(self, rows: list[dict]):
+        """Append rows to the file with a single flush.
+
+        Args:
+            rows: The rows.
+        """
+        with self.lock:
+            if self._handle is None:
+                self._open()
+            self._write_rows(rows)
+            self._handle.flush()
+
+    def close(self):
+        """Close the file. The next write opens it again."""
+        with self.lock:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = None
+
+    @classmethod
+    @contextmanager
+    def locked(cls, file: str | Path) -> Iterator[Self]:
+        """Hold the lock of a file and close its writer, for code that rewrites or replaces the file.
+
+        Args:
+            file: Path to the trade record file.
+
+        Yields:
+            RecordWriter: The writer of the file.
+        """
+        writer = cls(file)
+        with writer.lock:
+            writer.close()
+            yield writer
+
+    @classmethod
+    def close_all(cls):
+        """Close the files of every writer of this class and its subclasses."""
+        with cls._lock:
+            writers = [writer for writer in cls._instances.values() if isinstance(writer, cls)]
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception as err:
+                logger.error("%s: Unable to close %s", err, writer.file)
+
+
+class CSVWriter(RecordWriter):
+    """An append-only writer of a csv trade record file.
+
+    The header of an existing file is read once, when the file is opened. A row with columns that are not in
+    the header, such as a strategy parameter that was added, rotates the file: the current file is renamed to
+    `{stem}.{n}.csv` and a new file is started with the extended header. Every file on disk therefore keeps a
+    header that matches its rows, and nothing is ever rewritten. Columns missing from a row are left empty.
+
+    Attributes:
+        fieldnames (list[str]): The header of the file.
+    """
+    fieldnames: list[str]
+
+    def __init__(self, file: str | Path):
+        """Get the writer of a file. The file is opened on the first write.
+
+        Args:
+            file: Path to the csv file.
+        """
+        if self._initialized:
+            return
+        super().__init__(file)
+        self.fieldnames = []
+        self._writer: csv.DictWriter | None = None
+
+    def _open(self):
+        """Open the file for appending, reading the header of an existing file or writing a new one."""
+        self.fieldnames = []
+        if self.file.exists() and self.file.stat().st_size:
+            with self.file.open("r", newline="") as fh:
+                self.fieldnames = next(csv.reader(fh), [])
+        super()._open()
+        self._writer = csv.DictWriter(self._handle, fieldnames=self.fieldnames, restval="", extrasaction="ignore")
+        if self.fieldnames and self._handle.tell() == 0:
+            self._writer.writeheader()
+
+    def _rotate(self, fieldnames: list[str]):
+        """Move the current file aside and start a new file with the given header."""
+        self.close()
+        if self.file.exists() and self.file.stat().st_size:
+            index = 1
+            while (rotated := self.file.with_name(f"{self.file.stem}.{index}{self.file.suffix}")).exists():
+                index += 1
+            self.file.rename(rotated)
+        self.fieldnames = fieldnames
+        self._handle = self.file.open("w", newline="")
+        self._writer = csv.DictWriter(self._handle, fieldnames=self.fieldnames, restval="", extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write_rows(self, rows: list[dict]):
+        for row in rows:
+            if new := [key for key in row if key not in self.fieldnames]:
+                self._rotate(self.fieldnames + new)
+            self._writer.writerow(row)
+
+    def close(self):
+        """Close the file. The next write opens it again."""
+        with self.lock:
+            super().close()
+            self._writer = None
+
+
+class JSONLWriter(RecordWriter):
+    """An append-only writer of a JSON Lines trade record file, one JSON object per line.
+
+    Values that are not JSON serializable are written as their string representation.
+    """
+
+    @staticmethod
+    def serialize(value) -> str:
+        """Fallback serializer for values that are not JSON serializable."""
+        return str(value)
+
+    def _write_rows(self, rows: list[dict]):
+        self._handle.write("".join(json.dumps(row, default=self.serialize) + "\n" for row in rows))
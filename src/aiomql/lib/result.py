@@ -1,7 +1,7 @@
 """Result module for recording and storing trade results.
 
 This module provides the Result class for saving trade results and
-strategy parameters to CSV, JSON, or SQL formats for record keeping
+strategy parameters to CSV, JSON, JSON Lines or SQL formats for record keeping
 and analysis.
 
 Example:
@@ -14,32 +14,37 @@ Example:
             time=1705312800000,
             expected_profit=50.0
         )
-        await result.save()  # Saves to configured format (csv/json/sql)
+        await result.save()  # Saves to configured format (csv/json/jsonl/sql)
 
     Recording synchronously::
 
         result.save_sync(trade_record_mode='csv')  # Force CSV format
 """
 
-import csv
+import atexit
 import json
 from datetime import datetime
 from logging import getLogger
-from typing import Iterable, Literal
-from threading import Lock
+from pathlib import Path
+from typing import Literal, Self
+from threading import Event, Lock, Thread
 
 from ..core.config import Config
 from ..core.models import OrderSendResult
+from .record_writers import CSVWriter, JSONLWriter
 from .result_db import ResultDB
 
 logger = getLogger(__name__)
 
+RESULT_EXCLUDE = frozenset({"retcode", "comment", "retcode_external", "request_id", "request"})
+REQUEST_FIELDS = ("symbol", "sl", "tp", "type")
+
 
 class Result:
     """Handler for trade results and strategy parameters for record keeping.
 
     Manages the recording of trade execution results and associated strategy
-    parameters to various storage formats (CSV, JSON, or SQL database).
+    parameters to various storage formats (CSV, JSON, JSON Lines or SQL database).
     Uses thread-safe locking for concurrent write operations.
 
     Attributes:
@@ -107,13 +112,31 @@ class Result:
             Logs an error if the save operation fails.
         """
         try:
-            data = self.get_data() | {"name": self.name}
-            data = ResultDB.filter_dict(data)
-            db = ResultDB(**data)
-            db.save(commit=True)
+            self.get_result_db().save(commit=True)
         except Exception as err:
             logger.error("%s: Error occurred while saving", err)
 
+    def get_result_db(self) -> ResultDB:
+        """Create the ResultDB record of the trade.
+
+        Returns:
+            ResultDB: The record, with the fields of get_data that are ResultDB fields.
+        """
+        data = self.get_data() | {"name": self.name}
+        return ResultDB(**ResultDB.filter_dict(data))
+
+    def get_csv_data(self) -> dict:
+        """Prepare the csv row of the trade.
+
+        Returns:
+            dict: The data of get_data with the time in seconds and the
+                parameters flattened into the row.
+        """
+        data = self.get_data()
+        data["time"] = data["time"] / 1000
+        parameters = data.pop("parameters", {})
+        return data | parameters
+
     def get_data(self) -> dict:
         """Prepare trade data for storage.
 
@@ -132,18 +155,18 @@ class Result:
             Fields 'retcode', 'comment', 'retcode_external', 'request_id',
             and 'request' are excluded from the order result.
         """
-        res = self.result.get_dict(exclude={"retcode", "comment", "retcode_external", "request_id", "request"})
-        req = self.result.request.get_dict(include={"symbol", "type", "sl", "tp"})
+        res = self.result.to_dict(self.result.dict_fields(RESULT_EXCLUDE))
+        req = self.result.request.to_dict(REQUEST_FIELDS)
         return res | {"profit": 0, "closed": False, "win": False, "parameters": self.parameters} | req |self.extra_params
 
-    async def save(self, *, trade_record_mode: Literal["csv", "json", "sql"] = None):
+    async def save(self, *, trade_record_mode: Literal["csv", "json", "jsonl", "sql"] = None):
         """Save trade results asynchronously to the configured storage format.
 
-        Thread-safe method that records trade results to CSV, JSON, or SQL
-        format based on configuration or explicit parameter.
+        Thread-safe method that records trade results to CSV, JSON, JSON Lines
+        or SQL format based on configuration or explicit parameter.
 
         Args:
-            trade_record_mode (Literal['csv', 'json', 'sql']): Storage format
+            trade_record_mode (Literal['csv', 'json', 'jsonl', 'sql']): Storage format
                 to use. If None, uses the mode from Config.trade_record_mode.
 
         Note:
@@ -156,19 +179,21 @@ class Result:
                 self.to_csv()
             elif trade_record_mode == "json":
                 self.to_json()
+            elif trade_record_mode == "jsonl":
+                self.to_jsonl()
             elif trade_record_mode == "sql":
                 self.to_sql()
             else:
                 logger.error(f"Invalid trade record mode: {trade_record_mode}")
 
-    def save_sync(self, *, trade_record_mode: Literal["csv", "json", "sql"] = None):
+    def save_sync(self, *, trade_record_mode: Literal["csv", "json", "jsonl", "sql"] = None):
         """Save trade results synchronously to the configured storage format.
 
         Thread-safe synchronous method that records trade results to CSV, JSON,
-        or SQL format based on configuration or explicit parameter.
+        JSON Lines or SQL format based on configuration or explicit parameter.
 
         Args:
-            trade_record_mode (Literal['csv', 'json', 'sql']): Storage format
+            trade_record_mode (Literal['csv', 'json', 'jsonl', 'sql']): Storage format
                 to use. If None, uses the mode from Config.trade_record_mode.
 
         Note:
@@ -181,6 +206,8 @@ class Result:
                 self.to_csv()
             elif trade_record_mode == "json":
                 self.to_json()
+            elif trade_record_mode == "jsonl":
+                self.to_jsonl()
             elif trade_record_mode == "sql":
                 self.to_sql()
             else:
@@ -190,8 +217,9 @@ class Result:
         """Save trade results and parameters to a CSV file.
 
         Appends the trade record to a CSV file in the configured records
-        directory. Creates the file if it doesn't exist. Handles dynamic
-        column headers by reading existing headers and merging with new data.
+        directory through the CSVWriter of the file, which keeps the file open
+        and never rewrites it. A record with parameters that are not columns of
+        the file yet rotates the file, see CSVWriter.
 
         The file is named '{self.name}.csv' and stored in config.records_dir.
 
@@ -199,24 +227,7 @@ class Result:
             Logs an error if the save operation fails.
         """
         try:
-            data = self.get_data()
-            data["time"] = data["time"] / 1000
-            parameters = data.pop("parameters", {})
-            data |= parameters
-            file = self.config.records_dir / f"{self.name}.csv"
-            file.touch(exist_ok=True) if not file.exists() else ...
-            read_file = file.open("r", newline="")
-            reader: Iterable[dict] = csv.DictReader(read_file)
-            rows: list[dict] = []
-            headers = set()
-            [(rows.append(row), headers.update(row.keys())) for row in reader]
-            rows.append(data)
-            headers.update(data.keys())
-            read_file.close()
-            with file.open("w", newline="") as write_file:
-                writer = csv.DictWriter(write_file, fieldnames=headers, restval=None, extrasaction="ignore")
-                writer.writeheader()
-                writer.writerows(rows)
+            CSVWriter(self.config.records_dir / f"{self.name}.csv").write(self.get_csv_data())
         except Exception as err:
             logger.error(f"Unable to save to csv: {err}")
 
@@ -254,21 +265,219 @@ class Result:
             Logs an error if the save operation fails.
         """
         try:
-            file = self.config.records_dir / f"{self.name}.json"
-            data = self.get_data()
-            if not file.exists():
-                file.touch()
-                with file.open("w") as fh:
-                    json.dump([], fh, indent=2)
-
-            try:
-                with file.open("r") as fh:
-                    rows = json.load(fh)
-                    rows.append(data)
-            except json.decoder.JSONDecodeError as _:
-                rows = [data]
+            self.write_json(self.config.records_dir / f"{self.name}.json", [self.get_data()])
+        except Exception as err:
+            logger.error(f"Unable to save as json file: {err}")
+
+    @classmethod
+    def write_json(cls, file: Path, rows: list[dict]):
+        """Append rows to a JSON array file, creating it if it doesn't exist.
 
+        Args:
+            file: The JSON file.
+            rows: The records to append.
+        """
+        if not file.exists():
+            file.touch()
             with file.open("w") as fh:
-                json.dump(rows, fh, indent=2, skipkeys=True, default=self.serialize)
+                json.dump([], fh, indent=2)
+
+        try:
+            with file.open("r") as fh:
+                data = json.load(fh)
+                data.extend(rows)
+        except json.decoder.JSONDecodeError as _:
+            data = rows
+
+        with file.open("w") as fh:
+            json.dump(data, fh, indent=2, skipkeys=True, default=cls.serialize)
+
+    def to_jsonl(self):
+        """Save trade results and parameters to a JSON Lines file.
+
+        Appends the trade record as one line to a JSON Lines file in the
+        configured records directory through the JSONLWriter of the file. The
+        file is never read or rewritten, closed trades are recorded by
+        TradeRecords as update lines appended to the same file.
+
+        The file is named '{self.name}.jsonl' and stored in config.records_dir.
+
+        Note:
+            Logs an error if the save operation fails.
+        """
+        try:
+            JSONLWriter(self.config.records_dir / f"{self.name}.jsonl").write(self.get_data())
         except Exception as err:
-            logger.error(f"Unable to save as json file: {err}")
+            logger.error(f"Unable to save as jsonl file: {err}")
+
+    @classmethod
+    def save_many(cls, results: list[Self], *, trade_record_mode: Literal["csv", "json", "jsonl", "sql"] = None):
+        """Save many trade results with one write per file, or a single transaction in sql mode.
+
+        In sql mode the records are inserted with ResultDB.save_many. If the
+        transaction fails, for example because one of the orders is already
+        recorded, the results are saved one at a time so that the others are
+        not lost.
+
+        Args:
+            results: The trade results to save.
+            trade_record_mode (Literal['csv', 'json', 'jsonl', 'sql']): Storage format
+                to use. If None, uses the mode from Config.trade_record_mode.
+
+        Note:
+            Logs an error for invalid trade record modes and failed writes.
+        """
+        if not results:
+            return
+        with cls.lock:
+            config = results[0].config
+            trade_record_mode = trade_record_mode or config.trade_record_mode
+            if trade_record_mode == "sql":
+                try:
+                    ResultDB.save_many([result.get_result_db() for result in results])
+                except Exception as err:
+                    logger.error("%s: Unable to save %d results in one transaction, saving them one at a time",
+                                 err, len(results))
+                    for result in results:
+                        result.to_sql()
+                return
+            if trade_record_mode not in ("csv", "json", "jsonl"):
+                logger.error(f"Invalid trade record mode: {trade_record_mode}")
+                return
+            files: dict[str, list[Self]] = {}
+            for result in results:
+                files.setdefault(result.name, []).append(result)
+            for name, group in files.items():
+                file = config.records_dir / f"{name}.{trade_record_mode}"
+                try:
+                    if trade_record_mode == "csv":
+                        CSVWriter(file).write_many([result.get_csv_data() for result in group])
+                    elif trade_record_mode == "json":
+                        cls.write_json(file, [result.get_data() for result in group])
+                    else:
+                        JSONLWriter(file).write_many([result.get_data() for result in group])
+                except Exception as err:
+                    logger.error("%s: Unable to save %d results to %s", err, len(group), file)
+
+
+class ResultSink:
+    """A singleton that collects the trade results of every strategy and saves them in batches.
+
+    Results are buffered and saved with Result.save_many on a background thread, every `interval` seconds or
+    as soon as `batch_size` results are waiting, so a batch costs one write per file in the csv, json and
+    jsonl modes and one transaction in the sql mode. Stopping the sink saves the buffered results, and a
+    result added after it was stopped starts it again, so the sink can be reused in the same process.
+
+    Attributes:
+        batch_size (int): Number of buffered results that triggers a save.
+        interval (float): Seconds between background saves.
+        batches (int): Number of batches saved.
+        records (int): Number of results saved.
+    """
+    _instance: Self
+    batch_size: int
+    interval: float
+    batches: int
+    records: int
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, *, batch_size: int = None, interval: float = None):
+        """Initialize the sink. Only the first instantiation sets the options.
+
+        Args:
+            batch_size: Number of buffered results that triggers a save. Defaults to Config.record_batch_size.
+            interval: Seconds between background saves. Defaults to Config.record_flush_interval.
+        """
+        if self._initialized:
+            return
+        config = Config()
+        self.batch_size = batch_size or config.record_batch_size
+        self.interval = interval or config.record_flush_interval
+        self.batches = 0
+        self.records = 0
+        self._buffer: list[tuple[Result, str | None]] = []
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._initialized = True
+        # last resort final save for bots that exit without going through Executor.exit
+        atexit.register(self.stop)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered results."""
+        return len(self._buffer)
+
+    def add(self, result: Result, *, trade_record_mode: Literal["csv", "json", "jsonl", "sql"] = None):
+        """Buffer a trade result for saving.
+
+        Args:
+            result: The trade result.
+            trade_record_mode (Literal['csv', 'json', 'jsonl', 'sql']): Storage format
+                to use. If None, uses the mode from Config.trade_record_mode when the batch is saved.
+        """
+        with self._lock:
+            self._buffer.append((result, trade_record_mode))
+            pending = len(self._buffer)
+            if not self.running:
+                # every thread gets its own stop event, so a stop in progress can't be undone by a restart
+                self._stop = Event()
+                self._thread = Thread(target=self._run, args=(self._stop,), daemon=True, name="ResultSink")
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Save the buffered results on the calling thread."""
+        with self._flush_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, []
+            if not buffer:
+                return
+            modes: dict[str | None, list[Result]] = {}
+            for result, trade_record_mode in buffer:
+                modes.setdefault(trade_record_mode, []).append(result)
+            for trade_record_mode, results in modes.items():
+                try:
+                    Result.save_many(results, trade_record_mode=trade_record_mode)
+                except Exception as err:
+                    logger.error("%s: Unable to save %d results", err, len(results))
+            self.batches += 1
+            self.records += len(buffer)
+
+    def _run(self, stop: Event):
+        """Save every interval or when woken up, until stopped.
+
+        Args:
+            stop: The stop event of the thread.
+        """
+        while not stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self):
+        """Stop the background thread and save the buffered results.
+
+        Results added afterwards start a new background thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            stop = self._stop
+        if thread is not None:
+            stop.set()
+            self._wake.set()
+            thread.join()
+        self.flush()
@@ -29,13 +29,16 @@ Example:
 
         # Get all closed trades
         closed_trades = ResultDB.filter(closed=True)
+
+    Querying strategy parameters inside SQLite::
+
+        trades = ResultDB.query(name='MyStrategy', parameters__fast_ema__gte=10).all()
 """
 
-import pickle
 from dataclasses import dataclass, field
 from typing import ClassVar
 
-from ..core.db import DB
+from ..core.db import DB, JSONField
 
 
 @dataclass(kw_only=True)
@@ -66,12 +69,20 @@ class ResultDB(DB):
         closed: Whether the trade has been closed. Defaults to False.
         profit: Final profit/loss amount. Defaults to 0.
         comment: Optional trade comment. Defaults to empty string.
-        parameters: Strategy parameters, stored as pickled bytes in the
-            database. Can be dict, bytes, or str. Defaults to empty string.
+        parameters: Strategy parameters, stored as JSON text in the database
+            and decoded on first access. Pickled bytes, the format of earlier
+            versions, are still read and are rewritten as JSON when the table
+            is initialized. Defaults to an empty dict.
 
     Class Attributes:
         _table: The database table name ('result').
 
+    Indexes:
+        (name, time) and (symbol, time) for per strategy and per symbol time
+        range queries, closed for the lookup of open trades, and
+        (closed, name, time_close, profit) and (closed, symbol, time_close,
+        profit), which cover the reports and equity curves of ResultReport.
+
     Example:
         >>> result = ResultDB(
         ...     deal=123, order=456, name='Test', symbol='EURUSD',
@@ -80,11 +91,13 @@ class ResultDB(DB):
         >>> result.save()
     """
     _table: ClassVar[str] = "result"
+    INDEXES: ClassVar[dict[str, tuple[str, ...]]] = {"closed_name": ("closed", "name", "time_close", "profit"),
+                                                     "closed_symbol": ("closed", "symbol", "time_close", "profit")}
     deal: int = field(metadata={"NOT NULL": True})
     order: int = field(metadata={"PRIMARY KEY": True, "UNIQUE": True, "NOT NULL": True})
-    name: str = field(metadata={"NOT NULL": True})
-    symbol: str = field(metadata={"NOT NULL": True})
-    time: float = field(metadata={"NOT NULL": True})
+    name: str = field(metadata={"NOT NULL": True, "INDEX": "name_time"})
+    symbol: str = field(metadata={"NOT NULL": True, "INDEX": "symbol_time"})
+    time: float = field(metadata={"NOT NULL": True, "INDEX": ("name_time", "symbol_time")})
     volume: float
     price: float
     type: int
@@ -96,41 +109,21 @@ class ResultDB(DB):
     time_close: float = 0
     expected_profit: float = 0
     win: bool = False
-    closed: bool = False
+    closed: bool = field(default=False, metadata={"INDEX": True})
     profit: float = 0
     comment: str = ""
-    parameters: dict|bytes|str = ""
+    parameters: dict|bytes|str = JSONField()
 
     def __post_init__(self):
         """Initialize the ResultDB instance after dataclass initialization.
 
-        Calls the parent DB.__post_init__ and deserializes the parameters
-        field if it was stored as pickled bytes.
+        Normalizes the comment and the boolean fields. The parameters are
+        left encoded until they are accessed.
         """
-        if isinstance(self.parameters, bytes):
-            params = pickle.loads(self.parameters)
-            self.parameters = params if isinstance(params, dict) else {}
-        else:
-            self.parameters = self.parameters or {}
         self.comment = str() if self.comment is None else self.comment
         self.win = bool(self.win)
         self.closed = bool(self.closed)
 
-    def get_data(self) -> dict:
-        """Prepare the record data for database storage.
-
-        Converts the dataclass to a dictionary and serializes the parameters
-        field to pickled bytes for database storage.
-
-        Returns:
-            dict: Dictionary representation of the record with parameters
-                serialized as bytes for SQLite blob storage.
-        """
-        data = self.asdict()
-        if not isinstance(params:=data["parameters"], bytes):
-            data["parameters"] = pickle.dumps(params, protocol=pickle.HIGHEST_PROTOCOL)
-        return data
-
     @classmethod
     def dump_to_csv(cls, file_path: str = None, name: str = ""):
         """Dump all records from the database table to a CSV file.
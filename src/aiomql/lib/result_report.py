@@ -0,0 +1,274 @@
+"""Performance reports computed inside SQLite over the ResultDB table.
+
+This module provides the ResultReport class. Win rate, expectancy, profit
+factor and the other per group figures are computed by SQL aggregates grouped
+by strategy name, symbol, strategy parameters and time bucket, so only one row
+per group leaves the database. Equity curves and drawdowns are computed in a single pass over a
+cursor that selects only the group, closing time and profit of each trade, so
+memory stays flat no matter how many trades are reported on. Only closed trades
+are reported on.
+
+Example:
+    Reporting per strategy and month::
+
+        report = ResultReport(symbol="EURUSD")
+        for summary in report.summary(by=("name",), bucket="month"):
+            print(summary.group, summary.win_rate, summary.profit_factor)
+
+        drawdowns = report.drawdown(by="name")
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import ClassVar, Iterator, NamedTuple, Sequence
+
+from .result_db import ResultDB
+
+
+@dataclass
+class Performance:
+    """The performance of a group of closed trades.
+
+    Attributes:
+        group (dict): The values of the grouping columns and bucket of the group.
+        trades (int): Number of trades.
+        wins (int): Number of trades with a profit.
+        losses (int): Number of trades with a loss.
+        net_profit (float): Sum of the profits.
+        gross_profit (float): Sum of the profits of the winning trades.
+        gross_loss (float): Sum of the losses of the losing trades, as a positive number.
+        best (float): The largest profit.
+        worst (float): The largest loss.
+    """
+    group: dict = field(default_factory=dict)
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    net_profit: float = 0
+    gross_profit: float = 0
+    gross_loss: float = 0
+    best: float = 0
+    worst: float = 0
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of the trades that were won."""
+        return self.wins / self.trades if self.trades else 0
+
+    @property
+    def average_win(self) -> float:
+        """The average profit of the winning trades."""
+        return self.gross_profit / self.wins if self.wins else 0
+
+    @property
+    def average_loss(self) -> float:
+        """The average loss of the losing trades, as a positive number."""
+        return self.gross_loss / self.losses if self.losses else 0
+
+    @property
+    def expectancy(self) -> float:
+        """The average profit per trade."""
+        return self.net_profit / self.trades if self.trades else 0
+
+    @property
+    def profit_factor(self) -> float:
+        """The gross profit divided by the gross loss, inf when nothing was lost."""
+        if self.gross_loss:
+            return self.gross_profit / self.gross_loss
+        return float("inf") if self.gross_profit else 0
+
+
+class EquityPoint(NamedTuple):
+    """A point of an equity curve, the cumulative profit after a trade closed."""
+    group: str | None
+    time_close: float
+    profit: float
+    equity: float
+    peak: float
+    drawdown: float
+
+
+@dataclass
+class Drawdown:
+    """The maximum drawdown of an equity curve.
+
+    Attributes:
+        trades (int): Number of trades in the curve.
+        equity (float): The final equity.
+        peak (float): The highest equity.
+        max_drawdown (float): The largest fall of the equity from a previous peak.
+        max_drawdown_pct (float): max_drawdown as a fraction of the equity at that peak.
+        time_close (float): The closing time of the trade at the bottom of the maximum drawdown.
+    """
+    trades: int = 0
+    equity: float = 0
+    peak: float = 0
+    max_drawdown: float = 0
+    max_drawdown_pct: float = 0
+    time_close: float = 0
+
+
+class ResultReport:
+    """Performance reports over the closed trades of a ResultDB table.
+
+    Attributes:
+        model (type[ResultDB]): The DB class of the trade results.
+        balance (float): The starting balance of the equity curves, used for the relative drawdown.
+        batch_size (int): Number of rows fetched at a time when streaming equity curves.
+    """
+    BUCKETS: ClassVar[dict[str, str]] = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "week": "%Y-W%W",
+                                         "month": "%Y-%m", "year": "%Y"}
+    GROUPS: ClassVar[tuple[str, ...]] = ("name", "symbol", "type", "parameters")
+    AGGREGATES: ClassVar[str] = ("COUNT(*), SUM(profit > 0), SUM(profit < 0), TOTAL(profit), "
+                                 "TOTAL(CASE WHEN profit > 0 THEN profit END), "
+                                 "-TOTAL(CASE WHEN profit < 0 THEN profit END), "
+                                 "COALESCE(MAX(profit), 0), COALESCE(MIN(profit), 0)")
+
+    def __init__(self, model: type[ResultDB] = ResultDB, *, balance: float = 0, batch_size: int = 1000,
+                 **conditions):
+        """Create a report on the closed trades matching the conditions.
+
+        Args:
+            model: The DB class of the trade results. Defaults to ResultDB.
+            balance: The starting balance of the equity curves. Defaults to 0.
+            batch_size: Number of rows fetched at a time when streaming equity curves. Defaults to 1000.
+            **conditions: Conditions as accepted by Query.where, e.g. name="scalper" or time__gte=start.
+        """
+        self.model = model
+        self.balance = balance
+        self.batch_size = batch_size
+        self.query = model.query(closed=True, **conditions)
+
+    def group_columns(self, by: Sequence[str]) -> list[str]:
+        """Validates the grouping columns and returns their SQL expressions.
+
+        A parameter is grouped on with its key after a double underscore, e.g. parameters__fast_ema, and whole
+        parameter sets with parameters.
+
+        Raises:
+            ValueError: If a column can't be grouped on.
+        """
+        if invalid := [column for column in by if column.split("__")[0] not in self.GROUPS]:
+            raise ValueError(f"Can't group by {invalid}, choose from {self.GROUPS}")
+        return [self.query.expression(column) for column in by]
+
+    def bucket_expression(self, bucket: str) -> str:
+        """The SQL expression of the time bucket of the closing time of a trade.
+
+        Raises:
+            ValueError: For an unknown bucket.
+        """
+        if bucket not in self.BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket!r}, choose from {tuple(self.BUCKETS)}")
+        return f"strftime('{self.BUCKETS[bucket]}', {self.query.column('time_close')} / 1000, 'unixepoch')"
+
+    def summary_sql(self, by: Sequence[str] = (), bucket: str | None = None) -> tuple[str, list, list[str]]:
+        """Builds the aggregate query of summary.
+
+        Returns:
+            tuple[str, list, list[str]]: The statement, its parameters and the names of the group values.
+        """
+        keys, columns = list(by), self.group_columns(by)
+        if bucket:
+            keys.append("bucket")
+            columns.append(self.bucket_expression(bucket))
+        query, params = self.query.sql(", ".join([*columns, self.AGGREGATES]))
+        if columns:
+            positions = ", ".join(str(index) for index in range(1, len(columns) + 1))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+        return query, params, keys
+
+    def _summary(self, conn: sqlite3.Connection, by: Sequence[str] = (), bucket: str | None = None) \
+            -> list[Performance]:
+        query, params, keys = self.summary_sql(by, bucket)
+        size = len(keys)
+        return [Performance(dict(zip(keys, row[:size])), *row[size:]) for row in conn.execute(query, params)
+                if row[size]]
+
+    def summary(self, by: Sequence[str] = (), bucket: str | None = None) -> list[Performance]:
+        """Computes the performance of the trades per group.
+
+        Args:
+            by: The columns to group by, any of name, symbol, type and parameters, or a parameter such as
+                parameters__fast_ema. Defaults to no grouping.
+            bucket: Also group by the hour, day, week, month or year of the closing time. Defaults to None.
+
+        Returns:
+            list[Performance]: The performance of every group, ordered by group.
+        """
+        return self._summary(self.model.connection(), by, bucket)
+
+    async def asummary(self, by: Sequence[str] = (), bucket: str | None = None) -> list[Performance]:
+        """Computes the performance of the trades per group on the worker thread of the database.
+
+        Args:
+            by: The columns to group by, any of name, symbol, type and parameters, or a parameter such as
+                parameters__fast_ema. Defaults to no grouping.
+            bucket: Also group by the hour, day, week, month or year of the closing time. Defaults to None.
+
+        Returns:
+            list[Performance]: The performance of every group, ordered by group.
+        """
+        return await self.model.get_worker().run(self._summary, by, bucket, conn=True)
+
+    def _equity(self, conn: sqlite3.Connection, by: str | None = None) -> Iterator[EquityPoint]:
+        group = self.group_columns([by])[0] if by else "NULL"
+        query = self.query.copy().order_by(*((by,) if by else ()), "time_close")
+        cursor = conn.execute(*query.sql(f"{group}, time_close, profit"))
+        key, equity, peak = object(), 0, 0
+        try:
+            while rows := cursor.fetchmany(self.batch_size):
+                for name, time_close, profit in rows:
+                    if name != key:
+                        key, equity, peak = name, self.balance, self.balance
+                    equity += profit
+                    peak = max(peak, equity)
+                    yield EquityPoint(name, time_close, profit, equity, peak, peak - equity)
+        finally:
+            cursor.close()
+
+    def equity(self, by: str | None = None) -> Iterator[EquityPoint]:
+        """Streams the equity curve of the trades, in order of closing time.
+
+        Args:
+            by: Stream one curve per value of name, symbol, type or a parameter, one after the other. Defaults to a single
+                curve.
+
+        Yields:
+            EquityPoint: The equity after every trade.
+        """
+        return self._equity(self.model.connection(), by)
+
+    def _drawdown(self, conn: sqlite3.Connection, by: str | None = None) -> dict[str | None, Drawdown]:
+        drawdowns: dict[str | None, Drawdown] = {}
+        for point in self._equity(conn, by):
+            if (drawdown := drawdowns.get(point.group)) is None:
+                drawdown = drawdowns[point.group] = Drawdown(peak=self.balance)
+            drawdown.trades += 1
+            drawdown.equity, drawdown.peak = point.equity, point.peak
+            if point.drawdown > drawdown.max_drawdown:
+                drawdown.max_drawdown, drawdown.time_close = point.drawdown, point.time_close
+                drawdown.max_drawdown_pct = point.drawdown / point.peak if point.peak > 0 else 0
+        return drawdowns
+
+    def drawdown(self, by: str | None = None) -> dict[str | None, Drawdown]:
+        """Computes the maximum drawdown of the equity curves in one pass.
+
+        Args:
+            by: Compute one curve per value of name, symbol, type or a parameter. Defaults to a single curve, under None.
+
+        Returns:
+            dict[str | None, Drawdown]: The drawdown of every curve.
+        """
+        return self._drawdown(self.model.connection(), by)
+
+    async def adrawdown(self, by: str | None = None) -> dict[str | None, Drawdown]:
+        """Computes the maximum drawdown of the equity curves on the worker thread of the database.
+
+        Args:
+            by: Compute one curve per value of name, symbol, type or a parameter. Defaults to a single curve, under None.
+
+        Returns:
+            dict[str | None, Drawdown]: The drawdown of every curve.
+        """
+        return await self.model.get_worker().run(self._drawdown, by, conn=True)
@@ -17,11 +17,16 @@ from typing import ClassVar
 from datetime import datetime, UTC
 from logging import getLogger
 
+import numpy as np
+import pandas as pd
+
 from ...core.config import Config
 from ...core.sync.meta_trader import MetaTrader
 from ...core.models import TradeDeal, TradeOrder
 from ...core.exceptions import InvalidRequest
 from ...core.base import BaseMeta
+from ..history import HistoryIndex, DEAL_COLUMNS, ORDER_COLUMNS, history_array
+from ..history_cache import HistoryCache
 
 logger = getLogger(__name__)
 
@@ -31,16 +36,29 @@ class History(metaclass=BaseMeta):
 
     Provides synchronous methods to retrieve and filter historical trade deals
     and orders within a specified date range. Supports filtering by symbol group,
-    order ticket, and position ID.
+    order ticket, position ID, symbol, magic number and time. The filters look the
+    deals and orders up in indexes built on first use instead of scanning them.
+
+    The deals and orders are kept as returned by the terminal. TradeDeal and
+    TradeOrder objects are only built when deals or orders is first accessed,
+    and deal_array, order_array, deals_frame and orders_frame build columns
+    straight from the terminal tuples, without any objects.
+    With a HistoryCache, only the parts of the date range missing from the local
+    journal are fetched from the terminal.
 
     This is the synchronous version of the History class. Use this when you need
     to access trade history without async/await syntax.
 
     Attributes:
-        deals: Tuple of trade deals retrieved from history.
-        orders: Tuple of trade orders retrieved from history.
+        deals: Tuple of trade deals retrieved from history, built on first access.
+        orders: Tuple of trade orders retrieved from history, built on first access.
+        deal_array: Structured NumPy array of the deals, typed by DEAL_COLUMNS.
+        order_array: Structured NumPy array of the orders, typed by ORDER_COLUMNS.
         total_deals: Total number of deals retrieved.
         total_orders: Total number of orders retrieved.
+        deal_index: HistoryIndex of the deals, by time_msc.
+        order_index: HistoryIndex of the orders, by time_setup_msc.
+        cache: The local journal the history is read from, or None.
         group: Symbol filter pattern for selecting history.
         date_from: Start date for history query.
         date_to: End date for history query.
@@ -76,7 +94,8 @@ class History(metaclass=BaseMeta):
     mode: str = "sync"
 
     def __init__(
-        self, *, date_from: datetime | float, date_to: datetime | float, group: str = "", use_utc: bool = False
+        self, *, date_from: datetime | float, date_to: datetime | float, group: str = "", use_utc: bool = False,
+        cache: HistoryCache | None = None
     ):
         """Initialize a History instance with date range and filters.
 
@@ -89,6 +108,8 @@ class History(metaclass=BaseMeta):
                 wildcard. Defaults to empty string (all symbols).
             use_utc: If True, convert date_from and date_to to UTC timezone.
                 Defaults to False.
+            cache: A local journal to read the history from, fetching only
+                what it is missing. Defaults to None, fetching everything.
 
         Example:
             Create history for specific date range::
@@ -117,10 +138,13 @@ class History(metaclass=BaseMeta):
         self.date_from = date_from.astimezone(UTC) if use_utc else date_from
         self.date_to = date_to.astimezone(UTC) if use_utc else date_to
         self.group = group
-        self.deals: tuple[TradeDeal, ...] = ()
-        self.orders: tuple[TradeOrder, ...] = ()
+        self.cache = cache
+        self.deals = ()
+        self.orders = ()
         self.total_deals: int = 0
         self.total_orders: int = 0
+        self._deal_index: HistoryIndex[TradeDeal] = HistoryIndex()
+        self._order_index: HistoryIndex[TradeOrder] = HistoryIndex(time="time_setup_msc")
 
     def initialize(self) -> None:
         """Fetch history deals and orders from the trading account.
@@ -130,12 +154,108 @@ class History(metaclass=BaseMeta):
 
         Note:
             This is the synchronous version. If fetching deals or orders fails,
-            the corresponding attribute will be an empty tuple.
+            the corresponding attribute will be an empty tuple. With a cache,
+            what the cache holds is used instead.
+        """
+        if self.cache is not None:
+            deals, orders = self.sync_cache()
+        else:
+            deals = self.mt5.history_deals_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
+            orders = self.mt5.history_orders_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
+        self.set_raw(deals=deals or (), orders=orders or ())
+
+    def set_raw(self, *, deals: tuple, orders: tuple):
+        """Keep deals and orders as returned by the terminal, building objects and arrays from them on first use.
+
+        Args:
+            deals: The deals, as named tuples.
+            orders: The orders, as named tuples.
         """
-        self.deals = self.get_deals()
-        self.orders = self.get_orders()
-        self.total_deals = len(self.deals)
-        self.total_orders = len(self.orders)
+        self._raw_deals, self._raw_orders = deals, orders
+        self._deals = self._orders = self._deal_array = self._order_array = None
+        self.total_deals = len(deals)
+        self.total_orders = len(orders)
+
+    @property
+    def deals(self) -> tuple[TradeDeal, ...]:
+        """The deals as TradeDeal objects, built on first access."""
+        if self._deals is None:
+            self._deals = TradeDeal.from_mt5_many(self._raw_deals)
+        return self._deals
+
+    @deals.setter
+    def deals(self, deals: tuple[TradeDeal, ...]):
+        self._deals, self._raw_deals, self._deal_array = deals, None, None
+
+    @property
+    def orders(self) -> tuple[TradeOrder, ...]:
+        """The orders as TradeOrder objects, built on first access."""
+        if self._orders is None:
+            self._orders = TradeOrder.from_mt5_many(self._raw_orders)
+        return self._orders
+
+    @orders.setter
+    def orders(self, orders: tuple[TradeOrder, ...]):
+        self._orders, self._raw_orders, self._order_array = orders, None, None
+
+    @property
+    def deal_array(self) -> np.ndarray:
+        """The deals as a structured array, built in one pass from the terminal tuples when available."""
+        if self._deal_array is None:
+            self._deal_array = history_array(self.deals if self._raw_deals is None else self._raw_deals,
+                                             DEAL_COLUMNS)
+        return self._deal_array
+
+    @property
+    def order_array(self) -> np.ndarray:
+        """The orders as a structured array, built in one pass from the terminal tuples when available."""
+        if self._order_array is None:
+            self._order_array = history_array(self.orders if self._raw_orders is None else self._raw_orders,
+                                              ORDER_COLUMNS)
+        return self._order_array
+
+    def deals_frame(self) -> pd.DataFrame:
+        """The deals as a DataFrame with a column per field, enums as small ints and times as int64."""
+        return pd.DataFrame(self.deal_array)
+
+    def orders_frame(self) -> pd.DataFrame:
+        """The orders as a DataFrame with a column per field, enums as small ints and times as int64."""
+        return pd.DataFrame(self.order_array)
+
+    @property
+    def deal_index(self) -> HistoryIndex[TradeDeal]:
+        """The index of the deals, rebuilt when the deals have been replaced. Until the TradeDeal objects are
+        built, it indexes the terminal tuples and builds only the deals a lookup returns."""
+        raw = self._deals is None
+        if self._deal_index.items is not (deals := self._raw_deals if raw else self._deals):
+            self._deal_index = HistoryIndex(deals, build=TradeDeal.from_mt5 if raw else None)
+        return self._deal_index
+
+    @property
+    def order_index(self) -> HistoryIndex[TradeOrder]:
+        """The index of the orders, rebuilt when the orders have been replaced. Until the TradeOrder objects
+        are built, it indexes the terminal tuples and builds only the orders a lookup returns."""
+        raw = self._orders is None
+        if self._order_index.items is not (orders := self._raw_orders if raw else self._orders):
+            self._order_index = HistoryIndex(orders, time="time_setup_msc", build=TradeOrder.from_mt5 if raw else None)
+        return self._order_index
+
+    def sync_cache(self) -> tuple[tuple[TradeDeal, ...], tuple[TradeOrder, ...]]:
+        """Fetch the parts of the date range the cache is missing, then read the range from the cache.
+
+        The missing ranges are fetched for all symbols, so the cache can answer any group.
+
+        Returns:
+            tuple[tuple, tuple]: The deals and orders of the date range, as named tuples.
+        """
+        for date_from, date_to in self.cache.windows(self.date_from, self.date_to):
+            deals = self.mt5.history_deals_get(date_from=date_from, date_to=date_to)
+            orders = self.mt5.history_orders_get(date_from=date_from, date_to=date_to)
+            if deals is None or orders is None:
+                logger.warning("Failed to fetch the history from %s to %s into the cache", date_from, date_to)
+                continue
+            self.cache.save(deals=deals, orders=orders, date_from=date_from, date_to=date_to)
+        return self.cache.load(date_from=self.date_from, date_to=self.date_to, group=self.group, raw=True)
 
     def get_deals(self) -> tuple[TradeDeal, ...]:
         """Retrieve trade deals from history.
@@ -151,7 +271,7 @@ class History(metaclass=BaseMeta):
             Logs a warning if fetching deals fails.
         """
         deals = self.mt5.history_deals_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
-        return tuple(TradeDeal(**deal._asdict()) for deal in deals)
+        return TradeDeal.from_mt5_many(deals)
 
     def filter_deals_by_ticket(self, *, ticket: int) -> tuple[TradeDeal, ...]:
         """Filters cached deals by ticket number.
@@ -162,7 +282,7 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeDeal, ...]: Deals matching the specified ticket.
         """
-        return tuple(deal for deal in self.deals if deal.ticket == ticket)
+        return self.deal_index.get(ticket)
 
     def filter_deals_by_position(self, *, position: int) -> tuple[TradeDeal, ...]:
         """Filters cached deals by position identifier.
@@ -173,14 +293,49 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeDeal, ...]: Deals matching the specified position.
         """
-        return tuple(deal for deal in self.deals if deal.position_id == position)
+        return self.deal_index.filter("position_id", position)
+
+    def filter_deals_by_symbol(self, *, symbol: str) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by symbol.
+
+        Args:
+            symbol: The symbol name to filter by.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals of the specified symbol.
+        """
+        return self.deal_index.filter("symbol", symbol)
+
+    def filter_deals_by_magic(self, *, magic: int) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by magic number.
+
+        Args:
+            magic: The expert advisor magic number to filter by.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals with the specified magic number.
+        """
+        return self.deal_index.filter("magic", magic)
+
+    def filter_deals_by_time(self, *, start: datetime | float, end: datetime | float) -> tuple[TradeDeal, ...]:
+        """Filters cached deals by execution time.
+
+        Args:
+            start: Start of the range, a datetime or a timestamp in seconds.
+            end: End of the range, inclusive, a datetime or a timestamp in seconds.
+
+        Returns:
+            tuple[TradeDeal, ...]: Deals executed in the range, in order of time.
+        """
+        return self.deal_index.between(start, end)
 
     @classmethod
-    def get_deal_by_ticket(cls, *, ticket: int) -> TradeDeal:
+    def get_deal_by_ticket(cls, *, ticket: int, cache: HistoryCache | None = None) -> TradeDeal:
         """Fetches a single deal from history by its ticket number.
 
         Args:
             ticket: The deal ticket number.
+            cache: A local journal to look the deal up in before asking the terminal. Defaults to None.
 
         Returns:
             TradeDeal: The matching deal.
@@ -188,23 +343,37 @@ class History(metaclass=BaseMeta):
         Raises:
             InvalidRequest: If no deal matches the given ticket.
         """
+        if cache is not None and (deals := cache.get_deals(ticket=ticket)):
+            return deals[0]
         deals = cls.mt5.history_deals_get(ticket=ticket)
+        if cache is not None and deals:
+            cache.save(deals=deals, orders=())
         if (deal := deals[0]).ticket == ticket:
-            return TradeDeal(**deal._asdict())
+            return TradeDeal.from_mt5(deal)
         raise InvalidRequest("Ticket not found")
 
     @classmethod
-    def get_deals_by_position(cls, *, position: int = None) -> tuple[TradeDeal, ...]:
+    def get_deals_by_position(cls, *, position: int = None, cache: HistoryCache | None = None) \
+            -> tuple[TradeDeal, ...]:
         """Fetches deals from history by position identifier.
 
         Args:
             position: The position ID to filter by.
+            cache: A local journal to read the deals from while it is fresh and holds the whole position, see
+                HistoryCache.is_fresh and HistoryCache.holds_position, and to store them in otherwise. Defaults to
+                None.
 
         Returns:
             tuple[TradeDeal, ...]: Deals associated with the position.
         """
+        if cache is not None and cache.is_fresh():
+            cached = cache.get_deals(position_id=position)
+            if cache.holds_position(position, deals=cached):
+                return cached
         deals = cls.mt5.history_deals_get(position=position)
-        return tuple(TradeDeal(**deal._asdict()) for deal in deals if deal.position_id == position)
+        if cache is not None and deals:
+            cache.save(deals=deals, orders=())
+        return TradeDeal.from_mt5_many(deal for deal in deals if deal.position_id == position)
 
     def get_orders(self) -> tuple[TradeOrder, ...]:
         """Retrieve trade orders from history.
@@ -220,7 +389,7 @@ class History(metaclass=BaseMeta):
             Logs a warning if fetching orders fails.
         """
         orders = self.mt5.history_orders_get(date_from=self.date_from, date_to=self.date_to, group=self.group)
-        return tuple(TradeOrder(**order._asdict()) for order in orders)
+        return TradeOrder.from_mt5_many(orders)
 
     def filter_orders_by_ticket(self, *, ticket: int) -> tuple[TradeOrder, ...]:
         """Filters cached orders by ticket number.
@@ -231,7 +400,7 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeOrder, ...]: Orders matching the specified ticket.
         """
-        return tuple(order for order in self.orders if order.ticket == ticket)
+        return self.order_index.get(ticket)
 
     def filter_orders_by_position(self, *, position: int) -> tuple[TradeOrder, ...]:
         """Filters cached orders by position identifier.
@@ -242,14 +411,49 @@ class History(metaclass=BaseMeta):
         Returns:
             tuple[TradeOrder, ...]: Orders matching the specified position.
         """
-        return tuple(order for order in self.orders if order.position_id == position)
+        return self.order_index.filter("position_id", position)
+
+    def filter_orders_by_symbol(self, *, symbol: str) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by symbol.
+
+        Args:
+            symbol: The symbol name to filter by.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders of the specified symbol.
+        """
+        return self.order_index.filter("symbol", symbol)
+
+    def filter_orders_by_magic(self, *, magic: int) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by magic number.
+
+        Args:
+            magic: The expert advisor magic number to filter by.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders with the specified magic number.
+        """
+        return self.order_index.filter("magic", magic)
+
+    def filter_orders_by_time(self, *, start: datetime | float, end: datetime | float) -> tuple[TradeOrder, ...]:
+        """Filters cached orders by setup time.
+
+        Args:
+            start: Start of the range, a datetime or a timestamp in seconds.
+            end: End of the range, inclusive, a datetime or a timestamp in seconds.
+
+        Returns:
+            tuple[TradeOrder, ...]: Orders placed in the range, in order of time.
+        """
+        return self.order_index.between(start, end)
 
     @classmethod
-    def get_order_by_ticket(cls, *, ticket: int) -> TradeOrder:
+    def get_order_by_ticket(cls, *, ticket: int, cache: HistoryCache | None = None) -> TradeOrder:
         """Fetches a single order from history by its ticket number.
 
         Args:
             ticket: The order ticket number.
+            cache: A local journal to look the order up in before asking the terminal. Defaults to None.
 
         Returns:
             TradeOrder: The matching order.
@@ -257,20 +461,34 @@ class History(metaclass=BaseMeta):
         Raises:
             InvalidRequest: If no order matches the given ticket.
         """
+        if cache is not None and (orders := cache.get_orders(ticket=ticket)):
+            return orders[0]
         orders = cls.mt5.history_orders_get(ticket=ticket)
+        if cache is not None and orders:
+            cache.save(deals=(), orders=orders)
         if (order := orders[0]).ticket == ticket:
-            return TradeOrder(**order._asdict())
+            return TradeOrder.from_mt5(order)
         raise InvalidRequest("Ticket not found")
 
     @classmethod
-    def get_orders_by_position(cls, *, position: int) -> tuple[TradeOrder, ...]:
+    def get_orders_by_position(cls, *, position: int, cache: HistoryCache | None = None) \
+            -> tuple[TradeOrder, ...]:
         """Fetches orders from history by position identifier.
 
         Args:
             position: The position ID to filter by.
+            cache: A local journal to read the orders from while it is fresh and holds the whole position, see
+                HistoryCache.is_fresh and HistoryCache.holds_position, and to store them in otherwise. Defaults to
+                None.
 
         Returns:
             tuple[TradeOrder, ...]: Orders associated with the position.
         """
+        if cache is not None and cache.is_fresh():
+            cached = cache.get_orders(position_id=position)
+            if cache.holds_position(position, orders=cached):
+                return cached
         orders = cls.mt5.history_orders_get(position=position)
-        return tuple(TradeOrder(**order._asdict()) for order in orders)
+        if cache is not None and orders:
+            cache.save(deals=(), orders=orders)
+        return TradeOrder.from_mt5_many(orders)
@@ -19,6 +19,7 @@ from ...core.sync.meta_trader import MetaTrader
 from ...core.base import BaseMeta
 from ...core.exceptions import InvalidRequest
 from .order import Order
+from ..positions import PositionsSnapshot
 
 
 logger = getLogger(__name__)
@@ -46,10 +47,28 @@ class Positions(metaclass=BaseMeta):
             kwargs["group"] = group
         positions = cls.mt5.positions_get(**kwargs)
         if positions is not None:
-            return tuple(TradePosition(**pos._asdict()) for pos in positions)
+            return TradePosition.from_mt5_many(positions)
         logger.warning("Failed to get open positions")
         return ()
 
+    @classmethod
+    def get_snapshot(cls, *, symbol: str = None, group: str = None) -> PositionsSnapshot:
+        """Get the open positions as columnar arrays, without building a TradePosition per position.
+
+        Args:
+            symbol (str): Only the positions of this symbol.
+            group (str): Only the positions of the symbols matching this group.
+
+        Returns:
+            PositionsSnapshot: The open positions, empty if they could not be retrieved
+        """
+        kwargs = {key: value for key, value in (("symbol", symbol), ("group", group)) if value is not None}
+        positions = cls.mt5.positions_get(**kwargs)
+        if positions is None:
+            logger.warning("Failed to get open positions")
+            positions = ()
+        return PositionsSnapshot(positions)
+
     @classmethod
     def get_position_by_ticket(cls, *, ticket: int) -> TradePosition | None:
         """Get an open position by ticket.
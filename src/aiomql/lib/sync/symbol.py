@@ -73,7 +73,7 @@ class Symbol(_Base, SymbolInfo):
                 self.mt5.market_book_add(name)
                 tick = self.mt5.symbol_info_tick(name)
             if tick is not None:
-                tick = Tick(**tick._asdict())
+                tick = Tick.from_mt5(tick)
                 setattr(self, "tick", tick) if not name else ...
             return tick
         except Exception as err:
@@ -127,7 +127,7 @@ class Symbol(_Base, SymbolInfo):
             info_tick = self.mt5.symbol_info_tick(self.name)
 
             if info_tick:
-                self.tick = Tick(**info_tick._asdict())
+                self.tick = Tick.from_mt5(info_tick)
 
             if info is not None and info_tick is not None:
                 self.initialized = True
@@ -153,7 +153,7 @@ class Symbol(_Base, SymbolInfo):
 
             info_tick = self.mt5._symbol_info_tick(self.name)
             if info_tick:
-                self.tick = Tick(**info_tick._asdict())
+                self.tick = Tick.from_mt5(info_tick)
 
             if info is not None and info_tick is not None:
                 self.initialized = True
@@ -185,7 +185,7 @@ class Symbol(_Base, SymbolInfo):
         book_info = self.mt5.market_book_get(self.name)
 
         if book_info is not None:
-            book_infos = (BookInfo(**info._asdict()) for info in book_info)
+            book_infos = (BookInfo.from_mt5(info) for info in book_info)
             return tuple(book_infos)
 
         raise ValueError(f"Could not get book info for {self.name}")
@@ -22,8 +22,7 @@ from logging import getLogger
 
 from ...core.models import OrderType, OrderSendResult, OrderCheckResult
 from ...core.config import Config
-from ...core.task_queue import QueueItem
-from ..result import Result
+from ..result import Result, ResultSink
 from .order import Order
 from .symbol import Symbol as _Symbol
 from ..ram import RAM
@@ -221,7 +220,8 @@ class Trader(ABC):
             name: Name of the trading strategy.
             expected_profit: Expected profit for the trade. If not provided,
                 calculates using order.calc_profit().
-            use_task_queue: If True, adds save operation to task queue.
+            use_task_queue: If True, hands the result to the shared ResultSink,
+                which saves it in a batch on a background thread.
                 If False, saves synchronously. Defaults to True.
         """
         if self.config.record_trades is False or result.retcode != 10009:
@@ -233,7 +233,7 @@ class Trader(ABC):
         result.request.tp = order.tp
         res = Result(result=result, parameters=params, name=name, time=order.time_setup_msc, expected_profit=expected_profit)
         if use_task_queue:
-            self.config.task_queue.add(item=QueueItem(res.save_sync), must_complete=True)
+            ResultSink().add(res)
         else:
             res.save_sync()
 
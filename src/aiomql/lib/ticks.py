@@ -85,6 +85,23 @@ class Tick:
         self.index = kwargs.pop("index", self.time_msc)
         self.set_attributes(**kwargs)
 
+    @classmethod
+    def from_mt5(cls, tick) -> Self:
+        """Create a Tick from the namedtuple returned by symbol_info_tick without copying it to a dict first.
+
+        Args:
+            tick: A Tick namedtuple from the MetaTrader5 package.
+
+        Returns:
+            Tick: A tick with the same attributes as ``Tick(**tick._asdict())``.
+        """
+        self = cls.__new__(cls)
+        time_msc = tick.time_msc
+        self.__dict__ = {"time": tick.time, "time_msc": time_msc, "Index": 0, "index": time_msc, "bid": tick.bid,
+                         "ask": tick.ask, "last": tick.last, "volume": tick.volume, "flags": tick.flags,
+                         "volume_real": tick.volume_real}
+        return self
+
     def __repr__(self) -> str:
         """Return a string representation of the Tick.
 
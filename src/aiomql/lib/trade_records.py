@@ -1,31 +1,33 @@
 """Trade records module for managing trade result files.
 
 This module provides the TradeRecords class for reading, updating, and
-managing trade record files in CSV, JSON, and SQL formats. It updates trade
+managing trade record files in CSV, JSON, JSON Lines and SQL formats. It updates trade
 records with actual profit/loss data from closed positions.
 
 Example:
     Updating trade records asynchronously::
 
         records = TradeRecords()
-        await records.update_csv_records()
-        await records.update_json_records()
+        await records.update_records()
         await records.update_sql_records()
 
     Updating trade records synchronously::
 
         records = TradeRecords()
-        records.update_csv_records_sync()
-        records.update_json_records_sync()
+        records.update_records_sync()
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
 import json
+import os
 from pathlib import Path
 import csv
 import logging
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ClassVar, Iterable, Iterator, MutableMapping, TextIO
 
+from .record_writers import CSVWriter, JSONLWriter
+from .result import Result
 from .result_db import ResultDB
 from ..core.config import Config
 from ..core.meta_trader import MetaTrader
@@ -40,34 +42,183 @@ class TradeRecords:
     Reads trade records from CSV, JSON files, or SQL database and updates them
     with actual profit/loss data from closed positions retrieved via MetaTrader 5.
 
+    Updates are incremental. For every record source, a file or the sql database, a watermark holding the time
+    of the last deal processed and the orders that were still open is persisted in the store. A run only fetches
+    the deals after the watermark, or after the opening time of trades recorded since the previous run, in
+    windows of sync_chunk, and only matches them against the open trades, indexed by order.
+
+    update_records updates every record file at once: the files are read and written on a thread pool, off the
+    event loop, and a single snapshot of the deals, indexed by position, serves all of them. Files are rewritten
+    through a temporary file that is moved over the original, so a file is never left half written.
+
+    JSON Lines records are append-only. A closed trade is recorded by appending an update line, an object
+    with the order of the trade under UPDATE_KEY and the fields in CLOSE_FIELDS, which is merged into the
+    trade when the file is read. compact_jsonl folds the update lines into the trades.
+
     Attributes:
         config: Configuration object for accessing settings.
         mt5: MetaTrader instance for retrieving trade data.
         result_db: ResultDB class reference for SQL operations.
         records_dir: Path to directory containing trade record files.
         positions: Cached list of open positions, or None.
+        sync_chunk: The length of the windows in which deals are fetched.
 
     Example:
         >>> records = TradeRecords(records_dir='/path/to/records')
-        >>> await records.update_csv_records()
+        >>> await records.update_records()
         >>> await records.update_sql_records()
     """
     config: Config
     mt5: MetaTrader
     result_db: type[ResultDB]
     positions: list[TradePosition] | None = None
+    UPDATE_KEY: ClassVar[str] = "_update"
+    CLOSE_FIELDS: ClassVar[tuple[str, ...]] = ("profit", "win", "closed", "time_close", "price_close")
+    WATERMARK_KEY: ClassVar[str] = "trade_records:{source}"
 
-    def __init__(self, *, records_dir: Path | str = ""):
+    def __init__(self, *, records_dir: Path | str = "", store: MutableMapping = None, chunk_days: int = 30):
         """Initialize the Records class. The main method of this class is update_records which you should call to update
         all the records specified in the records_dir.
 
         Keyword Args:
             records_dir (Path): Absolute path to directory containing record of placed trades.
+            store (MutableMapping): Where the sync watermarks are persisted. Defaults to config.store.
+            chunk_days (int): The length in days of the windows in which deals are fetched. Defaults to 30.
         """
         self.config = Config()
         self.mt5 = MetaTrader()
         self.records_dir = records_dir or self.config.records_dir
         self.result_db = ResultDB
+        self.sync_chunk = timedelta(days=chunk_days)
+        self._store = store
+
+    @property
+    def store(self) -> MutableMapping:
+        """The mapping in which the sync watermarks are persisted."""
+        if self._store is None:
+            self._store = self.config.store
+        return self._store
+
+    def get_watermark(self, source: str) -> dict:
+        """Get the sync watermark of a record source.
+
+        Args:
+            source: The record source, a file path or 'sql'.
+
+        Returns:
+            dict: The time in milliseconds of the last deal processed under 'time', None before the first sync,
+                and the orders that were still open after the last sync under 'orders'.
+        """
+        value = self.store.get(self.WATERMARK_KEY.format(source=source))
+        try:
+            return json.loads(value) if value else {"time": None, "orders": []}
+        except (TypeError, ValueError):
+            # an unreadable watermark only costs a sync from the opening time of the open trades
+            logger.warning("Unable to read the sync watermark of %s", source)
+            return {"time": None, "orders": []}
+
+    def set_watermark(self, source: str, *, time: int | None, orders: Iterable[int]):
+        """Persist the sync watermark of a record source.
+
+        The watermark is saved as JSON text, which every store, including a Store backed by SQLite, keeps as is.
+
+        Args:
+            source: The record source, a file path or 'sql'.
+            time: The time in milliseconds of the last deal processed.
+            orders: The orders that are still open.
+        """
+        self.store[self.WATERMARK_KEY.format(source=source)] = json.dumps({"time": time, "orders": list(orders)})
+
+    @staticmethod
+    def to_msc(value: float | str) -> float:
+        """Convert a record time to milliseconds. csv records hold the time in seconds, the others in milliseconds."""
+        value = float(value)
+        return value if value > 1e11 else value * 1000
+
+    def plan_sync(self, *, items: Iterable[tuple[int, float | str, object]], source: str = "") \
+            -> tuple[dict[int, object], datetime | None, int | None]:
+        """Index the open trades of a record source and find where fetching deals should start.
+
+        Trades that were open at the previous sync start from the watermark, trades recorded since then start from
+        their own opening time.
+
+        Args:
+            items: The order, opening time and row of every open trade.
+            source: The record source. Without one no watermark is used.
+
+        Returns:
+            tuple: The open rows by order, the start of the first window or None if no trade is open, and the time
+                of the last deal processed.
+        """
+        watermark = self.get_watermark(source) if source else {"time": None, "orders": []}
+        mark, known = watermark["time"], set(watermark["orders"])
+        index, start = {}, None
+        for order, time, row in items:
+            index[order] = row
+            since = mark if mark is not None and order in known else self.to_msc(time)
+            start = since if start is None else min(start, since)
+        if start is not None:
+            start = datetime.fromtimestamp(start / 1000).replace(hour=0, minute=0, second=0, microsecond=0)
+        return index, start, mark
+
+    def sync_windows(self, start: datetime) -> Iterator[tuple[datetime, datetime]]:
+        """Split the time from start to the end of today into windows of sync_chunk.
+
+        Args:
+            start: The start of the first window.
+
+        Yields:
+            tuple[datetime, datetime]: The start and end of a window.
+        """
+        end = datetime.now().replace(hour=23, minute=59)
+        while start < end:
+            yield start, (stop := min(start + self.sync_chunk, end))
+            start = stop
+
+    @staticmethod
+    def fetched(deals, date_from: datetime, date_to: datetime) -> bool:
+        """Whether the deals of a window were fetched. history_deals_get returns None on error.
+
+        Syncing stops before a window that failed, without saving a newer watermark, so that its deals are fetched
+        again on the next sync.
+        """
+        if deals is None:
+            logger.warning("Unable to get the deals from %s to %s, the trade records are synced up to %s",
+                           date_from, date_to, date_from)
+            return False
+        return True
+
+    def is_closing(self, deal) -> bool:
+        """Whether a deal closes a position."""
+        return deal.entry == self.mt5.DEAL_ENTRY_OUT and deal.order != deal.position_id
+
+    def close_rows(self, *, index: dict, deals: Iterable, mark: int | None, close: Callable) -> int | None:
+        """Match the closing deals against the open trades and close the trades found.
+
+        Args:
+            index: The open rows by order. Closed rows are removed from it.
+            deals: The deals of a window.
+            mark: The time in milliseconds of the last deal processed.
+            close: Called with the row and the closing deal of every trade found.
+
+        Returns:
+            int | None: The time in milliseconds of the last deal processed.
+        """
+        for deal in deals or ():
+            mark = deal.time_msc if mark is None else max(mark, deal.time_msc)
+            if self.is_closing(deal) and (row := index.pop(deal.position_id, None)) is not None:
+                close(row, deal)
+        return mark
+
+    @staticmethod
+    def close_row(row: dict, deal):
+        """Update a csv, json or jsonl row with its closing deal."""
+        row.update(profit=deal.profit, win=deal.profit > 0, closed=True, time_close=deal.time_msc / 1000,
+                   price_close=deal.price)
+
+    def open_row_items(self, rows: list[dict]) -> Iterator[tuple[int, str | float, dict]]:
+        """The order, opening time and row of the open trades in csv, json or jsonl rows."""
+        return ((int(row["order"]), row["time"], row) for row in rows if self.str_to_bool(row["closed"]) is False)
 
     def get_sql_records_unclosed(self):
         """Retrieve all unclosed trade records from the SQL database.
@@ -81,28 +232,38 @@ class TradeRecords:
     async def update_sql_records(self):
         """Update SQL trade records with actual profit/loss from closed positions.
 
-        Fetches unclosed records from the database, retrieves closing deals
-        from MetaTrader history, and updates records with profit, win status,
-        closing time, and closing price.
+        Fetches unclosed records from the database, retrieves the deals after
+        the sync watermark from MetaTrader history, and updates records with
+        profit, win status, closing time, and closing price.
 
         Note:
             Uses batch processing for efficiency - all updates are committed
             together at the end.
         """
-        conn = self.result_db.get_connection()
         rows = self.get_sql_records_unclosed()
-        rows.sort(key=lambda r: r.time)
-        start = datetime.fromtimestamp(rows[0].time/1000).replace(hour=0, minute=0)
-        end = datetime.now().replace(hour=23, minute=59)
-        deals = await self.mt5.history_deals_get(date_from=start, date_to=end)
-        closing_deals = {deal.position_id: deal for deal in deals if deal.order != deal.position_id and deal.entry == self.mt5.DEAL_ENTRY_OUT}
-        for row in rows:
-            if row.order in closing_deals and not row.closed:
-                deal = closing_deals[row.order]
-                data = dict(profit=deal.profit, win=deal.profit > 0, closed=True, time_close=deal.time_msc, price_close=deal.price)
-                row.save(conn=conn, update=True, data=data, commit=False)
-        conn.commit()
-        conn.close()
+        index, start, mark = self.plan_sync(items=((row.order, row.time, row) for row in rows if not row.closed),
+                                            source="sql")
+        if not index:
+            return
+        conn = self.result_db.get_connection()
+
+        def close(row, deal):
+            data = dict(profit=deal.profit, win=deal.profit > 0, closed=True, time_close=deal.time_msc,
+                        price_close=deal.price)
+            row.save(conn=conn, update=True, data=data, commit=False)
+
+        try:
+            for date_from, date_to in self.sync_windows(start):
+                deals = await self.mt5.history_deals_get(date_from=date_from, date_to=date_to)
+                if not self.fetched(deals, date_from, date_to):
+                    break
+                mark = self.close_rows(index=index, deals=deals, mark=mark, close=close)
+                self.set_watermark("sql", time=mark, orders=index)
+                if not index:
+                    break
+            conn.commit()
+        finally:
+            conn.close()
 
     def get_csv_records(self):
         """Get trade records saved as csv from records_dir folder
@@ -124,6 +285,169 @@ class TradeRecords:
             if file.is_file() and file.name.endswith(".json"):
                 yield file
 
+    def get_jsonl_records(self):
+        """Get trade records saved as JSON Lines from records_dir folder
+
+        Yields:
+            files (Path): Trade record files
+        """
+        for file in Path(self.records_dir).iterdir():
+            if file.is_file() and file.name.endswith(".jsonl"):
+                yield file
+
+    def get_record_files(self) -> list[Path]:
+        """Get the csv, json and JSON Lines trade record files in the records_dir folder.
+
+        Returns:
+            list[Path]: The trade record files.
+        """
+        return [*self.get_csv_records(), *self.get_json_records(), *self.get_jsonl_records()]
+
+    def read_rows(self, *, file: Path) -> list[dict]:
+        """Read the rows of a csv or json trade record file, or the unclosed trades of a JSON Lines file.
+
+        Args:
+            file: Trade record file.
+
+        Returns:
+            list[dict]: The rows.
+
+        Raises:
+            ValueError: For files that are not csv, json or jsonl files.
+        """
+        file = Path(file)
+        match file.suffix:
+            case ".csv":
+                with open(file, mode="r", newline="") as fh:
+                    return list(csv.DictReader(fh))
+            case ".json":
+                with open(file, mode="r") as fh:
+                    return json.load(fh)
+            case ".jsonl":
+                return self.get_jsonl_rows_unclosed(file=file)
+        raise ValueError(f"{file} is not a csv, json or jsonl trade record file")
+
+    def write_rows(self, *, file: Path, rows: list[dict]):
+        """Write updated rows back to a trade record file.
+
+        Args:
+            file: Trade record file.
+            rows: The updated rows.
+        """
+        file = Path(file)
+        match file.suffix:
+            case ".csv":
+                self.write_csv_rows(file=file, rows=rows)
+            case ".json":
+                self.write_json_rows(file=file, rows=rows)
+            case ".jsonl":
+                self.write_jsonl_updates(file=file, rows=rows)
+
+    @staticmethod
+    def replace_file(*, file: Path, write: Callable[[TextIO], None], newline: str | None = None):
+        """Rewrite a file atomically, writing a temporary file next to it and moving it over the file.
+
+        Args:
+            file: The file to rewrite.
+            write: Called with the open temporary file.
+            newline: The newline argument of open.
+        """
+        temp = file.with_name(f"{file.name}.tmp")
+        try:
+            with open(temp, mode="w", newline=newline) as fh:
+                write(fh)
+            os.replace(temp, file)
+        finally:
+            temp.unlink(missing_ok=True)
+
+    def read_jsonl_updates(self, *, file: Path) -> dict:
+        """Read the update lines of a JSON Lines trade record file.
+
+        Args:
+            file: Trade record file in JSON Lines format
+
+        Returns:
+            dict: The merged updates of each order.
+        """
+        updates = {}
+        with open(file, mode="r") as fh:
+            for line in fh:
+                # cheap check before parsing, trade lines are far more common than update lines
+                if self.UPDATE_KEY not in line or self.UPDATE_KEY not in (row := json.loads(line)):
+                    continue
+                order = row.pop(self.UPDATE_KEY)
+                updates[order] = updates.get(order, {}) | row
+        return updates
+
+    def read_jsonl(self, *, file: Path) -> Iterator[dict]:
+        """Stream the trades of a JSON Lines trade record file with their updates applied.
+
+        Only the update lines are held in memory, the trades are yielded one at a time.
+
+        Args:
+            file: Trade record file in JSON Lines format
+
+        Yields:
+            dict: A trade record.
+        """
+        updates = self.read_jsonl_updates(file=file)
+        with open(file, mode="r") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if self.UPDATE_KEY in row:
+                    continue
+                if (update := updates.get(row.get("order"))) is not None:
+                    row |= update
+                yield row
+
+    def get_jsonl_rows_unclosed(self, *, file: Path) -> list[dict]:
+        """Get the trades of a JSON Lines trade record file that are not closed yet.
+
+        Args:
+            file: Trade record file in JSON Lines format
+
+        Returns:
+            list[dict]: The unclosed trades.
+        """
+        return [row for row in self.read_jsonl(file=file) if not self.str_to_bool(row.get("closed", False))]
+
+    def write_jsonl_updates(self, *, file: Path, rows: list[dict]):
+        """Append an update line for every closed trade in rows.
+
+        Args:
+            file: Trade record file in JSON Lines format
+            rows: Trades updated by update_rows.
+        """
+        updates = [{self.UPDATE_KEY: row["order"]} | {key: row.get(key) for key in self.CLOSE_FIELDS}
+                   for row in rows if self.str_to_bool(row["closed"])]
+        if updates:
+            JSONLWriter(file).write_many(updates)
+
+    def compact_jsonl(self, *, file: Path):
+        """Fold the update lines of a JSON Lines trade record file into its trades.
+
+        The compacted file is written next to the original and moved over it, while holding the lock of
+        the file's JSONLWriter.
+
+        Args:
+            file: Trade record file in JSON Lines format
+        """
+        file = Path(file)
+        try:
+            with JSONLWriter.locked(file):
+                rows = self.read_jsonl(file=file)
+                self.replace_file(file=file, write=lambda fh: fh.writelines(json.dumps(row, default=str) + "\n"
+                                                                           for row in rows))
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to compact jsonl trade records")
+
+    def compact_jsonl_records(self):
+        """Compact the JSON Lines trade records in the records_dir folder."""
+        for record in self.get_jsonl_records():
+            self.compact_jsonl(file=record)
+
     async def read_update_csv(self, *, file: Path):
         """Read and update csv trade records
 
@@ -134,14 +458,53 @@ class TradeRecords:
             with open(file, mode="r", newline="") as fr:
                 reader: Iterable[dict] | csv.DictReader = csv.DictReader(fr)
                 rows = [row for row in reader]
-                rows = await self.update_rows(rows=rows)
+            rows = await self.update_rows(rows=rows, source=str(file))
+            self.write_csv_rows(file=file, rows=rows)
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to read and update csv trade records")
+
+    @staticmethod
+    def write_csv_rows(*, file: Path, rows: list[dict]):
+        """Write updated rows back to a csv trade record file.
+
+        The file is read again under the lock of its CSVWriter, and its rows are replaced by the updated
+        rows with the same order, so rows appended by strategies after the file was first read are kept. The
+        file is replaced atomically.
+
+        Args:
+            file: Trade record file in csv format
+            rows: The updated rows.
+        """
+        updated = {row["order"]: row for row in rows}
+        with CSVWriter.locked(file):
+            with open(file, mode="r", newline="") as fr:
+                reader: Iterable[dict] | csv.DictReader = csv.DictReader(fr)
+                rows = [updated.get(row["order"], row) for row in reader]
 
-            with open(file, mode="w", newline="") as fw:
+            def write(fw: TextIO):
                 writer = csv.DictWriter(fw, fieldnames=reader.fieldnames, extrasaction="ignore", restval=None)
                 writer.writeheader()
                 writer.writerows(rows)
-        except Exception as err:
-            logger.error(f"Error: {err}. Unable to read and update csv trade records")
+
+            TradeRecords.replace_file(file=Path(file), write=write, newline="")
+
+    @staticmethod
+    def write_json_rows(*, file: Path, rows: list[dict]):
+        """Write updated rows back to a json trade record file.
+
+        The file is read again while holding the lock Result saves with, and its rows are replaced by the
+        updated rows with the same order, so results saved after the file was first read are kept. The file
+        is replaced atomically.
+
+        Args:
+            file: Trade record file in json format
+            rows: The updated rows.
+        """
+        updated = {row["order"]: row for row in rows}
+        with Result.lock:
+            with open(file, mode="r") as fh:
+                rows = [updated.get(row["order"], row) for row in json.load(fh)]
+            TradeRecords.replace_file(file=Path(file), write=lambda fh: json.dump(rows, fh, indent=2))
 
     async def read_update_json(self, *, file: Path):
         """Read and update json trade records
@@ -150,41 +513,56 @@ class TradeRecords:
         """
         try:
             with open(file, mode="r") as fh:
-                data = json.load(fh)
-                rows = [row for row in data]
-                rows = await self.update_rows(rows=rows)
-
-            with open(file, mode="w") as fh:
-                json.dump(rows, fh, indent=2)
+                rows = json.load(fh)
+            rows = await self.update_rows(rows=rows, source=str(file))
+            self.write_json_rows(file=file, rows=rows)
         except Exception as err:
             logger.error(f"Error: {err}. Unable to read and update json trade records")
 
-    async def update_rows(self, rows: list[dict]) -> list[dict]:
+    async def read_update_jsonl(self, *, file: Path):
+        """Read the unclosed trades of a JSON Lines file and append updates for the closed ones.
+
+        Args:
+            file: Trade record file in JSON Lines format
+        """
+        try:
+            if rows := self.get_jsonl_rows_unclosed(file=file):
+                rows = await self.update_rows(rows=rows, source=str(file))
+                self.write_jsonl_updates(file=file, rows=rows)
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to read and update jsonl trade records")
+
+    async def update_rows(self, rows: list[dict], *, source: str = "") -> list[dict]:
         """Update multiple trade rows with actual profit/loss from closed positions.
 
-        Retrieves historical deals from MetaTrader for the time range covered
-        by the rows and updates each unclosed row with closing information.
+        Retrieves the historical deals from MetaTrader after the sync
+        watermark of the source, or after the opening time of the trades
+        recorded since the last sync, and updates the unclosed rows with
+        closing information.
 
         Args:
             rows: List of trade record dictionaries to update. Each dict must
-                contain 'time' (in seconds) and 'order' keys.
+                contain 'time', 'closed' and 'order' keys.
+            source: The record source, used to persist the sync watermark.
+                Without one all deals since the earliest open trade are fetched.
 
         Returns:
             list[dict]: Updated list of trade records with profit, win status,
                 time_close, and price_close fields populated for closed trades.
-
-        Note:
-            Time values in rows should be in seconds. The method converts
-            them to milliseconds for the MetaTrader API.
         """
         rows.sort(key=lambda _row: _row["time"])
-        start = datetime.fromtimestamp(float(rows[0]["time"]) / 1000).replace(hour=0, minute=0)
-        end = datetime.now().replace(hour=23, minute=59)
-        deals = await self.mt5.history_deals_get(date_from=start, date_to=end)
-        closing_deals = {deal.position_id: deal for deal in deals if deal.order != deal.position_id and deal.entry == self.mt5.DEAL_ENTRY_OUT}
-        for row in rows:
-            if (self.str_to_bool(row["closed"])) is False  and (deal := closing_deals.get(int(row["order"]), 0)) and deal.order != deal.position_id and deal.entry == self.mt5.DEAL_ENTRY_OUT:
-                row.update(profit=deal.profit, win=deal.profit > 0, closed=True, time_close=deal.time_msc/1000, price_close=deal.price)
+        index, start, mark = self.plan_sync(items=self.open_row_items(rows), source=source)
+        if not index:
+            return rows
+        for date_from, date_to in self.sync_windows(start):
+            deals = await self.mt5.history_deals_get(date_from=date_from, date_to=date_to)
+            if not self.fetched(deals, date_from, date_to):
+                break
+            mark = self.close_rows(index=index, deals=deals, mark=mark, close=self.close_row)
+            if source:
+                self.set_watermark(source, time=mark, orders=index)
+            if not index:
+                break
         return rows
 
     @staticmethod
@@ -220,6 +598,128 @@ class TradeRecords:
         records = [self.read_update_json(file=record) for record in self.get_json_records()]
         await asyncio.gather(*records)
 
+    async def update_jsonl_records(self):
+        """Update JSON Lines trade records in the records_dir folder."""
+        records = [self.read_update_jsonl(file=record) for record in self.get_jsonl_records()]
+        await asyncio.gather(*records)
+
+    def read_records(self, file: Path) -> list[dict] | None:
+        """Read the rows of a trade record file for update_records, logging errors instead of raising them."""
+        try:
+            return self.read_rows(file=file)
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to read trade records from {file}")
+
+    def write_records(self, file: Path, rows: list[dict]):
+        """Write the rows of a trade record file for update_records, logging errors instead of raising them."""
+        try:
+            self.write_rows(file=file, rows=rows)
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to write trade records to {file}")
+
+    def plan_records(self, files: list[Path], reads: list[list[dict] | None]) \
+            -> tuple[list[tuple[Path, list[dict], dict, int | None]], datetime | None]:
+        """Index the open trades of every file and find where the deals snapshot should start.
+
+        Args:
+            files: The trade record files.
+            reads: The rows of every file, None for files that could not be read.
+
+        Returns:
+            tuple: The file, rows, open rows by order and watermark time of every file with open trades, and the
+                start of the snapshot, None if no trade is open.
+        """
+        plans, start = [], None
+        for file, rows in zip(files, reads):
+            if not rows:
+                continue
+            index, since, mark = self.plan_sync(items=self.open_row_items(rows), source=str(file))
+            if index:
+                plans.append((file, rows, index, mark))
+                start = since if start is None else min(start, since)
+        return plans, start
+
+    def index_deals(self, *, deals: Iterable, closing: dict, mark: int | None) -> int | None:
+        """Add the closing deals of a window of the snapshot to the index of closing deals by position.
+
+        Args:
+            deals: The deals of a window.
+            closing: The closing deals by position id.
+            mark: The time in milliseconds of the last deal of the snapshot.
+
+        Returns:
+            int | None: The time in milliseconds of the last deal of the snapshot.
+        """
+        for deal in deals or ():
+            mark = deal.time_msc if mark is None else max(mark, deal.time_msc)
+            if self.is_closing(deal):
+                closing[deal.position_id] = deal
+        return mark
+
+    def close_records(self, *, plans: list[tuple[Path, list[dict], dict, int | None]], closing: dict,
+                      mark: int | None, save: bool = True) -> tuple[list[tuple[Path, list[dict]]], int]:
+        """Close the open trades of every file that have a closing deal and save the watermarks.
+
+        Args:
+            plans: The plans of plan_records.
+            closing: The closing deals by position id.
+            mark: The time in milliseconds of the last deal of the snapshot.
+            save: Whether to save the watermarks. False when a window of the snapshot could not be fetched.
+
+        Returns:
+            tuple: The files with closed trades and their rows, and the number of trades closed.
+        """
+        writes, count = [], 0
+        for file, rows, index, file_mark in plans:
+            closed = 0
+            for order in [order for order in index if order in closing]:
+                self.close_row(index.pop(order), closing[order])
+                closed += 1
+            if save:
+                marks = [time for time in (file_mark, mark) if time is not None]
+                self.set_watermark(str(file), time=max(marks) if marks else None, orders=index)
+            if closed:
+                writes.append((file, rows))
+                count += closed
+        return writes, count
+
+    async def update_records(self, *, files: Iterable[Path | str] = None, workers: int | None = None) -> int:
+        """Update the csv, json and JSON Lines trade record files together.
+
+        The files are read and written on a thread pool, off the event loop. One snapshot of the deals, from the
+        earliest sync watermark or open trade of all the files, is fetched and indexed by position, until every
+        open trade has its closing deal, and every file is matched against it. Files with closed trades are
+        replaced atomically.
+
+        Args:
+            files: The trade record files. Defaults to every record file in records_dir.
+            workers: Number of threads reading and writing files. Defaults to the ThreadPoolExecutor default.
+
+        Returns:
+            int: The number of trades closed.
+        """
+        files = [Path(file) for file in files] if files is not None else self.get_record_files()
+        if not files:
+            return 0
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TradeRecords") as pool:
+            reads = await asyncio.gather(*(loop.run_in_executor(pool, self.read_records, file) for file in files))
+            plans, start = self.plan_records(files, reads)
+            if start is None:
+                return 0
+            pending, closing, mark, complete = {order for *_, index, _ in plans for order in index}, {}, None, True
+            for date_from, date_to in self.sync_windows(start):
+                deals = await self.mt5.history_deals_get(date_from=date_from, date_to=date_to)
+                if not (complete := self.fetched(deals, date_from, date_to)):
+                    break
+                mark = self.index_deals(deals=deals, closing=closing, mark=mark)
+                if pending <= closing.keys():
+                    break
+            writes, count = self.close_records(plans=plans, closing=closing, mark=mark, save=complete)
+            await asyncio.gather(*(loop.run_in_executor(pool, self.write_records, file, rows)
+                                   for file, rows in writes))
+        return count
+
     async def update_csv_record(self, *, file: Path | str):
         """Update a single trade record csv file."""
         await self.read_update_csv(file=file)
@@ -238,12 +738,8 @@ class TradeRecords:
             with open(file, mode="r", newline="") as fr:
                 reader: Iterable[dict] | csv.DictReader = csv.DictReader(fr)
                 rows = [row for row in reader]
-                rows = self.update_rows_sync(rows=rows)
-
-            with open(file, mode="w", newline="") as fw:
-                writer = csv.DictWriter(fw, fieldnames=reader.fieldnames, extrasaction="ignore", restval=None)
-                writer.writeheader()
-                writer.writerows(rows)
+            rows = self.update_rows_sync(rows=rows, source=str(file))
+            self.write_csv_rows(file=file, rows=rows)
         except Exception as err:
             logger.error(f"Error: {err}. Unable to read and update csv trade records")
 
@@ -255,35 +751,48 @@ class TradeRecords:
         """
         try:
             with open(file, mode="r") as fh:
-                data = json.load(fh)
-                rows = [row for row in data]
-                rows = self.update_rows_sync(rows=rows)
-
-            with open(file, mode="w") as fh:
-                json.dump(rows, fh, indent=2)
+                rows = json.load(fh)
+            rows = self.update_rows_sync(rows=rows, source=str(file))
+            self.write_json_rows(file=file, rows=rows)
         except Exception as err:
             logger.error(f"Error: {err}. Unable to read and update json trade records")
 
-    def update_rows_sync(self, *, rows: list[dict]) -> list[dict]:
+    def read_update_jsonl_sync(self, *, file: Path):
+        """Read the unclosed trades of a JSON Lines file and append updates for the closed ones synchronously.
+
+        Args:
+            file: Trade record file in JSON Lines format
+        """
+        try:
+            if rows := self.get_jsonl_rows_unclosed(file=file):
+                rows = self.update_rows_sync(rows=rows, source=str(file))
+                self.write_jsonl_updates(file=file, rows=rows)
+        except Exception as err:
+            logger.error(f"Error: {err}. Unable to read and update jsonl trade records")
+
+    def update_rows_sync(self, *, rows: list[dict], source: str = "") -> list[dict]:
         """Update the rows of entered trades in the csv or json file with the actual profit synchronously.
 
         Args:
             rows: A list of dictionaries.
+            source: The record source, used to persist the sync watermark.
 
         Returns:
             list[dict]: A list of dictionaries with the actual profit and win status.
         """
         rows.sort(key=lambda _row: _row["time"])
-        start = datetime.fromtimestamp(float(rows[0]["time"]) / 1000).replace(hour=0, minute=0)
-        end = datetime.now().replace(hour=23, minute=59)
-        deals = self.mt5._history_deals_get(date_from=start, date_to=end)
-        closing_deals = {deal.position_id: deal for deal in deals if
-                         deal.order != deal.position_id and deal.entry == self.mt5.DEAL_ENTRY_OUT}
-        for row in rows:
-            if (self.str_to_bool(row["closed"])) is False and (deal := closing_deals.get(int(row["order"]),
-                                                                                         0)) and deal.order != deal.position_id and deal.entry == self.mt5.DEAL_ENTRY_OUT:
-                row.update(profit=deal.profit, win=deal.profit > 0, closed=True, time_close=deal.time_msc / 1000,
-                           price_close=deal.price)
+        index, start, mark = self.plan_sync(items=self.open_row_items(rows), source=source)
+        if not index:
+            return rows
+        for date_from, date_to in self.sync_windows(start):
+            deals = self.mt5._history_deals_get(date_from=date_from, date_to=date_to)
+            if not self.fetched(deals, date_from, date_to):
+                break
+            mark = self.close_rows(index=index, deals=deals, mark=mark, close=self.close_row)
+            if source:
+                self.set_watermark(source, time=mark, orders=index)
+            if not index:
+                break
         return rows
 
     def update_csv_records_sync(self):
@@ -296,6 +805,40 @@ class TradeRecords:
         for record in self.get_json_records():
             self.read_update_json_sync(file=record)
 
+    def update_jsonl_records_sync(self):
+        """Update JSON Lines trade records in the records_dir folder synchronously."""
+        for record in self.get_jsonl_records():
+            self.read_update_jsonl_sync(file=record)
+
+    def update_records_sync(self, *, files: Iterable[Path | str] = None, workers: int | None = None) -> int:
+        """Update the csv, json and JSON Lines trade record files together synchronously.
+
+        Args:
+            files: The trade record files. Defaults to every record file in records_dir.
+            workers: Number of threads reading and writing files. Defaults to the ThreadPoolExecutor default.
+
+        Returns:
+            int: The number of trades closed.
+        """
+        files = [Path(file) for file in files] if files is not None else self.get_record_files()
+        if not files:
+            return 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TradeRecords") as pool:
+            plans, start = self.plan_records(files, list(pool.map(self.read_records, files)))
+            if start is None:
+                return 0
+            pending, closing, mark, complete = {order for *_, index, _ in plans for order in index}, {}, None, True
+            for date_from, date_to in self.sync_windows(start):
+                deals = self.mt5._history_deals_get(date_from=date_from, date_to=date_to)
+                if not (complete := self.fetched(deals, date_from, date_to)):
+                    break
+                mark = self.index_deals(deals=deals, closing=closing, mark=mark)
+                if pending <= closing.keys():
+                    break
+            writes, count = self.close_records(plans=plans, closing=closing, mark=mark, save=complete)
+            list(pool.map(self.write_records, [file for file, _ in writes], [rows for _, rows in writes]))
+        return count
+
     def update_csv_record_sync(self, *, file: Path | str):
         """Update a single trade record csv file synchronously."""
         self.read_update_csv_sync(file=file)
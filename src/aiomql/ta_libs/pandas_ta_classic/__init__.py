@@ -13,8 +13,43 @@ from ._meta import (
     RATE,
 )
 
-# Import core functionality
-from .core import *
+from importlib import import_module
+
+from pandas.api.extensions import register_dataframe_accessor
+
+
+# Indicator modules, the 'ta' DataFrame accessor implementation and their
+# dependencies are imported on first use by __getattr__ and _LazyAnalysisIndicators.
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    core = import_module(".core", __name__)
+
+    if name in globals():
+        return globals()[name]
+    try:
+        value = getattr(core, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    core = import_module(".core", __name__)
+
+    return sorted(set(globals()) | {name for name in dir(core) if not name.startswith("_")})
+
+
+@register_dataframe_accessor("ta")
+class _LazyAnalysisIndicators:
+    """Pandas TA DataFrame accessor that imports the indicators on first use"""
+
+    def __new__(cls, pandas_obj):
+        from .core import AnalysisIndicators
+
+        return AnalysisIndicators(pandas_obj)
+
 
 __version__ = version
 __description__ = (
@@ -163,7 +163,7 @@ class BasePandasObject(PandasObject):
 
 
 # Pandas TA - DataFrame Analysis Indicators
-@pd.api.extensions.register_dataframe_accessor("ta")
+# Registered as the 'ta' DataFrame accessor by the package __init__
 class AnalysisIndicators(BasePandasObject):
     """
     This Pandas Extension is named 'ta' for Technical Analysis. In other words,
@@ -2,7 +2,7 @@
 # Absolute Price Oscillator (APO)
 from .. import Imports
 from ..overlap.ma import ma
-from ..utils import get_offset, tal_ma, verify_series
+from ..utils import get_offset, tal_ma, verify_series, talib_mode
 
 
 def apo(close, fast=None, slow=None, mamode=None, talib=None, offset=None, **kwargs):
@@ -15,7 +15,7 @@ def apo(close, fast=None, slow=None, mamode=None, talib=None, offset=None, **kwa
     close = verify_series(close, max(fast, slow))
     mamode = mamode if isinstance(mamode, str) else "sma"
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Balance of Power (BOP)
 from .. import Imports
-from ..utils import get_offset, non_zero_range, verify_series
+from ..utils import get_offset, non_zero_range, verify_series, talib_mode
 
 
 def bop(open_, high, low, close, scalar=None, talib=None, offset=None, **kwargs):
@@ -13,7 +13,7 @@ def bop(open_, high, low, close, scalar=None, talib=None, offset=None, **kwargs)
     close = verify_series(close)
     scalar = float(scalar) if scalar else 1
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     # Calculate Result
     if Imports["talib"] and mode_tal:
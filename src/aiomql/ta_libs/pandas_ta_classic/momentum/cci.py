@@ -4,7 +4,7 @@ from .. import Imports
 from ..overlap.hlc3 import hlc3
 from ..overlap.sma import sma
 from ..statistics import mad, stdev
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def cci(high, low, close, length=None, c=None, talib=None, offset=None, **kwargs):
@@ -16,7 +16,7 @@ def cci(high, low, close, length=None, c=None, talib=None, offset=None, **kwargs
     low = verify_series(low, length)
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None:
         return
@@ -2,7 +2,7 @@
 # Chande Momentum Oscillator (CMO)
 from .. import Imports
 from ..overlap.rma import rma
-from ..utils import get_drift, get_offset, verify_series
+from ..utils import get_drift, get_offset, verify_series, talib_mode
 
 
 def cmo(close, length=None, scalar=None, talib=None, drift=None, offset=None, **kwargs):
@@ -13,7 +13,7 @@ def cmo(close, length=None, scalar=None, talib=None, drift=None, offset=None, **
     close = verify_series(close, length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -3,7 +3,7 @@
 from pandas import DataFrame
 from .. import Imports
 from ..overlap.ma import ma
-from ..utils import get_offset, verify_series, get_drift, zero
+from ..utils import get_offset, verify_series, get_drift, zero, talib_mode
 
 
 def dm(
@@ -17,7 +17,7 @@ def dm(
     low = verify_series(low)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None:
         return
@@ -3,7 +3,7 @@
 from pandas import concat, DataFrame
 from .. import Imports
 from ..overlap.ema import ema
-from ..utils import get_offset, verify_series, signals
+from ..utils import get_offset, verify_series, signals, talib_mode
 
 
 def macd(close, fast=None, slow=None, signal=None, talib=None, offset=None, **kwargs):
@@ -16,7 +16,7 @@ def macd(close, fast=None, slow=None, signal=None, talib=None, offset=None, **kw
         fast, slow = slow, fast
     close = verify_series(close, max(fast, slow, signal))
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Momentum (MOM)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def mom(close, length=None, talib=None, offset=None, **kwargs):
@@ -10,7 +10,7 @@ def mom(close, length=None, talib=None, offset=None, **kwargs):
     length = int(length) if length and length > 0 else 10
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
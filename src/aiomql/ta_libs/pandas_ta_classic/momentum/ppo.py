@@ -3,7 +3,7 @@
 from pandas import DataFrame
 from .. import Imports
 from ..overlap.ma import ma
-from ..utils import get_offset, tal_ma, verify_series
+from ..utils import get_offset, tal_ma, verify_series, talib_mode
 
 
 def ppo(
@@ -28,7 +28,7 @@ def ppo(
         fast, slow = slow, fast
     close = verify_series(close, max(fast, slow, signal))
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
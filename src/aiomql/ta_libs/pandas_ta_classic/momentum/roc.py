@@ -2,7 +2,7 @@
 # Rate of Change (ROC)
 from .mom import mom
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def roc(close, length=None, scalar=None, talib=None, offset=None, **kwargs):
@@ -12,7 +12,7 @@ def roc(close, length=None, scalar=None, talib=None, offset=None, **kwargs):
     scalar = float(scalar) if scalar and scalar > 0 else 100
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
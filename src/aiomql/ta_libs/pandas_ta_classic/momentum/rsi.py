@@ -3,7 +3,7 @@
 from pandas import DataFrame, concat
 from .. import Imports
 from ..overlap.rma import rma
-from ..utils import get_drift, get_offset, verify_series, signals
+from ..utils import get_drift, get_offset, verify_series, signals, talib_mode
 
 
 def rsi(close, length=None, scalar=None, talib=None, drift=None, offset=None, **kwargs):
@@ -14,7 +14,7 @@ def rsi(close, length=None, scalar=None, talib=None, drift=None, offset=None, **
     close = verify_series(close, length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -2,7 +2,7 @@
 # Ultimate Oscillator (UO)
 from pandas import DataFrame
 from .. import Imports
-from ..utils import get_drift, get_offset, verify_series
+from ..utils import get_drift, get_offset, verify_series, talib_mode
 
 
 def uo(
@@ -34,7 +34,7 @@ def uo(
     close = verify_series(close, _length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None:
         return
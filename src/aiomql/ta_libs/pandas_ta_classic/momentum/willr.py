@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Williams %R (WILLR)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def willr(high, low, close, length=None, talib=None, offset=None, **kwargs):
@@ -18,7 +18,7 @@ def willr(high, low, close, length=None, talib=None, offset=None, **kwargs):
     low = verify_series(low, _length)
     close = verify_series(close, _length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None:
         return
@@ -2,7 +2,7 @@
 # Double Exponential Moving Average (DEMA)
 from .ema import ema
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def dema(close, length=None, talib=None, offset=None, **kwargs):
@@ -11,7 +11,7 @@ def dema(close, length=None, talib=None, offset=None, **kwargs):
     length = int(length) if length and length > 0 else 10
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -4,7 +4,7 @@ import numpy as np
 from .. import Imports
 
 npNaN = np.nan
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def ema(close, length=None, talib=None, offset=None, **kwargs):
@@ -15,7 +15,7 @@ def ema(close, length=None, talib=None, offset=None, **kwargs):
     sma = kwargs.pop("sma", True)
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # HLC3 (HLC3)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def hlc3(high, low, close, talib=None, offset=None, **kwargs):
@@ -11,7 +11,7 @@ def hlc3(high, low, close, talib=None, offset=None, **kwargs):
     low = verify_series(low)
     close = verify_series(close)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     # Calculate Result
     if Imports["talib"] and mode_tal:
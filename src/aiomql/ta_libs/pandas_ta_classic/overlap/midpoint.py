@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Midpoint (MIDPOINT)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def midpoint(close, length=None, talib=None, offset=None, **kwargs):
@@ -15,7 +15,7 @@ def midpoint(close, length=None, talib=None, offset=None, **kwargs):
     )
     close = verify_series(close, max(length, min_periods))
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
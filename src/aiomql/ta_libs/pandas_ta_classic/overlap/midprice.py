@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Midprice (MIDPRICE)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def midprice(high, low, length=None, talib=None, offset=None, **kwargs):
@@ -17,7 +17,7 @@ def midprice(high, low, length=None, talib=None, offset=None, **kwargs):
     high = verify_series(high, _length)
     low = verify_series(low, _length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None:
         return
@@ -2,7 +2,7 @@
 # T3 (T3)
 from .ema import ema
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def t3(close, length=None, a=None, talib=None, offset=None, **kwargs):
@@ -12,7 +12,7 @@ def t3(close, length=None, a=None, talib=None, offset=None, **kwargs):
     a = float(a) if a and a > 0 and a < 1 else 0.7
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -2,7 +2,7 @@
 # Weighted Moving Average (WMA)
 from pandas import Series
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def wma(close, length=None, asc=None, talib=None, offset=None, **kwargs):
@@ -12,7 +12,7 @@ def wma(close, length=None, asc=None, talib=None, offset=None, **kwargs):
     asc = asc if asc else True
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -3,7 +3,7 @@
 from numpy import sqrt as npsqrt
 from .variance import variance
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def stdev(close, length=None, ddof=None, talib=None, offset=None, **kwargs):
@@ -13,7 +13,7 @@ def stdev(close, length=None, ddof=None, talib=None, offset=None, **kwargs):
     ddof = int(ddof) if isinstance(ddof, int) and ddof >= 0 and ddof < length else 1
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Variance (VARIANCE)
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def variance(close, length=None, ddof=None, talib=None, offset=None, **kwargs):
@@ -16,7 +16,7 @@ def variance(close, length=None, ddof=None, talib=None, offset=None, **kwargs):
     )
     close = verify_series(close, max(length, min_periods))
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
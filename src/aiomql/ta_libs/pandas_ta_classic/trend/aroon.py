@@ -2,7 +2,7 @@
 # Aroon (AROON)
 from pandas import DataFrame
 from .. import Imports
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 from ..utils import recent_maximum_index, recent_minimum_index
 
 
@@ -14,7 +14,7 @@ def aroon(high, low, length=None, scalar=None, talib=None, offset=None, **kwargs
     high = verify_series(high, length)
     low = verify_series(low, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None:
         return
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from ._backend import *
 from ._candles import *
 from ._core import *
 from ._math import *
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from time import perf_counter
+
+from numpy import nan
+from pandas import DataFrame, Series
+
+from .. import Imports
+
+# Indicators with a TA-Lib equivalent and the TA-Lib functions they dispatch to
+TALIB_INDICATORS = {
+    "ad": ("AD",),
+    "adosc": ("ADOSC",),
+    "apo": ("APO",),
+    "aroon": ("AROON", "AROONOSC"),
+    "atr": ("ATR",),
+    "bbands": ("BBANDS",),
+    "bop": ("BOP",),
+    "cci": ("CCI",),
+    "cmo": ("CMO",),
+    "dema": ("DEMA",),
+    "dm": ("MINUS_DM", "PLUS_DM"),
+    "ema": ("EMA",),
+    "hlc3": ("TYPPRICE",),
+    "macd": ("MACD",),
+    "mfi": ("MFI",),
+    "midpoint": ("MIDPOINT",),
+    "midprice": ("MIDPRICE",),
+    "mom": ("MOM",),
+    "natr": ("NATR",),
+    "obv": ("OBV",),
+    "ppo": ("PPO",),
+    "roc": ("ROC",),
+    "rsi": ("RSI",),
+    "sma": ("SMA",),
+    "stdev": ("STDDEV",),
+    "t3": ("T3",),
+    "tema": ("TEMA",),
+    "trima": ("TRIMA",),
+    "true_range": ("TRANGE",),
+    "uo": ("ULTOSC",),
+    "variance": ("VAR",),
+    "wcp": ("WCLPRICE",),
+    "willr": ("WILLR",),
+    "wma": ("WMA",),
+}
+
+# Global backend settings, TA-Lib is used by default whenever it is installed
+Backend = {"talib": Imports["talib"]}
+
+
+def use_talib(enabled: bool = True) -> bool:
+    """Route every indicator with a TA-Lib equivalent to TA-Lib or to the native
+    implementation. Returns the effective setting which is always False when
+    TA-Lib is not installed. A 'talib' keyword argument on an indicator call
+    still overrides the global setting."""
+    Backend["talib"] = bool(enabled) and Imports["talib"]
+    return Backend["talib"]
+
+
+def talib_mode(talib: bool = None) -> bool:
+    """Helper Function that resolves if an indicator call should use TA-Lib"""
+    if not Imports["talib"]:
+        return False
+    return bool(talib) if isinstance(talib, bool) else Backend["talib"]
+
+
+def _result_columns(result) -> list:
+    if isinstance(result, DataFrame):
+        return list(result.columns)
+    if isinstance(result, Series):
+        return [result.name]
+    return []
+
+
+def _max_abs_diff(native, talib) -> float:
+    if not isinstance(native, (DataFrame, Series)) or not isinstance(talib, (DataFrame, Series)):
+        return nan
+    native, talib = DataFrame(native), DataFrame(talib)
+    if list(native.columns) != list(talib.columns):
+        return nan
+    diff = (native.astype(float) - talib.astype(float)).abs()
+    return float(diff.max().max()) if diff.size else nan
+
+
+def talib_benchmark(df: DataFrame, indicators: list = None, repeat: int = 5) -> DataFrame:
+    """Benchmark and parity matrix of the native and TA-Lib implementations
+
+    Every indicator is run 'repeat' times with 'talib=False' and 'talib=True' on the
+    given ohlcv DataFrame. When TA-Lib is not installed only the native timings are
+    collected.
+
+    Args:
+        df (pd.DataFrame): ohlcv DataFrame
+        indicators (list): Indicator names. Default: all of TALIB_INDICATORS
+        repeat (int): Number of runs per implementation. Default: 5
+
+    Returns:
+        pd.DataFrame: Indexed by indicator with the columns talib, native_ms,
+        talib_ms, speedup, same_columns and max_abs_diff, plus error for
+        indicators that failed to run
+    """
+    rows = []
+    for name in indicators or TALIB_INDICATORS:
+        method = getattr(df.ta, name)
+        row = {"indicator": name, "talib": ", ".join(TALIB_INDICATORS.get(name, ()))}
+        results, timings = {}, {}
+        try:
+            for mode in (False, True) if Imports["talib"] else (False,):
+                stime = perf_counter()
+                for _ in range(repeat):
+                    results[mode] = method(talib=mode)
+                timings[mode] = 1000 * (perf_counter() - stime) / repeat
+        except Exception as err:
+            row["error"] = f"{type(err).__name__}: {err}"
+
+        native_ms = timings.get(False, nan)
+        talib_ms = timings.get(True, nan)
+        compared = False in results and True in results
+        row |= {
+            "native_ms": native_ms,
+            "talib_ms": talib_ms,
+            "speedup": native_ms / talib_ms if talib_ms > 0 else nan,
+            "same_columns": _result_columns(results[False]) == _result_columns(results[True]) if compared else None,
+            "max_abs_diff": _max_abs_diff(results[False], results[True]) if compared else nan,
+        }
+        rows.append(row)
+    return DataFrame(rows).set_index("indicator")
@@ -3,7 +3,7 @@
 from .true_range import true_range
 from .. import Imports
 from ..overlap.ma import ma
-from ..utils import get_drift, get_offset, verify_series
+from ..utils import get_drift, get_offset, verify_series, talib_mode
 
 
 def atr(
@@ -26,7 +26,7 @@ def atr(
     close = verify_series(close, length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None:
         return
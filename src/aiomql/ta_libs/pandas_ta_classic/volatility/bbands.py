@@ -4,7 +4,7 @@ from pandas import DataFrame
 from .. import Imports
 from ..overlap.ma import ma
 from ..statistics import stdev
-from ..utils import get_offset, non_zero_range, tal_ma, verify_series
+from ..utils import get_offset, non_zero_range, tal_ma, verify_series, talib_mode
 
 
 def bbands(
@@ -18,7 +18,7 @@ def bbands(
     ddof = int(ddof) if ddof >= 0 and ddof < length else 1
     close = verify_series(close, length)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if close is None:
         return
@@ -2,7 +2,7 @@
 # Normalized Average True Range (NATR)
 from .atr import atr
 from .. import Imports
-from ..utils import get_drift, get_offset, verify_series
+from ..utils import get_drift, get_offset, verify_series, talib_mode
 
 
 def natr(
@@ -27,7 +27,7 @@ def natr(
     close = verify_series(close, length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None:
         return
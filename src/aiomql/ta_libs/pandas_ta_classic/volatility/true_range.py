@@ -5,7 +5,7 @@ from pandas import concat
 
 npNaN = np.nan
 from .. import Imports
-from ..utils import get_drift, get_offset, non_zero_range, verify_series
+from ..utils import get_drift, get_offset, non_zero_range, verify_series, talib_mode
 
 
 def true_range(high, low, close, talib=None, drift=None, offset=None, **kwargs):
@@ -16,7 +16,7 @@ def true_range(high, low, close, talib=None, drift=None, offset=None, **kwargs):
     close = verify_series(close)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     # Calculate Result
     if Imports["talib"] and mode_tal:
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Accumulation/Distribution (AD)
 from .. import Imports
-from ..utils import get_offset, non_zero_range, verify_series
+from ..utils import get_offset, non_zero_range, verify_series, talib_mode
 
 
 def ad(high, low, close, volume, open_=None, talib=None, offset=None, **kwargs):
@@ -12,7 +12,7 @@ def ad(high, low, close, volume, open_=None, talib=None, offset=None, **kwargs):
     close = verify_series(close)
     volume = verify_series(volume)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     # Calculate Result
     if Imports["talib"] and mode_tal:
@@ -3,7 +3,7 @@
 from .ad import ad
 from .. import Imports
 from ..overlap.ema import ema
-from ..utils import get_offset, verify_series
+from ..utils import get_offset, verify_series, talib_mode
 
 
 def adosc(
@@ -30,7 +30,7 @@ def adosc(
     offset = get_offset(offset)
     if "length" in kwargs:
         kwargs.pop("length")
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None or volume is None:
         return
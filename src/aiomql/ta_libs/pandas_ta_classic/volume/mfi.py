@@ -3,7 +3,7 @@
 from pandas import DataFrame
 from .. import Imports
 from ..overlap.hlc3 import hlc3
-from ..utils import get_drift, get_offset, verify_series
+from ..utils import get_drift, get_offset, verify_series, talib_mode
 
 
 def mfi(
@@ -18,7 +18,7 @@ def mfi(
     volume = verify_series(volume, length)
     drift = get_drift(drift)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     if high is None or low is None or close is None or volume is None:
         return
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # On Balance Volume (OBV)
 from .. import Imports
-from ..utils import get_offset, signed_series, verify_series
+from ..utils import get_offset, signed_series, verify_series, talib_mode
 
 
 def obv(close, volume, talib=None, offset=None, **kwargs):
@@ -10,7 +10,7 @@ def obv(close, volume, talib=None, offset=None, **kwargs):
     close = verify_series(close)
     volume = verify_series(volume)
     offset = get_offset(offset)
-    mode_tal = bool(talib) if isinstance(talib, bool) else True
+    mode_tal = talib_mode(talib)
 
     # Calculate Result
     if Imports["talib"] and mode_tal:
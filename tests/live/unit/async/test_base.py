@@ -5,10 +5,13 @@ Tests cover:
 - BaseMeta metaclass lazy setup behavior
 - _Base class with MetaTrader/Config integration and pickling support
 - Subclassing and annotation/exclude/include merging
+- Compiled construction from namedtuples with from_mt5 and from_mt5_many
+- to_dict, to_tuple and the per-class field lists
 """
 
 import enum
 import pickle
+from collections import namedtuple
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -562,3 +565,88 @@ class TestBaseSubclassing:
         assert isinstance(obj, Base)
         assert isinstance(obj, SimpleModel)
         assert isinstance(obj, ExtendedModel)
+
+
+# ===========================================================================
+# TestBaseFromMT5
+# ===========================================================================
+
+RawModel = namedtuple("RawModel", ["name", "color", "score", "unknown"])
+
+
+class TestBaseFromMT5:
+    """Tests for the compiled constructor used with namedtuples from the terminal."""
+
+    def test_matches_keyword_construction(self):
+        """from_mt5 sets the same attributes, converted the same way and in the same order."""
+        raw = RawModel(name="x", color=2, score=3, unknown="ignored")
+        obj = ModelWithEnum.from_mt5(raw)
+        assert obj.__dict__ == ModelWithEnum(**raw._asdict()).__dict__
+        assert list(obj.__dict__) == ["name", "color", "score"]
+        assert obj.color is EnumColor.GREEN and isinstance(obj.score, float)
+
+    def test_unconvertible_values_are_kept(self):
+        """Values that can't be converted are kept as they are, as with set_attributes."""
+        obj = ModelWithEnum.from_mt5(RawModel(name="x", color=9, score="high", unknown=None))
+        assert obj.color == 9 and obj.score == "high"
+
+    def test_builder_is_compiled_once(self):
+        """The constructor is generated once for a class and fields."""
+        assert ModelWithEnum.builder(RawModel._fields) is ModelWithEnum.builder(RawModel._fields)
+        assert SimpleModel.converters() is SimpleModel.converters()
+
+    def test_classes_with_metaclass_are_called(self):
+        """Classes that need their __init__ or metaclass are constructed by calling them."""
+        obj = AsyncBaseModel.from_mt5(namedtuple("Raw", ["name"])("x"))
+        assert obj.name == "x" and "config" in AsyncBaseModel.__dict__
+
+    def test_from_mt5_many(self):
+        """from_mt5_many builds a tuple in the order of the namedtuples."""
+        raws = [RawModel(name=str(n), color=1, score=n, unknown=0) for n in range(3)]
+        objs = ModelWithEnum.from_mt5_many(raw for raw in raws)
+        assert [obj.name for obj in objs] == ["0", "1", "2"]
+        assert ModelWithEnum.from_mt5_many([]) == ()
+
+
+# ===========================================================================
+# TestBaseToDict
+# ===========================================================================
+
+
+class TestBaseToDict:
+    """Tests for to_dict, to_tuple and dict_fields."""
+
+    def test_dict_fields(self):
+        """dict_fields lists the annotated attributes that aren't excluded, once per class."""
+        assert CustomExcludeModel.dict_fields() == ("name", "visible")
+        assert SimpleModel.dict_fields(frozenset({"score"})) == ("name", "value")
+        assert SimpleModel.dict_fields() is SimpleModel.dict_fields()
+
+    def test_to_dict_matches_dict(self):
+        """to_dict of the annotated attributes equals dict, class defaults included."""
+        obj = ModelWithClassVar(name="x")
+        assert obj.to_dict() == obj.dict == {"name": "x", "kind": "default_kind"}
+
+    def test_to_dict_fields_and_none(self):
+        """to_dict returns the given fields in order, keeping None values only when asked."""
+        obj = SimpleModel(name="x", value=1)
+        obj.score = None
+        assert obj.to_dict(("value", "name", "score")) == {"value": 1, "name": "x"}
+        assert obj.to_dict(("score", "name"), drop_none=False) == {"score": None, "name": "x"}
+        assert SimpleModel(name="x").to_dict(drop_none=False) == {"name": "x"}
+
+    def test_to_tuple(self):
+        """to_tuple returns the values of the fields, None for those not set."""
+        obj = ModelWithClassVar(name="x")
+        assert obj.to_tuple(("kind", "name")) == ("default_kind", "x")
+        assert SimpleModel(name="x", value=2).to_tuple() == ("x", 2, None)
+
+    def test_class_vars_follow_class_changes(self):
+        """class_vars reads the current values of the class attributes."""
+        class Model(ModelWithClassVar):
+            pass
+
+        obj = Model(name="x")
+        assert obj.class_vars["kind"] == "default_kind"
+        Model.kind = "changed"
+        assert obj.dict["kind"] == "changed"
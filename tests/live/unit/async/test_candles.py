@@ -6,6 +6,9 @@ Tests cover:
 - Candle class functionality
 - Candles container operations
 """
+import asyncio
+import subprocess
+import sys
 from datetime import datetime
 
 import pytest
@@ -589,6 +592,249 @@ class TestCandles:
         assert "fas" in candles.data.columns
 
 
+class TestCandlesPatterns:
+    """Test vectorized candle metrics and pattern columns."""
+
+    @pytest.fixture
+    def pattern_candles(self):
+        """Create candles with known patterns."""
+        data = pd.DataFrame({
+            'time': [1609459200.0 + i * 3600 for i in range(5)],
+            'open': [100.0, 104.0, 101.0, 103.0, 100.0],
+            'high': [106.0, 105.0, 107.0, 106.0, 101.0],
+            'low': [99.0, 100.0, 100.0, 102.0, 90.0],
+            'close': [105.0, 102.0, 106.0, 103.0, 100.5],
+        })
+        return Candles(data=data)
+
+    def test_candle_metrics_match_candle_properties(self, pattern_candles):
+        """Test candle_metrics matches the per candle properties."""
+        metrics = pattern_candles.candle_metrics()
+        assert len(metrics) == len(pattern_candles)
+        for candle in pattern_candles:
+            row = metrics.iloc[candle.Index]
+            assert row.cdl_body == candle.candle_body
+            assert row.cdl_upper_wick == candle.upper_wick
+            assert row.cdl_lower_wick == candle.lower_wick
+            assert row.cdl_range == candle.candle_range
+            assert abs(row.cdl_body_pct - candle.candle_body_percentage) < 1e-9
+            assert row.cdl_bullish == candle.is_bullish()
+            assert row.cdl_bearish == candle.is_bearish()
+
+    def test_candle_metrics_zero_range(self):
+        """Test zero range candles give NaN percentages."""
+        data = pd.DataFrame({'time': [1609459200.0], 'open': [100.0], 'high': [100.0], 'low': [100.0],
+                             'close': [100.0]})
+        metrics = Candles(data=data).candle_metrics()
+        assert metrics.cdl_body_pct.isna().all()
+
+    def test_candle_patterns(self, pattern_candles):
+        """Test candle_patterns detects the expected bars."""
+        patterns = pattern_candles.candle_patterns()
+        assert patterns.cdl_bullish_engulfing.tolist() == [False, False, True, False, False]
+        assert patterns.cdl_bearish_engulfing.tolist() == [False, False, False, False, False]
+        assert patterns.cdl_inside_bar.tolist() == [False, True, False, True, False]
+        assert patterns.cdl_doji.tolist() == [False, False, False, True, True]
+        assert patterns.cdl_bullish_pin_bar.tolist() == [False, False, False, False, True]
+        assert patterns.cdl_bearish_pin_bar.iloc[3]
+
+    def test_candle_patterns_doji_is_bullish(self):
+        """Test a doji counts as bullish, as in cdl_bullish and Candle.is_bullish."""
+        data = pd.DataFrame({'time': [1609459200.0, 1609462800.0], 'open': [100.0, 101.0],
+                             'high': [101.0, 102.0], 'low': [99.0, 98.0], 'close': [100.0, 99.0]})
+        candles = Candles(data=data)
+        assert candles[0].is_bullish()
+        assert candles.candle_metrics().cdl_bullish.iloc[0]
+        assert candles.candle_patterns().cdl_bearish_engulfing.tolist() == [False, True]
+
+    def test_candle_patterns_as_mask(self, pattern_candles):
+        """Test pattern columns can be used directly as masks."""
+        patterns = pattern_candles.candle_patterns()
+        engulfing = pattern_candles.data[patterns.cdl_bullish_engulfing]
+        assert len(engulfing) == 1
+        assert engulfing.close.iloc[0] == 106.0
+
+    def test_candle_patterns_append(self, pattern_candles):
+        """Test append adds the pattern columns to the data."""
+        pattern_candles.candle_patterns(append=True)
+        assert 'cdl_doji' in pattern_candles.columns
+        assert pattern_candles[3].cdl_doji
+
+
+class TestCandlesSignals:
+    """Test vectorized cross, threshold, run and bars since signals."""
+
+    @pytest.fixture
+    def signal_candles(self):
+        """Create candles with a fast and a slow line."""
+        close = [10.0, 11.0, 12.0, 11.0, 10.0, 9.0, 9.0, 10.0, 11.0, 12.0]
+        data = pd.DataFrame({
+            'time': [1609459200.0 + i * 3600 for i in range(10)],
+            'open': close,
+            'high': [c + 1 for c in close],
+            'low': [c - 1 for c in close],
+            'close': close,
+            'fast': close,
+            'slow': [10.5 for _ in range(10)],
+        })
+        return Candles(data=data)
+
+    def test_crossover(self, signal_candles):
+        """Test crossover of two columns."""
+        cross = signal_candles.crossover('fast', 'slow')
+        assert cross.tolist() == [False, True, False, False, False, False, False, False, True, False]
+
+    def test_crossunder(self, signal_candles):
+        """Test crossunder of two columns."""
+        cross = signal_candles.crossunder('fast', 'slow')
+        assert cross.tolist() == [False, False, False, False, True, False, False, False, False, False]
+
+    def test_cross_threshold(self, signal_candles):
+        """Test crossing a threshold value."""
+        cross = signal_candles.crossover('close', 11.5)
+        assert cross[cross].index.tolist() == [signal_candles.index[2], signal_candles.index[9]]
+
+    def test_breaches(self, signal_candles):
+        """Test threshold breaches."""
+        breaches = signal_candles.breaches('close', upper=11, lower=10)
+        assert breaches.tolist() == [False, False, True, False, False, True, True, False, False, True]
+
+    def test_runs(self, signal_candles):
+        """Test signed rising and falling runs."""
+        runs = signal_candles.runs('close')
+        assert runs.tolist() == [0, 1, 2, -1, -2, -3, 0, 1, 2, 3]
+        assert signal_candles.rising('close', 3).tolist()[-1]
+        assert signal_candles.falling('close', 2).tolist() == [False] * 4 + [True, True] + [False] * 4
+
+    def test_bars_since(self, signal_candles):
+        """Test bars since a condition."""
+        cross = signal_candles.crossover('fast', 'slow')
+        bars = signal_candles.bars_since(cross)
+        assert bars.isna().iloc[0]
+        assert bars.iloc[1:].tolist() == [0, 1, 2, 3, 4, 5, 6, 0, 1]
+        assert bars.name == 'fast_XA_slow_BARS_SINCE'
+        assert signal_candles.bars_since(cross.rename(None), last=3).name == 'BARS_SINCE'
+
+    def test_signal_names(self, signal_candles):
+        """Test the signals are named after the columns they are computed from."""
+        assert signal_candles.crossunder('fast', 50).name == 'fast_XB_50'
+        assert signal_candles.breaches('close', upper=1).name == 'close_BREACH'
+        assert signal_candles.runs('close').name == 'close_RUN'
+        assert signal_candles.rising('close', 3).name == 'close_RISING'
+        assert signal_candles.falling('close', last=2).name == 'close_FALLING'
+
+    def test_incremental_matches_full(self, signal_candles):
+        """Test the incremental mode only returns the newest bars with the same values."""
+        for last in (1, 3, 6, 20):
+            assert signal_candles.crossover('fast', 'slow', last=last).equals(
+                signal_candles.crossover('fast', 'slow').iloc[-last:])
+            assert signal_candles.runs('close', last=last).equals(signal_candles.runs('close').iloc[-last:])
+            cross = signal_candles.crossunder('fast', 'slow')
+            assert signal_candles.bars_since(cross, last=last).equals(
+                signal_candles.bars_since(cross).iloc[-last:])
+        assert len(signal_candles.crossover('fast', 'slow', last=2)) == 2
+
+
+class TestTalibBackend:
+    """Test the global TA-Lib backend registry of pandas_ta_classic."""
+
+    @pytest.fixture
+    def ohlcv(self):
+        """Create ohlcv data for the indicators."""
+        close = [100 + (i % 7) - (i % 3) * 0.5 for i in range(60)]
+        return pd.DataFrame({
+            'open': close,
+            'high': [c + 1 for c in close],
+            'low': [c - 1 for c in close],
+            'close': close,
+            'volume': [1000.0 + i for i in range(60)],
+        })
+
+    def test_talib_mode_follows_global_setting(self):
+        """Test use_talib toggles the default and the talib kwarg overrides it."""
+        try:
+            assert ta.use_talib(False) is False
+            assert ta.talib_mode() is False
+            assert ta.use_talib(True) is ta.Imports["talib"]
+            assert ta.talib_mode() is ta.Imports["talib"]
+            assert ta.talib_mode(False) is False
+        finally:
+            ta.use_talib(True)
+
+    def test_registry_indicators_exist(self):
+        """Test every registered indicator is available on the DataFrame accessor."""
+        assert "sma" in ta.TALIB_INDICATORS
+        df = pd.DataFrame({'close': [1.0, 2.0]})
+        assert all(hasattr(df.ta, name) for name in ta.TALIB_INDICATORS)
+
+    def test_talib_benchmark(self, ohlcv):
+        """Test the benchmark and parity matrix."""
+        matrix = ta.talib_benchmark(ohlcv, indicators=["sma", "ema"], repeat=1)
+        assert list(matrix.index) == ["sma", "ema"]
+        assert (matrix.native_ms > 0).all()
+        if ta.Imports["talib"]:
+            assert matrix.same_columns.all()
+            assert (matrix.max_abs_diff < 1e-6).all()
+
+
+class TestLazyImports:
+    """Test the indicators and mplfinance are imported on first use."""
+
+    def test_import_aiomql_is_lazy(self):
+        """Test importing aiomql does not import the indicators or mplfinance."""
+        code = ("import sys, aiomql\n"
+                "assert 'mplfinance' not in sys.modules\n"
+                "assert 'aiomql.ta_libs.pandas_ta_classic.core' not in sys.modules\n"
+                "import pandas as pd\n"
+                "assert pd.DataFrame({'close': [1.0, 2.0, 3.0]}).ta.sma(2).iloc[-1] == 2.5\n"
+                "assert 'aiomql.ta_libs.pandas_ta_classic.core' in sys.modules")
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_module_attributes_load_on_access(self):
+        """Test indicator functions are available on the package."""
+        assert callable(ta.sma)
+        assert callable(ta.above)
+        assert "sma" in dir(ta)
+
+
+class TestAsyncPlot:
+    """Test off-loop chart rendering."""
+
+    @pytest.fixture
+    def plot_candles(self):
+        """Create candles with an indicator column."""
+        data = pd.DataFrame({
+            'time': [1609459200.0 + i * 3600 for i in range(30)],
+            'open': [100.0 + i for i in range(30)],
+            'high': [102.0 + i for i in range(30)],
+            'low': [99.0 + i for i in range(30)],
+            'close': [101.0 + i for i in range(30)],
+            'tick_volume': [1000.0 + i for i in range(30)],
+            'spread': [1 for _ in range(30)],
+        })
+        candles = Candles(data=data)
+        candles['sma'] = candles.close.rolling(5).mean()
+        return candles
+
+    async def test_aplot(self, plot_candles):
+        """Test aplot saves the chart in the plots directory."""
+        path = await plot_candles.aplot(filename="aplot.png", span=20, volume=True,
+                                        subplots=[{"column": "sma", "color": "b"}])
+        assert path == plot_candles.config.plots_dir / "aplot.png"
+        assert path.exists()
+
+    async def test_aplot_batch(self, plot_candles):
+        """Test several charts rendered concurrently."""
+        futures = [plot_candles.aplot(filename=f"aplot_{i}.png") for i in range(5)]
+        paths = await asyncio.gather(*futures)
+        assert all(path.exists() for path in paths)
+
+    async def test_aplot_error(self, plot_candles):
+        """Test a failing chart raises from the future."""
+        with pytest.raises(Exception):
+            await plot_candles.aplot(filename="aplot_error.png", type="unknown")
+
+
 class TestCandleComparisonsWithDict:
     """Test candle comparisons with dict-like objects."""
 
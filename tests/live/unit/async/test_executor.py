@@ -614,6 +614,15 @@ class TestExit:
 
         executor.executor.shutdown.assert_called_once_with(wait=False, cancel_futures=False)
 
+    def test_exit_renders_queued_plots(self, executor):
+        """Test exit waits for the plot renderer to render the queued charts."""
+        executor.timeout = 0.1
+
+        with patch('aiomql.lib.executor.PlotRenderer') as mock_renderer:
+            executor.exit()
+
+        mock_renderer.return_value.stop.assert_called_once_with()
+
     def test_exit_force_shutdown(self, executor):
         """Test exit with force_shutdown."""
         executor.config.force_shutdown = True
@@ -9,13 +9,16 @@ Tests cover:
 - Class methods for direct MT5 data retrieval
 - Edge cases and error handling
 - UTC timezone handling
+- Deal and order indexes
+- Columnar arrays and DataFrames of deals and orders
 """
+from collections import namedtuple
 from datetime import datetime, UTC, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from aiomql.lib.history import History
+from aiomql.lib.history import History, HistoryIndex, DEAL_COLUMNS, ORDER_COLUMNS
 from aiomql.core.models import TradeDeal, TradeOrder
 
 
@@ -599,3 +602,117 @@ class TestHistoryClassMethods:
             orders = await History.get_orders_by_position(position=position)
             assert isinstance(orders, tuple)
             assert all(order.position_id == position for order in orders)
+
+
+def make_deal(ticket: int, position: int, symbol: str, magic: int, time: float) -> TradeDeal:
+    """A deal executed at a time in seconds."""
+    return TradeDeal(ticket=ticket, order=ticket, position_id=position, symbol=symbol, magic=magic,
+                     time=int(time), time_msc=int(time * 1000), profit=0.0)
+
+
+class TestHistoryIndex:
+    """Test the deal and order indexes."""
+
+    @classmethod
+    def setup_class(cls):
+        """Set up deals out of time order."""
+        cls.start = datetime(2024, 1, 1)
+        at = cls.start.timestamp()
+        cls.deals = (make_deal(1, 10, "EURUSD", 7, at + 30), make_deal(2, 10, "EURUSD", 7, at + 10),
+                     make_deal(3, 11, "GBPUSD", 8, at + 20), make_deal(4, 12, "EURUSD", 8, at + 40))
+
+    def test_lookups(self):
+        """Test ticket, position, symbol and magic lookups."""
+        history = History(date_from=self.start, date_to=self.start + timedelta(days=1))
+        history.deals = self.deals
+        assert history.filter_deals_by_ticket(ticket=3) == (self.deals[2],)
+        assert history.filter_deals_by_ticket(ticket=5) == ()
+        assert history.filter_deals_by_position(position=10) == self.deals[:2]
+        assert history.filter_deals_by_symbol(symbol="EURUSD") == (self.deals[0], self.deals[1], self.deals[3])
+        assert history.filter_deals_by_magic(magic=8) == self.deals[2:]
+        assert history.filter_deals_by_magic(magic=9) == ()
+
+    def test_time_range(self):
+        """Test a time range is inclusive and in order of time."""
+        history = History(date_from=self.start, date_to=self.start + timedelta(days=1))
+        history.deals = self.deals
+        deals = history.filter_deals_by_time(start=self.start + timedelta(seconds=10),
+                                             end=self.start.timestamp() + 30)
+        assert [deal.ticket for deal in deals] == [2, 3, 1]
+        assert history.filter_deals_by_time(start=self.start, end=self.start + timedelta(seconds=5)) == ()
+
+    def test_rebuilt_when_replaced(self):
+        """Test the index is built once and rebuilt when the deals are replaced."""
+        history = History(date_from=self.start, date_to=self.start + timedelta(days=1))
+        history.deals = self.deals
+        assert history.deal_index is history.deal_index
+        history.deals = self.deals[:1]
+        assert history.filter_deals_by_position(position=10) == self.deals[:1]
+
+    def test_orders_indexed_by_setup_time(self):
+        """Test orders are ranged by their setup time."""
+        at = int(self.start.timestamp() * 1000)
+        orders = tuple(TradeOrder(ticket=ticket, position_id=1, symbol="EURUSD", magic=0, time_setup_msc=at + ms)
+                       for ticket, ms in ((1, 2000), (2, 1000)))
+        index = HistoryIndex(orders, time="time_setup_msc")
+        assert index.between(self.start, self.start + timedelta(seconds=1)) == (orders[1],)
+        assert index.filter("position_id", 1) == orders
+
+
+RawDeal = namedtuple("RawDeal", list(DEAL_COLUMNS), defaults=[0] * 17 + [""] * 3)
+RawOrder = namedtuple("RawOrder", list(ORDER_COLUMNS), defaults=[0] * 21 + [""] * 3)
+
+
+class TestHistoryArrays:
+    """Test the columnar views of the history."""
+
+    @pytest.fixture
+    def history(self, monkeypatch):
+        """History over two raw deals and one raw order."""
+        deals = (RawDeal(ticket=1, time_msc=1704067200123, type=1, entry=0, profit=-2.5, symbol="EURUSD"),
+                 RawDeal(ticket=2, time_msc=1704067260456, type=0, entry=1, profit=7.5, symbol="GBPUSD"))
+        orders = (RawOrder(ticket=1, time_setup_msc=1704067200000, type=1, state=4, symbol="EURUSD"),)
+        terminal = MagicMock()
+        terminal.history_deals_get = AsyncMock(return_value=deals)
+        terminal.history_orders_get = AsyncMock(return_value=orders)
+        monkeypatch.setattr(History, "mt5", terminal)
+        return History(date_from=datetime(2024, 1, 1), date_to=datetime(2024, 1, 2))
+
+    async def test_objects_are_built_lazily(self, history):
+        """Test the arrays don't build objects, which are built on first access."""
+        await history.initialize()
+        assert history.total_deals == 2 and history.total_orders == 1
+        assert history.deal_array["profit"].sum() == 5
+        assert history._deals is None
+        assert isinstance(history.deals[0], TradeDeal)
+        assert history.orders[0].ticket == 1
+
+    async def test_lookups_build_only_matches(self, history):
+        """Test lookups index the terminal tuples and build only the deals and orders they return."""
+        await history.initialize()
+        deals = history.filter_deals_by_symbol(symbol="GBPUSD")
+        assert [type(deal) for deal in deals] == [TradeDeal] and deals[0].ticket == 2
+        assert history._deals is None and list(history.deal_index._built) == [1]
+        assert history.filter_deals_by_ticket(ticket=2)[0] is deals[0]
+        assert history.filter_orders_by_ticket(ticket=1)[0].symbol == "EURUSD" and history._orders is None
+        assert history.deals[1].ticket == 2
+        assert history.filter_deals_by_ticket(ticket=2)[0] is history.deals[1]
+
+    async def test_column_types(self, history):
+        """Test enums are small ints, times int64 and text columns strings."""
+        await history.initialize()
+        array = history.deal_array
+        assert array.dtype["type"] == "i1" and array.dtype["time_msc"] == "i8"
+        assert list(array["time_msc"]) == [1704067200123, 1704067260456]
+        frame = history.deals_frame()
+        assert list(frame["symbol"]) == ["EURUSD", "GBPUSD"]
+        assert str(frame["entry"].dtype) == "int8"
+        assert history.orders_frame()["state"].tolist() == [4]
+
+    def test_array_of_objects(self):
+        """Test replaced deals are read attribute by attribute, and no deals give an empty array."""
+        history = History(date_from=datetime(2024, 1, 1), date_to=datetime(2024, 1, 2))
+        assert len(history.deal_array) == 0 and "ticket" in history.deal_array.dtype.names
+        history.deals = (TradeDeal(**RawDeal(ticket=5, profit=1.5, symbol="XAUUSD")._asdict()),)
+        assert history.deal_array["ticket"].tolist() == [5]
+        assert history.deals_frame()["symbol"].tolist() == ["XAUUSD"]
@@ -0,0 +1,217 @@
+"""Tests for the history_cache module.
+
+Tests cover:
+- The ranges fetched under each refresh policy
+- Storing deals and orders without duplicates
+- Range, group, position and ticket queries from the cache
+- History reading a date range through the cache
+"""
+
+import time
+from collections import namedtuple
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import ClassVar
+
+import pytest
+
+from aiomql.core.store import Store
+from aiomql.lib.history import History
+from aiomql.lib.history_cache import Coverage, HistoryCache, HistoryDeal, HistoryOrder
+
+
+@dataclass(kw_only=True)
+class CacheDeal(HistoryDeal):
+    """HistoryDeal on a table of its own."""
+    _table: ClassVar[str] = "cache_deal"
+
+
+@dataclass(kw_only=True)
+class CacheOrder(HistoryOrder):
+    """HistoryOrder on a table of its own."""
+    _table: ClassVar[str] = "cache_order"
+
+
+Deal = namedtuple("Deal", [f.name for f in fields(HistoryDeal)], defaults=[0] * 16 + [""] * 3)
+Order = namedtuple("Order", [f.name for f in fields(HistoryOrder)], defaults=[0] * 20 + [""] * 3)
+START = datetime(2024, 1, 1)
+
+
+def at(hours: float) -> int:
+    """The time in milliseconds some hours after START."""
+    return int((START + timedelta(hours=hours)).timestamp() * 1000)
+
+
+class Terminal:
+    """Returns the deals and orders of the requested range and counts the requests."""
+
+    def __init__(self, deals, orders):
+        self.deals, self.orders, self.requests = deals, orders, []
+
+    async def history_deals_get(self, date_from=None, date_to=None, group="", ticket=None, position=None):
+        self.requests.append(("deals", date_from, date_to, ticket, position))
+        if position is not None:
+            return tuple(deal for deal in self.deals if deal.position_id == position)
+        low, high = date_from.timestamp() * 1000, date_to.timestamp() * 1000
+        return tuple(deal for deal in self.deals if low <= deal.time_msc <= high)
+
+    async def history_orders_get(self, date_from=None, date_to=None, group="", ticket=None, position=None):
+        self.requests.append(("orders", date_from, date_to, ticket, position))
+        if position is not None:
+            return tuple(order for order in self.orders if order.position_id == position)
+        low, high = date_from.timestamp() * 1000, date_to.timestamp() * 1000
+        return tuple(order for order in self.orders if low <= order.time_setup_msc <= high)
+
+
+@pytest.fixture
+def cache():
+    """A cache on empty tables with an in-memory store."""
+    CacheDeal.clear()
+    CacheOrder.clear()
+    yield HistoryCache(store={}, deal_model=CacheDeal, order_model=CacheOrder)
+    CacheDeal.clear()
+    CacheOrder.clear()
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    """Deals of two positions on two symbols, one order per position."""
+    deals = [Deal(ticket=1, position_id=10, symbol="EURUSD", time_msc=at(1), profit=5.0),
+             Deal(ticket=2, position_id=10, symbol="EURUSD", time_msc=at(2)),
+             Deal(ticket=3, position_id=11, symbol="GBPUSD", time_msc=at(30))]
+    orders = [Order(ticket=1, position_id=10, symbol="EURUSD", time_setup_msc=at(1)),
+              Order(ticket=3, position_id=11, symbol="GBPUSD", time_setup_msc=at(30))]
+    terminal = Terminal(deals, orders)
+    monkeypatch.setattr(History, "mt5", terminal)
+    return terminal
+
+
+class TestWindows:
+    """Tests for HistoryCache.windows."""
+
+    def test_first_fetch(self, cache):
+        """Test the whole range is fetched before anything is cached."""
+        assert cache.windows(START, START + timedelta(days=1)) == [(START, START + timedelta(days=1))]
+
+    def test_covered_range(self, cache):
+        """Test a covered range isn't fetched, and ranges before the coverage join it."""
+        cache.set_coverage(Coverage(START.timestamp(), (START + timedelta(days=2)).timestamp()))
+        assert cache.windows(START, START + timedelta(days=1)) == []
+        assert cache.windows(START - timedelta(days=3), START) == [(START - timedelta(days=3), START)]
+
+    def test_refresh_policies(self, cache):
+        """Test the end of the coverage is fetched again from overlap before it, following the policy."""
+        now = datetime.now().replace(microsecond=0)
+        cache.set_coverage(Coverage(START.timestamp(), now.timestamp() - 10))
+        later = now + timedelta(hours=1)
+        assert cache.windows(START, later) == []
+        cache.max_age = 5
+        assert cache.windows(START, later) == [(now - timedelta(seconds=10, days=1), later)]
+        cache.refresh, cache.max_age = "always", 60
+        assert len(cache.windows(START, later)) == 1
+        cache.refresh = "never"
+        assert cache.windows(START - timedelta(days=1), later) == []
+
+    def test_unknown_policy(self):
+        """Test an unknown refresh policy is rejected."""
+        with pytest.raises(ValueError):
+            HistoryCache(refresh="sometimes")
+
+    def test_extend_stops_at_now(self, cache):
+        """Test the coverage never ends in the future."""
+        cache.extend(START, datetime.now() + timedelta(days=1))
+        assert cache.get_coverage().end <= time.time()
+
+    def test_coverage_in_store(self, terminal, tmp_path):
+        """Test the coverage is persisted in a Store and read back by another cache."""
+        store = Store(db_name=tmp_path / "db.sqlite3")
+        try:
+            cache = HistoryCache(store=store, deal_model=CacheDeal, order_model=CacheOrder)
+            cache.save(deals=terminal.deals, orders=terminal.orders, date_from=START,
+                       date_to=START + timedelta(days=2))
+            again = HistoryCache(store=store, deal_model=CacheDeal, order_model=CacheOrder)
+            assert again.get_coverage() == Coverage(START.timestamp(), (START + timedelta(days=2)).timestamp())
+            assert again.windows(START, START + timedelta(days=1)) == []
+        finally:
+            store.conn.close()
+
+    def test_unreadable_coverage(self, cache):
+        """Test a coverage that isn't JSON text is read as no coverage."""
+        cache.store[cache.coverage_key] = b"\x80\x04"
+        assert cache.get_coverage() == Coverage()
+
+
+class TestCacheStorage:
+    """Tests for saving to and reading from the cache."""
+
+    def test_save_replaces_by_ticket(self, cache, terminal):
+        """Test saving the same deals again doesn't duplicate them."""
+        cache.save(deals=terminal.deals, orders=terminal.orders, date_from=START, date_to=START + timedelta(days=2))
+        cache.save(deals=terminal.deals[:1], orders=())
+        deals, orders = cache.load(date_from=START, date_to=START + timedelta(days=2))
+        assert [deal.ticket for deal in deals] == [1, 2, 3]
+        assert [order.ticket for order in orders] == [1, 3]
+        assert deals[0].profit == 5.0
+
+    def test_load_range_and_group(self, cache, terminal):
+        """Test a load is restricted to the range and the symbols of the group."""
+        cache.save(deals=terminal.deals, orders=terminal.orders)
+        deals, _ = cache.load(date_from=START, date_to=START + timedelta(hours=1))
+        assert [deal.ticket for deal in deals] == [1]
+        deals, orders = cache.load(date_from=START, date_to=START + timedelta(days=2), group="*,!EUR*")
+        assert [deal.symbol for deal in deals] == ["GBPUSD"] and len(orders) == 1
+
+    def test_group_filter(self):
+        """Test the patterns of a group."""
+        matches = HistoryCache.group_filter("*USD*,!GBP*")
+        assert matches("EURUSD") and matches("USDJPY")
+        assert not matches("GBPUSD") and not matches("EURJPY")
+
+    async def test_position_and_ticket_queries(self, cache, terminal):
+        """Test the queries by position and ticket on the worker thread."""
+        await cache.asave(deals=terminal.deals, orders=terminal.orders)
+        assert [deal.ticket for deal in await cache.aget_deals(position_id=10)] == [1, 2]
+        assert [order.ticket for order in await cache.aget_orders(ticket=3)] == [3]
+
+
+class TestHistoryWithCache:
+    """Tests for History reading through a cache."""
+
+    async def test_only_missing_ranges_are_fetched(self, cache, terminal):
+        """Test a covered range is answered from the cache without asking the terminal."""
+        history = History(date_from=START, date_to=START + timedelta(days=2), cache=cache)
+        await history.initialize()
+        assert history.total_deals == 3 and history.total_orders == 2
+        requests = len(terminal.requests)
+        history = History(date_from=START, date_to=START + timedelta(days=1), group="EUR*", cache=cache)
+        await history.initialize()
+        assert len(terminal.requests) == requests
+        assert [deal.ticket for deal in history.deals] == [1, 2]
+        assert history.filter_deals_by_position(position=10) == history.deals
+
+    async def test_deals_by_position(self, cache, terminal):
+        """Test deals by position come from the terminal until the cache is fresh."""
+        deals = await History.get_deals_by_position(position=11, cache=cache)
+        assert [deal.ticket for deal in deals] == [3]
+        cache.refresh = "never"
+        terminal.deals = []
+        deals = await History.get_deals_by_position(position=11, cache=cache)
+        assert [deal.ticket for deal in deals] == [3]
+
+    async def test_position_older_than_coverage(self, cache, terminal):
+        """Test a position opened before the coverage is fetched from the terminal and stored, even when the
+        cache is fresh and holds some of its deals."""
+        terminal.deals.append(Deal(ticket=4, position_id=10, symbol="EURUSD", time_msc=at(40), entry=1))
+        await cache.asave(deals=terminal.deals[2:], orders=terminal.orders[1:], date_from=START + timedelta(hours=20),
+                          date_to=datetime.now())
+        assert cache.is_fresh()
+        assert [deal.ticket for deal in await cache.aget_deals(position_id=10)] == [4]
+        deals = await History.get_deals_by_position(position=10, cache=cache)
+        assert [deal.ticket for deal in deals] == [1, 2, 4]
+        orders = await History.get_orders_by_position(position=10, cache=cache)
+        assert [order.ticket for order in orders] == [1]
+        assert [deal.ticket for deal in await cache.aget_deals(position_id=10)] == [1, 2, 4]
+        assert [order.ticket for order in await cache.aget_orders(position_id=10)] == [1]
+        requests = len(terminal.requests)
+        assert [deal.ticket for deal in await History.get_deals_by_position(position=11, cache=cache)] == [3]
+        assert len(terminal.requests) == requests
@@ -0,0 +1,50 @@
+"""Tests for the PlotRenderer lifecycle.
+
+Charts are rendered by a fake render function in a thread pool, so the tests
+don't need mplfinance or worker processes.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from aiomql.lib import plots
+from aiomql.lib.plots import PlotRenderer
+
+
+def fake_render(jobs):
+    time.sleep(0.05)
+    return [job["savefig"] for job in jobs]
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    """A fresh renderer rendering with fake_render in a thread pool."""
+    monkeypatch.setattr(plots, "render_plots", fake_render)
+    monkeypatch.setattr(plots, "ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers))
+    monkeypatch.delattr(PlotRenderer, "_instance", raising=False)
+    renderer = PlotRenderer(batch_size=2, batch_delay=0.01)
+    yield renderer
+    renderer.stop()
+    monkeypatch.delattr(PlotRenderer, "_instance", raising=False)
+
+
+class TestPlotRenderer:
+    """Tests for rendering and stopping the renderer."""
+
+    def test_stop_renders_queued_jobs(self, renderer):
+        """Test stop waits for every queued chart."""
+        futures = [renderer.submit({"savefig": f"{n}.png"}) for n in range(5)]
+        renderer.stop()
+        assert [future.result(timeout=0) for future in futures] == [Path(f"{n}.png") for n in range(5)]
+
+    def test_submit_after_stop_without_waiting(self, renderer):
+        """Test jobs submitted after a stop without waiting go to a new pool and all complete."""
+        first = [renderer.submit({"savefig": f"a{n}.png"}) for n in range(3)]
+        renderer.stop(wait=False)
+        second = [renderer.submit({"savefig": f"b{n}.png"}) for n in range(3)]
+        assert all(future.done() for future in first)
+        renderer.stop()
+        assert [future.result(timeout=0).name for future in second] == [f"b{n}.png" for n in range(3)]
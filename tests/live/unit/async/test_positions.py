@@ -7,11 +7,16 @@ Tests cover:
 - Closing positions (individual and all)
 - Class methods for position operations
 - Edge cases and error handling
+- Positions snapshots as arrays and their aggregations
 """
 
+from collections import namedtuple
+from unittest.mock import AsyncMock
+
 import pytest
 
-from aiomql.lib.positions import Positions
+from aiomql.lib.positions import Positions, PositionsSnapshot, POSITION_COLUMNS
+from aiomql.core.constants import OrderType
 from aiomql.core.models import TradePosition, OrderSendResult
 from aiomql.core.exceptions import InvalidRequest
 
@@ -33,6 +38,74 @@ class TestPositionsInitialization:
         assert Positions.config is Positions.config
 
 
+RawPosition = namedtuple("RawPosition", ["ticket", "time", "type", "magic", "volume", "price_open", "sl", "tp",
+                                         "profit", "symbol", "comment"], defaults=[0.0, 0.0, 0.0, "", ""])
+
+
+@pytest.fixture
+def raw_positions():
+    """Hedged positions on two symbols under two magic numbers."""
+    return (RawPosition(1, 0, OrderType.BUY, 7, 0.5, 1.1, profit=-4.0, symbol="EURUSD"),
+            RawPosition(2, 0, OrderType.SELL, 7, 0.2, 1.1, profit=6.0, symbol="EURUSD"),
+            RawPosition(3, 0, OrderType.SELL, 9, 1.0, 2000.0, profit=0.0, symbol="XAUUSD"))
+
+
+class TestPositionsSnapshot:
+    """Tests for positions as columnar arrays."""
+
+    def test_columns(self, raw_positions):
+        """Test the columns hold the positions in order, symbols as codes."""
+        snapshot = PositionsSnapshot(raw_positions)
+        assert tuple(snapshot.columns) == tuple(POSITION_COLUMNS)
+        assert snapshot.volume.dtype == POSITION_COLUMNS["volume"]
+        assert snapshot.ticket.tolist() == [1, 2, 3] and len(snapshot) == 3
+        assert snapshot.symbols == ("EURUSD", "XAUUSD") and snapshot.symbol.tolist() == [0, 0, 1]
+
+    def test_aggregations(self, raw_positions):
+        """Test exposure, net volume, profit per magic and losers."""
+        snapshot = PositionsSnapshot(raw_positions)
+        assert snapshot.exposure() == pytest.approx({"EURUSD": 0.3, "XAUUSD": -1.0})
+        assert snapshot.exposure(gross=True) == pytest.approx({"EURUSD": 0.7, "XAUUSD": 1.0})
+        assert snapshot.net_volume() == pytest.approx(-0.7)
+        assert snapshot.net_volume("EURUSD") == pytest.approx(0.3) and snapshot.net_volume("GBPUSD") == 0
+        assert snapshot.profit_by_magic() == {7: 2.0, 9: 0.0}
+        assert snapshot.count_losers() == 2 and snapshot.count_losers(threshold=-1) == 1
+
+    def test_objects_and_frame(self, raw_positions):
+        """Test a snapshot of TradePosition objects and its DataFrame."""
+        positions = TradePosition.from_mt5_many(raw_positions)
+        frame = PositionsSnapshot(positions).frame()
+        assert frame.index.tolist() == [1, 2, 3]
+        assert frame["symbol"].tolist() == ["EURUSD", "EURUSD", "XAUUSD"]
+
+    def test_get_position(self, raw_positions):
+        """Test positions are looked up by ticket as TradePosition objects."""
+        snapshot = PositionsSnapshot(raw_positions)
+        assert list(snapshot.tickets) == [1, 2, 3]
+        position = snapshot.get_position(2)
+        assert isinstance(position, TradePosition)
+        assert position.ticket == 2 and position.symbol == "EURUSD"
+        assert snapshot.get_position(4) is None
+        positions = TradePosition.from_mt5_many(raw_positions)
+        assert PositionsSnapshot(positions).get_position(3) is positions[2]
+
+    def test_empty(self):
+        """Test an empty snapshot aggregates to nothing."""
+        snapshot = PositionsSnapshot()
+        assert snapshot.exposure() == {} and snapshot.profit_by_magic() == {}
+        assert snapshot.net_volume() == 0 and snapshot.count_losers() == 0
+
+    async def test_get_snapshot(self, raw_positions, monkeypatch):
+        """Test get_snapshot asks the terminal once and falls back to an empty snapshot."""
+        positions_get = AsyncMock(return_value=raw_positions)
+        monkeypatch.setattr(Positions.mt5, "positions_get", positions_get)
+        snapshot = await Positions.get_snapshot(symbol="EURUSD")
+        positions_get.assert_awaited_once_with(symbol="EURUSD")
+        assert len(snapshot) == 3
+        positions_get.return_value = None
+        assert len(await Positions.get_snapshot()) == 0
+
+
 class TestGetPositionsLive:
     """Live tests for getting positions."""
 
@@ -0,0 +1,134 @@
+"""Tests for the record_writers module.
+
+Tests cover:
+- One CSVWriter per file
+- Appending rows without rewriting the file
+- Rotation when a row adds columns
+- Concurrent writes from several threads
+- locked and close_all
+- JSONLWriter
+"""
+
+import csv
+import json
+from datetime import datetime
+from threading import Thread
+
+import pytest
+
+from aiomql.lib.record_writers import CSVWriter, JSONLWriter, RecordWriter
+
+
+@pytest.fixture(autouse=True)
+def reset_writers():
+    """Close and forget the writers of the previous test."""
+    yield
+    RecordWriter.close_all()
+    RecordWriter._instances.clear()
+
+
+def read_rows(file):
+    """Returns the rows of a csv file."""
+    with open(file, newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+class TestCSVWriter:
+    """Tests for CSVWriter."""
+
+    def test_one_writer_per_file(self, tmp_path):
+        """Test the same file gives the same writer."""
+        assert CSVWriter(tmp_path / "a.csv") is CSVWriter(str(tmp_path / "a.csv"))
+        assert CSVWriter(tmp_path / "a.csv") is not CSVWriter(tmp_path / "b.csv")
+
+    def test_creates_file_with_header(self, tmp_path):
+        """Test the first write creates the file with the columns of the row."""
+        file = tmp_path / "trades.csv"
+        CSVWriter(file).write({"order": 1, "profit": 0})
+        assert file.read_text().splitlines() == ["order,profit", "1,0"]
+
+    def test_appends_to_existing_file(self, tmp_path):
+        """Test rows are appended under the header of an existing file."""
+        file = tmp_path / "trades.csv"
+        file.write_text("order,profit,closed\r\n1,0,False\r\n")
+        writer = CSVWriter(file)
+        writer.write({"profit": 5, "order": 2})
+        writer.write({"order": 3, "profit": 1, "closed": True})
+        assert read_rows(file) == [
+            {"order": "1", "profit": "0", "closed": "False"},
+            {"order": "2", "profit": "5", "closed": ""},
+            {"order": "3", "profit": "1", "closed": "True"},
+        ]
+
+    def test_new_columns_rotate_file(self, tmp_path):
+        """Test a row with new columns moves the file aside and starts a new one."""
+        file = tmp_path / "trades.csv"
+        writer = CSVWriter(file)
+        writer.write({"order": 1, "ema": 20})
+        writer.write({"order": 2, "ema": 20, "rsi": 14})
+        writer.write({"order": 3, "ema": 10, "rsi": 7})
+        assert read_rows(tmp_path / "trades.1.csv") == [{"order": "1", "ema": "20"}]
+        assert read_rows(file) == [{"order": "2", "ema": "20", "rsi": "14"}, {"order": "3", "ema": "10", "rsi": "7"}]
+        writer.write({"order": 4, "atr": 3})
+        assert (tmp_path / "trades.2.csv").exists()
+        assert read_rows(file) == [{"order": "4", "ema": "", "rsi": "", "atr": "3"}]
+
+    def test_concurrent_writes(self, tmp_path):
+        """Test writes from several threads are serialized."""
+        file = tmp_path / "trades.csv"
+
+        def write(start):
+            for order in range(start, start + 50):
+                CSVWriter(file).write({"order": order, "profit": 0})
+
+        threads = [Thread(target=write, args=(start,)) for start in range(0, 200, 50)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        assert sorted(int(row["order"]) for row in read_rows(file)) == list(range(200))
+
+    def test_locked_reopens_file(self, tmp_path):
+        """Test a file rewritten under locked is reopened with its new header."""
+        file = tmp_path / "trades.csv"
+        writer = CSVWriter(file)
+        writer.write({"order": 1, "profit": 0})
+        with CSVWriter.locked(file):
+            file.write_text("order,profit,closed\r\n1,5,True\r\n")
+        writer.write({"order": 2, "profit": 0, "closed": False})
+        assert not (tmp_path / "trades.1.csv").exists()
+        assert read_rows(file)[-1] == {"order": "2", "profit": "0", "closed": "False"}
+
+    def test_close_all(self, tmp_path):
+        """Test close_all closes every open file."""
+        writers = [CSVWriter(tmp_path / f"{name}.csv") for name in "ab"]
+        [writer.write({"order": 1}) for writer in writers]
+        CSVWriter.close_all()
+        assert all(writer._handle is None for writer in writers)
+
+
+class TestJSONLWriter:
+    """Tests for JSONLWriter."""
+
+    def test_writer_per_class(self, tmp_path):
+        """Test writers are shared per file and class."""
+        assert JSONLWriter(tmp_path / "a") is JSONLWriter(tmp_path / "a")
+        assert JSONLWriter(tmp_path / "a") is not CSVWriter(tmp_path / "a")
+
+    def test_appends_lines(self, tmp_path):
+        """Test every row is appended as one JSON line."""
+        file = tmp_path / "trades.jsonl"
+        writer = JSONLWriter(file)
+        writer.write({"order": 1, "parameters": {"ema": 20}})
+        writer.write_many([{"order": 2, "time": datetime(2024, 1, 15)}, {"order": 3}])
+        lines = [json.loads(line) for line in file.read_text().splitlines()]
+        assert lines == [{"order": 1, "parameters": {"ema": 20}}, {"order": 2, "time": "2024-01-15 00:00:00"},
+                         {"order": 3}]
+
+
+class TestRecordWriter:
+    """Tests for the RecordWriter base class."""
+
+    def test_is_abstract(self, tmp_path):
+        """Test writers must implement _write_rows."""
+        with pytest.raises(TypeError):
+            RecordWriter(tmp_path / "trades")
+        assert not RecordWriter._instances
@@ -8,7 +8,9 @@ Tests cover:
 - save_sync method with different trade record modes
 - to_csv method for CSV file storage
 - to_json method for JSON file storage
+- to_jsonl method for JSON Lines file storage
 - to_sql method for SQLite database storage
+- save_many and the ResultSink batch writer
 - serialize static method
 - Thread safety with Lock
 - Edge cases and error handling
@@ -18,13 +20,17 @@ Tests cover:
 import asyncio
 import csv
 import json
+import sqlite3
+import time
 from pathlib import Path
 from datetime import datetime
 from threading import Thread
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from aiomql.lib.result import Result
+from aiomql.lib.record_writers import CSVWriter
+from aiomql.lib.result import Result, ResultSink
 from aiomql.core.models import OrderSendResult, TradeRequest
 from aiomql.core.config import Config
 
@@ -489,6 +495,134 @@ class TestToJson:
             assert "win" in record
 
 
+class TestToJsonl:
+    """Test to_jsonl method."""
+
+    @pytest.fixture(scope="class")
+    def mock_order_result(self):
+        """Create a mock OrderSendResult with TradeRequest."""
+        request = TradeRequest(action=1, type=0, order=0, symbol="EURUSD", volume=0.01, sl=1.0800, tp=1.0900,
+                               price=1.0850, deviation=10, stop_limit=0, type_time=0, type_filling=0, expiration=0,
+                               position=0, position_by=0, comment="", magic=0)
+        osr = OrderSendResult(retcode=10009, deal=12345, order=67890, volume=0.01, price=1.0850, bid=1.0849,
+                              ask=1.0851, comment="", request_id=0, retcode_external=0)
+        osr.request = request
+        return osr
+
+    @pytest.fixture
+    def result(self, mock_order_result, tmp_path):
+        """Create a Result that records into a temporary directory."""
+        result = Result(result=mock_order_result, parameters={"ema": 20}, name="test_jsonl_method")
+        result.config = MagicMock(records_dir=tmp_path, trade_record_mode="jsonl")
+        yield result
+        CSVWriter.close_all()
+
+    def test_to_jsonl_appends_lines(self, result, tmp_path):
+        """Test to_jsonl appends one JSON object per trade."""
+        result.to_jsonl()
+        result.save_sync()
+        lines = (tmp_path / "test_jsonl_method.jsonl").read_text().splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[-1])
+        assert record["order"] == 67890
+        assert record["closed"] is False
+        assert record["parameters"] == {"ema": 20}
+
+
+class TestSaveMany:
+    """Test save_many class method and ResultSink."""
+
+    @pytest.fixture(scope="class")
+    def mock_order_result(self):
+        """Create a mock OrderSendResult with TradeRequest."""
+        request = TradeRequest(action=1, type=0, order=0, symbol="EURUSD", volume=0.01, sl=1.0800, tp=1.0900,
+                               price=1.0850, deviation=10, stop_limit=0, type_time=0, type_filling=0, expiration=0,
+                               position=0, position_by=0, comment="", magic=0)
+        osr = OrderSendResult(retcode=10009, deal=12345, order=67890, volume=0.01, price=1.0850, bid=1.0849,
+                              ask=1.0851, comment="", request_id=0, retcode_external=0)
+        osr.request = request
+        return osr
+
+    @pytest.fixture
+    def results(self, mock_order_result, tmp_path):
+        """Create Results of two strategies that record into a temporary directory."""
+        config = MagicMock(records_dir=tmp_path, trade_record_mode="csv")
+        results = [Result(result=mock_order_result, parameters={"symbol": "EURUSD", "ema": 20}, name=name)
+                   for name in ("first", "second", "first")]
+        for result in results:
+            result.config = config
+        yield results
+        CSVWriter.close_all()
+
+    @pytest.fixture
+    def sink(self):
+        """Create a fresh ResultSink."""
+        if hasattr(ResultSink, "_instance"):
+            delattr(ResultSink, "_instance")
+        sink = ResultSink(batch_size=3, interval=60)
+        yield sink
+        sink.stop()
+        delattr(ResultSink, "_instance")
+
+    def test_save_many_one_write_per_file(self, results, tmp_path):
+        """Test results are grouped into one file per strategy name."""
+        with patch("aiomql.lib.result.CSVWriter.write_many") as write_many:
+            Result.save_many(results)
+        assert write_many.call_count == 2
+        Result.save_many(results, trade_record_mode="jsonl")
+        assert len((tmp_path / "first.jsonl").read_text().splitlines()) == 2
+        assert len((tmp_path / "second.jsonl").read_text().splitlines()) == 1
+
+    def test_save_many_json(self, results, tmp_path):
+        """Test json results are appended to the array of their file."""
+        Result.save_many(results, trade_record_mode="json")
+        Result.save_many(results[:1], trade_record_mode="json")
+        with (tmp_path / "first.json").open() as fh:
+            assert len(json.load(fh)) == 3
+
+    def test_save_many_sql_single_transaction(self, results):
+        """Test sql results are saved with a single save_many call."""
+        with patch("aiomql.lib.result.ResultDB.save_many") as save_many:
+            Result.save_many(results, trade_record_mode="sql")
+        save_many.assert_called_once()
+        assert [record.name for record in save_many.call_args.args[0]] == ["first", "second", "first"]
+
+    def test_save_many_sql_falls_back_to_single_saves(self, results):
+        """Test a failed transaction saves the results one at a time."""
+        with (patch("aiomql.lib.result.ResultDB.save_many", side_effect=sqlite3.IntegrityError),
+              patch.object(Result, "to_sql") as to_sql):
+            Result.save_many(results, trade_record_mode="sql")
+        assert to_sql.call_count == 3
+
+    def test_sink_saves_on_batch_size(self, sink, results, tmp_path):
+        """Test the sink saves a batch once batch_size results are buffered."""
+        sink.add(results[0])
+        sink.add(results[1])
+        assert sink.pending == 2
+        assert not (tmp_path / "first.csv").exists()
+        sink.add(results[2])
+        end = time.monotonic() + 2
+        while sink.records < 3 and time.monotonic() < end:
+            time.sleep(0.01)
+        assert sink.batches == 1
+        assert sink.pending == 0
+        with (tmp_path / "first.csv").open() as fh:
+            assert len(list(csv.DictReader(fh))) == 2
+
+    def test_sink_stop_saves_buffered_results(self, sink, results, tmp_path):
+        """Test stop saves the buffered results and a later result restarts the sink."""
+        sink.add(results[0], trade_record_mode="jsonl")
+        sink.stop()
+        assert not sink.running
+        assert len((tmp_path / "first.jsonl").read_text().splitlines()) == 1
+        sink.add(results[2], trade_record_mode="jsonl")
+        assert sink.running
+        assert sink.pending == 1
+        sink.stop()
+        assert sink.pending == 0
+        assert len((tmp_path / "first.jsonl").read_text().splitlines()) == 2
+
+
 class TestToSql:
     """Test to_sql method."""
 
@@ -5,13 +5,14 @@ Tests cover:
 - __post_init__ method for parameter deserialization
 - get_data method for preparing data for storage
 - Database operations (save, get, filter, update, all, execute_raw)
-- Pickle serialization/deserialization of parameters
+- JSON serialization of parameters, lazy decoding and migration of pickled parameters
 - Field metadata and constraints
 - dump_to_csv functionality
 - Edge cases and error handling
 """
 
 import csv
+import json
 import os
 import pickle
 from datetime import datetime
@@ -293,7 +294,7 @@ class TestGetData:
         assert "type" in data
 
     def test_get_data_serializes_dict_parameters(self):
-        """Test get_data serializes dict parameters to bytes."""
+        """Test get_data serializes dict parameters to JSON."""
         params = {"ema": 20, "rsi": 14}
         result = ResultDB(
             deal=12345,
@@ -307,13 +308,11 @@ class TestGetData:
             parameters=params
         )
         data = result.get_data()
-        assert isinstance(data["parameters"], bytes)
-        # Verify it can be unpickled back
-        unpickled = pickle.loads(data["parameters"])
-        assert unpickled == params
+        assert data["parameters"] == '{"ema": 20, "rsi": 14}'
+        assert json.loads(data["parameters"]) == params
 
-    def test_get_data_keeps_bytes_parameters(self):
-        """Test get_data keeps already-pickled parameters."""
+    def test_get_data_converts_bytes_parameters(self):
+        """Test get_data writes pickled parameters as JSON."""
         params = {"ema": 20}
         pickled = pickle.dumps(params, protocol=pickle.HIGHEST_PROTOCOL)
 
@@ -328,9 +327,8 @@ class TestGetData:
             type=0,
             parameters=pickled
         )
-        # parameters is deserialized in __post_init__, then serialized again in get_data
         data = result.get_data()
-        assert isinstance(data["parameters"], bytes)
+        assert json.loads(data["parameters"]) == params
 
     def test_get_data_preserves_field_values(self):
         """Test get_data preserves all field values."""
@@ -360,7 +358,7 @@ class TestGetData:
         assert data["closed"] is True
 
     def test_get_data_serializes_empty_dict_parameters(self):
-        """Test get_data serializes empty dict parameters to bytes."""
+        """Test get_data serializes empty dict parameters to JSON."""
         result = ResultDB(
             deal=12345,
             order=67890,
@@ -373,8 +371,7 @@ class TestGetData:
             parameters={}
         )
         data = result.get_data()
-        assert isinstance(data["parameters"], bytes)
-        assert pickle.loads(data["parameters"]) == {}
+        assert data["parameters"] == "{}"
 
 
 class TestDatabaseOperations:
@@ -527,7 +524,7 @@ class TestFieldsMethod:
 
 
 class TestParametersSerialization:
-    """Test parameters pickle serialization/deserialization."""
+    """Test parameters JSON serialization/deserialization."""
 
     def test_empty_dict_serialization(self):
         """Test empty dict parameters."""
@@ -543,8 +540,7 @@ class TestParametersSerialization:
             parameters={}
         )
         data = result.get_data()
-        assert isinstance(data["parameters"], bytes)
-        assert pickle.loads(data["parameters"]) == {}
+        assert json.loads(data["parameters"]) == {}
 
     def test_complex_dict_serialization(self):
         """Test complex nested dict parameters."""
@@ -570,9 +566,9 @@ class TestParametersSerialization:
             parameters=complex_params
         )
         data = result.get_data()
-        unpickled = pickle.loads(data["parameters"])
-        assert unpickled == complex_params
-        assert unpickled["settings"]["ema_periods"] == [10, 20, 50]
+        decoded = json.loads(data["parameters"])
+        assert decoded == complex_params
+        assert decoded["settings"]["ema_periods"] == [10, 20, 50]
 
     def test_round_trip_serialization(self):
         """Test parameters survive save and retrieve."""
@@ -597,6 +593,48 @@ class TestParametersSerialization:
         assert retrieved is not None
         assert retrieved.parameters == params
 
+    def test_loaded_parameters_are_decoded_on_access(self):
+        """Test parameters loaded from the database stay encoded until they are accessed."""
+        unique_order = int(datetime.now().timestamp() * 1000000)
+        ResultDB(deal=unique_order, order=unique_order, name="TestLazy", symbol="EURUSD", time=1705312800.0,
+                 volume=0.1, price=1.0850, type=0, parameters={"fast_ema": 8}).save(commit=True)
+
+        retrieved = ResultDB.get(order=unique_order)
+        assert retrieved.__dict__["_parameters"] == '{"fast_ema": 8}'
+        assert retrieved.get_data()["parameters"] == '{"fast_ema": 8}'
+        assert retrieved.__dict__["_parameters"] == '{"fast_ema": 8}'
+        assert retrieved.parameters == {"fast_ema": 8}
+
+    def test_query_parameters(self):
+        """Test conditions on parameter values run inside SQLite."""
+        base = int(datetime.now().timestamp() * 1000000)
+        ResultDB.save_many([ResultDB(deal=base + fast, order=base + fast, name="TestParamQuery", symbol="EURUSD",
+                                     time=1705312800.0, volume=0.1, price=1.0850, type=0,
+                                     parameters={"fast_ema": fast, "slow_ema": 21}) for fast in (5, 8, 13)])
+
+        records = ResultDB.query(name="TestParamQuery", parameters__fast_ema__gte=8).order_by("order").all()
+        assert [record.parameters["fast_ema"] for record in records] == [8, 13]
+        assert ResultDB.query(name="TestParamQuery", parameters__slow_ema=21).count() == 3
+
+    def test_query_parameters_rejects_other_columns(self):
+        """Test keys can only follow JSON columns."""
+        with pytest.raises(ValueError):
+            ResultDB.query(symbol__fast_ema=8)
+
+    def test_migrate_json_rewrites_pickled_parameters(self):
+        """Test pickled parameters of earlier versions are rewritten as JSON."""
+        unique_order = int(datetime.now().timestamp() * 1000000)
+        conn = ResultDB.connection()
+        conn.execute('INSERT INTO "result" ("deal", "order", "name", "symbol", "time", "volume", "price", "type", '
+                     '"parameters") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                     (unique_order, unique_order, "TestMigrate", "EURUSD", 1705312800.0, 0.1, 1.085, 0,
+                      pickle.dumps({"fast_ema": 8})))
+        assert ResultDB.migrate_json(conn) >= 1
+        conn.commit()
+        stored = conn.execute('SELECT parameters FROM "result" WHERE "order" = ?', (unique_order,)).fetchone()[0]
+        assert stored == '{"fast_ema": 8}'
+        assert ResultDB.get(order=unique_order).parameters == {"fast_ema": 8}
+
 
 class TestDumpToCsv:
     """Test dump_to_csv method."""
@@ -0,0 +1,172 @@
+"""Tests for the result_report module.
+
+Tests cover:
+- Performance figures
+- summary grouped by name, symbol, parameter and time bucket
+- Streaming equity curves
+- drawdown per curve
+- Covering indexes of the equity curves
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import ClassVar
+
+import pytest
+
+from aiomql.lib.result_db import ResultDB
+from aiomql.lib.result_report import Drawdown, Performance, ResultReport
+
+
+@dataclass(kw_only=True)
+class ReportResult(ResultDB):
+    """ResultDB on a table of its own."""
+    _table: ClassVar[str] = "report_result"
+
+
+def msc(day: int, hour: int = 0) -> float:
+    """The time in milliseconds of a day of January 2024."""
+    return datetime(2024, 1, day, hour, tzinfo=timezone.utc).timestamp() * 1000
+
+
+TRADES = [
+    # name, symbol, closing day, profit
+    ("trend", "EURUSD", 1, 10.0),
+    ("trend", "EURUSD", 2, -5.0),
+    ("trend", "GBPUSD", 3, -10.0),
+    ("trend", "GBPUSD", 20, 20.0),
+    ("scalp", "EURUSD", 1, 3.0),
+    ("scalp", "EURUSD", 2, 3.0),
+]
+
+
+@pytest.fixture
+def results():
+    """Saves the trades, plus an open trade that is left out of the reports."""
+    ReportResult.clear()
+    records = [ReportResult(deal=order, order=order, name=name, symbol=symbol, time=msc(day) - 3600000,
+                            volume=0.1, price=1.1, type=0, closed=True, profit=profit, time_close=msc(day, order),
+                            parameters={"fast_ema": 8 if profit > 0 else 13})
+               for order, (name, symbol, day, profit) in enumerate(TRADES, start=1)]
+    records.append(ReportResult(deal=99, order=99, name="trend", symbol="EURUSD", time=msc(21), volume=0.1,
+                                price=1.1, type=0, profit=-100.0))
+    ReportResult.save_many(records)
+    yield records
+    ReportResult.clear()
+
+
+class TestPerformance:
+    """Tests for Performance."""
+
+    def test_figures(self):
+        """Test the figures derived from the aggregates."""
+        performance = Performance(trades=4, wins=2, losses=2, net_profit=15, gross_profit=30, gross_loss=15)
+        assert performance.win_rate == 0.5
+        assert performance.average_win == 15
+        assert performance.average_loss == 7.5
+        assert performance.expectancy == 3.75
+        assert performance.profit_factor == 2
+
+    def test_no_losses(self):
+        """Test the profit factor without losses and the figures without trades."""
+        assert Performance(trades=1, wins=1, gross_profit=5).profit_factor == float("inf")
+        assert Performance().profit_factor == 0
+        assert Performance().win_rate == 0
+
+
+class TestSummary:
+    """Tests for ResultReport.summary."""
+
+    def test_overall(self, results):
+        """Test the summary of every closed trade."""
+        [summary] = ResultReport(ReportResult).summary()
+        assert summary.group == {}
+        assert (summary.trades, summary.wins, summary.losses) == (6, 4, 2)
+        assert summary.net_profit == 21
+        assert (summary.gross_profit, summary.gross_loss) == (36, 15)
+        assert (summary.best, summary.worst) == (20, -10)
+
+    def test_by_name_and_symbol(self, results):
+        """Test the summary grouped by name and symbol, in group order."""
+        summaries = ResultReport(ReportResult).summary(by=("name", "symbol"))
+        assert [(s.group["name"], s.group["symbol"], s.trades, s.net_profit) for s in summaries] == [
+            ("scalp", "EURUSD", 2, 6), ("trend", "EURUSD", 2, 5), ("trend", "GBPUSD", 2, 10)]
+
+    def test_by_bucket(self, results):
+        """Test the summary grouped by the week of the closing time."""
+        summaries = ResultReport(ReportResult, name="trend").summary(bucket="week")
+        assert [(s.group["bucket"], s.trades) for s in summaries] == [("2024-W01", 3), ("2024-W03", 1)]
+
+    def test_by_parameter(self, results):
+        """Test the summary grouped by a strategy parameter."""
+        summaries = ResultReport(ReportResult).summary(by=("parameters__fast_ema",))
+        assert [(s.group["parameters__fast_ema"], s.trades, s.wins) for s in summaries] == [(8, 4, 4), (13, 2, 0)]
+
+    def test_conditions(self, results):
+        """Test the conditions restrict the trades reported on."""
+        [summary] = ResultReport(ReportResult, symbol="GBPUSD").summary()
+        assert summary.trades == 2
+
+    def test_no_trades(self, results):
+        """Test an empty report."""
+        assert ResultReport(ReportResult, name="missing").summary() == []
+
+    def test_invalid_group(self):
+        """Test only the supported columns can be grouped on."""
+        with pytest.raises(ValueError):
+            ResultReport(ReportResult).summary(by=("profit",))
+        with pytest.raises(ValueError):
+            ResultReport(ReportResult).summary(bucket="minute")
+
+    async def test_asummary(self, results):
+        """Test the summary on the worker thread."""
+        summaries = await ResultReport(ReportResult).asummary(by=("name",))
+        assert [(s.group["name"], s.trades) for s in summaries] == [("scalp", 2), ("trend", 4)]
+
+
+class TestEquity:
+    """Tests for ResultReport.equity and drawdown."""
+
+    def test_equity_curve(self, results):
+        """Test the curve is cumulative in closing order."""
+        points = list(ResultReport(ReportResult, name="trend", batch_size=2).equity())
+        assert [point.equity for point in points] == [10, 5, -5, 15]
+        assert [point.drawdown for point in points] == [0, 5, 15, 0]
+
+    def test_equity_per_group(self, results):
+        """Test every group starts its own curve from the balance."""
+        points = list(ResultReport(ReportResult, balance=100).equity(by="name"))
+        assert [(point.group, point.equity) for point in points] == [
+            ("scalp", 103), ("scalp", 106), ("trend", 110), ("trend", 105), ("trend", 95), ("trend", 115)]
+
+    def test_drawdown(self, results):
+        """Test the maximum drawdown of every curve."""
+        drawdowns = ResultReport(ReportResult, balance=100).drawdown(by="name")
+        assert drawdowns["scalp"] == Drawdown(trades=2, equity=106, peak=106)
+        trend = drawdowns["trend"]
+        assert (trend.trades, trend.equity, trend.peak, trend.max_drawdown) == (4, 115, 115, 15)
+        assert trend.max_drawdown_pct == pytest.approx(15 / 110)
+        assert trend.time_close == msc(3, 3)
+
+    def test_equity_and_drawdown_per_parameter(self, results):
+        """Test the curves grouped by a strategy parameter."""
+        report = ResultReport(ReportResult, balance=100)
+        points = list(report.equity(by="parameters__fast_ema"))
+        assert [(point.group, point.equity) for point in points] == [
+            (8, 110), (8, 113), (8, 116), (8, 136), (13, 95), (13, 85)]
+        drawdowns = report.drawdown(by="parameters__fast_ema")
+        assert (drawdowns[8].max_drawdown, drawdowns[13].max_drawdown, drawdowns[13].peak) == (0, 15, 100)
+
+    async def test_adrawdown(self, results):
+        """Test the drawdown of a single curve on the worker thread."""
+        drawdowns = await ResultReport(ReportResult).adrawdown()
+        assert list(drawdowns) == [None]
+        assert drawdowns[None].trades == 6
+
+    def test_equity_uses_covering_index(self, results):
+        """Test the equity curves per name are read from the covering index only."""
+        report = ResultReport(ReportResult)
+        query = report.query.copy().order_by("name", "time_close")
+        plan = ReportResult.connection().execute(f"EXPLAIN QUERY PLAN {query.sql('name, time_close, profit')[0]}",
+                                                 query.sql()[1]).fetchall()
+        assert "COVERING INDEX report_result_closed_name_idx" in " ".join(str(row[-1]) for row in plan)
@@ -13,6 +13,7 @@ Tests cover:
 - Integration tests with live MetaTrader data
 """
 
+from collections import namedtuple
 from datetime import datetime
 
 import pytest
@@ -113,6 +114,18 @@ class TestTickInitialization:
             Tick()
 
 
+class TestTickFromMT5:
+    """Test building a Tick from a terminal namedtuple."""
+
+    def test_from_mt5_matches_keyword_construction(self):
+        """Test from_mt5 sets the same attributes in the same order as Tick(**tick._asdict())."""
+        Raw = namedtuple("Tick", ["time", "bid", "ask", "last", "volume", "time_msc", "flags", "volume_real"])
+        raw = Raw(1704067200, 1.1, 1.2, 0.0, 0, 1704067200123, 6, 0.0)
+        tick = Tick.from_mt5(raw)
+        assert list(tick) == list(Tick(**raw._asdict()))
+        assert tick.index == 1704067200123 and tick.Index == 0
+
+
 class TestTickRepr:
     """Test Tick __repr__ method."""
 
@@ -4,6 +4,7 @@ Tests cover:
 - TradeRecords initialization with default and custom records_dir
 - get_csv_records and get_json_records generators
 - read_update_csv and read_update_json async methods
+- JSON Lines records: streaming reads, update lines and compaction
 - update_rows async method for batch updating trades
 - update_csv_records and update_json_records async methods
 - Synchronous variants of all update methods
@@ -11,20 +12,38 @@ Tests cover:
 - update_sql_records for SQL batch updates
 - str_to_bool static method
 - update_rows deal matching and update logic
+- Sync watermarks and chunked backfill
+- update_records bulk updates with a single deals snapshot
 - Edge cases and error handling
 """
 
 import csv
 import json
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 
+from aiomql.lib.record_writers import CSVWriter, JSONLWriter
 from aiomql.lib.trade_records import TradeRecords
 from aiomql.core.config import Config
+from aiomql.core.store import Store
+
+
+@pytest.fixture(autouse=True)
+def watermark_store(tmp_path_factory):
+    """Keep the sync watermarks of each test in a Store of its own."""
+    config = Config()
+    previous = config.__dict__.get("_store")
+    config.store = store = Store(db_name=tmp_path_factory.mktemp("store") / "db.sqlite3")
+    yield store
+    store.conn.close()
+    if previous is None:
+        del config._store
+    else:
+        config.store = previous
 
 
 class TestTradeRecordsInitialization:
@@ -170,6 +189,24 @@ class TestReadUpdateCsv:
             assert reader[0]["profit"] == "50.0"
             assert reader[0]["closed"] == "True"
 
+    async def test_read_update_csv_keeps_appended_rows(self, sample_csv_file, tmp_path):
+        """Test rows appended while the records were being updated are kept."""
+        records = TradeRecords(records_dir=tmp_path)
+
+        async def update_rows(rows, **kwargs):
+            CSVWriter(sample_csv_file).write({"order": "12347", "time": "1705313000", "profit": "0",
+                                              "closed": "False", "win": "False"})
+            rows[0].update(profit="50.0", closed="True", win="True")
+            return rows
+
+        records.update_rows = update_rows
+        await records.read_update_csv(file=sample_csv_file)
+        CSVWriter.close_all()
+        with open(sample_csv_file, "r", newline="") as f:
+            reader = list(csv.DictReader(f))
+            assert [row["order"] for row in reader] == ["12345", "12346", "12347"]
+            assert reader[0]["profit"] == "50.0"
+
     async def test_read_update_csv_handles_error(self, tmp_path):
         """Test read_update_csv handles missing file gracefully."""
         records = TradeRecords(records_dir=tmp_path)
@@ -232,6 +269,78 @@ class TestReadUpdateJson:
         await records.read_update_json(file=nonexistent)
 
 
+class TestJsonlRecords:
+    """Test JSON Lines trade records."""
+
+    @pytest.fixture
+    def sample_jsonl_file(self, tmp_path):
+        """Create a sample JSON Lines file with trade records."""
+        file = tmp_path / "trades.jsonl"
+        rows = [
+            {"order": 12345, "time": 1705312800000, "profit": 0, "closed": False, "win": False},
+            {"order": 12346, "time": 1705312900000, "profit": 0, "closed": False, "win": False},
+        ]
+        JSONLWriter(file).write_many(rows)
+        yield file
+        JSONLWriter.close_all()
+
+    @staticmethod
+    def close(rows):
+        """Simulates update_rows closing the first trade."""
+        rows[0].update(profit=50.0, win=True, closed=True, time_close=1705313000, price_close=1.1)
+        return rows
+
+    def test_get_jsonl_records(self, sample_jsonl_file, tmp_path):
+        """Test get_jsonl_records yields only JSON Lines files."""
+        (tmp_path / "trades.json").touch()
+        records = TradeRecords(records_dir=tmp_path)
+        assert list(records.get_jsonl_records()) == [sample_jsonl_file]
+
+    async def test_read_update_jsonl_appends_updates(self, sample_jsonl_file, tmp_path):
+        """Test closed trades are recorded as appended update lines."""
+        records = TradeRecords(records_dir=tmp_path)
+        records.update_rows = AsyncMock(side_effect=lambda rows, **kwargs: self.close(rows))
+        await records.read_update_jsonl(file=sample_jsonl_file)
+        lines = [json.loads(line) for line in sample_jsonl_file.read_text().splitlines()]
+        assert len(lines) == 3
+        assert lines[-1] == {"_update": 12345, "profit": 50.0, "win": True, "closed": True,
+                             "time_close": 1705313000, "price_close": 1.1}
+        rows = list(records.read_jsonl(file=sample_jsonl_file))
+        assert [row["order"] for row in rows] == [12345, 12346]
+        assert rows[0]["closed"] is True
+        assert rows[0]["profit"] == 50.0
+        assert rows[1]["closed"] is False
+
+    async def test_read_update_jsonl_only_reads_unclosed(self, sample_jsonl_file, tmp_path):
+        """Test trades closed by an update line are not updated again."""
+        records = TradeRecords(records_dir=tmp_path)
+        records.update_rows = AsyncMock(side_effect=lambda rows, **kwargs: self.close(rows))
+        await records.read_update_jsonl(file=sample_jsonl_file)
+        records.update_rows = AsyncMock(side_effect=lambda rows, **kwargs: rows)
+        await records.read_update_jsonl(file=sample_jsonl_file)
+        assert [row["order"] for row in records.update_rows.call_args.kwargs["rows"]] == [12346]
+
+    def test_read_update_jsonl_sync(self, sample_jsonl_file, tmp_path):
+        """Test the synchronous update appends update lines."""
+        records = TradeRecords(records_dir=tmp_path)
+        records.update_rows_sync = MagicMock(side_effect=lambda rows, **kwargs: self.close(rows))
+        records.update_jsonl_records_sync()
+        assert list(records.read_jsonl_updates(file=sample_jsonl_file)) == [12345]
+
+    def test_compact_jsonl(self, sample_jsonl_file, tmp_path):
+        """Test compaction folds the update lines into the trades."""
+        records = TradeRecords(records_dir=tmp_path)
+        rows = self.close(list(records.read_jsonl(file=sample_jsonl_file)))
+        records.write_jsonl_updates(file=sample_jsonl_file, rows=rows)
+        expected = list(records.read_jsonl(file=sample_jsonl_file))
+        records.compact_jsonl_records()
+        assert len(sample_jsonl_file.read_text().splitlines()) == 2
+        assert list(records.read_jsonl(file=sample_jsonl_file)) == expected
+        assert not (tmp_path / "trades.jsonl.tmp").exists()
+        JSONLWriter(sample_jsonl_file).write({"order": 12347, "closed": False})
+        assert [row["order"] for row in records.read_jsonl(file=sample_jsonl_file)] == [12345, 12346, 12347]
+
+
 class TestUpdateRows:
     """Test update_rows async method."""
 
@@ -758,3 +867,199 @@ class TestSyncWriteVerification:
         nonexistent = tmp_path / "nonexistent.json"
         # Should not raise, just log error
         records.read_update_json_sync(file=nonexistent)
+
+
+class TestSyncWatermark:
+    """Test the sync watermarks and the chunked backfill."""
+
+    @staticmethod
+    def day_start(days_ago: int) -> datetime:
+        return (datetime.now() - timedelta(days=days_ago)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    async def test_first_sync_backfills_in_chunks(self, watermark_store):
+        """Test the first sync fetches the deals since the earliest open trade in contiguous windows."""
+        records = TradeRecords(chunk_days=30)
+        opened = self.day_start(95)
+        rows = [{"order": 1, "time": opened.timestamp(), "closed": False}]
+        records.mt5.history_deals_get = AsyncMock(return_value=[])
+
+        await records.update_rows(rows, source="trades.csv")
+
+        windows = [(call.kwargs["date_from"], call.kwargs["date_to"])
+                   for call in records.mt5.history_deals_get.call_args_list]
+        assert len(windows) == 4
+        assert windows[0][0] == opened
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(windows, windows[1:]))
+        assert records.get_watermark("trades.csv") == {"time": None, "orders": [1]}
+
+    async def test_sync_starts_from_watermark(self, watermark_store):
+        """Test trades that were open at the previous sync only fetch the deals after the watermark."""
+        records = TradeRecords()
+        mark = self.day_start(1) + timedelta(hours=5)
+        records.set_watermark("trades.json", time=mark.timestamp() * 1000, orders=[1])
+        rows = [{"order": 1, "time": self.day_start(95).timestamp() * 1000, "closed": False}]
+        records.mt5.history_deals_get = AsyncMock(return_value=[])
+
+        await records.update_rows(rows, source="trades.json")
+
+        records.mt5.history_deals_get.assert_awaited_once()
+        assert records.mt5.history_deals_get.call_args.kwargs["date_from"] == self.day_start(1)
+
+    async def test_new_trade_starts_from_its_time(self, watermark_store):
+        """Test trades recorded since the previous sync start from their opening time."""
+        records = TradeRecords()
+        records.set_watermark("sql", time=datetime.now().timestamp() * 1000, orders=[1])
+        rows = [{"order": 1, "time": self.day_start(0).timestamp(), "closed": False},
+                {"order": 2, "time": self.day_start(10).timestamp(), "closed": False}]
+        records.mt5.history_deals_get = AsyncMock(return_value=[])
+
+        await records.update_rows(rows, source="sql")
+
+        assert records.mt5.history_deals_get.call_args_list[0].kwargs["date_from"] == self.day_start(10)
+
+    async def test_sync_updates_watermark(self, watermark_store):
+        """Test the watermark records the last deal and drops the closed trades."""
+        records = TradeRecords()
+        rows = [{"order": 1, "time": self.day_start(2).timestamp(), "closed": False},
+                {"order": 2, "time": self.day_start(2).timestamp(), "closed": False}]
+        deal = MagicMock(position_id=1, order=3, entry=records.mt5.DEAL_ENTRY_OUT, profit=5.0, time_msc=1000,
+                         price=1.1)
+        records.mt5.history_deals_get = AsyncMock(return_value=[deal])
+
+        await records.update_rows(rows, source="trades.csv")
+
+        assert rows[0]["closed"] is True
+        assert records.get_watermark("trades.csv") == {"time": 1000, "orders": [2]}
+
+    async def test_watermark_survives_store(self, watermark_store):
+        """Test the watermark is saved as text in the Store and read back on the next sync."""
+        records = TradeRecords()
+        records.set_watermark("trades.csv", time=1000, orders=[1, 2])
+        watermark_store.conn.commit()
+        reopened = Store(db_name=watermark_store.db_name)
+        try:
+            assert isinstance(reopened["trade_records:trades.csv"], str)
+        finally:
+            reopened.conn.close()
+        assert records.get_watermark("trades.csv") == {"time": 1000, "orders": [1, 2]}
+        index, start, mark = records.plan_sync(items=[(1, 0, {})], source="trades.csv")
+        assert mark == 1000
+        assert start == datetime.fromtimestamp(1).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def test_unreadable_watermark_starts_over(self, watermark_store):
+        """Test a watermark that isn't JSON text is read as no watermark."""
+        watermark_store["trade_records:trades.csv"] = b"\x80\x04"
+        assert TradeRecords().get_watermark("trades.csv") == {"time": None, "orders": []}
+
+    async def test_failed_window_keeps_watermark(self):
+        """Test the sync stops before a window whose deals couldn't be fetched and keeps the watermark."""
+        records = TradeRecords(chunk_days=30)
+        rows = [{"order": 1, "time": self.day_start(95).timestamp(), "closed": False},
+                {"order": 2, "time": self.day_start(95).timestamp(), "closed": False}]
+        deal = MagicMock(position_id=1, order=3, entry=records.mt5.DEAL_ENTRY_OUT, profit=5.0, time_msc=1000,
+                         price=1.1)
+        records.mt5.history_deals_get = AsyncMock(side_effect=[[deal], None, [], []])
+
+        await records.update_rows(rows, source="trades.csv")
+
+        assert records.mt5.history_deals_get.await_count == 2
+        assert rows[0]["closed"] is True
+        assert records.get_watermark("trades.csv") == {"time": 1000, "orders": [2]}
+
+    async def test_no_open_trades_skips_history(self):
+        """Test no deals are fetched when every trade is closed."""
+        records = TradeRecords()
+        records.mt5.history_deals_get = AsyncMock(return_value=[])
+        await records.update_rows([{"order": 1, "time": 1705312800, "closed": True}], source="trades.csv")
+        records.mt5.history_deals_get.assert_not_called()
+
+    def test_to_msc(self):
+        """Test csv times in seconds and other times in milliseconds are both read as milliseconds."""
+        assert TradeRecords.to_msc("1705312800") == 1705312800000
+        assert TradeRecords.to_msc(1705312800000) == 1705312800000
+
+
+class TestUpdateRecords:
+    """Test the bulk update of every record file."""
+
+    @pytest.fixture
+    def record_files(self, tmp_path):
+        """Create a csv, a json and a JSON Lines file with one open trade each and one closed csv trade."""
+        time = (datetime.now() - timedelta(days=2)).timestamp()
+        with open(tmp_path / "a.csv", "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=["order", "time", "profit", "closed", "win"])
+            writer.writeheader()
+            writer.writerows([{"order": 1, "time": time, "profit": 0, "closed": False, "win": False},
+                              {"order": 2, "time": time, "profit": 5, "closed": True, "win": True}])
+        (tmp_path / "b.json").write_text(json.dumps([{"order": 3, "time": time * 1000, "profit": 0,
+                                                      "closed": False, "win": False}]))
+        JSONLWriter(tmp_path / "c.jsonl").write({"order": 4, "time": time * 1000, "profit": 0, "closed": False,
+                                                 "win": False})
+        yield tmp_path
+        JSONLWriter.close_all()
+
+    @staticmethod
+    def deal(position, profit):
+        return MagicMock(position_id=position, order=position + 100, entry=TradeRecords().mt5.DEAL_ENTRY_OUT,
+                         profit=profit, time_msc=1705316400000 + position, price=1.1)
+
+    async def test_update_records(self, record_files):
+        """Test one deals snapshot closes the open trades of every file."""
+        records = TradeRecords(records_dir=record_files)
+        records.mt5.history_deals_get = AsyncMock(return_value=[self.deal(1, 10.0), self.deal(3, -2.0),
+                                                                self.deal(4, 1.0)])
+
+        assert await records.update_records(workers=2) == 3
+
+        records.mt5.history_deals_get.assert_awaited_once()
+        with open(record_files / "a.csv", newline="") as fh:
+            rows = list(csv.DictReader(fh))
+        assert [(row["order"], row["closed"], row["profit"]) for row in rows] == [("1", "True", "10.0"),
+                                                                                  ("2", "True", "5")]
+        assert json.loads((record_files / "b.json").read_text())[0]["profit"] == -2.0
+        assert list(records.read_jsonl_updates(file=record_files / "c.jsonl")) == [4]
+        assert not list(record_files.glob("*.tmp"))
+
+    async def test_update_records_saves_watermarks(self, record_files, watermark_store):
+        """Test the watermark of every file keeps the trades that are still open."""
+        records = TradeRecords(records_dir=record_files)
+        records.mt5.history_deals_get = AsyncMock(return_value=[self.deal(1, 10.0)])
+
+        assert await records.update_records() == 1
+
+        assert records.get_watermark(str(record_files / "a.csv")) == {"time": 1705316400001, "orders": []}
+        assert records.get_watermark(str(record_files / "b.json"))["orders"] == [3]
+
+    async def test_update_records_failed_window_keeps_watermarks(self, record_files):
+        """Test the trades closed before a failed window are saved but the watermarks are not."""
+        records = TradeRecords(records_dir=record_files, chunk_days=1)
+        records.mt5.history_deals_get = AsyncMock(side_effect=[[self.deal(1, 10.0)], None, [], []])
+
+        assert await records.update_records() == 1
+
+        assert records.mt5.history_deals_get.await_count == 2
+        with open(record_files / "a.csv", newline="") as fh:
+            assert next(csv.DictReader(fh))["closed"] == "True"
+        assert records.get_watermark(str(record_files / "a.csv")) == {"time": None, "orders": []}
+
+    async def test_update_records_without_open_trades(self, tmp_path):
+        """Test no deals are fetched when no trade is open."""
+        (tmp_path / "a.json").write_text(json.dumps([{"order": 1, "time": 1705312800000, "closed": True}]))
+        records = TradeRecords(records_dir=tmp_path)
+        records.mt5.history_deals_get = AsyncMock()
+        assert await records.update_records() == 0
+        records.mt5.history_deals_get.assert_not_called()
+
+    async def test_update_records_skips_unreadable_files(self, record_files):
+        """Test a file that can't be read doesn't stop the others."""
+        (record_files / "broken.json").write_text("[{")
+        records = TradeRecords(records_dir=record_files)
+        records.mt5.history_deals_get = AsyncMock(return_value=[self.deal(3, 1.0)])
+        assert await records.update_records() == 1
+
+    def test_update_records_sync(self, record_files):
+        """Test the synchronous bulk update."""
+        records = TradeRecords(records_dir=record_files)
+        records.mt5._history_deals_get = MagicMock(return_value=[self.deal(1, 10.0), self.deal(3, -2.0)])
+        assert records.update_records_sync(files=[record_files / "a.csv", record_files / "b.json"]) == 2
+        assert json.loads((record_files / "b.json").read_text())[0]["closed"] is True
@@ -23,7 +23,6 @@ from aiomql.lib.ram import RAM
 from aiomql.lib.symbol import Symbol
 from aiomql.core.models import OrderType, OrderSendResult, OrderCheckResult
 from aiomql.core.config import Config
-from aiomql.core.task_queue import QueueItem
 
 
 # --- Concrete subclass for testing abstract Trader ---
@@ -71,6 +70,13 @@ def mock_tick():
     return tick
 
 
+@pytest.fixture(autouse=True)
+def result_sink():
+    """Patch the ResultSink so that recorded trades are not saved."""
+    with patch('aiomql.lib.trader.ResultSink') as MockSink:
+        yield MockSink.return_value
+
+
 @pytest.fixture
 def trader(mock_symbol, mock_ram, mock_tick):
     """Create a ConcreteTrader for testing."""
@@ -650,11 +656,9 @@ class TestRecordTrade:
 
         # Should return early
 
-    async def test_record_trade_uses_task_queue(self, trader, successful_result):
-        """Test record_trade adds to task queue by default."""
+    async def test_record_trade_uses_result_sink(self, trader, successful_result, result_sink):
+        """Test record_trade hands the result to the ResultSink by default."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -670,7 +674,7 @@ class TestRecordTrade:
 
             await trader.record_trade(result=successful_result, parameters={"key": "value"})
 
-            trader.config.task_queue.add.assert_called_once()
+            result_sink.add.assert_called_once_with(mock_res)
 
     async def test_record_trade_direct_save(self, trader, successful_result):
         """Test record_trade saves directly when use_task_queue=False."""
@@ -698,8 +702,6 @@ class TestRecordTrade:
     async def test_record_trade_with_parameters(self, trader, successful_result):
         """Test record_trade passes parameters to Result."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -726,8 +728,6 @@ class TestRecordTrade:
     async def test_record_trade_with_expected_profit(self, trader, successful_result):
         """Test record_trade uses provided expected_profit."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -750,8 +750,6 @@ class TestRecordTrade:
     async def test_record_trade_non_dict_parameters(self, trader, successful_result):
         """Test record_trade handles non-dict parameters."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -775,8 +773,6 @@ class TestRecordTrade:
     async def test_record_trade_updates_sl_tp_from_history(self, trader, successful_result):
         """Test record_trade sets sl and tp on result.request from history order."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.08000
@@ -858,7 +854,7 @@ class TestIntegration:
         result = await trader.send_order()
         assert result.retcode == 10009
 
-    async def test_full_trade_lifecycle(self, trader, mock_tick):
+    async def test_full_trade_lifecycle(self, trader, mock_tick, result_sink):
         """Test full lifecycle: create, check, send, record."""
         order_type = MagicMock()
         order_type.is_long = True
@@ -888,8 +884,6 @@ class TestIntegration:
 
         # Record
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_history_order = MagicMock()
         mock_history_order.sl = 1.09500
@@ -905,4 +899,4 @@ class TestIntegration:
 
             await trader.record_trade(result=result, name="TestStrategy")
 
-            trader.config.task_queue.add.assert_called_once()
+            result_sink.add.assert_called_once_with(mock_res)
@@ -15,6 +15,7 @@ Tests cover:
 
 import pytest
 from dataclasses import fields
+from types import SimpleNamespace
 from unittest.mock import MagicMock, AsyncMock, patch
 
 from aiomql.contrib.trackers.open_position import PendingOrder, OpenPosition
@@ -301,6 +302,20 @@ class TestOpenPositionUpdate:
         # Should return current is_open value on exception
         assert result is True
 
+    async def test_update_position_from_snapshot(self, open_position):
+        """Test update_position reads the position from the snapshot of the cycle."""
+        new_position = MagicMock(spec=TradePosition)
+        open_position.positions.get_position_by_ticket = AsyncMock()
+        open_position.snapshot = MagicMock()
+        open_position.snapshot.get_position = MagicMock(return_value=new_position)
+
+        result = await open_position.update_position()
+
+        assert result is True
+        assert open_position.position is new_position
+        open_position.snapshot.get_position.assert_called_once_with(12345)
+        open_position.positions.get_position_by_ticket.assert_not_called()
+
 
 class TestOpenPositionStateManagement:
     """Tests for OpenPosition state management."""
@@ -328,16 +343,11 @@ class TestOpenPositionStateManagement:
 
     def test_remove_from_state(self, open_position):
         """Test remove_from_state removes position from tracked and archives it."""
-        tracked_positions = {12345: open_position}
-        archived_positions = {}
-        
-        open_position.config.state.get = MagicMock(side_effect=lambda key, default=None: 
-            tracked_positions if key == "tracked_positions" else archived_positions)
-        
+        open_position.config.state = state = {"tracked_positions:12345": open_position}
+
         open_position.remove_from_state()
-        
-        assert 12345 not in tracked_positions
-        assert 12345 in archived_positions
+
+        assert state == {"archived_positions:12345": open_position}
 
 
 class TestOpenPositionPendingOrders:
@@ -545,6 +555,22 @@ class TestOpenPositionTrack:
         tracker1.assert_called_once()
         tracker2.assert_called_once()
 
+    async def test_track_sets_and_clears_snapshot(self, open_position):
+        """Test track makes the snapshot available to the trackers and drops it afterwards."""
+        snapshot = MagicMock()
+        seen = []
+
+        async def tracker():
+            seen.append(open_position.snapshot)
+
+        tracker.rank = 1
+        open_position._trackers = {"t1": tracker}
+
+        await open_position.track(snapshot=snapshot)
+
+        assert seen == [snapshot]
+        assert open_position.snapshot is None
+
 
 class TestOpenPositionHedgeAndStack:
     """Tests for OpenPosition hedge and stack methods."""
@@ -728,3 +754,82 @@ class TestOpenPositionRemoveClosed:
         open_position.remove_from_state.assert_called_once()
         open_position.close_hedges.assert_not_called()
         open_position.close_stacks.assert_not_called()
+
+
+class TestOpenPositionStatePersistence:
+    """Tests that tracked and archived positions reach the state database."""
+
+    @pytest.fixture
+    def state(self, tmp_path):
+        """A real State on a temporary database."""
+        from aiomql.core.state import State
+
+        def reload():
+            for name in ("_instance", "_data"):
+                if hasattr(State, name):
+                    delattr(State, name)
+            State._initialized = False
+            return State(db_name=tmp_path / "state.db")
+
+        state = reload()
+        state.reload = reload
+        yield state
+        reload()
+        for name in ("_instance", "_data"):
+            if hasattr(State, name):
+                delattr(State, name)
+        State._initialized = False
+
+    @pytest.fixture
+    def open_position(self, state):
+        """Creates an OpenPosition tracked in the real state."""
+        config = MagicMock()
+        config.state = state
+        with patch.object(OpenPosition, "config", config, create=True):
+            with patch.object(OpenPosition, "positions", MagicMock(), create=True):
+                with patch("aiomql.contrib.trackers.open_position.PositionTracker"):
+                    symbol = SimpleNamespace(name="EURUSD")
+                    position = TradePosition(ticket=123, symbol="EURUSD", type=OrderType.BUY)
+                    yield OpenPosition(symbol=symbol, ticket=123, position=position)
+
+    def test_tracked_position_is_saved(self, open_position, state):
+        """Test a new position is written to disk, not only added in memory."""
+        assert state.reload()["tracked_positions:123"].ticket == 123
+
+    def test_archived_position_is_saved(self, open_position, state):
+        """Test remove_from_state writes both the tracked and the archived positions."""
+        open_position.remove_from_state()
+        reloaded = state.reload()
+        assert "tracked_positions:123" not in reloaded
+        assert reloaded["archived_positions:123"].ticket == 123
+
+    async def test_track_marks_only_changed_positions(self, open_position, state):
+        """Test tracking marks the key of a position it changed, without committing, and no other key."""
+        async def move_stop():
+            open_position.position.sl = 1.1
+
+        state["other"] = "value"
+        state.commit(close=True)
+        open_position._trackers = {"move_stop": AsyncMock(side_effect=move_stop, rank=1)}
+        await open_position.track()
+        assert state.dirty == {"tracked_positions:123"}
+        open_position._trackers = {}
+        state.commit(close=True)
+        await open_position.track()
+        assert state.dirty == set()
+        assert state.reload()["tracked_positions:123"].position.sl == 1.1
+
+    async def test_commit_during_track_skips_snapshot(self, open_position, state):
+        """Test a commit while tracking pickles the position without the snapshot of the cycle."""
+        async def commit():
+            open_position._trackers = {}
+            open_position.position.sl = 1.2
+            open_position.touch(autocommit=False)
+            state.commit(close=True)
+
+        open_position._trackers = {"commit": AsyncMock(side_effect=commit, rank=1)}
+        await open_position.track(snapshot=MagicMock())
+        reloaded = state.reload()["tracked_positions:123"]
+        assert reloaded.position.sl == 1.2
+        assert reloaded.snapshot is None
+        assert "snapshot" not in vars(reloaded)
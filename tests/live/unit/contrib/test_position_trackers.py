@@ -15,6 +15,15 @@ from unittest.mock import MagicMock, AsyncMock, patch
 from aiomql.contrib.trackers.position_trackers import PositionTracker, OpenPositionsTracker
 
 
+class FakeState(dict):
+    """A dict standing in for the State, keeping the positions under their own keys."""
+
+    def __init__(self, positions=(), key="tracked_positions"):
+        super().__init__({f"{key}:{pos.ticket}": pos for pos in positions})
+        self.conn = MagicMock()
+        self.acommit = AsyncMock()
+
+
 class TestPositionTrackerInitialization:
     """Tests for PositionTracker initialization."""
 
@@ -275,10 +284,8 @@ class TestOpenPositionsTrackerTrack:
         mock_position2 = MagicMock()
         mock_position2.track = AsyncMock()
         
-        mock_state = MagicMock()
-        mock_state.conn = MagicMock()
-        mock_state.conn.close = MagicMock()
-        mock_state.get = MagicMock(return_value={1: mock_position1, 2: mock_position2})
+        mock_position1.ticket, mock_position2.ticket = 1, 2
+        mock_state = FakeState([mock_position1, mock_position2])
         
         with patch("aiomql.contrib.trackers.position_trackers.Config", return_value=mock_config):
             with patch("aiomql.contrib.trackers.position_trackers.Positions"):
@@ -420,8 +427,7 @@ class TestOpenPositionsTrackerRemoveClosed:
         
         tracked_positions = {111: tracked_pos1, 222: tracked_pos2, 333: tracked_pos3}
         
-        mock_state = MagicMock()
-        mock_state.__setitem__ = MagicMock()
+        mock_state = FakeState(tracked_positions.values())
         
         with patch("aiomql.contrib.trackers.position_trackers.Config"):
             with patch("aiomql.contrib.trackers.position_trackers.Positions", return_value=mock_positions):
@@ -432,14 +438,9 @@ class TestOpenPositionsTrackerRemoveClosed:
                     
                     await tracker.remove_closed_positions(tracked_positions)
                     
-                    # Should have set state with only open positions
-                    call_args = mock_state.__setitem__.call_args
-                    assert call_args[0][0] == "tracked_positions"
                     # Position 333 should be removed
-                    result_dict = call_args[0][1]
-                    assert 111 in result_dict
-                    assert 222 in result_dict
-                    assert 333 not in result_dict
+                    assert mock_state == {"tracked_positions:111": tracked_pos1,
+                                          "tracked_positions:222": tracked_pos2}
 
     async def test_remove_closed_positions_removes_all_when_none_open(self):
         """Test remove_closed_positions removes all when no positions open."""
@@ -450,8 +451,7 @@ class TestOpenPositionsTrackerRemoveClosed:
         tracked_pos1.ticket = 111
         tracked_positions = {111: tracked_pos1}
         
-        mock_state = MagicMock()
-        mock_state.__setitem__ = MagicMock()
+        mock_state = FakeState(tracked_positions.values())
         
         with patch("aiomql.contrib.trackers.position_trackers.Config"):
             with patch("aiomql.contrib.trackers.position_trackers.Positions", return_value=mock_positions):
@@ -462,6 +462,145 @@ class TestOpenPositionsTrackerRemoveClosed:
                     
                     await tracker.remove_closed_positions(tracked_positions)
                     
-                    call_args = mock_state.__setitem__.call_args
-                    result_dict = call_args[0][1]
-                    assert result_dict == {}
+                    assert mock_state == {}
+
+    async def test_remove_closed_positions_uses_snapshot(self):
+        """Test remove_closed_positions reads open tickets from the snapshot of the cycle."""
+        mock_positions = MagicMock()
+        mock_positions.get_positions = AsyncMock()
+
+        snapshot = MagicMock()
+        snapshot.tickets = {111: MagicMock()}
+
+        tracked_pos1 = MagicMock()
+        tracked_pos1.ticket = 111
+        tracked_pos2 = MagicMock()
+        tracked_pos2.ticket = 222
+        tracked_positions = {111: tracked_pos1, 222: tracked_pos2}
+
+        mock_state = FakeState(tracked_positions.values())
+
+        with patch("aiomql.contrib.trackers.position_trackers.Config"):
+            with patch("aiomql.contrib.trackers.position_trackers.Positions", return_value=mock_positions):
+                with patch("aiomql.contrib.trackers.position_trackers.State", return_value=mock_state):
+                    tracker = OpenPositionsTracker(state_key="tracked_positions")
+                    tracker.positions = mock_positions
+                    tracker.state = mock_state
+
+                    await tracker.remove_closed_positions(tracked_positions, snapshot=snapshot)
+
+                    mock_positions.get_positions.assert_not_called()
+                    assert mock_state == {"tracked_positions:111": tracked_pos1}
+
+
+class TestOpenPositionsTrackerSnapshot:
+    """Tests for the positions snapshot shared by a tracking cycle."""
+
+    @pytest.fixture(autouse=True)
+    def reset_class_attributes(self):
+        """Reset class attributes before each test."""
+        for name in ("config", "positions", "state"):
+            if hasattr(OpenPositionsTracker, name):
+                delattr(OpenPositionsTracker, name)
+        yield
+
+    @pytest.fixture
+    def tracker(self):
+        """Creates an OpenPositionsTracker with mocked dependencies."""
+        with patch("aiomql.contrib.trackers.position_trackers.Config"):
+            with patch("aiomql.contrib.trackers.position_trackers.Positions"):
+                with patch("aiomql.contrib.trackers.position_trackers.State"):
+                    tracker = OpenPositionsTracker()
+                    tracker.positions = MagicMock()
+                    yield tracker
+
+    async def test_get_snapshot(self, tracker):
+        """Test get_snapshot builds a snapshot from a single positions_get call."""
+        raw = (MagicMock(ticket=111), MagicMock(ticket=222))
+        tracker.positions.mt5.positions_get = AsyncMock(return_value=raw)
+        with patch("aiomql.contrib.trackers.position_trackers.PositionsSnapshot") as mock_snapshot:
+            snapshot = await tracker.get_snapshot()
+        tracker.positions.mt5.positions_get.assert_awaited_once_with()
+        mock_snapshot.assert_called_once_with(raw)
+        assert snapshot is mock_snapshot.return_value
+
+    async def test_get_snapshot_returns_none_on_failure(self, tracker):
+        """Test get_snapshot returns None when the terminal does not return the positions."""
+        tracker.positions.mt5.positions_get = AsyncMock(return_value=None)
+        assert await tracker.get_snapshot() is None
+        tracker.positions.mt5.positions_get = AsyncMock(side_effect=Exception("Test error"))
+        assert await tracker.get_snapshot() is None
+
+    async def test_track_shares_one_snapshot(self, tracker):
+        """Test track hands the same snapshot to every position and to the cleanup."""
+        tracker.config = MagicMock()
+        tracker.config.shutdown = False
+
+        async def mock_sleep(secs):
+            tracker.config.shutdown = True
+
+        positions = [MagicMock(track=AsyncMock(), ticket=ticket) for ticket in range(3)]
+        tracker.state = FakeState(positions)
+        tracker.auto_remove_closed = True
+        tracker.remove_closed_positions = AsyncMock()
+        snapshot = MagicMock()
+        tracker.get_snapshot = AsyncMock(return_value=snapshot)
+
+        with patch("aiomql.contrib.trackers.position_trackers.sleep", side_effect=mock_sleep):
+            await tracker.track()
+
+        tracker.get_snapshot.assert_awaited_once()
+        for position in positions:
+            position.track.assert_awaited_once_with(snapshot=snapshot)
+        tracker.remove_closed_positions.assert_awaited_once_with(dict(enumerate(positions)), snapshot=snapshot)
+
+    async def test_track_commits_once(self, tracker):
+        """Test an autocommit cycle commits the state once, the positions mark their own keys."""
+        tracker.config = MagicMock()
+        tracker.config.shutdown = False
+
+        async def mock_sleep(secs):
+            tracker.config.shutdown = True
+
+        tracker.state = FakeState([MagicMock(track=AsyncMock(), ticket=1)])
+        tracker.autocommit, tracker.auto_remove_closed = True, False
+        tracker.get_snapshot = AsyncMock(return_value=None)
+
+        with patch("aiomql.contrib.trackers.position_trackers.sleep", side_effect=mock_sleep):
+            await tracker.track()
+
+        tracker.state.acommit.assert_awaited_once_with(conn=tracker.config.state.conn, close=False)
+
+    def test_legacy_tracked_positions_are_moved(self, tracker):
+        """Test positions kept in one dictionary by previous versions are moved to keys of their own."""
+        position = MagicMock(ticket=7)
+        tracker.state = FakeState()
+        tracker.state["tracked_positions"] = {7: position}
+        assert tracker.get_tracked_positions() == {7: position}
+        assert tracker.state == {"tracked_positions:7": position}
+
+    async def test_track_keeps_positions_added_during_cycle(self, tracker):
+        """Test a position tracked while the cycle runs isn't removed for missing from the snapshot."""
+        tracker.config = MagicMock()
+        tracker.config.shutdown = False
+
+        async def mock_sleep(secs):
+            tracker.config.shutdown = True
+
+        tracked = {111: MagicMock(ticket=111), 222: MagicMock(ticket=222)}
+        added = MagicMock(ticket=333)
+
+        async def open_position(snapshot):
+            state["tracked_positions:333"] = added
+
+        tracked[111].track = AsyncMock(side_effect=open_position)
+        tracked[222].track = AsyncMock()
+        tracker.state = state = FakeState(tracked.values())
+        tracker.state_key, tracker.auto_remove_closed, tracker.autocommit = "tracked_positions", True, False
+        snapshot = MagicMock(tickets={111: MagicMock()})
+        tracker.get_snapshot = AsyncMock(return_value=snapshot)
+
+        with patch("aiomql.contrib.trackers.position_trackers.sleep", side_effect=mock_sleep):
+            await tracker.track()
+
+        assert state == {"tracked_positions:111": tracked[111], "tracked_positions:333": added}
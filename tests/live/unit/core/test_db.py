@@ -10,12 +10,16 @@ Tests cover:
 - Data sanitization
 """
 
+import asyncio
 import os
 import pytest
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from typing import ClassVar
 
 from aiomql.core.db import DB
+from aiomql.core.db_worker import DBWorker
 
 
 @pytest.fixture
@@ -24,6 +28,7 @@ def temp_db_path():
     fd, path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
     yield path
+    DB.close_connections()
     if os.path.exists(path):
         os.remove(path)
 
@@ -393,3 +398,239 @@ class TestDBDictFactory:
 
         results = TestModel.all()
         assert isinstance(results[0], TestModel)
+
+
+class TestDBAsyncOperations:
+    """Tests for the async DB operations run on the worker thread."""
+
+    @pytest.fixture(autouse=True)
+    def setup_model(self, setup_db_config):
+        """Reset model state before each test."""
+        TestModel._initialized = False
+        TestModel._table = ""
+        yield
+        DBWorker.stop_all()
+
+    async def test_asave_and_aget(self, setup_db_config):
+        """Test asave inserts a record that aget returns."""
+        await TestModel(id=1, name="test", value=1.0).asave()
+        result = await TestModel.aget(id=1)
+        assert isinstance(result, TestModel)
+        assert result.name == "test"
+        assert await TestModel.aget(id=2) is None
+
+    async def test_afilter_and_aall(self, setup_db_config):
+        """Test afilter and aall return matching records."""
+        await asyncio.gather(*(TestModel(id=i, name="even" if i % 2 == 0 else "odd", value=i).asave()
+                               for i in range(10)))
+        assert len(await TestModel.afilter(name="even")) == 5
+        assert len(await TestModel.aall()) == 10
+        assert len(await TestModel.aall(limit=3)) == 3
+        assert len(TestModel.all()) == 10
+
+    async def test_asave_update_and_aupdate(self, setup_db_config):
+        """Test updating records asynchronously."""
+        record = TestModel(id=1, name="old", value=1.0)
+        await record.asave()
+        record.value = 2.0
+        await record.asave(update=True)
+        await TestModel.aupdate({"name": "new"}, id=1)
+        result = TestModel.get(id=1)
+        assert (result.name, result.value) == ("new", 2.0)
+
+    async def test_aclear(self, setup_db_config):
+        """Test aclear removes all records."""
+        await TestModel(id=1, name="test", value=1.0).asave()
+        await TestModel.aclear()
+        assert await TestModel.aall() == []
+
+
+class TestDBConnections:
+    """Tests for the persistent connections and bulk inserts."""
+
+    @pytest.fixture(autouse=True)
+    def setup_model(self, setup_db_config):
+        """Reset model state before each test."""
+        TestModel._initialized = False
+        TestModel._table = ""
+        SimpleModel._initialized = False
+        SimpleModel._table = ""
+        yield
+
+    def test_connection_is_reused(self, setup_db_config):
+        """Test the calling thread keeps one connection per database."""
+        assert TestModel.connection() is TestModel.connection()
+        assert SimpleModel.connection() is TestModel.connection()
+
+    def test_connection_per_thread(self, setup_db_config):
+        """Test every thread gets its own connection."""
+        conn = TestModel.connection()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other = executor.submit(TestModel.connection).result()
+        assert other is not conn
+
+    def test_close_connections(self, setup_db_config):
+        """Test close_connections closes the connections of the calling thread."""
+        conn = TestModel.connection()
+        DB.close_connections()
+        assert TestModel.connection() is not conn
+
+    def test_pragmas(self, setup_db_config):
+        """Test the connections use write-ahead logging and synchronous NORMAL."""
+        conn = TestModel.connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_save_many(self, setup_db_config):
+        """Test save_many inserts all records."""
+        records = [TestModel(id=i, name=f"name{i}", value=i) for i in range(100)]
+        assert TestModel.save_many(records) == 100
+        assert len(TestModel.all()) == 100
+        assert TestModel.get(id=42).name == "name42"
+
+    def test_save_many_rolls_back_on_error(self, setup_db_config):
+        """Test save_many inserts nothing when one record fails."""
+        records = [TestModel(id=1, name="a"), TestModel(id=2, name="b"), TestModel(id=1, name="duplicate")]
+        with pytest.raises(Exception):
+            TestModel.save_many(records)
+        assert TestModel.all() == []
+
+    def test_save_many_replace(self, setup_db_config):
+        """Test save_many with replace overwrites the rows with the same primary key."""
+        TestModel.save_many([TestModel(id=1, name="a"), TestModel(id=2, name="b")])
+        assert TestModel.save_many([TestModel(id=1, name="c"), TestModel(id=3, name="d")], replace=True) == 2
+        assert sorted((record.id, record.name) for record in TestModel.all()) == [(1, "c"), (2, "b"), (3, "d")]
+
+    async def test_asave_many(self, setup_db_config):
+        """Test asave_many inserts all records on the worker thread."""
+        records = [SimpleModel(name=f"name{i}", count=i) for i in range(50)]
+        assert await SimpleModel.asave_many(records) == 50
+        assert len(SimpleModel.all()) == 50
+        DBWorker.stop_all()
+
+
+@dataclass
+class IndexedModel(DB):
+    """Model with single and composite indexes."""
+    id: int = field(metadata={"PRIMARY KEY": True})
+    symbol: str = field(default="", metadata={"INDEX": "symbol_time"})
+    time: float = field(default=0.0, metadata={"INDEX": ("symbol_time", "time_only")})
+    closed: bool = field(default=False, metadata={"INDEX": True})
+
+
+@dataclass
+class OrderedIndexModel(IndexedModel):
+    """Model with a composite index declared out of field order."""
+    INDEXES: ClassVar[dict] = {"closed_symbol": ("closed", "symbol", "time")}
+
+
+class TestDBIndexes:
+    """Tests for index declarations."""
+
+    @pytest.fixture(autouse=True)
+    def setup_model(self, setup_db_config):
+        """Reset model state before each test."""
+        IndexedModel._initialized = False
+        IndexedModel._table = ""
+        yield
+
+    def test_get_indexes(self):
+        """Test indexes are collected from the field metadata in field order."""
+        assert IndexedModel.get_indexes() == {
+            "indexedmodel_symbol_time_idx": ["symbol", "time"],
+            "indexedmodel_time_only_idx": ["time"],
+            "indexedmodel_closed_idx": ["closed"],
+        }
+
+    def test_get_indexes_with_indexes_attribute(self):
+        """Test the INDEXES attribute adds composite indexes in their declared column order."""
+        indexes = OrderedIndexModel.get_indexes()
+        assert indexes["orderedindexmodel_closed_symbol_idx"] == ["closed", "symbol", "time"]
+        assert indexes["orderedindexmodel_symbol_time_idx"] == ["symbol", "time"]
+
+    def test_index_metadata_is_not_a_constraint(self):
+        """Test the INDEX metadata is left out of the column definitions."""
+        assert "INDEX" not in IndexedModel.get_columns()
+
+    def test_create_table_creates_indexes(self, setup_db_config):
+        """Test create_table creates the declared indexes."""
+        IndexedModel(id=1)
+        conn = IndexedModel.connection()
+        indexes = {row[0]: row[1] for row in
+                   conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+        assert set(indexes) == {"indexedmodel_symbol_time_idx", "indexedmodel_time_only_idx",
+                                "indexedmodel_closed_idx"}
+        assert '("symbol", "time")' in indexes["indexedmodel_symbol_time_idx"]
+
+    def test_query_uses_index(self, setup_db_config):
+        """Test range queries on indexed columns use the index."""
+        query, params = IndexedModel.query(symbol="EURUSD", time__gte=10).sql()
+        plan = " ".join(row[-1] for row in IndexedModel.connection().execute(f"EXPLAIN QUERY PLAN {query}", params))
+        assert "indexedmodel_symbol_time_idx" in plan
+
+
+class TestDBQuery:
+    """Tests for the Query builder."""
+
+    @pytest.fixture(autouse=True)
+    def setup_model(self, setup_db_config):
+        """Create records for every test."""
+        IndexedModel._initialized = False
+        IndexedModel._table = ""
+        IndexedModel.save_many([IndexedModel(id=i, symbol="EURUSD" if i % 2 else "GBPUSD", time=float(i % 10),
+                                             closed=i < 20) for i in range(50)])
+        yield
+
+    def test_operators(self):
+        """Test comparison, range and membership operators."""
+        assert len(IndexedModel.query(symbol="EURUSD").all()) == 25
+        assert len(IndexedModel.query(symbol__ne="EURUSD").all()) == 25
+        assert len(IndexedModel.query(time__gte=5, time__lt=7).all()) == 10
+        assert len(IndexedModel.query(time__between=(2, 3)).all()) == 10
+        assert len(IndexedModel.query(id__in=[1, 2, 3, 100]).all()) == 3
+        assert len(IndexedModel.query(id__not_in=[1, 2]).all()) == 48
+        assert IndexedModel.query(id__in=[]).all() == []
+        assert len(IndexedModel.query(symbol__like="EUR%", closed=True).all()) == 10
+        assert IndexedModel.query(symbol__is_null=True).count() == 0
+
+    def test_invalid_column_and_operator(self):
+        """Test unknown columns and operators are rejected."""
+        with pytest.raises(ValueError):
+            IndexedModel.query(missing=1)
+        with pytest.raises(ValueError):
+            IndexedModel.query(id__near=1)
+        with pytest.raises(ValueError):
+            IndexedModel.query().order_by("missing")
+
+    def test_order_limit_offset(self):
+        """Test ordering, limit and offset."""
+        records = IndexedModel.query().order_by("-time", "id").limit(3).offset(1).all()
+        assert [record.id for record in records] == [19, 29, 39]
+        assert IndexedModel.query(symbol="EURUSD").order_by("-id").first().id == 49
+        assert IndexedModel.query(symbol="EURUSD").limit(5).count() == 25
+
+    def test_keyset_pagination(self):
+        """Test after continues after a row and pages walks the whole result."""
+        query = IndexedModel.query().order_by("time", "-id")
+        first = query.copy().limit(5).all()
+        second = query.copy().after(first[-1]).limit(5).all()
+        expected = query.all()
+        assert [record.id for record in first + second] == [record.id for record in expected[:10]]
+        pages = list(query.pages(7))
+        assert [len(page) for page in pages] == [7] * 7 + [1]
+        assert [record.id for page in pages for record in page] == [record.id for record in expected]
+        with pytest.raises(ValueError):
+            IndexedModel.query().after({"id": 1})
+
+    def test_streaming_iterator(self):
+        """Test iterating a query yields instances lazily."""
+        stream = IndexedModel.query(symbol="GBPUSD").order_by("id").iter(batch_size=4)
+        assert isinstance(next(stream), IndexedModel)
+        assert len(list(stream)) == 24
+        assert [record.id for record in IndexedModel.query(id__lt=3).order_by("id")] == [0, 1, 2]
+
+    async def test_async_query(self):
+        """Test the async query methods."""
+        assert len(await IndexedModel.query(closed=False).aall()) == 30
+        assert (await IndexedModel.query().order_by("-id").afirst()).id == 49
+        DBWorker.stop_all()
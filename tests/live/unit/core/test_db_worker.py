@@ -0,0 +1,132 @@
+"""Tests for the DBWorker module.
+
+Tests cover:
+- One worker per database
+- Running functions on the worker thread
+- Batched and serialized writes
+- Per request rollback of failed writes
+- Requests writing through their own connections
+- Stopping workers, and workers that can't connect
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from aiomql.core.db_worker import DBWorker
+
+
+@pytest.fixture
+def temp_db():
+    """Creates a temporary database file with a table."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (key TEXT UNIQUE, value INTEGER)")
+    yield path
+    DBWorker.stop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def insert(conn, key, value):
+    """Inserts a row through the worker connection."""
+    conn.execute("INSERT INTO items VALUES (?, ?)", (key, value))
+    return key
+
+
+def count(conn):
+    """Counts the rows through the worker connection."""
+    return conn.execute("SELECT count(*) FROM items").fetchone()[0]
+
+
+class TestDBWorkerInstances:
+    """Tests for DBWorker instances."""
+
+    def test_one_worker_per_database(self, temp_db):
+        """Test the same worker is returned for a database."""
+        assert DBWorker(temp_db) is DBWorker(temp_db)
+
+    def test_stopped_worker_is_replaced(self, temp_db):
+        """Test a new worker is created after the previous one is stopped."""
+        worker = DBWorker(temp_db)
+        worker.stop()
+        with pytest.raises(RuntimeError):
+            worker.submit(count, conn=True)
+        assert DBWorker(temp_db) is not worker
+
+    async def test_worker_that_cannot_connect(self, tmp_path):
+        """Test a worker that can't open its database fails its requests and is replaced."""
+        db_name = tmp_path / "missing" / "db.sqlite3"
+        worker = DBWorker(db_name)
+        with pytest.raises(sqlite3.OperationalError):
+            await asyncio.wait_for(worker.run(count, conn=True), timeout=2)
+        assert worker._stopped
+        assert DBWorker(db_name) is not worker
+        DBWorker(db_name).stop()
+
+    async def test_locked_database_keeps_its_journal_mode(self, temp_db):
+        """Test the worker starts on a database locked by another connection."""
+        other = sqlite3.connect(temp_db)
+        other.execute("INSERT INTO items VALUES ('locked', 0)")
+        worker = DBWorker(temp_db)
+        assert await asyncio.wait_for(worker.run(lambda: "ok"), timeout=2) == "ok"
+        other.commit()
+        other.close()
+        assert await worker.run(count, conn=True) == 1
+
+
+class TestDBWorkerRequests:
+    """Tests for running requests on a DBWorker."""
+
+    async def test_run_on_worker_thread(self, temp_db):
+        """Test functions run on the worker thread."""
+        worker = DBWorker(temp_db)
+        name = await worker.run(lambda: threading.current_thread().name)
+        assert name == f"DBWorker({temp_db})"
+
+    async def test_concurrent_writes_are_committed(self, temp_db):
+        """Test writes queued together are all committed."""
+        worker = DBWorker(temp_db)
+        keys = await asyncio.gather(*(worker.run(insert, f"key{i}", i, write=True) for i in range(200)))
+        assert keys == [f"key{i}" for i in range(200)]
+        with sqlite3.connect(temp_db) as conn:
+            assert count(conn) == 200
+
+    async def test_failed_write_is_rolled_back_alone(self, temp_db):
+        """Test a failing write does not affect the other writes of its batch."""
+        worker = DBWorker(temp_db)
+        results = await asyncio.gather(worker.run(insert, "a", 1, write=True),
+                                       worker.run(insert, "a", 2, write=True),
+                                       worker.run(insert, "b", 3, write=True), return_exceptions=True)
+        assert results[0] == "a" and results[2] == "b"
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        assert await worker.run(count, conn=True) == 2
+
+    def test_stop_handles_queued_requests(self, temp_db):
+        """Test stop waits for the queued requests."""
+        worker = DBWorker(temp_db)
+        futures = [worker.submit(insert, f"key{i}", i, write=True) for i in range(50)]
+        worker.stop()
+        assert all(future.done() for future in futures)
+        with sqlite3.connect(temp_db) as conn:
+            assert count(conn) == 50
+
+    async def test_own_connection_writes_run_outside_the_batch_transaction(self, temp_db):
+        """Test a request writing through its own connection doesn't wait for the writes of its batch."""
+        worker = DBWorker(temp_db)
+
+        def own_insert(key, value):
+            with sqlite3.connect(temp_db, timeout=0.5) as conn:
+                conn.execute("INSERT INTO items VALUES (?, ?)", (key, value))
+            return key
+
+        results = await asyncio.wait_for(asyncio.gather(worker.run(insert, "a", 1, write=True),
+                                                        worker.run(own_insert, "b", 2),
+                                                        worker.run(insert, "c", 3, write=True)), timeout=5)
+        assert results == ["a", "b", "c"]
+        assert await worker.run(count, conn=True) == 3
@@ -11,10 +11,13 @@ Tests cover:
 """
 
 import os
+import pickle
+import sqlite3
 import pytest
 import tempfile
 from collections.abc import MutableMapping
 
+from aiomql.core.db_worker import DBWorker
 from aiomql.core.state import State
 
 
@@ -413,3 +416,128 @@ class TestStateAutocommit:
 
         state2 = State(db_name=temp_db)
         assert "key" not in state2
+
+
+class TestStateIncrementalPersistence:
+    """Tests for per-key State persistence."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Creates a temporary database file."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        yield path
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    @staticmethod
+    def rows(db_name):
+        """Returns the stored keys and their pickled values."""
+        with sqlite3.connect(db_name) as conn:
+            return {key: pickle.loads(value) for key, value in conn.execute("SELECT key, value FROM state_items")}
+
+    @staticmethod
+    def reload(db_name):
+        """Resets the singleton and loads the state from the database."""
+        delattr(State, "_instance")
+        delattr(State, "_data")
+        State._initialized = False
+        return State(db_name=db_name, autocommit=False)
+
+    def test_one_row_per_key(self, temp_db):
+        """Test every key is stored in its own row."""
+        state = State(db_name=temp_db, autocommit=False)
+        state.update({"a": 1, "b": [1, 2]})
+        state.commit()
+        assert self.rows(temp_db) == {"a": 1, "b": [1, 2]}
+
+    def test_commit_writes_only_dirty_keys(self, temp_db):
+        """Test a commit only writes the keys changed since the last commit."""
+        state = State(db_name=temp_db, autocommit=False)
+        state.update({"a": 1, "b": 2})
+        state.commit()
+        state["a"] = 10
+        assert state.dirty == {"a"}
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE state_items SET value = ? WHERE key = 'b'", (pickle.dumps("untouched"),))
+        state.commit()
+        assert state.dirty == set()
+        assert self.rows(temp_db) == {"a": 10, "b": "untouched"}
+
+    def test_deleted_keys_are_removed(self, temp_db):
+        """Test deleted and popped keys are removed from the database."""
+        state = State(db_name=temp_db, autocommit=False, data={"a": 1, "b": 2, "c": 3}, flush=True)
+        del state["a"]
+        state.pop("b")
+        state.commit()
+        assert self.rows(temp_db) == {"c": 3}
+
+    def test_touch_marks_mutated_values(self, temp_db):
+        """Test touch persists values mutated in place."""
+        state = State(db_name=temp_db, autocommit=False)
+        positions = state.setdefault("positions", {})
+        state.commit()
+        positions[1] = "open"
+        state.commit()
+        assert self.rows(temp_db)["positions"] == {}
+        state.touch("positions", "missing")
+        assert state.dirty == {"positions"}
+        state.commit()
+        assert self.reload(temp_db)["positions"] == {1: "open"}
+
+    def test_flush_replaces_all_rows(self, temp_db):
+        """Test flush removes every stored key."""
+        state = State(db_name=temp_db, autocommit=False, data={"a": 1}, flush=True)
+        state.flush({"b": 2})
+        assert self.rows(temp_db) == {"b": 2}
+
+    def test_legacy_state_is_migrated(self, temp_db):
+        """Test a state stored as a single pickled dictionary is migrated to one row per key."""
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("CREATE TABLE state (key text unique, value blob)")
+            conn.execute("INSERT INTO state (key, value) VALUES ('data', ?)", (pickle.dumps({"a": 1, "b": 2}),))
+        state = State(db_name=temp_db, autocommit=False)
+        assert dict(state) == {"a": 1, "b": 2}
+        assert self.rows(temp_db) == {"a": 1, "b": 2}
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT count(*) FROM state").fetchone()[0] == 0
+
+    def test_wal_journal_mode(self, temp_db):
+        """Test the state database uses write-ahead logging."""
+        State(db_name=temp_db)
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestStateAsyncOperations:
+    """Tests for the async State operations."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Creates a temporary database file."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        yield path
+        DBWorker.stop_all()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    async def test_async_mutations_are_committed(self, temp_db):
+        """Test aset, aupdate and adelete commit through the worker when autocommit is on."""
+        state = State(db_name=temp_db, autocommit=True)
+        await state.aset("a", 1)
+        await state.aupdate({"b": 2}, c=3)
+        await state.adelete("c")
+        assert state.dirty == set()
+        with sqlite3.connect(temp_db) as conn:
+            assert {row[0] for row in conn.execute("SELECT key FROM state_items")} == {"a", "b"}
+
+    async def test_async_mutations_without_autocommit(self, temp_db):
+        """Test async mutations stay pending without autocommit."""
+        state = State(db_name=temp_db, autocommit=False)
+        await state.aset("a", 1)
+        assert state.dirty == {"a"}
+        await state.acommit()
+        assert state.dirty == set()
@@ -10,10 +10,12 @@ Tests cover:
 - Flush behavior
 """
 
+import asyncio
 import os
 import pytest
 import tempfile
 import gc
+import sqlite3
 from collections.abc import MutableMapping
 
 from aiomql.core.store import Store
@@ -397,3 +399,197 @@ class TestStoreConnectionHandling:
         conn2 = Store.connection(temp_db)
         assert conn1 is conn2
         conn1.close()
+
+
+class TestStoreReadCache:
+    """Tests for the Store read cache."""
+
+    def test_cache_disabled_by_default(self, temp_db):
+        """Test no values are cached without a cache size."""
+        store = Store(db_name=temp_db, data={"key": "value"})
+        assert store["key"] == "value"
+        assert len(store._cache) == 0
+        store.conn.close()
+
+    def test_hot_keys_skip_sqlite(self, temp_db):
+        """Test cached keys are served without querying the database."""
+        store = Store(db_name=temp_db, data={"key": "value"}, cache_size=10)
+        assert store["key"] == "value"
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE store SET value = 'changed' WHERE key = 'key'")
+        assert store["key"] == "value"
+        assert "key" in store
+        store.conn.close()
+
+    def test_cache_coherent_with_writes(self, temp_db):
+        """Test writes through the store update the cache."""
+        store = Store(db_name=temp_db, cache_size=10)
+        store["key"] = "value"
+        assert store["key"] == "value"
+        store["key"] = "new"
+        assert store["key"] == "new"
+        store.update({"key": "updated"})
+        assert store["key"] == "updated"
+        del store["key"]
+        assert "key" not in store
+        store["other"] = 1
+        store.clear()
+        assert store.get("other") is None
+        store.conn.close()
+
+    def test_cache_is_bounded(self, temp_db):
+        """Test least recently used keys are evicted beyond the cache size."""
+        store = Store(db_name=temp_db, cache_size=2)
+        store.set_many({"a": 1, "b": 2})
+        assert store["a"] == 1
+        store["c"] = 3
+        assert list(store._cache) == ["a", "c"]
+        store.conn.close()
+
+
+class TestStoreBulkOperations:
+    """Tests for Store bulk operations."""
+
+    def test_set_many_and_get_many(self, temp_db):
+        """Test set_many writes all pairs and get_many returns the existing keys."""
+        store = Store(db_name=temp_db, cache_size=5)
+        store.set_many({f"key{i}": i for i in range(2000)})
+        assert len(store) == 2000
+        found = store.get_many([f"key{i}" for i in range(0, 2000, 2)] + ["missing"])
+        assert found == {f"key{i}": i for i in range(0, 2000, 2)}
+        store.conn.close()
+
+    def test_delete_many(self, temp_db):
+        """Test delete_many removes the keys and returns the deleted count."""
+        store = Store(db_name=temp_db, data={"a": 1, "b": 2, "c": 3})
+        assert store.delete_many(["a", "b", "missing"]) == 2
+        assert store.data == {"c": 3}
+        store.conn.close()
+
+    def test_delitem_missing_key_raises(self, temp_db):
+        """Test deleting a missing key raises KeyError."""
+        store = Store(db_name=temp_db)
+        with pytest.raises(KeyError):
+            del store["missing"]
+        store.conn.close()
+
+
+class TestStoreTransactions:
+    """Tests for Store transaction context managers."""
+
+    def test_transaction_commits_once(self, temp_db):
+        """Test writes inside a transaction are committed when it exits."""
+        store = Store(db_name=temp_db, autocommit=True)
+        with store.transaction():
+            store["a"] = 1
+            store.update({"b": 2})
+            with sqlite3.connect(temp_db) as conn:
+                assert conn.execute("SELECT count(*) FROM store").fetchone()[0] == 0
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT count(*) FROM store").fetchone()[0] == 2
+        store.conn.close()
+
+    def test_transaction_rolls_back_on_error(self, temp_db):
+        """Test writes inside a failed transaction are discarded."""
+        store = Store(db_name=temp_db, autocommit=True, data={"a": 1}, cache_size=10)
+        with pytest.raises(ValueError):
+            with store.transaction():
+                store["a"] = 10
+                store["b"] = 2
+                raise ValueError
+        assert store["a"] == 1
+        assert "b" not in store
+        store.conn.close()
+
+    async def test_atransaction(self, temp_db):
+        """Test the staged writes of an async transaction are applied when it exits."""
+        store = Store(db_name=temp_db, autocommit=True, data={"a": 1, "b": 2})
+        async with store.atransaction() as txn:
+            txn["c"] = txn["a"] + 2
+            txn.set_many({"d": 4})
+            del txn["b"]
+            assert "b" not in txn and txn["c"] == 3
+            assert "c" not in store
+        assert store.data == {"a": 1, "c": 3, "d": 4}
+        store.conn.close()
+
+    async def test_atransaction_rolls_back_on_error(self, temp_db):
+        """Test a failed async transaction drops its writes but not the writes made around it."""
+        store = Store(db_name=temp_db, autocommit=True, data={"a": 1})
+
+        async def write():
+            store["other"] = 1
+
+        with pytest.raises(ValueError):
+            async with store.atransaction() as txn:
+                txn["a"] = 10
+                txn.clear()
+                await asyncio.gather(write())
+                raise ValueError
+        assert store.data == {"a": 1, "other": 1}
+        store.conn.close()
+
+    async def test_atransaction_does_not_block_the_worker(self, temp_db):
+        """Test operations run on the worker thread complete while an async transaction is open."""
+        store = Store(db_name=temp_db, autocommit=True)
+        async with store.atransaction() as txn:
+            txn["a"] = 1
+            await asyncio.wait_for(store.aset("b", 2), timeout=2)
+            await asyncio.wait_for(store.acommit(), timeout=2)
+        assert store.data == {"a": 1, "b": 2}
+        store.conn.close()
+
+    async def test_atransactions_run_one_at_a_time(self, temp_db):
+        """Test concurrent async transactions on a loop don't interleave."""
+        store = Store(db_name=temp_db, autocommit=True, data={"count": 0})
+
+        async def increment():
+            async with store.atransaction() as txn:
+                count = txn["count"]
+                await asyncio.sleep(0)
+                txn["count"] = count + 1
+
+        await asyncio.gather(*(increment() for _ in range(5)))
+        assert store["count"] == 5
+        store.conn.close()
+
+
+class TestStoreAsyncOperations:
+    """Tests for the async Store operations run on the worker thread."""
+
+    async def test_aset_aget_adelete(self, temp_db):
+        """Test single key async operations."""
+        store = Store(db_name=temp_db)
+        await store.aset("key", "value")
+        assert await store.aget("key") == "value"
+        await store.adelete("key")
+        assert await store.aget("key", "missing") == "missing"
+        with pytest.raises(KeyError):
+            await store.adelete("key")
+        store.worker.stop()
+        store.conn.close()
+
+    async def test_bulk_async_operations(self, temp_db):
+        """Test bulk async operations."""
+        store = Store(db_name=temp_db, cache_size=10)
+        await store.aset_many({"a": 1, "b": 2, "c": 3})
+        assert await store.aget_many(["a", "c", "d"]) == {"a": 1, "c": 3}
+        assert await store.adelete_many(["a", "b"]) == 2
+        assert store.data == {"c": 3}
+        store.worker.stop()
+        store.conn.close()
+
+    async def test_sync_reads_alongside_async_operations(self, temp_db):
+        """Test reads on the event loop while the worker thread runs async operations on the same store."""
+        store = Store(db_name=temp_db, data={f"key{n}": n for n in range(2000)})
+        tasks = [asyncio.create_task(coro) for n in range(200)
+                 for coro in (store.aget(f"key{n}"), store.aset(f"new{n}", n), store.acommit())]
+        await asyncio.sleep(0)
+        for _ in range(20):
+            assert sum(1 for _ in store.iteritems()) >= 2000
+            assert store["key1"] == 1 and "key2" in store and len(store) >= 2000
+        results = await asyncio.gather(*tasks)
+        assert results[::3] == list(range(200))
+        assert store.get_many(f"new{n}" for n in range(200)) == {f"new{n}": n for n in range(200)}
+        store.worker.stop()
+        store.conn.close()
@@ -0,0 +1,231 @@
+"""Tests for the WriteBehind module.
+
+Tests cover:
+- Singleton behavior
+- Background flushing of State and Store on interval and threshold
+- Final flush on stop
+- Flush metrics
+"""
+
+import gc
+import os
+import sqlite3
+import tempfile
+import time
+
+import pytest
+
+from aiomql.core.state import State
+from aiomql.core.store import Store
+from aiomql.core.write_behind import WriteBehind
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Reset the WriteBehind, State and Store class level state before each test."""
+    for cls in (WriteBehind, State):
+        if hasattr(cls, "_instance"):
+            delattr(cls, "_instance")
+    if hasattr(State, "_data"):
+        delattr(State, "_data")
+    State._initialized = False
+    Store._conn = None
+    Store._buffers.clear()
+    Store._cleared.clear()
+    yield
+    if hasattr(WriteBehind, "_instance"):
+        WriteBehind._instance.stop()
+        delattr(WriteBehind, "_instance")
+    if hasattr(State, "_instance"):
+        delattr(State, "_instance")
+    if hasattr(State, "_data"):
+        delattr(State, "_data")
+    State._initialized = False
+    gc.collect()
+    if Store._conn is not None:
+        Store._conn.close()
+    Store._conn = None
+    Store._buffers.clear()
+    Store._cleared.clear()
+
+
+@pytest.fixture
+def temp_db():
+    """Creates a temporary database file."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    yield path
+    gc.collect()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def stored_state_keys(db_name):
+    """Returns the keys committed to the state table."""
+    with sqlite3.connect(db_name) as conn:
+        return {row[0] for row in conn.execute("SELECT key FROM state_items")}
+
+
+def wait_for(condition, timeout=2.0):
+    """Polls a condition until it holds or the timeout elapses."""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestWriteBehindSingleton:
+    """Tests for WriteBehind singleton behavior."""
+
+    def test_same_instance(self):
+        """Test WriteBehind returns the same instance and keeps the first options."""
+        first = WriteBehind(interval=5, threshold=10)
+        second = WriteBehind(interval=1, threshold=1)
+        assert first is second
+        assert second.interval == 5
+        assert second.threshold == 10
+
+
+class TestWriteBehindState:
+    """Tests for write-behind flushing of State."""
+
+    def test_mutations_are_not_committed_synchronously(self, temp_db):
+        """Test a registered state does not commit on mutation."""
+        state = State(db_name=temp_db, autocommit=True)
+        WriteBehind(interval=60, threshold=100).register(state)
+        state["key"] = "value"
+        assert state["key"] == "value"
+        assert state.pending == 1
+        assert "key" not in stored_state_keys(temp_db)
+
+    def test_flush_on_interval(self, temp_db):
+        """Test the state is flushed after the interval."""
+        state = State(db_name=temp_db, autocommit=False)
+        WriteBehind(interval=0.05, threshold=100).register(state)
+        state["key"] = "value"
+        assert wait_for(lambda: "key" in stored_state_keys(temp_db))
+        assert state.pending == 0
+
+    def test_flush_on_threshold(self, temp_db):
+        """Test reaching the threshold flushes before the interval elapses."""
+        state = State(db_name=temp_db, autocommit=False)
+        WriteBehind(interval=60, threshold=3).register(state)
+        state.update({"a": 1, "b": 2})
+        time.sleep(0.1)
+        assert stored_state_keys(temp_db) == set()
+        state["c"] = 3
+        assert wait_for(lambda: stored_state_keys(temp_db) == {"a", "b", "c"})
+
+    def test_stop_flushes_pending_changes(self, temp_db):
+        """Test stop runs a final flush."""
+        state = State(db_name=temp_db, autocommit=False)
+        write_behind = WriteBehind(interval=60, threshold=100)
+        write_behind.register(state)
+        state["key"] = "value"
+        write_behind.stop()
+        assert not write_behind.running
+        assert "key" in stored_state_keys(temp_db)
+
+    def test_unregister_restores_commits(self, temp_db):
+        """Test an unregistered state is flushed and commits on its own again."""
+        state = State(db_name=temp_db, autocommit=True)
+        write_behind = WriteBehind(interval=60, threshold=100)
+        write_behind.register(state)
+        state["a"] = 1
+        write_behind.unregister(state)
+        assert state.write_behind is None
+        state["b"] = 2
+        assert stored_state_keys(temp_db) == {"a", "b"}
+
+
+class TestWriteBehindStore:
+    """Tests for write-behind flushing of Store."""
+
+    def test_store_flushed_on_stop(self, temp_db):
+        """Test store writes are committed by the flusher."""
+        store = Store(db_name=temp_db, autocommit=False)
+        write_behind = WriteBehind(interval=60, threshold=100)
+        write_behind.register(store)
+        store.update({"a": 1, "b": 2})
+        store["c"] = 3
+        assert store.pending == 3
+        write_behind.stop()
+        assert store.pending == 0
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT count(*) FROM store").fetchone()[0] == 3
+
+
+    def test_store_reads_buffered_changes(self, temp_db):
+        """Test buffered sets, deletes and clears are seen by reads before the flush."""
+        Store(db_name=temp_db, data={"a": 1, "b": 2}).conn.close()
+        store = Store(db_name=temp_db, autocommit=False)
+        WriteBehind(interval=60, threshold=100).register(store)
+        store["c"] = 3
+        del store["a"]
+        assert store["c"] == 3 and "a" not in store
+        assert store.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+        assert len(store) == 2 and store.data == {"b": 2, "c": 3}
+        with pytest.raises(KeyError):
+            del store["a"]
+        store.clear()
+        store["d"] = 4
+        assert store.data == {"d": 4} and "b" not in store
+        with sqlite3.connect(temp_db) as conn:
+            assert dict(conn.execute("SELECT key, value FROM store")) == {"a": 1, "b": 2}
+        WriteBehind().flush()
+        with sqlite3.connect(temp_db) as conn:
+            assert dict(conn.execute("SELECT key, value FROM store")) == {"d": 4}
+
+    def test_store_does_not_lock_the_database(self, temp_db):
+        """Test pending store changes leave the database free for the state and other connections."""
+        state = State(db_name=temp_db, autocommit=False)
+        store = Store(db_name=temp_db, autocommit=False)
+        write_behind = WriteBehind(interval=60, threshold=100)
+        write_behind.register(store)
+        write_behind.register(state)
+        store["a"] = 1
+        state["key"] = "value"
+        with sqlite3.connect(temp_db, timeout=0.1) as conn:
+            conn.execute("CREATE TABLE other (value)")
+        start = time.perf_counter()
+        write_behind.flush()
+        assert time.perf_counter() - start < 1
+        assert write_behind.errors == 0
+        assert "key" in stored_state_keys(temp_db)
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT value FROM store WHERE key = 'a'").fetchone() == (1,)
+
+    def test_store_transaction_rollback_drops_buffered_writes(self, temp_db):
+        """Test a failed transaction discards its buffered writes only."""
+        store = Store(db_name=temp_db, autocommit=False)
+        WriteBehind(interval=60, threshold=100).register(store)
+        store["a"] = 1
+        with pytest.raises(ValueError):
+            with store.transaction():
+                store["b"] = 2
+                store.clear()
+                raise ValueError
+        assert store.data == {"a": 1}
+        assert store.pending == 1
+
+
+class TestWriteBehindMetrics:
+    """Tests for WriteBehind flush metrics."""
+
+    def test_stats(self, temp_db):
+        """Test flushes and latencies are recorded."""
+        state = State(db_name=temp_db, autocommit=False)
+        write_behind = WriteBehind(interval=60, threshold=100)
+        write_behind.register(state)
+        write_behind.flush()
+        assert write_behind.stats["flushes"] == 0
+        state["key"] = "value"
+        write_behind.flush()
+        stats = write_behind.stats
+        assert stats["flushes"] == 1
+        assert stats["errors"] == 0
+        assert stats["max_ms"] >= stats["last_ms"] > 0
+        assert stats["mean_ms"] == pytest.approx(stats["last_ms"])
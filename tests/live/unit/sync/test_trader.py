@@ -23,7 +23,6 @@ from aiomql.lib.ram import RAM
 from aiomql.lib.sync.symbol import Symbol
 from aiomql.core.models import OrderType, OrderSendResult, OrderCheckResult
 from aiomql.core.config import Config
-from aiomql.core.task_queue import QueueItem
 
 
 # --- Concrete subclass for testing abstract Trader ---
@@ -71,6 +70,13 @@ def mock_tick():
     return tick
 
 
+@pytest.fixture(autouse=True)
+def result_sink():
+    """Patch the ResultSink so that recorded trades are not saved."""
+    with patch('aiomql.lib.sync.trader.ResultSink') as MockSink:
+        yield MockSink.return_value
+
+
 @pytest.fixture
 def trader(mock_symbol, mock_ram, mock_tick):
     """Create a ConcreteTrader for testing."""
@@ -630,11 +636,9 @@ class TestRecordTrade:
 
         trader.record_trade(result=result)
 
-    def test_record_trade_uses_task_queue(self, trader, successful_result):
-        """Test record_trade adds to task queue by default."""
+    def test_record_trade_uses_result_sink(self, trader, successful_result, result_sink):
+        """Test record_trade hands the result to the ResultSink by default."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -650,7 +654,7 @@ class TestRecordTrade:
 
             trader.record_trade(result=successful_result, parameters={"key": "value"})
 
-            trader.config.task_queue.add.assert_called_once()
+            result_sink.add.assert_called_once_with(mock_res)
 
     def test_record_trade_direct_save(self, trader, successful_result):
         """Test record_trade saves directly when use_task_queue=False."""
@@ -678,8 +682,6 @@ class TestRecordTrade:
     def test_record_trade_with_parameters(self, trader, successful_result):
         """Test record_trade passes parameters to Result."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -706,8 +708,6 @@ class TestRecordTrade:
     def test_record_trade_with_expected_profit(self, trader, successful_result):
         """Test record_trade uses provided expected_profit."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -730,8 +730,6 @@ class TestRecordTrade:
     def test_record_trade_non_dict_parameters(self, trader, successful_result):
         """Test record_trade handles non-dict parameters."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.09500
@@ -755,8 +753,6 @@ class TestRecordTrade:
     def test_record_trade_updates_sl_tp_from_history(self, trader, successful_result):
         """Test record_trade sets sl and tp on result.request from history order."""
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_order = MagicMock()
         mock_order.sl = 1.08000
@@ -836,7 +832,7 @@ class TestIntegration:
         result = trader.send_order()
         assert result.retcode == 10009
 
-    def test_full_trade_lifecycle(self, trader, mock_tick):
+    def test_full_trade_lifecycle(self, trader, mock_tick, result_sink):
         """Test full lifecycle: create, check, send, record."""
         order_type = MagicMock()
         order_type.is_long = True
@@ -866,8 +862,6 @@ class TestIntegration:
 
         # Record
         trader.config.record_trades = True
-        trader.config.task_queue = MagicMock()
-        trader.config.task_queue.add = MagicMock()
 
         mock_history_order = MagicMock()
         mock_history_order.sl = 1.09500
@@ -883,4 +877,4 @@ class TestIntegration:
 
             trader.record_trade(result=result, name="TestStrategy")
 
-            trader.config.task_queue.add.assert_called_once()
+            result_sink.add.assert_called_once_with(mock_res)